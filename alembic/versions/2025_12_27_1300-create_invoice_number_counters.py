@@ -0,0 +1,48 @@
+"""Create invoice_number_counters table.
+
+Revision ID: create_invoice_counters
+Revises: create_licensing_enums
+Create Date: 2025-12-27 13:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "create_invoice_counters"
+down_revision: str | None = "create_licensing_enums"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "invoice_number_counters" in sa.inspect(bind).get_table_names():
+        return
+
+    # Rows are created on first allocation, seeded from the tenant's
+    # highest existing invoice number for the year
+    op.create_table(
+        "invoice_number_counters",
+        sa.Column("tenant_id", sa.String(255), primary_key=True),
+        sa.Column("year", sa.Integer(), primary_key=True),
+        sa.Column("last_value", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("invoice_number_counters")
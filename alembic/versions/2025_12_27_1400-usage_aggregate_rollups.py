@@ -0,0 +1,212 @@
+"""Prepare usage_aggregates for incremental rollups.
+
+Revision ID: usage_agg_rollups
+Revises: create_invoice_counters
+Create Date: 2025-12-27 14:00:00.000000
+
+Brings usage_aggregates in line with the UsageAggregate model, keys the
+unique index on customer_id as well (the ON CONFLICT target of rollup
+upserts) and backfills hourly, daily and monthly rollups from usage_records.
+Downgrading merges aggregates that differ only by customer, so no usage is
+lost when the narrower unique index is restored.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "usage_agg_rollups"
+down_revision: str | None = "create_invoice_counters"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ROLLUP_KEY = [
+    "tenant_id",
+    "subscription_id",
+    "customer_id",
+    "usage_type",
+    "period_start",
+    "period_type",
+]
+
+# Unique key before this revision
+LEGACY_KEY = ["tenant_id", "subscription_id", "usage_type", "period_start", "period_type"]
+
+# period_type -> (date_trunc unit, bucket length)
+ROLLUP_PERIODS = {
+    "hourly": ("hour", "1 hour"),
+    "daily": ("day", "1 day"),
+    "monthly": ("month", "1 month"),
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "usage_aggregates" not in inspector.get_table_names():
+        op.create_table(
+            "usage_aggregates",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("tenant_id", sa.String(50), nullable=False, index=True),
+            sa.Column("subscription_id", sa.String(50), nullable=True, index=True),
+            sa.Column("customer_id", sa.String(50), nullable=True, index=True),
+            sa.Column("usage_type", sa.String(50), nullable=False, index=True),
+            sa.Column("period_start", sa.DateTime(timezone=True), nullable=False, index=True),
+            sa.Column("period_end", sa.DateTime(timezone=True), nullable=False, index=True),
+            sa.Column("period_type", sa.String(20), nullable=False),
+            sa.Column("total_quantity", sa.Numeric(20, 6), nullable=False),
+            sa.Column("total_amount", sa.Integer(), nullable=True),
+            sa.Column("record_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("min_quantity", sa.Numeric(20, 6), nullable=True),
+            sa.Column("max_quantity", sa.Numeric(20, 6), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+    else:
+        columns = {column["name"]: column for column in inspector.get_columns("usage_aggregates")}
+        missing = [
+            sa.Column("customer_id", sa.String(50), nullable=True),
+            sa.Column("usage_type", sa.String(50), nullable=True),
+            sa.Column("period_type", sa.String(20), nullable=True),
+            sa.Column("total_amount", sa.Integer(), nullable=True),
+            sa.Column("record_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("min_quantity", sa.Numeric(20, 6), nullable=True),
+            sa.Column("max_quantity", sa.Numeric(20, 6), nullable=True),
+        ]
+        for column in missing:
+            if column.name not in columns:
+                op.add_column("usage_aggregates", column)
+
+        # Legacy columns the model never writes
+        for name in ("aggregate_id", "product_id", "billable_quantity"):
+            if name in columns and not columns[name]["nullable"]:
+                op.alter_column("usage_aggregates", name, nullable=True)
+
+        if columns.get("subscription_id", {}).get("nullable") is False:
+            # NULL subscription marks a tenant-level aggregate
+            op.alter_column("usage_aggregates", "subscription_id", nullable=True)
+
+        indexes = {index["name"] for index in inspector.get_indexes("usage_aggregates")}
+        if "ix_usage_agg_unique" in indexes:
+            op.drop_index("ix_usage_agg_unique", table_name="usage_aggregates")
+
+    op.create_index("ix_usage_agg_unique", "usage_aggregates", ROLLUP_KEY, unique=True)
+
+    if bind.dialect.name != "postgresql" or "usage_records" not in inspector.get_table_names():
+        return
+
+    record_columns = {column["name"] for column in inspector.get_columns("usage_records")}
+    if not {"customer_id", "usage_type", "period_start", "total_amount"} <= record_columns:
+        return
+
+    for period_type, (unit, length) in ROLLUP_PERIODS.items():
+        op.execute(
+            sa.text(
+                f"""
+                INSERT INTO usage_aggregates (
+                    id, tenant_id, subscription_id, customer_id, usage_type,
+                    period_type, period_start, period_end, total_quantity,
+                    total_amount, record_count, min_quantity, max_quantity,
+                    created_at, updated_at
+                )
+                SELECT
+                    gen_random_uuid(), tenant_id, subscription_id, customer_id, usage_type,
+                    '{period_type}', bucket, bucket + interval '{length}', total_quantity,
+                    total_amount, record_count, min_quantity, max_quantity, now(), now()
+                FROM (
+                    SELECT
+                        tenant_id,
+                        COALESCE(subscription_id, '') AS subscription_id,
+                        COALESCE(customer_id, '') AS customer_id,
+                        usage_type,
+                        date_trunc('{unit}', period_start AT TIME ZONE 'UTC')
+                            AT TIME ZONE 'UTC' AS bucket,
+                        SUM(quantity) AS total_quantity,
+                        COALESCE(SUM(total_amount), 0) AS total_amount,
+                        COUNT(*) AS record_count,
+                        MIN(quantity) AS min_quantity,
+                        MAX(quantity) AS max_quantity
+                    FROM usage_records
+                    WHERE tenant_id IS NOT NULL
+                      AND usage_type IS NOT NULL
+                      AND period_start IS NOT NULL
+                    GROUP BY 1, 2, 3, 4, 5
+                ) AS rollups
+                ON CONFLICT ({", ".join(ROLLUP_KEY)}) DO UPDATE SET
+                    period_end = EXCLUDED.period_end,
+                    total_quantity = EXCLUDED.total_quantity,
+                    total_amount = EXCLUDED.total_amount,
+                    record_count = EXCLUDED.record_count,
+                    min_quantity = EXCLUDED.min_quantity,
+                    max_quantity = EXCLUDED.max_quantity,
+                    updated_at = EXCLUDED.updated_at
+                """
+            )
+        )
+
+
+def downgrade() -> None:
+    # The previous unique key has no customer_id: merge rows that only differ
+    # by customer into the oldest one instead of deleting any aggregates
+    partition = ", ".join(LEGACY_KEY)
+    ranked = f"""
+        SELECT usage_aggregates.*,
+            FIRST_VALUE(id) OVER (PARTITION BY {partition} ORDER BY id) AS keep_id
+        FROM usage_aggregates
+    """
+    op.execute(
+        sa.text(
+            f"""
+            UPDATE usage_aggregates SET
+                customer_id = CASE
+                    WHEN merged.customers > 1 THEN NULL ELSE usage_aggregates.customer_id
+                END,
+                period_end = merged.period_end,
+                total_quantity = merged.total_quantity,
+                total_amount = merged.total_amount,
+                record_count = merged.record_count,
+                min_quantity = merged.min_quantity,
+                max_quantity = merged.max_quantity
+            FROM (
+                SELECT
+                    keep_id,
+                    COUNT(DISTINCT customer_id) AS customers,
+                    MAX(period_end) AS period_end,
+                    SUM(total_quantity) AS total_quantity,
+                    SUM(total_amount) AS total_amount,
+                    SUM(record_count) AS record_count,
+                    MIN(min_quantity) AS min_quantity,
+                    MAX(max_quantity) AS max_quantity
+                FROM ({ranked}) AS ranked
+                GROUP BY keep_id
+                HAVING COUNT(*) > 1
+            ) AS merged
+            WHERE usage_aggregates.id = merged.keep_id
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            f"""
+            DELETE FROM usage_aggregates
+            WHERE id IN (SELECT id FROM ({ranked}) AS ranked WHERE id <> keep_id)
+            """
+        )
+    )
+
+    op.drop_index("ix_usage_agg_unique", table_name="usage_aggregates")
+    op.create_index("ix_usage_agg_unique", "usage_aggregates", LEGACY_KEY, unique=True)
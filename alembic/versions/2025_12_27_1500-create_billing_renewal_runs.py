@@ -0,0 +1,66 @@
+"""Create billing_renewal_runs table.
+
+Revision ID: create_renewal_runs
+Revises: usage_agg_rollups
+Create Date: 2025-12-27 15:00:00.000000
+
+Stores the keyset checkpoint of the subscription renewal engine and indexes
+billing_subscriptions for its walk in subscription_id order.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "create_renewal_runs"
+down_revision: str | None = "usage_agg_rollups"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if "billing_renewal_runs" not in tables:
+        op.create_table(
+            "billing_renewal_runs",
+            sa.Column("run_id", sa.String(50), primary_key=True),
+            sa.Column("cutoff", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("status", sa.String(20), nullable=False, server_default="running"),
+            sa.Column("last_subscription_id", sa.String(50), nullable=True),
+            sa.Column("renewed", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("skipped", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            ),
+        )
+        op.create_index("ix_billing_renewal_runs_status", "billing_renewal_runs", ["status"])
+
+    if "billing_subscriptions" in tables:
+        indexes = {index["name"] for index in inspector.get_indexes("billing_subscriptions")}
+        if "ix_billing_subscriptions_status_id" not in indexes:
+            op.create_index(
+                "ix_billing_subscriptions_status_id",
+                "billing_subscriptions",
+                ["status", "subscription_id"],
+            )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_billing_subscriptions_status_id", table_name="billing_subscriptions")
+    op.drop_index("ix_billing_renewal_runs_status", table_name="billing_renewal_runs")
+    op.drop_table("billing_renewal_runs")
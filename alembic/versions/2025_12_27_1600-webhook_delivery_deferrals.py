@@ -0,0 +1,37 @@
+"""Add webhook_deliveries.deferral_count.
+
+Revision ID: webhook_deferrals
+Revises: create_renewal_runs
+Create Date: 2025-12-27 16:00:00.000000
+
+Counts how often the endpoint scheduler held a delivery back without sending
+it, so deferrals beyond ``endpoint_max_deferrals`` use up retries.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "webhook_deferrals"
+down_revision: str | None = "create_renewal_runs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "webhook_deliveries" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("webhook_deliveries")}
+    if "deferral_count" not in columns:
+        op.add_column(
+            "webhook_deliveries",
+            sa.Column("deferral_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("webhook_deliveries", "deferral_count")
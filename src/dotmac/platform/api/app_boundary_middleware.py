@@ -15,6 +15,7 @@ import structlog
 from fastapi import HTTPException, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from dotmac.platform.core.asgi_middleware import BeforeRequestASGIMixin
 from dotmac.platform.settings import settings
 
 logger = structlog.get_logger(__name__)
@@ -61,6 +62,16 @@ class AppBoundaryMiddleware(BaseHTTPMiddleware):
         Returns:
             Response
 
+        Raises:
+            HTTPException: If boundary rules are violated
+        """
+        await self.process_request(request)
+        return await call_next(request)
+
+    async def process_request(self, request: Request) -> Response | None:
+        """
+        Enforce app boundaries for a request.
+
         Raises:
             HTTPException: If boundary rules are violated
         """
@@ -68,7 +79,7 @@ class AppBoundaryMiddleware(BaseHTTPMiddleware):
 
         # Skip middleware for public and health routes
         if self._is_public_route(path) or self._is_health_route(path):
-            return await call_next(request)
+            return None
 
         # Get user from request state (set by auth middleware)
         user = getattr(request.state, "user", None)
@@ -84,8 +95,7 @@ class AppBoundaryMiddleware(BaseHTTPMiddleware):
 
         # Shared routes - no additional enforcement (handled by route dependencies)
 
-        # Proceed with request
-        return await call_next(request)
+        return None
 
     def _enforce_platform_boundary(
         self,
@@ -381,9 +391,14 @@ class SingleTenantMiddleware(BaseHTTPMiddleware):
         Returns:
             Response
         """
+        await self.process_request(request)
+        return await call_next(request)
+
+    async def process_request(self, request: Request) -> Response | None:
+        """Set fixed tenant context for single-tenant deployment."""
         # Only apply in single-tenant mode
         if settings.DEPLOYMENT_MODE != "single_tenant":
-            return await call_next(request)
+            return None
 
         # Set fixed tenant ID from config
         if settings.TENANT_ID:
@@ -399,4 +414,12 @@ class SingleTenantMiddleware(BaseHTTPMiddleware):
                 path=request.url.path,
             )
 
-        return await call_next(request)
+        return None
+
+
+class AppBoundaryASGIMiddleware(BeforeRequestASGIMixin, AppBoundaryMiddleware):
+    """Pure ASGI variant of AppBoundaryMiddleware."""
+
+
+class SingleTenantASGIMiddleware(BeforeRequestASGIMixin, SingleTenantMiddleware):
+    """Pure ASGI variant of SingleTenantMiddleware."""
@@ -46,7 +46,11 @@ Usage Examples:
     )
 """
 
-from .middleware import AuditContextMiddleware, create_audit_aware_dependency
+from .middleware import (
+    AuditContextASGIMiddleware,
+    AuditContextMiddleware,
+    create_audit_aware_dependency,
+)
 from .models import (
     ActivitySeverity,
     ActivityType,
@@ -79,5 +83,6 @@ __all__ = [
     "log_system_activity",
     # Middleware
     "AuditContextMiddleware",
+    "AuditContextASGIMiddleware",
     "create_audit_aware_dependency",
 ]
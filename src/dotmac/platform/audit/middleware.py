@@ -10,6 +10,7 @@ from typing import Any
 import structlog
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Receive, Scope, Send
 
 from ..tenant import get_tenant_context
 
@@ -55,6 +56,25 @@ class AuditContextMiddleware(BaseHTTPMiddleware):
         """Process request and set audit context."""
 
         original_tenant = get_tenant_context()
+        tenant_overridden = await self.populate_context(request)
+
+        try:
+            response = await call_next(request)
+        finally:
+            if tenant_overridden:
+                from ..tenant import set_current_tenant_id
+
+                set_current_tenant_id(original_tenant)
+
+        return response
+
+    async def populate_context(self, request: Request) -> bool:
+        """
+        Set audit context on ``request.state`` from the JWT or API key.
+
+        Returns True if the tenant context variable was overridden and must be
+        restored once the request completes.
+        """
         tenant_overridden = False
 
         try:
@@ -80,12 +100,12 @@ class AuditContextMiddleware(BaseHTTPMiddleware):
 
             if jwt_token or api_key:
                 # Import here to avoid circular dependency
-                from ..auth.core import TokenType, api_key_service, jwt_service
+                from ..auth.core import TokenType, api_key_service, verify_request_token
 
                 # Extract user info from JWT token (header or cookie)
                 if jwt_token:
                     try:
-                        claims = jwt_service.verify_token(jwt_token, TokenType.ACCESS)
+                        claims = verify_request_token(request, jwt_token, TokenType.ACCESS)
                         user_id = claims.get("sub")
                         username = claims.get("username")
                         email = claims.get("email")
@@ -123,9 +143,7 @@ class AuditContextMiddleware(BaseHTTPMiddleware):
                         request.state.email = email
                         existing_tenant_id = getattr(request.state, "tenant_id", None)
                         if not existing_tenant_id:
-                            request.state.tenant_id = (
-                                active_managed_tenant_id or tenant_id_claim
-                            )
+                            request.state.tenant_id = active_managed_tenant_id or tenant_id_claim
                         request.state.roles = roles
 
                         # Set partner context fields for audit logging
@@ -216,16 +234,29 @@ class AuditContextMiddleware(BaseHTTPMiddleware):
             # Don't fail the request if we can't extract user context
             logger.debug("Failed to extract audit context", error=str(e))
 
+        return tenant_overridden
+
+
+class AuditContextASGIMiddleware(AuditContextMiddleware):
+    """Pure ASGI variant of AuditContextMiddleware (see ``settings.middleware_mode``)."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        original_tenant = get_tenant_context()
+        tenant_overridden = await self.populate_context(request)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send)
         finally:
             if tenant_overridden:
                 from ..tenant import set_current_tenant_id
 
                 set_current_tenant_id(original_tenant)
 
-        return response
-
 
 def create_audit_aware_dependency(user_info_dependency: Any) -> Any:
     """
@@ -28,6 +28,8 @@ from .core import (  # Services; Service instances; Models; Dependencies; Utilit
     jwt_service,
     session_manager,
     verify_password,
+    verify_request_token,
+    verify_request_token_async,
 )
 from .dependencies import (
     require_admin,
@@ -60,6 +62,8 @@ __all__ = [
     # Dependencies
     "get_current_user",
     "get_current_user_optional",
+    "verify_request_token",
+    "verify_request_token_async",
     "require_auth",
     "require_admin",
     "require_scopes",
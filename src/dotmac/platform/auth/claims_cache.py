@@ -0,0 +1,119 @@
+"""
+Verified JWT Claims Cache.
+
+Signature verification (especially RS256/ES256) dominates the cost of
+authenticating a request, and the same bearer token is presented on every
+request until it expires. Two layers avoid repeating that work:
+
+- ``VerifiedClaimsCache``: bounded, process-wide LRU of token hash -> claims
+  whose signature, issuer and audience were already validated. Entries expire
+  at the token's ``exp``. Revocation is *not* cached; callers still check the
+  blacklist on every verification.
+- Request memo: the first verification result for a token (claims or the
+  raised error) is stored on the ASGI scope so TenantMiddleware,
+  AuditContextMiddleware and ``get_current_user`` verify it once per request.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+REQUEST_SCOPE_KEY = "dotmac.verified_tokens"
+
+_MISSING = object()
+
+
+class VerifiedClaimsCache:
+    """Bounded LRU of signature-verified claims keyed by token hash."""
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        # verify_token is sync and may run in threadpool workers
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """Return a copy of the cached claims, or None if missing or expired."""
+        if self.max_size <= 0:
+            return None
+
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(claims)
+
+    def set(self, token: str, claims: dict[str, Any]) -> None:
+        """Cache verified claims until the token's ``exp``."""
+        if self.max_size <= 0:
+            return
+
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            # Tokens without an expiry are never cached
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(exp), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        """Drop a single token from the cache."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        """Drop all cached claims (e.g. after a signing key rotation)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _request_memo(request: Any) -> dict[tuple[str, str | None], Any] | None:
+    scope = getattr(request, "scope", None)
+    if not isinstance(scope, dict):
+        return None
+    memo = scope.get(REQUEST_SCOPE_KEY)
+    if memo is None:
+        memo = scope[REQUEST_SCOPE_KEY] = {}
+    return memo
+
+
+def get_request_verification(request: Any, token: str, expected_type: str | None) -> Any:
+    """
+    Return the memoized verification result for ``token`` on this request.
+
+    The result is either a claims dict or the exception raised by the first
+    verification. Returns ``None`` if the token has not been verified yet.
+    """
+    memo = _request_memo(request)
+    if memo is None:
+        return None
+    result = memo.get((token, expected_type), _MISSING)
+    return None if result is _MISSING else result
+
+
+def set_request_verification(
+    request: Any, token: str, expected_type: str | None, result: dict[str, Any] | Exception
+) -> None:
+    """Memoize a verification result (claims or exception) on the request scope."""
+    memo = _request_memo(request)
+    if memo is not None:
+        memo[(token, expected_type)] = result
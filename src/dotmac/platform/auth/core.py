@@ -32,6 +32,11 @@ from fastapi.security import (
 from passlib.context import CryptContext
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from dotmac.platform.auth.claims_cache import (
+    VerifiedClaimsCache,
+    get_request_verification,
+    set_request_verification,
+)
 from dotmac.platform.utils.crypto_compat import ensure_bcrypt_metadata
 
 redis_async: Any | None
@@ -305,6 +310,16 @@ class JWTService:
         self._redis: Any | None = None
         self._redis_sync: Any | None = None
 
+        # Signature-verified claims (revocation is still checked on every call)
+        cache_size = 4096
+        try:
+            from ..settings import settings
+
+            cache_size = settings.auth.jwt_claims_cache_size
+        except Exception:
+            pass
+        self._claims_cache = VerifiedClaimsCache(max_size=cache_size)
+
         # JWKS/Asymmetric key support
         self._key_manager: Any | None = None
         try:
@@ -441,20 +456,7 @@ class JWTService:
             HTTPException: If token is invalid, revoked, or has wrong type
         """
         try:
-            claims: dict[str, Any] | None = None
-            claims_options = self._get_claims_options()
-
-            # Try asymmetric verification first if kid is present
-            claims = self._try_asymmetric_verification(token, claims_options)
-
-            # Fall back to HS256 if asymmetric failed or not applicable
-            if claims is None:
-                if claims_options:
-                    claims_raw = jwt.decode(token, self.secret, claims_options=claims_options)
-                else:
-                    claims_raw = jwt.decode(token, self.secret)
-                claims_raw.validate()
-                claims = cast(dict[str, Any], dict(claims_raw))
+            claims = self._decode_verified(token)
 
             # Validate token type if specified
             if expected_type:
@@ -483,6 +485,33 @@ class JWTService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+    def _decode_verified(self, token: str) -> dict[str, Any]:
+        """Return signature-verified claims, served from the claims cache when possible."""
+        claims = self._claims_cache.get(token)
+        if claims is not None:
+            return claims
+
+        claims_options = self._get_claims_options()
+
+        # Try asymmetric verification first if kid is present
+        claims = self._try_asymmetric_verification(token, claims_options)
+
+        # Fall back to HS256 if asymmetric failed or not applicable
+        if claims is None:
+            if claims_options:
+                claims_raw = jwt.decode(token, self.secret, claims_options=claims_options)
+            else:
+                claims_raw = jwt.decode(token, self.secret)
+            claims_raw.validate()
+            claims = cast(dict[str, Any], dict(claims_raw))
+
+        self._claims_cache.set(token, claims)
+        return claims
+
+    def clear_claims_cache(self) -> None:
+        """Forget cached signature verifications (call after removing a signing key)."""
+        self._claims_cache.clear()
+
     def _try_asymmetric_verification(
         self,
         token: str,
@@ -571,6 +600,7 @@ class JWTService:
             jti = claims.get("jti")
             if not jti:
                 return False
+            self._claims_cache.discard(token)
 
             # Calculate TTL based on token expiry
             exp = claims.get("exp")
@@ -631,9 +661,12 @@ class JWTService:
             HTTPException: If token is invalid, revoked, or has wrong type
         """
         try:
-            claims_raw = jwt.decode(token, self.secret)
-            claims_raw.validate()
-            claims = cast(dict[str, Any], dict(claims_raw))
+            # Claims verified by verify_token (which also checks iss/aud) can be reused
+            claims = self._claims_cache.get(token)
+            if claims is None:
+                claims_raw = jwt.decode(token, self.secret)
+                claims_raw.validate()
+                claims = cast(dict[str, Any], dict(claims_raw))
 
             # Validate token type if specified
             if expected_type:
@@ -1244,6 +1277,54 @@ async def _verify_token_with_fallback(
     return jwt_service.verify_token(token, expected_type)
 
 
+def verify_request_token(
+    request: Any, token: str, expected_type: TokenType | None = TokenType.ACCESS
+) -> dict[str, Any]:
+    """Verify a token at most once per request (sync path used by middleware).
+
+    The result, including a rejection, is memoized on the ASGI scope so later
+    middleware and dependencies reuse it instead of verifying again.
+    """
+    type_value = expected_type.value if expected_type else None
+    cached = get_request_verification(request, token, type_value)
+    if isinstance(cached, HTTPException):
+        raise cached
+    if cached is not None:
+        return cast(dict[str, Any], cached)
+
+    try:
+        claims = jwt_service.verify_token(token, expected_type)
+    except HTTPException as exc:
+        set_request_verification(request, token, type_value, exc)
+        raise
+
+    if isinstance(claims, dict):
+        set_request_verification(request, token, type_value, claims)
+    return claims
+
+
+async def verify_request_token_async(
+    request: Any, token: str, expected_type: TokenType | None = TokenType.ACCESS
+) -> dict[str, Any]:
+    """Async counterpart of :func:`verify_request_token`."""
+    type_value = expected_type.value if expected_type else None
+    cached = get_request_verification(request, token, type_value)
+    if isinstance(cached, HTTPException):
+        raise cached
+    if cached is not None:
+        return cast(dict[str, Any], cached)
+
+    try:
+        claims = await _verify_token_with_fallback(token, expected_type)
+    except HTTPException as exc:
+        set_request_verification(request, token, type_value, exc)
+        raise
+
+    if isinstance(claims, dict):
+        set_request_verification(request, token, type_value, claims)
+    return claims
+
+
 async def get_current_user(
     request: Request,
     token: str | None = Depends(oauth2_scheme),
@@ -1265,7 +1346,9 @@ async def get_current_user(
     # Try Bearer token - must be ACCESS token
     if credentials and credentials.credentials:
         try:
-            claims = await _verify_token_with_fallback(credentials.credentials, TokenType.ACCESS)
+            claims = await verify_request_token_async(
+                request, credentials.credentials, TokenType.ACCESS
+            )
             await _ensure_session_active(claims)
             return _claims_to_user_with_context(request, claims)
         except HTTPException:
@@ -1274,7 +1357,7 @@ async def get_current_user(
     # Try OAuth2 token - must be ACCESS token
     if token:
         try:
-            claims = await _verify_token_with_fallback(token, TokenType.ACCESS)
+            claims = await verify_request_token_async(request, token, TokenType.ACCESS)
             await _ensure_session_active(claims)
             return _claims_to_user_with_context(request, claims)
         except HTTPException:
@@ -1284,7 +1367,7 @@ async def get_current_user(
     access_token = request.cookies.get("access_token")
     if access_token:
         try:
-            claims = await _verify_token_with_fallback(access_token, TokenType.ACCESS)
+            claims = await verify_request_token_async(request, access_token, TokenType.ACCESS)
             await _ensure_session_active(claims)
             return _claims_to_user_with_context(request, claims)
         except HTTPException:
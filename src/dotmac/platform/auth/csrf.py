@@ -11,6 +11,8 @@ import structlog
 from fastapi import HTTPException, Request, Response, status
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from dotmac.platform.core.asgi_middleware import BeforeRequestASGIMixin
+
 logger = structlog.get_logger(__name__)
 
 CallNext = Callable[[Request], Awaitable[Response]]
@@ -23,18 +25,25 @@ class CSRFMiddleware(BaseHTTPMiddleware):
     _REFRESH_PATHS = {"/api/v1/auth/refresh", "/auth/refresh"}
 
     async def dispatch(self, request: Request, call_next: CallNext) -> Response:
+        early_response = await self.process_request(request)
+        if early_response is not None:
+            return early_response
+        return await call_next(request)
+
+    async def process_request(self, request: Request) -> Response | None:
+        """Validate the CSRF token; raises HTTPException on failure."""
         method = request.method.upper()
         if method in self._SAFE_METHODS:
-            return await call_next(request)
+            return None
 
         # Skip CSRF check for non-cookie auth (e.g., Bearer/API key clients).
         auth_header = request.headers.get("Authorization")
         if isinstance(auth_header, str) and auth_header.lower().startswith("bearer "):
-            return await call_next(request)
+            return None
 
         access_cookie = request.cookies.get("access_token")
         if not access_cookie:
-            return await call_next(request)
+            return None
 
         if request.url.path in self._REFRESH_PATHS:
             body = await request.body()
@@ -53,7 +62,7 @@ class CSRFMiddleware(BaseHTTPMiddleware):
                     parsed = parse_qs(body.decode("utf-8", errors="ignore"))
                     refresh_token = parsed.get("refresh_token", [None])[0]
             if isinstance(refresh_token, str) and refresh_token.strip():
-                return await call_next(request)
+                return None
 
         csrf_cookie = request.cookies.get("csrf_token")
         csrf_header = request.headers.get("X-CSRF-Token")
@@ -82,4 +91,8 @@ class CSRFMiddleware(BaseHTTPMiddleware):
                 detail="Invalid CSRF token",
             )
 
-        return await call_next(request)
+        return None
+
+
+class CSRFASGIMiddleware(BeforeRequestASGIMixin, CSRFMiddleware):
+    """Pure ASGI variant of CSRFMiddleware."""
@@ -0,0 +1,89 @@
+"""
+RBAC Permission Cache.
+
+Async, two-tier cache of per-user permission snapshots:
+
+- L1: small per-process TTL + LRU cache holding compiled snapshots, so a hot
+  user's permission checks never leave the process.
+- L2: async Redis shared by all workers, so a cold worker does not have to
+  hit the database.
+
+Concurrent misses for the same user share a single load (single-flight).
+Mutations drop the local entry, unlink the Redis keys and broadcast the user
+id over pub/sub so every worker drops its L1 copy immediately instead of
+waiting for the TTL. Invalidations tied to a database change are repeated once
+the session commits, so a load racing the transaction cannot re-cache the old
+permissions.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from dotmac.platform.core.snapshot_cache import SnapshotCache
+from dotmac.platform.redis_client import RedisClientType
+from dotmac.platform.settings import settings
+
+INVALIDATION_CHANNEL = "rbac:permissions:invalidate"
+KEY_PREFIX = "rbac:perms"
+
+
+class PermissionCache(SnapshotCache[Any]):
+    """Per-process L1 in front of async Redis for user permission snapshots."""
+
+    def __init__(
+        self,
+        ttl: int | None = None,
+        local_ttl: float | None = None,
+        local_max_size: int | None = None,
+        redis: RedisClientType | None = None,
+    ) -> None:
+        super().__init__(
+            key_prefix=KEY_PREFIX,
+            channel=INVALIDATION_CHANNEL,
+            ttl=settings.auth.rbac_cache_ttl if ttl is None else ttl,
+            local_ttl=settings.auth.rbac_local_cache_ttl if local_ttl is None else local_ttl,
+            local_max_size=(
+                settings.auth.rbac_local_cache_size if local_max_size is None else local_max_size
+            ),
+            redis=redis,
+        )
+
+    @staticmethod
+    def redis_key(user_id: UUID | str, include_expired: bool) -> str:
+        return f"{KEY_PREFIX}:{user_id}:expired={include_expired}"
+
+    def redis_keys(self, scope: str) -> tuple[str, ...]:
+        return self.redis_key(scope, False), self.redis_key(scope, True)
+
+    async def get_or_load(
+        self,
+        user_id: UUID | str,
+        include_expired: bool,
+        loader: Callable[[], Awaitable[Any]],
+        decode: Callable[[Any], Any | None],
+    ) -> Any:
+        """
+        Return the cached snapshot for a user, loading it at most once.
+
+        ``loader`` produces the snapshot from the database on a miss; the
+        snapshot must provide ``to_cache_payload()``. ``decode`` rebuilds a
+        snapshot from the JSON payload stored in Redis (returning ``None`` for
+        unusable payloads).
+        """
+        return await self.fetch(
+            str(user_id), self.redis_key(user_id, include_expired), loader, decode
+        )
+
+
+_permission_cache: PermissionCache | None = None
+
+
+def get_permission_cache() -> PermissionCache:
+    """Return the process-wide RBAC permission cache."""
+    global _permission_cache
+    if _permission_cache is None:
+        _permission_cache = PermissionCache()
+    return _permission_cache
@@ -0,0 +1,198 @@
+"""
+Compiled Permission Structures.
+
+In-memory structures backing RBAC permission checks:
+
+- ``PermissionTrie``: dot-segment trie compiled from a permission set, so a
+  check walks at most one node per segment instead of scanning every
+  wildcard entry.
+- ``PermissionHierarchy``: closure table of the permission ``parent_id``
+  hierarchy, loaded with a single query and refreshed when its version is
+  bumped (on permission changes) or it ages out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dotmac.platform.auth.models import Permission
+
+WILDCARD_SUFFIX = ".*"
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal", "wildcard")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.terminal = False  # Exact permission ends here
+        self.wildcard = False  # "<prefix>.*" grants this node and everything below
+
+
+class PermissionTrie:
+    """
+    Dot-segment trie over a set of permission strings.
+
+    Matching semantics are those of the original linear scan:
+
+    - ``"*"`` grants everything
+    - ``"a.b.*"`` grants ``"a.b"`` and anything starting with ``"a.b."``
+    - any other entry grants exactly itself
+    """
+
+    __slots__ = ("_root", "_grants_all")
+
+    def __init__(self, entries: Iterable[str] = ()) -> None:
+        self._root = _TrieNode()
+        self._grants_all = False
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry: str) -> None:
+        """Add a permission or wildcard entry."""
+        if entry == "*":
+            self._grants_all = True
+            return
+
+        wildcard = entry.endswith(WILDCARD_SUFFIX)
+        path = entry[: -len(WILDCARD_SUFFIX)] if wildcard else entry
+        node = self._root
+        for segment in path.split("."):
+            node = node.children.setdefault(segment, _TrieNode())
+        if wildcard:
+            node.wildcard = True
+        else:
+            node.terminal = True
+
+    def matches(self, permission: str) -> bool:
+        """Return True if any entry grants ``permission`` (O(segments))."""
+        if self._grants_all:
+            return True
+
+        node: _TrieNode | None = self._root
+        for segment in permission.split("."):
+            node = node.children.get(segment) if node is not None else None
+            if node is None:
+                break
+            if node.wildcard:
+                return True
+
+        return node is not None and node.terminal
+
+
+class PermissionHierarchy:
+    """
+    Process-wide closure table of permission ancestors.
+
+    Holding a permission implies every ancestor reachable through
+    ``Permission.parent_id``. The whole hierarchy is loaded with one query
+    and kept until :meth:`invalidate` bumps the version or ``max_age`` passes.
+    """
+
+    def __init__(self, max_age: float = 300.0) -> None:
+        self.max_age = max_age
+        self.version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._ancestors_by_id: dict[UUID, frozenset[UUID]] = {}
+        self._ancestor_names: dict[str, frozenset[str]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        if self._loaded_version != self.version:
+            return False
+        return self.max_age <= 0 or time.monotonic() - self._loaded_at <= self.max_age
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load the hierarchy if missing or stale (single-flight)."""
+        if self.is_fresh:
+            return
+
+        async with self._lock:
+            if self.is_fresh:
+                return
+
+            version = self.version
+            result = await db.execute(select(Permission.id, Permission.name, Permission.parent_id))
+            rows = [tuple(row) for row in result.all()]
+
+            # Skip publishing if an invalidation landed while we were loading
+            if version == self.version:
+                self.build(rows)
+                self._loaded_version = version
+                self._loaded_at = time.monotonic()
+
+    def build(self, rows: Iterable[Any]) -> None:
+        """Build the closure table from ``(id, name, parent_id)`` rows."""
+        names: dict[UUID, str] = {}
+        parents: dict[UUID, UUID | None] = {}
+        for permission_id, name, parent_id in rows:
+            names[permission_id] = name
+            parents[permission_id] = parent_id
+
+        closure: dict[UUID, frozenset[UUID]] = {}
+        for permission_id in names:
+            # Walk up until a resolved node, the root, or a cycle
+            path: list[UUID] = []
+            seen: set[UUID] = set()
+            node: UUID | None = permission_id
+            while node is not None and node not in closure and node not in seen:
+                seen.add(node)
+                path.append(node)
+                node = parents.get(node)
+
+            base: frozenset[UUID] = frozenset()
+            if node is not None and node in closure:
+                base = closure[node] | {node}
+
+            # Fill from the top down so each entry extends its parent's closure
+            for path_node in reversed(path):
+                closure[path_node] = base
+                base = base | {path_node}
+
+        self._ancestors_by_id = {
+            permission_id: frozenset(a for a in ancestors if a in names)
+            for permission_id, ancestors in closure.items()
+            if permission_id in names
+        }
+        self._ancestor_names = {
+            names[permission_id]: frozenset(names[a] for a in ancestors)
+            for permission_id, ancestors in self._ancestors_by_id.items()
+            if ancestors
+        }
+
+    def ancestors_of(self, permission_id: UUID) -> frozenset[UUID]:
+        """Return all ancestor ids of a permission."""
+        return self._ancestors_by_id.get(permission_id, frozenset())
+
+    def expand(self, permissions: Iterable[str]) -> set[str]:
+        """Return ``permissions`` plus every ancestor they imply."""
+        expanded = set(permissions)
+        for name in list(expanded):
+            ancestors = self._ancestor_names.get(name)
+            if ancestors:
+                expanded.update(ancestors)
+        return expanded
+
+    def invalidate(self) -> None:
+        """Mark the hierarchy stale; the next check reloads it."""
+        self.version += 1
+
+
+_permission_hierarchy: PermissionHierarchy | None = None
+
+
+def get_permission_hierarchy() -> PermissionHierarchy:
+    """Return the process-wide permission hierarchy."""
+    global _permission_hierarchy
+    if _permission_hierarchy is None:
+        _permission_hierarchy = PermissionHierarchy()
+    return _permission_hierarchy
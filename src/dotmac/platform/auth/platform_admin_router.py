@@ -760,8 +760,12 @@ async def clear_system_cache(
     )
 
     # Placeholder - implement cache clearing
+    from dotmac.platform.auth.permission_cache import get_permission_cache
     from dotmac.platform.core.caching import get_redis
 
+    if cache_type in (None, "permissions"):
+        await get_permission_cache().invalidate()
+
     try:
         redis_client = get_redis()
         if redis_client:
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from dotmac.platform.auth.core import UserInfo, get_current_user
 from dotmac.platform.auth.models import PermissionCategory
+from dotmac.platform.auth.permission_cache import get_permission_cache
 from dotmac.platform.auth.rbac_dependencies import require_admin, require_permission
 from dotmac.platform.auth.rbac_service import RBACService, get_rbac_service
 from dotmac.platform.db import get_async_session
@@ -368,6 +369,10 @@ async def update_role(
 
     await db.commit()
 
+    # Every holder of the role is affected; role membership is not worth resolving here
+    if request.permissions is not None or request.is_active is not None:
+        await get_permission_cache().invalidate()
+
     return RoleResponse(
         id=role.id,
         name=role.name,
@@ -402,6 +407,7 @@ async def delete_role(
 
     await db.delete(role)
     await db.commit()
+    await get_permission_cache().invalidate()
 
 
 # ==================== User Role Assignment ====================
@@ -26,8 +26,10 @@ from dotmac.platform.auth.models import (
     user_permissions,
     user_roles,
 )
+from dotmac.platform.auth.permission_cache import get_permission_cache
+from dotmac.platform.auth.permission_index import PermissionTrie, get_permission_hierarchy
 from dotmac.platform.auth.rbac_audit import rbac_audit_logger
-from dotmac.platform.core.caching import cache_delete, cache_get, cache_set
+from dotmac.platform.core.caching import cache_delete
 from dotmac.platform.db import get_async_session
 from dotmac.platform.tenant import get_current_tenant_id
 from dotmac.platform.user_management.models import User
@@ -44,9 +46,12 @@ logger = structlog.get_logger(__name__)
 class PermissionSnapshot(Iterable[str]):
     """
     Container for a user's effective permissions, including explicit denies.
+
+    Allows and denies are compiled into segment tries on first use, so a
+    check costs O(permission depth) regardless of how many wildcards are held.
     """
 
-    __slots__ = ("allows", "denies")
+    __slots__ = ("allows", "denies", "_allow_trie", "_deny_trie")
 
     def __init__(
         self,
@@ -55,6 +60,8 @@ class PermissionSnapshot(Iterable[str]):
     ) -> None:
         self.allows: set[str] = set(allows or [])
         self.denies: set[str] = set(denies or [])
+        self._allow_trie: PermissionTrie | None = None
+        self._deny_trie: PermissionTrie | None = None
         self._prune_conflicting_allows()
 
     def __iter__(self) -> Iterator[str]:
@@ -78,10 +85,26 @@ class PermissionSnapshot(Iterable[str]):
             self.allows.difference_update(to_remove)
 
     def allows_permission(self, permission: str) -> bool:
-        return self._matches(self.allows, permission)
+        if self._allow_trie is None:
+            self._allow_trie = PermissionTrie(self.allows)
+        return self._allow_trie.matches(permission)
 
     def is_denied(self, permission: str) -> bool:
-        return self._matches(self.denies, permission)
+        if self._deny_trie is None:
+            self._deny_trie = PermissionTrie(self.denies)
+        return self._deny_trie.matches(permission)
+
+    def grants(self, permission: str) -> bool:
+        """Return True if the permission is allowed and not explicitly denied."""
+        return not self.is_denied(permission) and self.allows_permission(permission)
+
+    def grants_any(self, permissions: Iterable[str]) -> bool:
+        """Evaluate a list of permissions in one pass, stopping at the first grant."""
+        return any(self.grants(permission) for permission in permissions)
+
+    def grants_all(self, permissions: Iterable[str]) -> bool:
+        """Evaluate a list of permissions in one pass, stopping at the first miss."""
+        return all(self.grants(permission) for permission in permissions)
 
     def to_cache_payload(self) -> dict[str, list[str]]:
         return {"allows": list(self.allows), "denies": list(self.denies)}
@@ -97,19 +120,6 @@ class PermissionSnapshot(Iterable[str]):
             return cls(set(payload), set())
         return None
 
-    def _matches(self, bucket: set[str], permission: str) -> bool:
-        if permission in bucket or "*" in bucket:
-            return True
-
-        for entry in bucket:
-            if not entry.endswith(".*"):
-                continue
-            prefix = entry[:-2]
-            if permission == prefix or permission.startswith(f"{prefix}."):
-                return True
-
-        return False
-
 
 class RBACService:
     """Service for managing roles and permissions"""
@@ -120,10 +130,22 @@ class RBACService:
         self._role_cache: dict[str, Role] = {}
 
     def _invalidate_user_permission_cache(self, user_id: UUID | str) -> None:
-        """Remove cached permissions for a user (clears legacy and new cache keys)."""
+        """Remove cached permissions for a user from this process (and legacy cache keys)."""
         cache_delete(f"user_perms:{user_id}")
         cache_delete(f"user_perms:{user_id}:expired=False")
         cache_delete(f"user_perms:{user_id}:expired=True")
+        get_permission_cache().invalidate_local(user_id)
+
+    async def _invalidate_user_permissions(self, user_id: UUID | str) -> None:
+        """Remove cached permissions for a user and broadcast the change to all workers.
+
+        The change is not visible to other sessions until the caller commits, so the
+        invalidation is repeated after commit to drop snapshots reloaded in between.
+        """
+        self._invalidate_user_permission_cache(user_id)
+        cache = get_permission_cache()
+        await cache.invalidate(user_id)
+        cache.invalidate_after_commit(self.db, user_id)
 
     # ==================== User Permissions ====================
 
@@ -135,15 +157,18 @@ class RBACService:
         if isinstance(user_id, str):
             user_id = UUID(user_id)
 
-        # Include include_expired flag in cache key to prevent cache poisoning
-        cache_key = f"user_perms:{user_id}:expired={include_expired}"
-
-        # Check cache first
-        cached = cache_get(cache_key)
-        snapshot = PermissionSnapshot.from_cache_payload(cached)
-        if snapshot is not None:
-            return snapshot
+        # Cached per (user, include_expired) to prevent cache poisoning
+        return await get_permission_cache().get_or_load(
+            user_id,
+            include_expired,
+            lambda: self._load_user_permissions(user_id, include_expired),
+            PermissionSnapshot.from_cache_payload,
+        )
 
+    async def _load_user_permissions(
+        self, user_id: UUID, include_expired: bool
+    ) -> PermissionSnapshot:
+        """Load a user's effective permissions from the database."""
         permissions: set[str] = set()
         denied_permissions: set[str] = set()
         now = datetime.now(UTC)
@@ -194,9 +219,6 @@ class RBACService:
 
         snapshot = PermissionSnapshot(permissions, denied_permissions)
 
-        # Cache for 5 minutes
-        cache_set(cache_key, snapshot.to_cache_payload(), ttl=300)
-
         logger.info(f"Loaded {len(snapshot)} permissions for user {user_id}")
         return snapshot
 
@@ -231,8 +253,8 @@ class RBACService:
                     return True
             return False
 
-        user_perms = await self.get_user_permissions(user_id)
-        return any(self._permission_matches(user_perms, perm) for perm in permissions)
+        user_perms = self._as_snapshot(await self.get_user_permissions(user_id))
+        return user_perms.grants_any(permissions)
 
     async def user_has_all_permissions(self, user_id: UUID | str, permissions: list[str]) -> bool:
         """Check if user has all specified permissions"""
@@ -243,8 +265,14 @@ class RBACService:
                     return False
             return True
 
-        user_perms = await self.get_user_permissions(user_id)
-        return all(self._permission_matches(user_perms, perm) for perm in permissions)
+        user_perms = self._as_snapshot(await self.get_user_permissions(user_id))
+        return user_perms.grants_all(permissions)
+
+    @staticmethod
+    def _as_snapshot(permissions: PermissionSnapshot | set[str]) -> PermissionSnapshot:
+        if isinstance(permissions, PermissionSnapshot):
+            return permissions
+        return PermissionSnapshot(set(permissions or ()), set())
 
     @staticmethod
     def _permission_matches(snapshot: PermissionSnapshot | set[str], permission: str) -> bool:
@@ -252,13 +280,7 @@ class RBACService:
         if not snapshot:
             return False
 
-        if isinstance(snapshot, set):
-            snapshot = PermissionSnapshot(snapshot, set())
-
-        if snapshot.is_denied(permission):
-            return False
-
-        return snapshot.allows_permission(permission)
+        return RBACService._as_snapshot(snapshot).grants(permission)
 
     # ==================== Role Management ====================
 
@@ -320,7 +342,7 @@ class RBACService:
         user_exists = await self.db.get(User, user_id)
         if not user_exists:
             logger.warning("Role assignment skipped for missing user", user_id=str(user_id))
-            self._invalidate_user_permission_cache(user_id)
+            await self._invalidate_user_permissions(user_id)
             return
 
         # Assign role
@@ -344,7 +366,7 @@ class RBACService:
         )
 
         # Clear cache
-        self._invalidate_user_permission_cache(user_id)
+        await self._invalidate_user_permissions(user_id)
 
         logger.info(f"Assigned role {role_name} to user {user_id}")
 
@@ -384,7 +406,7 @@ class RBACService:
         user_exists = await self.db.get(User, user_id)
         if not user_exists:
             logger.warning("Role revocation skipped for missing user", user_id=str(user_id))
-            self._invalidate_user_permission_cache(user_id)
+            await self._invalidate_user_permissions(user_id)
             return
 
         # Remove role assignment
@@ -405,7 +427,7 @@ class RBACService:
         )
 
         # Clear cache
-        self._invalidate_user_permission_cache(user_id)
+        await self._invalidate_user_permissions(user_id)
 
         logger.info(f"Revoked role {role_name} from user {user_id}")
 
@@ -447,7 +469,7 @@ class RBACService:
         user_exists = await self.db.get(User, user_id)
         if not user_exists:
             logger.warning("Permission grant skipped for missing user", user_id=str(user_id))
-            self._invalidate_user_permission_cache(user_id)
+            await self._invalidate_user_permissions(user_id)
             return
 
         # Check if already granted
@@ -502,7 +524,7 @@ class RBACService:
         )
 
         # Clear cache (need to clear both cache keys for expired=True and expired=False)
-        self._invalidate_user_permission_cache(user_id)
+        await self._invalidate_user_permissions(user_id)
 
         logger.info(f"Granted permission {permission_name} to user {user_id}")
 
@@ -542,7 +564,7 @@ class RBACService:
         user_exists = await self.db.get(User, user_id)
         if not user_exists:
             logger.warning("Permission revocation skipped for missing user", user_id=str(user_id))
-            self._invalidate_user_permission_cache(user_id)
+            await self._invalidate_user_permissions(user_id)
             return
 
         # Remove the permission grant
@@ -570,7 +592,7 @@ class RBACService:
         )
 
         # Clear cache
-        self._invalidate_user_permission_cache(user_id)
+        await self._invalidate_user_permissions(user_id)
 
         logger.info(f"Revoked permission {permission_name} from user {user_id}")
 
@@ -669,6 +691,9 @@ class RBACService:
         self.db.add(permission)
         await self.db.flush()
 
+        # The hierarchy closure changed
+        get_permission_hierarchy().invalidate()
+
         logger.info(f"Created permission: {name}")
         return permission
 
@@ -701,17 +726,10 @@ class RBACService:
         return permission
 
     async def _include_parent_permissions(self, permissions: set[str]) -> set[str]:
-        """Add parent permissions defined via the permission hierarchy."""
-        expanded = set(permissions)
-
-        for perm_name in list(permissions):
-            permission_record = await self._get_permission_by_name(perm_name)
-            if permission_record and permission_record.parent_id:
-                parent = await self.db.get(Permission, permission_record.parent_id)
-                if parent:
-                    expanded.add(parent.name)
-
-        return expanded
+        """Add ancestor permissions defined via the permission hierarchy."""
+        hierarchy = get_permission_hierarchy()
+        await hierarchy.ensure_loaded(self.db)
+        return hierarchy.expand(permissions)
 
     async def _expand_permissions(self, permissions: set[str]) -> set[str]:
         """Expand permissions with parent hierarchy and wildcard variants."""
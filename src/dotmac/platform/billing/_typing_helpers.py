@@ -9,6 +9,7 @@ from celery import shared_task as celery_shared_task
 
 from dotmac.platform.core.cache_decorators import CacheTier as _CacheTier
 from dotmac.platform.core.cache_decorators import cached_result as _cached_result
+from dotmac.platform.core.cache_stampede import StampedeProtection
 from dotmac.platform.core.rate_limiting import rate_limit as _rate_limit
 from dotmac.platform.core.tasks import idempotent_task as _idempotent_task
 
@@ -42,9 +43,12 @@ def cached_result(
     key_prefix: str = "",
     key_params: list[str] | None = None,
     tier: Any = CacheTier.L2_REDIS,
+    stampede: StampedeProtection | None = None,
 ) -> Callable[[Callable[P, Awaitable[S]]], Callable[P, Awaitable[S]]]:
     """Typed wrapper around the shared cached_result decorator."""
-    decorator = _cached_result(ttl=ttl, key_prefix=key_prefix, key_params=key_params, tier=tier)
+    decorator = _cached_result(
+        ttl=ttl, key_prefix=key_prefix, key_params=key_params, tier=tier, stampede=stampede
+    )
     return decorator
 
 
@@ -3,28 +3,69 @@ Billing module caching layer.
 
 Provides high-performance caching for frequently accessed billing data
 with intelligent invalidation and multi-tier caching strategies.
+
+Tags are indexed in Redis (tag -> keys and key -> tags sets) so any worker
+can invalidate entries written by another, and every invalidation is
+broadcast over pub/sub so all workers drop their L1 copies.
 """
 
+import asyncio
 import hashlib
 import json
-from collections.abc import Awaitable, Callable, MutableMapping
+import re
+from collections.abc import Awaitable, Callable, Iterable, Mapping, MutableMapping
 from datetime import UTC, datetime
 from enum import Enum
 from functools import wraps
-from typing import Any, TypeVar
+from types import MappingProxyType
+from typing import Any, ClassVar, TypeVar
+from uuid import uuid4
 
 import structlog
 from cachetools import TTLCache  # noqa: PGH003
 
 # Core cache primitives reused here for consistency
 from dotmac.platform.core.cache_decorators import CacheTier
+from dotmac.platform.core.cache_stampede import (
+    StampedeProtection,
+    check_protection,
+    get_stampede_guard,
+)
 from dotmac.platform.core.caching import cache_get, cache_set, get_redis
+from dotmac.platform.core.invalidation import InvalidationListener
+from dotmac.platform.redis_client import RedisClientType
 
 logger = structlog.get_logger(__name__)
 
 T = TypeVar("T")
 Loader = Callable[[], Awaitable[Any]]
 
+INVALIDATION_CHANNEL = "billing:cache:invalidate"
+TAG_KEY_PREFIX = "billing:cache:tag:"
+KEY_TAGS_PREFIX = "billing:cache:keytags:"
+SCAN_BATCH_SIZE = 500
+
+# KEYS[1] = key -> tags set, KEYS[2..] = tag -> keys sets
+# ARGV[1] = ttl, ARGV[2] = cache key, ARGV[3..] = tags
+# Index sets only ever extend their TTL so they outlive every member.
+_TAG_INDEX_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], ARGV[2])
+end
+for i = 1, #KEYS do
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return #KEYS
+"""
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
 
 class CacheStrategy(str, Enum):
     """Cache strategy types."""
@@ -51,6 +92,20 @@ class BillingCacheConfig:
     PRICING_CACHE_SIZE = 500
     SUBSCRIPTION_CACHE_SIZE = 2000
 
+    # L1 cache holding each key namespace ("billing:<namespace>:..." or
+    # "<namespace>:..."). Namespaces not listed here are only cached in Redis.
+    L1_NAMESPACES: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "product": "product",
+            "products": "product",
+            "pricing": "pricing",
+            "price": "pricing",
+            "plan": "subscription",
+            "subscription": "subscription",
+            "subscriptions": "subscription",
+        }
+    )
+
     # Feature flags
     ENABLE_L1_CACHE = True
     ENABLE_L2_CACHE = True
@@ -188,7 +243,7 @@ class BillingCache:
     - L1 in-memory cache for ultra-fast access
     - L2 Redis cache for distributed caching
     - Intelligent cache warming
-    - Automatic invalidation
+    - Tag and pattern invalidation shared across workers
     - Metrics collection
     """
 
@@ -216,9 +271,15 @@ class BillingCache:
             self.pricing_cache = {}
             self.subscription_cache = {}
 
-        # Track cache dependencies for invalidation
+        # Track cache dependencies for invalidation (local view; Redis holds the shared index)
         self.dependencies: dict[str, set[str]] = {}
 
+        self._instance_id = uuid4().hex
+        self._tag_script: Any = None
+        self._listener = InvalidationListener(
+            INVALIDATION_CHANNEL, self.handle_message, self._clear_memory, name="billing.cache"
+        )
+
     async def get(
         self,
         key: str,
@@ -315,6 +376,11 @@ class BillingCache:
                     if tag not in self.dependencies:
                         self.dependencies[tag] = set()
                     self.dependencies[tag].add(key)
+                client = get_redis() if self.config.ENABLE_L2_CACHE else None
+                if client:
+                    await asyncio.to_thread(
+                        self._index_tags, client, key, tags, ttl or self.config.PRODUCT_TTL
+                    )
 
             self.metrics.record_set()
             logger.debug("Cache set", key=key, ttl=ttl, tier=tier.value)
@@ -340,11 +406,12 @@ class BillingCache:
             if self.config.ENABLE_L1_CACHE:
                 self._delete_from_memory(key)
 
-            # Delete from L2 Redis cache
+            # Delete from L2 Redis cache and drop other workers' L1 copies
             if self.config.ENABLE_L2_CACHE:
                 client = get_redis()
                 if client:
                     client.delete(key)
+                    self._broadcast(client, keys=[key])
 
             self.metrics.record_delete()
             logger.debug("Cache delete", key=key)
@@ -359,6 +426,9 @@ class BillingCache:
         """
         Invalidate all cache keys matching pattern.
 
+        Redis keys are found with SCAN and removed with UNLINK in a worker
+        thread, so large keyspaces do not block Redis or the event loop.
+
         Args:
             pattern: Pattern to match (e.g., "billing:product:*")
 
@@ -371,18 +441,11 @@ class BillingCache:
             if self.config.ENABLE_L2_CACHE:
                 client = get_redis()
                 if client:
-                    keys = client.keys(pattern)
-                    if keys:
-                        count = client.delete(*keys)
+                    count = await asyncio.to_thread(self._unlink_matching, client, pattern)
 
             # Clear from memory caches
             if self.config.ENABLE_L1_CACHE:
-                # Simple pattern matching for memory caches
-                for cache in [self.product_cache, self.pricing_cache, self.subscription_cache]:
-                    keys_to_delete = [k for k in cache.keys() if self._match_pattern(k, pattern)]
-                    for k in keys_to_delete:
-                        del cache[k]
-                        count += 1
+                count += self._invalidate_memory_pattern(pattern)
 
             logger.info("Cache invalidation", pattern=pattern, count=count)
             return count
@@ -395,54 +458,192 @@ class BillingCache:
         """
         Invalidate cache entries by tags.
 
+        Keys are resolved from both the local dependency map and the shared
+        Redis tag index, so entries cached by other workers are included.
+
         Args:
             tags: List of tags to invalidate
 
         Returns:
             Number of keys invalidated
         """
-        count = 0
+        keys: set[str] = set()
         for tag in tags:
-            if tag in self.dependencies:
-                for key in self.dependencies[tag]:
-                    if await self.delete(key):
-                        count += 1
-                del self.dependencies[tag]
+            keys.update(self.dependencies.pop(tag, ()))
+
+        if self.config.ENABLE_L2_CACHE and tags:
+            try:
+                client = get_redis()
+                if client:
+                    keys.update(await asyncio.to_thread(self._invalidate_tags_remote, client, tags))
+            except Exception as e:
+                self.metrics.record_error()
+                logger.error("Cache tag invalidation error", tags=tags, error=str(e))
+
+        if self.config.ENABLE_L1_CACHE:
+            for key in keys:
+                self._delete_from_memory(key)
+        for _ in keys:
+            self.metrics.record_delete()
+
+        logger.debug("Cache tag invalidation", tags=tags, count=len(keys))
+        return len(keys)
+
+    def _index_tags(self, client: Any, key: str, tags: list[str], ttl: int) -> None:
+        """Record key <-> tag membership in Redis (best effort; runs in a thread)."""
+        try:
+            if (
+                self._tag_script is None
+                or getattr(self._tag_script, "registered_client", client) is not client
+            ):
+                self._tag_script = client.register_script(_TAG_INDEX_SCRIPT)
+            self._tag_script(
+                keys=[KEY_TAGS_PREFIX + key, *(TAG_KEY_PREFIX + tag for tag in tags)],
+                args=[ttl, key, *tags],
+                client=client,
+            )
+        except Exception as e:
+            logger.debug("Cache tag index update failed", key=key, error=str(e))
+
+    def _invalidate_tags_remote(self, client: Any, tags: list[str]) -> list[str]:
+        """Resolve, unlink and broadcast all keys indexed under ``tags`` (runs in a thread)."""
+        tag_keys = [TAG_KEY_PREFIX + tag for tag in tags]
+
+        pipe = client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        keys = sorted({_decode(member) for members in pipe.execute() for member in members})
+
+        pipe = client.pipeline(transaction=False)
+        if keys:
+            # Remove the keys from tags that are not being invalidated
+            lookup = client.pipeline(transaction=False)
+            for key in keys:
+                lookup.smembers(KEY_TAGS_PREFIX + key)
+            invalidated = set(tags)
+            for key, key_tags in zip(keys, lookup.execute(), strict=True):
+                for tag in {_decode(t) for t in key_tags} - invalidated:
+                    pipe.srem(TAG_KEY_PREFIX + tag, key)
+
+            for start in range(0, len(keys), SCAN_BATCH_SIZE):
+                batch = keys[start : start + SCAN_BATCH_SIZE]
+                pipe.unlink(*batch, *(KEY_TAGS_PREFIX + key for key in batch))
+        pipe.unlink(*tag_keys)
+        pipe.execute()
+
+        self._broadcast(client, keys=keys, tags=tags)
+        return keys
+
+    def _unlink_matching(self, client: Any, pattern: str) -> int:
+        """SCAN for ``pattern`` and UNLINK matches in batches (runs in a thread)."""
+        count = 0
+        batch: list[Any] = []
+        for key in client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                count += int(client.unlink(*batch))
+                batch.clear()
+        if batch:
+            count += int(client.unlink(*batch))
+
+        self._broadcast(client, patterns=[pattern])
         return count
 
+    def _broadcast(
+        self,
+        client: Any,
+        keys: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+    ) -> None:
+        """Tell other workers to drop matching L1 entries."""
+        message = {
+            "origin": self._instance_id,
+            "keys": list(keys),
+            "tags": list(tags),
+            "patterns": list(patterns),
+        }
+        try:
+            client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.debug("Cache invalidation broadcast failed", error=str(e))
+
+    def handle_message(self, data: str | bytes) -> None:
+        """Apply an invalidation broadcast from another worker to the L1 caches."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Invalid cache invalidation message", data=str(data)[:200])
+            return
+        if not isinstance(message, dict) or message.get("origin") == self._instance_id:
+            return
+
+        keys = set(message.get("keys") or ())
+        for tag in message.get("tags") or ():
+            keys.update(self.dependencies.pop(tag, ()))
+        if self.config.ENABLE_L1_CACHE:
+            for key in keys:
+                self._delete_from_memory(key)
+            for pattern in message.get("patterns") or ():
+                self._invalidate_memory_pattern(pattern)
+
+    async def start_listener(self, redis: RedisClientType) -> None:
+        """Start the background pub/sub listener for cross-worker invalidations."""
+        self._listener.start(redis)
+
+    async def stop_listener(self) -> None:
+        """Stop the background pub/sub listener."""
+        await self._listener.stop()
+
+    def _memory_for(self, key: str) -> MutableMapping[str, Any] | None:
+        """Return the L1 cache configured for the key's namespace, if any."""
+        namespace, _, rest = key.partition(":")
+        if namespace == "billing":
+            namespace = rest.partition(":")[0]
+        name = self.config.L1_NAMESPACES.get(namespace)
+        if name is None:
+            return None
+        cache: MutableMapping[str, Any] = getattr(self, f"{name}_cache")
+        return cache
+
+    def _memory_caches(self) -> list[MutableMapping[str, Any]]:
+        return [self.product_cache, self.pricing_cache, self.subscription_cache]
+
     def _get_from_memory(self, key: str) -> Any | None:
         """Get value from L1 memory cache."""
-        # Check appropriate cache based on key prefix
-        if "product" in key:
-            return self.product_cache.get(key)
-        elif "pricing" in key or "price" in key:
-            return self.pricing_cache.get(key)
-        elif "subscription" in key or "plan" in key:
-            return self.subscription_cache.get(key)
-        return None
+        cache = self._memory_for(key)
+        return cache.get(key) if cache is not None else None
 
     def _set_in_memory(self, key: str, value: Any) -> None:
         """Set value in L1 memory cache."""
-        # Store in appropriate cache based on key prefix
-        if "product" in key:
-            self.product_cache[key] = value
-        elif "pricing" in key or "price" in key:
-            self.pricing_cache[key] = value
-        elif "subscription" in key or "plan" in key:
-            self.subscription_cache[key] = value
+        cache = self._memory_for(key)
+        if cache is not None:
+            cache[key] = value
 
     def _delete_from_memory(self, key: str) -> None:
         """Delete value from L1 memory cache."""
-        # Delete from appropriate cache based on key prefix
-        for cache in [self.product_cache, self.pricing_cache, self.subscription_cache]:
-            if key in cache:
-                del cache[key]
+        cache = self._memory_for(key)
+        if cache is not None:
+            cache.pop(key, None)
+
+    def _invalidate_memory_pattern(self, pattern: str) -> int:
+        """Drop L1 entries matching a wildcard pattern."""
+        count = 0
+        for cache in self._memory_caches():
+            keys_to_delete = [k for k in list(cache.keys()) if self._match_pattern(k, pattern)]
+            for k in keys_to_delete:
+                cache.pop(k, None)
+                count += 1
+        return count
+
+    def _clear_memory(self) -> None:
+        for cache in self._memory_caches():
+            cache.clear()
+        self.dependencies.clear()
 
     @staticmethod
     def _match_pattern(key: str, pattern: str) -> bool:
         """Simple pattern matching for cache keys."""
-        import re
-
         # Convert wildcard pattern to regex
         regex_pattern = pattern.replace("*", ".*").replace("?", ".")
         return bool(re.match(regex_pattern, key))
@@ -516,6 +717,7 @@ def cached_result(
     key_prefix: str = "",
     key_params: list[str] | None = None,
     tier: CacheTier = CacheTier.L2_REDIS,
+    stampede: StampedeProtection | None = None,
 ) -> Any:
     """
     Decorator for caching function results.
@@ -525,6 +727,7 @@ def cached_result(
         key_prefix: Prefix for cache key
         key_params: Parameters to include in cache key
         tier: Cache tier to use
+        stampede: Opt into single-flight, lease, XFetch and stale-while-revalidate
 
     Example:
         @cached_result(ttl=3600, key_prefix="product", key_params=["product_id", "tenant_id"])
@@ -534,6 +737,8 @@ def cached_result(
     """
 
     def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        check_protection(func, stampede)
+
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             cache = get_billing_cache()
@@ -556,6 +761,23 @@ def cached_result(
                 # Use function name and all args
                 cache_key = f"{key_prefix}:{func.__name__}:{str(args)}:{str(kwargs)}"
 
+            if stampede is not None:
+
+                async def read() -> Any:
+                    return await cache.get(cache_key, tier=tier)
+
+                async def write(entry: Any, entry_ttl: int | None) -> None:
+                    await cache.set(cache_key, entry, ttl=entry_ttl, tier=tier)
+
+                return await get_stampede_guard().fetch(
+                    cache_key,
+                    lambda: func(*args, **kwargs),
+                    read=read,
+                    write=write,
+                    ttl=ttl or cache.config.PRODUCT_TTL,
+                    protection=stampede,
+                )
+
             # Try to get from cache
             result = await cache.get(cache_key, tier=tier)
             if result is not None:
@@ -9,6 +9,7 @@ from .entities import (
     CustomerCreditEntity,
     InvoiceEntity,
     InvoiceLineItemEntity,
+    InvoiceNumberCounterEntity,
     PaymentEntity,
     PaymentInvoiceEntity,
     PaymentMethodEntity,
@@ -77,6 +78,7 @@ __all__ = [
     "CustomerCreditEntity",
     "InvoiceEntity",
     "InvoiceLineItemEntity",
+    "InvoiceNumberCounterEntity",
     "PaymentEntity",
     "PaymentInvoiceEntity",
     "PaymentMethodEntity",
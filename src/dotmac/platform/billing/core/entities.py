@@ -166,6 +166,17 @@ class InvoiceLineItemEntity(Base):  # type: ignore[misc]  # Base has type Any
     invoice: Mapped[InvoiceEntity] = relationship(back_populates="line_items")
 
 
+class InvoiceNumberCounterEntity(Base, TimestampMixin):  # type: ignore[misc]  # Mixin has type Any
+    """Last invoice sequence number handed out per tenant and year"""
+
+    __tablename__ = "invoice_number_counters"
+    __table_args__ = ({"extend_existing": True},)
+
+    tenant_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 # ============================================================================
 # Payment Entities
 # ============================================================================
@@ -546,5 +557,3 @@ class CustomerCreditEntity(Base, TenantMixin, TimestampMixin):  # type: ignore[m
     extra_data: Mapped[dict[str, Any]] = mapped_column(MutableDict.as_mutable(JSON), default=dict)
 
     # Composite primary key handled in __table_args__
-
-
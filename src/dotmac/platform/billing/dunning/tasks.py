@@ -17,6 +17,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dotmac.platform.celery_app import celery_app
+from dotmac.platform.core.http_pool import get_http_client
 from dotmac.platform.db import async_session_maker, set_session_rls_context
 from dotmac.platform.tenant import get_current_tenant_id, set_current_tenant_id
 
@@ -842,36 +843,34 @@ async def _trigger_webhook(
             ).hexdigest()
             headers["X-Webhook-Signature"] = signature
 
-        # Send webhook with timeout and retry
-        timeout = httpx.Timeout(10.0, connect=5.0)
-
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                webhook_url,
-                json=payload,
-                headers=headers,
-            )
+        # Send webhook on the pooled client (10s timeout, 5s connect)
+        client = get_http_client(webhook_url, profile="fast")
+        response = await client.post(
+            webhook_url,
+            json=payload,
+            headers=headers,
+        )
 
-            response.raise_for_status()
+        response.raise_for_status()
 
-            logger.info(
-                "dunning.webhook.success",
-                execution_id=execution.id,
-                webhook_url=webhook_url,
-                status_code=response.status_code,
-            )
+        logger.info(
+            "dunning.webhook.success",
+            execution_id=execution.id,
+            webhook_url=webhook_url,
+            status_code=response.status_code,
+        )
 
-            return {
-                "status": "success",
-                "action_type": "webhook",
-                "details": {
-                    "webhook_url": webhook_url,
-                    "status_code": response.status_code,
-                    "triggered_at": datetime.now(UTC).isoformat(),
-                    "response_time_ms": response.elapsed.total_seconds() * 1000,
-                },
-                "external_id": f"webhook_{execution.id}",
-            }
+        return {
+            "status": "success",
+            "action_type": "webhook",
+            "details": {
+                "webhook_url": webhook_url,
+                "status_code": response.status_code,
+                "triggered_at": datetime.now(UTC).isoformat(),
+                "response_time_ms": response.elapsed.total_seconds() * 1000,
+            },
+            "external_id": f"webhook_{execution.id}",
+        }
 
     except httpx.HTTPStatusError as e:
         logger.error(
@@ -76,12 +76,13 @@ class BillingIntegrationService:
         self.invoice_service = InvoiceService(db_session)
 
     async def process_subscription_billing(
-        self, subscription_id: str, tenant_id: str
+        self, subscription_id: str, tenant_id: str, idempotency_key: str | None = None
     ) -> str | None:
         """
         Process billing for a subscription.
 
-        Returns invoice ID if created, None if no billing needed.
+        Returns invoice ID if created, None if no billing needed. With an
+        ``idempotency_key``, a repeated call returns the invoice created first.
         """
         try:
             # Get subscription details
@@ -205,7 +206,9 @@ class BillingIntegrationService:
             )
 
             # Create invoice through existing system
-            invoice_id = await self._create_invoice(invoice_request, tenant_id)
+            invoice_id = await self._create_invoice(
+                invoice_request, tenant_id, idempotency_key=idempotency_key
+            )
 
             if invoice_id:
                 # Record billing event
@@ -288,9 +291,7 @@ class BillingIntegrationService:
         threshold = datetime.now(UTC) - timedelta(days=7)
         return created_at >= threshold
 
-    async def _resolve_tenant_billing_details(
-        self, tenant_id: str
-    ) -> tuple[str, dict[str, str]]:
+    async def _resolve_tenant_billing_details(self, tenant_id: str) -> tuple[str, dict[str, str]]:
         """
         Resolve billing email and address information for the tenant.
 
@@ -338,7 +339,10 @@ class BillingIntegrationService:
         return await self._resolve_tenant_billing_details(tenant_id)
 
     async def _create_invoice(
-        self, invoice_request: BillingInvoiceRequest, tenant_id: str
+        self,
+        invoice_request: BillingInvoiceRequest,
+        tenant_id: str,
+        idempotency_key: str | None = None,
     ) -> str | None:
         """
         Create invoice using existing invoice system.
@@ -374,6 +378,7 @@ class BillingIntegrationService:
                 currency=resolved_currency,
                 notes=f"Subscription billing for period {invoice_request.billing_period_start.date()} to {invoice_request.billing_period_end.date()}",
                 extra_data=invoice_request.metadata,
+                idempotency_key=idempotency_key,
             )
 
             invoice_id_value: str | None = invoice.invoice_id
@@ -566,6 +571,9 @@ class BillingIntegrationService:
                 extra={"tenant_id": tenant_id, "count": len(subscriptions_due)},
             )
 
+            # One counter update for the whole run when block allocation is enabled
+            await self.invoice_service.reserve_invoice_numbers(tenant_id, len(subscriptions_due))
+
             for subscription in subscriptions_due:
                 try:
                     invoice_id = await self.process_subscription_billing(
@@ -607,11 +615,14 @@ class BillingIntegrationService:
         tenant_id: str,
         billing_period_start: datetime | None = None,
         billing_period_end: datetime | None = None,
+        idempotency_key: str | None = None,
     ) -> str | None:
         """
         Generate usage-based invoice for a tenant.
 
         For usage-based products that are billed separately from subscriptions.
+        With an ``idempotency_key``, a repeated call returns the invoice created
+        first.
         """
         try:
             # Get product details
@@ -708,7 +719,9 @@ class BillingIntegrationService:
                 },
             )
 
-            invoice_id = await self._create_invoice(invoice_request, tenant_id)
+            invoice_id = await self._create_invoice(
+                invoice_request, tenant_id, idempotency_key=idempotency_key
+            )
 
             logger.info(
                 "Usage invoice created",
@@ -0,0 +1,258 @@
+"""
+Invoice number allocation from per-tenant, per-year counters.
+
+Numbers look like ``INV-<tenant suffix>-<year>-<sequence>``. Each sequence
+value comes from one ``UPDATE invoice_number_counters ... RETURNING`` on the
+tenant's counter row. On PostgreSQL that update runs in its own short
+transaction, so the row lock is held for the update only and concurrent
+invoice creation for a tenant no longer queues behind whole invoice
+transactions. Those transactions use a small pool of their own
+(``billing.invoice_number_pool_size``): borrowing a second connection from
+the application pool while the caller's session holds one could exhaust it
+under load, leaving every request waiting for a connection only another
+waiting request can release. Like a database sequence, a number is not returned if the
+invoice transaction later rolls back, so gaps are possible.
+
+Block allocation (``billing.invoice_number_block_size`` > 1) reserves
+ranges per worker process, trading strictly ascending numbers across
+workers for one counter write per block. Bulk runs can reserve exactly the
+numbers they need with ``reserve``.
+"""
+
+import asyncio
+import hashlib
+from collections import deque
+from datetime import UTC, datetime
+
+import structlog
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from dotmac.platform.billing.core.entities import InvoiceEntity, InvoiceNumberCounterEntity
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+CounterKey = tuple[str, int]
+
+
+def tenant_suffix(tenant_id: str) -> str:
+    """Short tenant-specific component that keeps numbers unique across tenants."""
+    return hashlib.sha256(tenant_id.encode()).hexdigest()[:4].upper()
+
+
+def format_invoice_number(tenant_id: str, year: int, sequence: int) -> str:
+    return f"INV-{tenant_suffix(tenant_id)}-{year}-{sequence:06d}"
+
+
+class InvoiceNumberAllocator:
+    """
+    Hands out invoice numbers from ``invoice_number_counters``.
+
+    Usage:
+        allocator = get_invoice_number_allocator()
+        invoice_number = await allocator.next_number(db, tenant_id)
+    """
+
+    def __init__(self, block_size: int | None = None) -> None:
+        self.block_size = max(1, block_size or settings.billing.invoice_number_block_size)
+        # Ranges reserved by this process, per (tenant, year)
+        self._blocks: dict[CounterKey, deque[range]] = {}
+        self._locks: dict[CounterKey, asyncio.Lock] = {}
+        # Dedicated counter engines, per application database
+        self._engines: dict[URL, AsyncEngine] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._disposers: set[asyncio.Task[None]] = set()
+
+    async def next_number(self, db: AsyncSession, tenant_id: str) -> str:
+        """Allocate the next invoice number for a tenant."""
+        year = datetime.now(UTC).year
+        engine = self._autonomous_engine(db)
+        if engine is None:
+            # Allocate inside the caller's transaction: a rollback also rolls
+            # the counter back, so nothing can be reserved locally
+            last = await self._increment(db, tenant_id, year, 1, concurrent=False)
+            return format_invoice_number(tenant_id, year, last)
+
+        key = (tenant_id, year)
+        async with self._lock(key):
+            blocks = self._blocks.get(key)
+            if not blocks:
+                await self._reserve_block(engine, tenant_id, year, self.block_size)
+                blocks = self._blocks[key]
+            sequence = self._take(blocks)
+        return format_invoice_number(tenant_id, year, sequence)
+
+    async def reserve(self, db: AsyncSession, tenant_id: str, count: int) -> None:
+        """
+        Reserve ``count`` numbers for a bulk invoice run in one counter update.
+
+        Only used in block allocation mode on PostgreSQL; reserved numbers
+        that the run does not use are skipped.
+        """
+        if count <= 1 or self.block_size <= 1:
+            return
+        engine = self._autonomous_engine(db)
+        if engine is None:
+            return
+
+        year = datetime.now(UTC).year
+        key = (tenant_id, year)
+        async with self._lock(key):
+            available = sum(len(block) for block in self._blocks.get(key, ()))
+            if available < count:
+                await self._reserve_block(engine, tenant_id, year, count - available)
+
+    def _take(self, blocks: deque[range]) -> int:
+        block = blocks[0]
+        if len(block) == 1:
+            blocks.popleft()
+        else:
+            blocks[0] = block[1:]
+        return block[0]
+
+    def _lock(self, key: CounterKey) -> asyncio.Lock:
+        self._bind_loop()
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Locks and pooled connections belong to the loop that created
+            # them (e.g. Celery asyncio.run)
+            self._loop = loop
+            self._locks = {}
+            self._engines = {}
+
+    def _autonomous_engine(self, db: AsyncSession) -> AsyncEngine | None:
+        """Dedicated engine for short counter transactions (PostgreSQL), else None."""
+        bind = db.bind
+        if isinstance(bind, AsyncConnection):
+            bind = bind.engine
+        if not isinstance(bind, AsyncEngine) or bind.dialect.name != "postgresql":
+            return None
+
+        self._bind_loop()
+        engine = self._engines.get(bind.url)
+        if engine is None:
+            engine = create_async_engine(
+                bind.url,
+                pool_size=settings.billing.invoice_number_pool_size,
+                max_overflow=0,
+                pool_timeout=settings.database.pool_timeout,
+                pool_recycle=settings.database.pool_recycle,
+                pool_pre_ping=settings.database.pool_pre_ping,
+            )
+            self._engines[bind.url] = engine
+            self._dispose_with_loop(engine)
+        return engine
+
+    def _dispose_with_loop(self, engine: AsyncEngine) -> None:
+        """
+        Dispose ``engine`` when the loop that owns its connections shuts down.
+
+        Its pooled connections cannot be closed from another loop, so a
+        task parked on the owning loop disposes the engine once it is
+        cancelled, which ``asyncio.run`` (e.g. per Celery task) does to every
+        pending task before closing the loop.
+        """
+
+        async def dispose_on_shutdown() -> None:
+            try:
+                await asyncio.get_running_loop().create_future()
+            finally:
+                await engine.dispose()
+
+        task = asyncio.get_running_loop().create_task(dispose_on_shutdown())
+        self._disposers.add(task)
+        task.add_done_callback(self._disposers.discard)
+
+    async def _reserve_block(
+        self, engine: AsyncEngine, tenant_id: str, year: int, count: int
+    ) -> None:
+        async with engine.begin() as conn:
+            last = await self._increment(conn, tenant_id, year, count, concurrent=True)
+        self._blocks.setdefault((tenant_id, year), deque()).append(
+            range(last - count + 1, last + 1)
+        )
+
+    async def _increment(
+        self,
+        executor: AsyncSession | AsyncConnection,
+        tenant_id: str,
+        year: int,
+        count: int,
+        *,
+        concurrent: bool,
+    ) -> int:
+        """Advance the counter by ``count`` and return its new value."""
+        table = InvoiceNumberCounterEntity.__table__
+        stmt = (
+            update(table)
+            .where(table.c.tenant_id == tenant_id, table.c.year == year)
+            .values(last_value=table.c.last_value + count, updated_at=datetime.now(UTC))
+            .returning(table.c.last_value)
+        )
+        last = (await executor.execute(stmt)).scalar_one_or_none()
+        if last is not None:
+            return int(last)
+
+        # First allocation for this tenant and year
+        now = datetime.now(UTC)
+        last = await self._last_issued(executor, tenant_id, year) + count
+        values = {
+            "tenant_id": tenant_id,
+            "year": year,
+            "last_value": last,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if not concurrent:
+            await executor.execute(insert(table).values(**values))
+        else:
+            # Concurrent first allocations race to create the row; the loser's
+            # insert is a no-op and it takes its numbers from the winner's row
+            created = await executor.execute(
+                pg_insert(table)
+                .values(**values)
+                .on_conflict_do_nothing()
+                .returning(table.c.last_value)
+            )
+            if created.scalar_one_or_none() is None:
+                return int((await executor.execute(stmt)).scalar_one())
+
+        logger.info("invoice_number_counter.created", tenant_id=tenant_id, year=year, last=last)
+        return last
+
+    @staticmethod
+    async def _last_issued(
+        executor: AsyncSession | AsyncConnection, tenant_id: str, year: int
+    ) -> int:
+        """Highest sequence among the tenant's invoices numbered before the counter existed."""
+        prefix = f"INV-{tenant_suffix(tenant_id)}-{year}-"
+        result = await executor.execute(
+            select(func.max(InvoiceEntity.invoice_number)).where(
+                InvoiceEntity.tenant_id == tenant_id,
+                InvoiceEntity.invoice_number.like(f"{prefix}%"),
+            )
+        )
+        last_number = result.scalar_one_or_none()
+        return int(last_number.rsplit("-", 1)[-1]) if last_number else 0
+
+
+_allocator: InvoiceNumberAllocator | None = None
+
+
+def get_invoice_number_allocator() -> InvoiceNumberAllocator:
+    """Get the process-wide invoice number allocator."""
+    global _allocator
+    if _allocator is None:
+        _allocator = InvoiceNumberAllocator()
+    return _allocator
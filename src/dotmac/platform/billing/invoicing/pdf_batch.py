@@ -0,0 +1,179 @@
+"""
+Batch invoice PDF rendering on a process pool.
+
+ReportLab rendering is CPU-bound pure Python, so a month-end batch rendered
+on the event loop stalls every request on the API worker. The renderer
+ships invoices to a ``ProcessPoolExecutor`` sized to the CPU cores. Each
+worker process builds its ``ReportLabInvoiceGenerator`` (paragraph styles)
+and loads the font metrics once, and PDFs are handed back one by one as
+they finish so callers can write or upload them while the rest render.
+"""
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from dotmac.platform.billing.core.models import Invoice
+from dotmac.platform.billing.pdf_generator_reportlab import (
+    DEFAULT_LOCALE,
+    ReportLabInvoiceGenerator,
+)
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Called with (rendered, total) after each PDF
+ProgressCallback = Callable[[int, int], Awaitable[None] | None]
+
+# Fonts used by the invoice layout
+_FONTS = ("Helvetica", "Helvetica-Bold")
+
+_worker_generator: ReportLabInvoiceGenerator | None = None
+
+
+def _init_worker() -> None:
+    """Per-process setup: parse styles and font metrics once, not per invoice."""
+    global _worker_generator
+    from reportlab.pdfbase import pdfmetrics
+
+    for font in _FONTS:
+        pdfmetrics.getFont(font)
+    _worker_generator = ReportLabInvoiceGenerator()
+
+
+def _render(invoice: Invoice, company_info: dict[str, Any] | None, locale: str) -> bytes:
+    """Render one invoice in a worker process."""
+    if _worker_generator is None:
+        _init_worker()
+    assert _worker_generator is not None
+    return _worker_generator.generate_invoice_pdf(
+        invoice=invoice, company_info=company_info, locale=locale
+    )
+
+
+def invoice_pdf_filename(invoice: Invoice) -> str:
+    return f"invoice_{invoice.invoice_number}_{invoice.customer_id}.pdf"
+
+
+@dataclass(frozen=True)
+class RenderedInvoicePDF:
+    """A finished invoice PDF."""
+
+    invoice: Invoice
+    filename: str
+    content: bytes
+
+
+class InvoicePDFRenderer:
+    """
+    Renders invoice PDFs in worker processes.
+
+    Usage:
+        renderer = get_invoice_pdf_renderer()
+        async for pdf in renderer.render(invoices, progress=report):
+            await store(pdf.filename, pdf.content)
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        workers = settings.billing.pdf_render_workers if max_workers is None else max_workers
+        self.max_workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned, not forked: the parent has a running event loop,
+            # threads and open database connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def render(
+        self,
+        invoices: Sequence[Invoice],
+        *,
+        company_info: dict[str, Any] | None = None,
+        locale: str = DEFAULT_LOCALE,
+        progress: ProgressCallback | None = None,
+    ) -> AsyncIterator[RenderedInvoicePDF]:
+        """Render ``invoices`` in parallel, yielding each PDF as soon as it is done."""
+        if not invoices:
+            return
+
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        pending: dict[asyncio.Future[bytes], Invoice] = {
+            loop.run_in_executor(pool, _render, invoice, company_info, locale): invoice
+            for invoice in invoices
+        }
+        total = len(pending)
+        rendered = 0
+        try:
+            while pending:
+                finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    invoice = pending.pop(future)
+                    content = future.result()
+                    rendered += 1
+                    if progress is not None:
+                        result = progress(rendered, total)
+                        if inspect.isawaitable(result):
+                            await result
+                    yield RenderedInvoicePDF(
+                        invoice=invoice,
+                        filename=invoice_pdf_filename(invoice),
+                        content=content,
+                    )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM killed); start a fresh pool next time
+            logger.error("invoice_pdf.pool_broken", rendered=rendered, total=total)
+            self._executor = None
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_renderer: InvoicePDFRenderer | None = None
+
+
+def get_invoice_pdf_renderer() -> InvoicePDFRenderer:
+    """Get the process-wide invoice PDF renderer."""
+    global _renderer
+    if _renderer is None:
+        _renderer = InvoicePDFRenderer()
+    return _renderer
+
+
+def close_invoice_pdf_renderer() -> None:
+    """Shut down the process-wide renderer's worker pool."""
+    global _renderer
+    if _renderer is not None:
+        _renderer.close()
+        _renderer = None
+
+
+__all__ = [
+    "InvoicePDFRenderer",
+    "ProgressCallback",
+    "RenderedInvoicePDF",
+    "close_invoice_pdf_renderer",
+    "get_invoice_pdf_renderer",
+    "invoice_pdf_filename",
+]
@@ -134,6 +134,8 @@ class BatchPDFRequest(BaseModel):
     invoice_ids: list[str] = Field(..., min_length=1, max_length=100)
     company_info: dict[str, Any] | None = None
     locale: str = Field("en_US")
+    store: bool = Field(False, description="Store the PDFs in file storage")
+    archive: bool = Field(False, description="Store a single zip archive (implies store)")
 
 
 class InvoiceDiscountRequest(BaseModel):
@@ -273,6 +275,7 @@ async def list_invoices(
         has_more=has_more,
     )
 
+
 @router.get(
     "/{invoice_id}",
     response_model=Invoice,
@@ -534,6 +537,34 @@ async def generate_batch_pdfs(
     enforce_tenant_access(tenant_id, current_user)
     service = InvoiceService(db)
 
+    def log_progress(rendered: int, total: int) -> None:
+        if rendered == total or rendered % 10 == 0:
+            logger.info(
+                "invoice.batch_pdf.progress", tenant_id=tenant_id, rendered=rendered, total=total
+            )
+
+    if batch_request.store or batch_request.archive:
+        try:
+            file_ids = await service.store_batch_invoices_pdf(
+                tenant_id=tenant_id,
+                invoice_ids=batch_request.invoice_ids,
+                company_info=batch_request.company_info,
+                locale=batch_request.locale,
+                archive=batch_request.archive,
+                progress=log_progress,
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to generate batch PDFs: {str(e)}",
+            )
+        return {
+            "success": True,
+            "count": len(file_ids),
+            "message": f"Stored {len(file_ids)} file(s)",
+            "file_ids": file_ids,
+        }
+
     import os
     import tempfile
 
@@ -546,6 +577,7 @@ async def generate_batch_pdfs(
             output_dir=temp_dir,
             company_info=batch_request.company_info,
             locale=batch_request.locale,
+            progress=log_progress,
         )
 
         return {
@@ -3,12 +3,16 @@ Invoice service with tenant support and idempotency
 """
 
 import os
+import tempfile
+import zipfile
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 import structlog
-from sqlalchemy import and_, func, select, text
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -24,6 +28,12 @@ from dotmac.platform.billing.core.exceptions import (
 )
 from dotmac.platform.billing.core.models import Invoice, InvoiceLineItem
 from dotmac.platform.billing.currency.service import CurrencyRateService
+from dotmac.platform.billing.invoicing.numbering import get_invoice_number_allocator
+from dotmac.platform.billing.invoicing.pdf_batch import (
+    ProgressCallback,
+    RenderedInvoicePDF,
+    get_invoice_pdf_renderer,
+)
 from dotmac.platform.billing.metrics import get_billing_metrics
 from dotmac.platform.billing.money_utils import money_handler
 from dotmac.platform.billing.pdf_generator_reportlab import ReportLabInvoiceGenerator
@@ -34,6 +44,9 @@ from dotmac.platform.settings import settings
 from dotmac.platform.webhooks.events import get_event_bus
 from dotmac.platform.webhooks.models import WebhookEvent
 
+if TYPE_CHECKING:
+    from dotmac.platform.file_storage.service import FileStorageService
+
 logger = structlog.get_logger(__name__)
 
 
@@ -50,6 +63,8 @@ class InvoiceService:
         self.db = db_session
         self.metrics = get_billing_metrics()
         self.pdf_generator = ReportLabInvoiceGenerator()
+        self.pdf_renderer = get_invoice_pdf_renderer()
+        self.number_allocator = get_invoice_number_allocator()
 
     async def _normalize_currency_components(
         self,
@@ -721,24 +736,138 @@ class InvoiceService:
         output_dir: str,
         company_info: dict[str, Any] | None = None,
         locale: str = "en_US",
+        progress: ProgressCallback | None = None,
     ) -> list[str]:
-        """Generate PDF files for multiple invoices."""
-        invoices: list[Invoice] = []
-        for invoice_id in invoice_ids:
-            invoice = await self.get_invoice(tenant_id, invoice_id, include_line_items=True)
-            if invoice:
-                invoices.append(invoice)
+        """Generate PDF files for multiple invoices, rendered in worker processes."""
+        invoices = await self._get_invoices_for_rendering(tenant_id, invoice_ids)
+        if not invoices:
+            return []
 
+        os.makedirs(output_dir, exist_ok=True)
+        # Keyed like Invoice.invoice_id, which is optional on the model
+        paths: dict[str | None, str] = {}
+        async for pdf in self.pdf_renderer.render(
+            invoices, company_info=company_info, locale=locale, progress=progress
+        ):
+            path = os.path.join(output_dir, pdf.filename)
+            with open(path, "wb") as f:
+                f.write(pdf.content)
+            paths[pdf.invoice.invoice_id] = path
+
+        logger.info("Batch invoices generated", count=len(paths), directory=output_dir)
+        return [paths[invoice.invoice_id] for invoice in invoices]
+
+    async def store_batch_invoices_pdf(
+        self,
+        tenant_id: str,
+        invoice_ids: list[str],
+        company_info: dict[str, Any] | None = None,
+        locale: str = "en_US",
+        *,
+        archive: bool = False,
+        storage: "FileStorageService | None" = None,
+        progress: ProgressCallback | None = None,
+    ) -> list[str]:
+        """
+        Render invoice PDFs and store them in file storage.
+
+        Each PDF is uploaded as soon as it is rendered. With ``archive`` the
+        PDFs are added to a zip file as they finish and the zip is stored
+        instead. Returns the stored file ids.
+        """
+        if storage is None:
+            from dotmac.platform.file_storage.service import get_storage_service
+
+            storage = get_storage_service()
+
+        invoices = await self._get_invoices_for_rendering(tenant_id, invoice_ids)
         if not invoices:
             return []
 
-        output_paths: list[str] = self.pdf_generator.generate_batch_invoices(
-            invoices=invoices,
-            output_dir=output_dir,
-            company_info=company_info,
-            locale=locale,
+        batch_id = uuid4().hex
+        path = f"invoices/{tenant_id}/batches/{batch_id}"
+        rendered = self.pdf_renderer.render(
+            invoices, company_info=company_info, locale=locale, progress=progress
         )
-        return output_paths
+
+        if archive:
+            file_id = await self._store_invoice_archive(
+                rendered, storage, tenant_id=tenant_id, path=path, batch_id=batch_id
+            )
+            return [file_id]
+
+        file_ids: dict[str | None, str] = {}
+        async for pdf in rendered:
+            file_ids[pdf.invoice.invoice_id] = await storage.store_file(
+                file_data=pdf.content,
+                file_name=pdf.filename,
+                content_type="application/pdf",
+                path=path,
+                metadata={"invoice_id": pdf.invoice.invoice_id, "batch_id": batch_id},
+                tenant_id=tenant_id,
+            )
+
+        logger.info("Batch invoice PDFs stored", tenant_id=tenant_id, count=len(file_ids))
+        return [file_ids[invoice.invoice_id] for invoice in invoices]
+
+    async def _store_invoice_archive(
+        self,
+        rendered: AsyncIterator[RenderedInvoicePDF],
+        storage: "FileStorageService",
+        *,
+        tenant_id: str,
+        path: str,
+        batch_id: str,
+    ) -> str:
+        from dotmac.platform.file_storage.streaming import iter_file
+
+        # Spools to disk past 32 MB instead of holding a large batch in memory
+        with tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024) as buffer:
+            count = 0
+            # PDFs are already compressed
+            with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+                async for pdf in rendered:
+                    archive.writestr(pdf.filename, pdf.content)
+                    count += 1
+            buffer.seek(0)
+            stored = await storage.store_file_stream(
+                iter_file(buffer),
+                file_name=f"invoices_{batch_id}.zip",
+                content_type="application/zip",
+                path=path,
+                metadata={"batch_id": batch_id, "invoice_count": count},
+                tenant_id=tenant_id,
+            )
+
+        logger.info("Batch invoice archive stored", tenant_id=tenant_id, count=count)
+        return stored.file_id
+
+    async def _get_invoices_for_rendering(
+        self, tenant_id: str, invoice_ids: list[str]
+    ) -> list[Invoice]:
+        """Load invoices with their line items in one query, in request order."""
+        if not invoice_ids:
+            return []
+
+        result = await self.db.execute(
+            select(InvoiceEntity)
+            .where(
+                InvoiceEntity.tenant_id == tenant_id,
+                InvoiceEntity.invoice_id.in_(invoice_ids),
+            )
+            .options(selectinload(InvoiceEntity.line_items))
+        )
+        entities = {entity.invoice_id: entity for entity in result.scalars().all()}
+
+        invoices: list[Invoice] = []
+        for invoice_id in dict.fromkeys(invoice_ids):
+            entity = entities.get(invoice_id)
+            if entity is None:
+                continue
+            if entity.extra_data is None:
+                entity.extra_data = {}
+            invoices.append(Invoice.model_validate(entity))
+        return invoices
 
     async def apply_percentage_discount(
         self,
@@ -755,9 +884,7 @@ class InvoiceService:
         subtotal_minor = int(invoice_entity.subtotal or 0)
         discount_rate = Decimal(str(discount_percentage)) / Decimal("100")
         discount_minor = int(
-            (Decimal(subtotal_minor) * discount_rate).quantize(
-                Decimal("1"), rounding=ROUND_HALF_UP
-            )
+            (Decimal(subtotal_minor) * discount_rate).quantize(Decimal("1"), rounding=ROUND_HALF_UP)
         )
 
         invoice_entity.discount_amount = discount_minor
@@ -1162,7 +1289,9 @@ class InvoiceService:
         """Get invoice entity with line items for update operations."""
         query = (
             select(InvoiceEntity)
-            .where(and_(InvoiceEntity.tenant_id == tenant_id, InvoiceEntity.invoice_id == invoice_id))
+            .where(
+                and_(InvoiceEntity.tenant_id == tenant_id, InvoiceEntity.invoice_id == invoice_id)
+            )
             .options(selectinload(InvoiceEntity.line_items))
         )
         result = await self.db.execute(query)
@@ -1184,57 +1313,12 @@ class InvoiceService:
         return result.scalar_one_or_none()
 
     async def _generate_invoice_number(self, tenant_id: str) -> str:
-        """Generate unique invoice number for tenant using advisory lock for atomicity.
-
-        SECURITY: Uses PostgreSQL advisory lock to prevent duplicate invoice numbers
-        under concurrent load. The lock is automatically released at transaction end.
-        """
-
-        # Get tenant settings for invoice number format
-        # For now, use simple sequential numbering
-        year = datetime.now(UTC).year
-
-        # Use a short tenant-specific suffix to guarantee uniqueness across tenants
-        import hashlib
-
-        tenant_suffix = hashlib.sha256(tenant_id.encode()).hexdigest()[:4].upper()
-
-        # CRITICAL: Use PostgreSQL advisory lock to prevent race conditions
-        # Lock key incorporates tenant-specific suffix and year
-        lock_key = int(hashlib.sha256(f"{tenant_suffix}-{year}".encode()).hexdigest()[:15], 16) % (
-            2**31
-        )
-
-        # Acquire advisory lock (automatically released at transaction end)
-        # Only use PostgreSQL advisory locks when using PostgreSQL
-        if self.db.bind.dialect.name == "postgresql":
-            await self.db.execute(text(f"SELECT pg_advisory_xact_lock({lock_key})"))
-        # For SQLite and other databases, the transaction isolation provides sufficient protection
-
-        # Now safely query for last invoice number (protected by advisory lock)
-        query = (
-            select(InvoiceEntity)
-            .where(
-                and_(
-                    InvoiceEntity.tenant_id == tenant_id,
-                    InvoiceEntity.invoice_number.like(f"INV-{tenant_suffix}-{year}-%"),
-                )
-            )
-            .order_by(InvoiceEntity.invoice_number.desc())
-            .limit(1)
-        )
-
-        result = await self.db.execute(query)
-        last_invoice = result.scalar_one_or_none()
-
-        if last_invoice and last_invoice.invoice_number:
-            # Extract sequence number and increment
-            last_seq = int(last_invoice.invoice_number.split("-")[-1])
-            next_seq = last_seq + 1
-        else:
-            next_seq = 1
+        """Allocate the next invoice number for the tenant from its counter row."""
+        return await self.number_allocator.next_number(self.db, tenant_id)
 
-        return f"INV-{tenant_suffix}-{year}-{next_seq:06d}"
+    async def reserve_invoice_numbers(self, tenant_id: str, count: int) -> None:
+        """Reserve numbers ahead of a bulk invoice run (block allocation mode only)."""
+        await self.number_allocator.reserve(self.db, tenant_id, count)
 
     async def _create_invoice_transaction(self, invoice: InvoiceEntity) -> None:
         """Create transaction record for invoice creation"""
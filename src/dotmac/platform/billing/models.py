@@ -16,6 +16,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     Index,
+    Integer,
     Numeric,
     String,
     Text,
@@ -34,6 +35,7 @@ from dotmac.platform.billing.core.models import (
     Subscription,
 )
 from dotmac.platform.core.pydantic import AppBaseModel
+from dotmac.platform.db import Base, TimestampMixin
 from dotmac.platform.db import BaseModel as SQLBaseModel
 
 
@@ -216,6 +218,8 @@ class BillingSubscriptionTable(BillingSQLModel):
         Index("ix_billing_subscriptions_tenant_plan", "tenant_id", "plan_id"),
         Index("ix_billing_subscriptions_tenant_status", "tenant_id", "status"),
         Index("ix_billing_subscriptions_period_end", "current_period_end"),
+        # Keyset walk of the renewal engine
+        Index("ix_billing_subscriptions_status_id", "status", "subscription_id"),
         {"extend_existing": True},
     )
 
@@ -247,6 +251,31 @@ class BillingSubscriptionEventTable(BillingSQLModel):
     )
 
 
+class BillingRenewalRunTable(Base, TimestampMixin):  # type: ignore[misc]  # Mixin has type Any
+    """Checkpoint of a cross-tenant subscription renewal run."""
+
+    __tablename__ = "billing_renewal_runs"
+
+    run_id = Column(String(50), primary_key=True)
+
+    # Subscriptions with current_period_end <= cutoff are renewed
+    cutoff = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False, default="running")  # running, completed
+
+    # Keyset position: the last subscription_id of the last committed batch
+    last_subscription_id = Column(String(50), nullable=True)
+
+    renewed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_billing_renewal_runs_status", "status"),
+        {"extend_existing": True},
+    )
+
+
 class BillingPricingRuleTable(BillingSQLModel):
     """SQLAlchemy table for pricing rules."""
 
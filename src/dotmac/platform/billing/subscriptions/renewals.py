@@ -0,0 +1,478 @@
+"""
+Bulk subscription renewal.
+
+The nightly renewal job used to load every due subscription of a tenant and
+renew it through ``extend_subscription``, paying for two lookups and two
+commits per subscription. ``SubscriptionRenewalEngine`` walks the due
+subscriptions of all tenants in ``subscription_id`` order, one keyset batch
+at a time:
+
+- the plans of a batch are loaded with one query
+- each due subscription is invoiced through
+  ``BillingIntegrationService.process_subscription_billing`` before its
+  period moves, with an idempotency key per subscription and period, so a
+  re-run never bills a period twice; only invoiced subscriptions renew
+- period updates go out as one executemany UPDATE, committed together with
+  the run checkpoint
+- ``subscription.renewed`` webhooks are then published concurrently,
+  bounded by ``concurrency``
+
+The checkpoint row in ``billing_renewal_runs`` holds the run's cutoff and
+the last committed subscription_id, so an interrupted run resumes after its
+last batch instead of starting over.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+import structlog
+from sqlalchemy import and_, bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dotmac.platform.billing.exceptions import SubscriptionError
+from dotmac.platform.billing.integration import BillingIntegrationService
+from dotmac.platform.billing.models import (
+    BillingRenewalRunTable,
+    BillingSubscriptionPlanTable,
+    BillingSubscriptionTable,
+)
+from dotmac.platform.billing.subscriptions.models import (
+    SubscriptionPlan,
+    SubscriptionStatus,
+)
+from dotmac.platform.billing.subscriptions.service import SubscriptionService
+from dotmac.platform.db import async_session_maker, set_session_rls_context
+from dotmac.platform.settings import settings
+from dotmac.platform.webhooks.events import get_event_bus
+from dotmac.platform.webhooks.models import WebhookEvent
+
+logger = structlog.get_logger(__name__)
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+@dataclass(frozen=True)
+class RenewalCheckpoint:
+    """Committed progress of a renewal run."""
+
+    run_id: str
+    cutoff: datetime
+    status: str = RUN_RUNNING
+    last_subscription_id: str | None = None
+    renewed: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    @classmethod
+    def from_row(cls, row: BillingRenewalRunTable) -> "RenewalCheckpoint":
+        return cls(
+            run_id=row.run_id,
+            cutoff=_aware(row.cutoff),
+            status=row.status,
+            last_subscription_id=row.last_subscription_id,
+            renewed=row.renewed or 0,
+            skipped=row.skipped or 0,
+            failed=row.failed or 0,
+        )
+
+
+@dataclass(frozen=True)
+class RenewedSubscription:
+    """A subscription moved to its next billing period."""
+
+    tenant_id: str
+    subscription_id: str
+    customer_id: str
+    plan: SubscriptionPlan
+    amount: Decimal
+    previous_period_end: datetime
+    new_period_end: datetime
+    invoice_id: str | None = None
+
+    @property
+    def idempotency_key(self) -> str:
+        """Identifies the invoice for this subscription's renewed period."""
+        return f"renewal:{self.subscription_id}:{self.previous_period_end.isoformat()}"
+
+
+class SubscriptionRenewalEngine:
+    """
+    Renews due subscriptions across tenants in checkpointed batches.
+
+    Usage:
+        engine = SubscriptionRenewalEngine()
+        stats = await engine.run()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        *,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        look_ahead_days: int = 1,
+    ) -> None:
+        self._session_factory = session_factory or async_session_maker
+        self.batch_size = batch_size or settings.billing.renewal_batch_size
+        self.concurrency = concurrency or settings.billing.renewal_concurrency
+        self.look_ahead_days = look_ahead_days
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        async with self._session_factory() as session:
+            # The walk spans every tenant
+            set_session_rls_context(session, tenant_id=None, bypass_rls=True)
+            yield session
+
+    async def run(self, run_id: str | None = None) -> dict[str, Any]:
+        """
+        Renew every subscription due by the run's cutoff.
+
+        Without ``run_id`` the latest unfinished run is resumed, or a new
+        one is started. Returns the run's counters.
+        """
+        checkpoint = await self._start(run_id)
+        batches = 0
+
+        while checkpoint.status == RUN_RUNNING:
+            async with self._session() as db:
+                checkpoint, renewed = await self._renew_batch(db, checkpoint)
+            if renewed:
+                batches += 1
+                await self._publish(renewed)
+
+        logger.info(
+            "Subscription renewal run completed",
+            run_id=checkpoint.run_id,
+            renewed=checkpoint.renewed,
+            skipped=checkpoint.skipped,
+            failed=checkpoint.failed,
+            batches=batches,
+        )
+        return {
+            "run_id": checkpoint.run_id,
+            "renewed": checkpoint.renewed,
+            "skipped": checkpoint.skipped,
+            "failed": checkpoint.failed,
+            "batches": batches,
+        }
+
+    async def _start(self, run_id: str | None) -> RenewalCheckpoint:
+        async with self._session() as db:
+            stmt = select(BillingRenewalRunTable)
+            if run_id is not None:
+                stmt = stmt.where(BillingRenewalRunTable.run_id == run_id)
+            else:
+                stmt = (
+                    stmt.where(BillingRenewalRunTable.status == RUN_RUNNING)
+                    .order_by(BillingRenewalRunTable.created_at.desc())
+                    .limit(1)
+                )
+            row = (await db.execute(stmt)).scalar_one_or_none()
+
+            if row is not None:
+                checkpoint = RenewalCheckpoint.from_row(row)
+                logger.info(
+                    "Resuming subscription renewal run",
+                    run_id=checkpoint.run_id,
+                    last_subscription_id=checkpoint.last_subscription_id,
+                )
+                return checkpoint
+
+            checkpoint = RenewalCheckpoint(
+                run_id=run_id or f"renewal_{uuid4().hex[:12]}",
+                cutoff=datetime.now(UTC) + timedelta(days=self.look_ahead_days),
+            )
+            db.add(
+                BillingRenewalRunTable(
+                    run_id=checkpoint.run_id,
+                    cutoff=checkpoint.cutoff,
+                    status=RUN_RUNNING,
+                    renewed=0,
+                    skipped=0,
+                    failed=0,
+                )
+            )
+            await db.commit()
+            return checkpoint
+
+    async def _renew_batch(
+        self, db: AsyncSession, checkpoint: RenewalCheckpoint
+    ) -> tuple[RenewalCheckpoint, list[RenewedSubscription]]:
+        """Renew the next keyset batch and commit it with the advanced checkpoint."""
+        stmt = (
+            select(BillingSubscriptionTable)
+            .where(
+                and_(
+                    BillingSubscriptionTable.status == SubscriptionStatus.ACTIVE.value,
+                    BillingSubscriptionTable.current_period_end <= checkpoint.cutoff,
+                    # Scheduled cancellations end at period end instead of renewing
+                    BillingSubscriptionTable.cancel_at_period_end == False,  # noqa: E712
+                    BillingSubscriptionTable.ended_at.is_(None),
+                )
+            )
+            .order_by(BillingSubscriptionTable.subscription_id)
+            .limit(self.batch_size)
+            .with_for_update()
+        )
+        if checkpoint.last_subscription_id is not None:
+            stmt = stmt.where(
+                BillingSubscriptionTable.subscription_id > checkpoint.last_subscription_id
+            )
+        rows = list((await db.execute(stmt)).scalars().all())
+
+        now = datetime.now(UTC)
+        if not rows:
+            checkpoint = replace(checkpoint, status=RUN_COMPLETED)
+            await self._save_checkpoint(db, checkpoint, now, completed_at=now)
+            await db.commit()
+            return checkpoint, []
+
+        service = SubscriptionService(db)
+        plans = await self._load_plans(db, service, rows)
+        due: list[RenewedSubscription] = []
+        skipped = failed = 0
+
+        for row in rows:
+            plan = plans.get((row.tenant_id, row.plan_id))
+            if plan is None:
+                logger.warning(
+                    "Renewal skipped, plan not found",
+                    subscription_id=row.subscription_id,
+                    plan_id=row.plan_id,
+                    tenant_id=row.tenant_id,
+                )
+                skipped += 1
+                continue
+
+            previous_period_end = _aware(row.current_period_end)
+            try:
+                new_period_end = service._calculate_period_end(
+                    previous_period_end, plan.billing_cycle
+                )
+            except SubscriptionError as e:
+                logger.error(
+                    "Renewal failed",
+                    subscription_id=row.subscription_id,
+                    tenant_id=row.tenant_id,
+                    error=str(e),
+                )
+                failed += 1
+                continue
+
+            due.append(
+                RenewedSubscription(
+                    tenant_id=row.tenant_id,
+                    subscription_id=row.subscription_id,
+                    customer_id=row.customer_id,
+                    plan=plan,
+                    amount=row.custom_price if row.custom_price else plan.price,
+                    previous_period_end=previous_period_end,
+                    new_period_end=new_period_end,
+                )
+            )
+
+        # Invoicing commits per subscription, which expires the loaded rows
+        last_subscription_id = rows[-1].subscription_id
+        renewed, not_invoiced, invoice_failed = await self._invoice(db, due)
+        skipped += not_invoiced
+        failed += invoice_failed
+
+        if renewed:
+            await self._apply(db, renewed, now)
+
+        checkpoint = replace(
+            checkpoint,
+            last_subscription_id=last_subscription_id,
+            renewed=checkpoint.renewed + len(renewed),
+            skipped=checkpoint.skipped + skipped,
+            failed=checkpoint.failed + failed,
+        )
+        await self._save_checkpoint(db, checkpoint, now)
+        await db.commit()
+
+        logger.info(
+            "Subscription renewal batch committed",
+            run_id=checkpoint.run_id,
+            renewed=len(renewed),
+            skipped=skipped,
+            failed=failed,
+            last_subscription_id=checkpoint.last_subscription_id,
+        )
+        return checkpoint, renewed
+
+    async def _load_plans(
+        self,
+        db: AsyncSession,
+        service: SubscriptionService,
+        rows: list[BillingSubscriptionTable],
+    ) -> dict[tuple[str, str], SubscriptionPlan]:
+        """Load every plan referenced by ``rows`` in one query."""
+        result = await db.execute(
+            select(BillingSubscriptionPlanTable).where(
+                BillingSubscriptionPlanTable.plan_id.in_({row.plan_id for row in rows})
+            )
+        )
+        plans = (service._db_to_pydantic_plan(db_plan) for db_plan in result.scalars().all())
+        return {(plan.tenant_id, plan.plan_id): plan for plan in plans}
+
+    async def _invoice(
+        self, db: AsyncSession, due: list[RenewedSubscription]
+    ) -> tuple[list[RenewedSubscription], int, int]:
+        """
+        Invoice the renewed period of each due subscription.
+
+        Returns the invoiced subscriptions, with their invoice ids, and the
+        numbers skipped (nothing to bill) and failed. Only invoiced
+        subscriptions have their period advanced.
+        """
+        billing = BillingIntegrationService(db)
+        per_tenant: dict[str, int] = {}
+        for renewal in due:
+            per_tenant[renewal.tenant_id] = per_tenant.get(renewal.tenant_id, 0) + 1
+        for tenant_id, count in per_tenant.items():
+            # One counter update per tenant when block allocation is enabled
+            await billing.invoice_service.reserve_invoice_numbers(tenant_id, count)
+
+        invoiced: list[RenewedSubscription] = []
+        skipped = failed = 0
+        for renewal in due:
+            try:
+                invoice_id = await billing.process_subscription_billing(
+                    renewal.subscription_id,
+                    renewal.tenant_id,
+                    idempotency_key=renewal.idempotency_key,
+                )
+            except Exception as e:
+                await db.rollback()
+                logger.error(
+                    "Renewal invoicing failed",
+                    subscription_id=renewal.subscription_id,
+                    tenant_id=renewal.tenant_id,
+                    error=str(e),
+                )
+                failed += 1
+                continue
+
+            if invoice_id is None:
+                logger.warning(
+                    "Renewal skipped, no invoice created",
+                    subscription_id=renewal.subscription_id,
+                    tenant_id=renewal.tenant_id,
+                )
+                skipped += 1
+                continue
+            invoiced.append(replace(renewal, invoice_id=invoice_id))
+
+        return invoiced, skipped, failed
+
+    async def _apply(
+        self, db: AsyncSession, renewed: list[RenewedSubscription], now: datetime
+    ) -> None:
+        # The RENEWED audit event, with the invoice id, was recorded while invoicing
+        table = BillingSubscriptionTable.__table__
+        connection = await db.connection()
+        await connection.execute(
+            update(table)
+            .where(
+                and_(
+                    table.c.subscription_id == bindparam("b_subscription_id"),
+                    table.c.tenant_id == bindparam("b_tenant_id"),
+                )
+            )
+            .values(
+                current_period_start=bindparam("b_period_start"),
+                current_period_end=bindparam("b_period_end"),
+                # Usage counters start over with the new period
+                usage_records={},
+                updated_at=now,
+            ),
+            [
+                {
+                    "b_subscription_id": renewal.subscription_id,
+                    "b_tenant_id": renewal.tenant_id,
+                    "b_period_start": renewal.previous_period_end,
+                    "b_period_end": renewal.new_period_end,
+                }
+                for renewal in renewed
+            ],
+        )
+
+    async def _save_checkpoint(
+        self,
+        db: AsyncSession,
+        checkpoint: RenewalCheckpoint,
+        now: datetime,
+        completed_at: datetime | None = None,
+    ) -> None:
+        await db.execute(
+            update(BillingRenewalRunTable)
+            .where(BillingRenewalRunTable.run_id == checkpoint.run_id)
+            .values(
+                status=checkpoint.status,
+                last_subscription_id=checkpoint.last_subscription_id,
+                renewed=checkpoint.renewed,
+                skipped=checkpoint.skipped,
+                failed=checkpoint.failed,
+                completed_at=completed_at,
+                updated_at=now,
+            )
+        )
+
+    async def _publish(self, renewed: list[RenewedSubscription]) -> None:
+        """Publish ``subscription.renewed`` for a committed batch."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def publish(renewal: RenewedSubscription) -> None:
+            new_period_end = renewal.new_period_end.isoformat()
+            async with semaphore:
+                try:
+                    async with self._session() as db:
+                        await get_event_bus().publish(
+                            event_type=WebhookEvent.SUBSCRIPTION_RENEWED.value,
+                            event_data={
+                                "subscription_id": renewal.subscription_id,
+                                "customer_id": renewal.customer_id,
+                                "plan_id": renewal.plan.plan_id,
+                                "amount": float(renewal.amount),
+                                "currency": renewal.plan.currency,
+                                "billing_cycle": renewal.plan.billing_cycle.value,
+                                "previous_period_end": renewal.previous_period_end.isoformat(),
+                                "current_period_start": renewal.previous_period_end.isoformat(),
+                                "current_period_end": new_period_end,
+                                "next_billing_date": new_period_end,
+                                "payment_id": None,
+                                "invoice_id": renewal.invoice_id,
+                            },
+                            tenant_id=renewal.tenant_id,
+                            db=db,
+                        )
+                        await db.commit()
+                except Exception as e:
+                    logger.warning(
+                        "Failed to publish subscription.renewed event",
+                        subscription_id=renewal.subscription_id,
+                        tenant_id=renewal.tenant_id,
+                        error=str(e),
+                    )
+
+        await asyncio.gather(*(publish(renewal) for renewal in renewed))
+
+
+__all__ = [
+    "RenewalCheckpoint",
+    "RenewedSubscription",
+    "SubscriptionRenewalEngine",
+]
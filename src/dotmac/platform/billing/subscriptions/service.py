@@ -868,12 +868,12 @@ class SubscriptionService:
         if db_subscription is None:
             raise SubscriptionNotFoundError(f"Subscription {subscription_id} not found")
 
-            # Update period dates
-            db_subscription.current_period_start = new_period_start
-            db_subscription.current_period_end = new_period_end
+        # Update period dates
+        db_subscription.current_period_start = new_period_start
+        db_subscription.current_period_end = new_period_end
 
-            # Reset usage counters for new period
-            db_subscription.usage_records = {}
+        # Reset usage counters for new period
+        db_subscription.usage_records = {}
 
         # If subscription was trialing and trial has ended, activate it
         if subscription.status == SubscriptionStatus.TRIALING:
@@ -3,17 +3,22 @@ Background tasks for subscription management.
 
 This module contains Celery tasks for:
 - Processing scheduled plan changes
+- Bulk subscription renewals
 - Subscription renewal reminders
 - Trial expiration notifications
 - Subscription status updates
 - Grace period enforcement
 """
 
+from typing import Any
+
 import structlog
 
 from dotmac.platform.celery_app import celery_app
 from dotmac.platform.database import get_async_session_context
+from dotmac.platform.settings import settings
 
+from .renewals import SubscriptionRenewalEngine
 from .service import SubscriptionService
 
 logger = structlog.get_logger(__name__)
@@ -75,6 +80,25 @@ def process_scheduled_plan_changes_task() -> dict[str, int]:
     return result
 
 
+@celery_app.task(name="subscriptions.process_renewals")
+def process_renewals_task() -> dict[str, Any]:
+    """
+    Renew active subscriptions due within the next day, across all tenants.
+
+    Subscriptions are renewed in keyset batches (settings.billing.renewal_batch_size)
+    committed together with a checkpoint, so a run interrupted by a worker
+    restart resumes after its last committed batch on the next invocation.
+
+    Returns:
+        Dictionary with the run_id and renewed/skipped/failed/batches counters
+    """
+    result = _run_async(SubscriptionRenewalEngine().run())
+
+    logger.info("Subscription renewal task completed", **result)
+
+    return result
+
+
 @celery_app.task(name="subscriptions.enforce_grace_periods")
 def enforce_grace_periods_task() -> dict[str, int]:
     """
@@ -156,3 +180,11 @@ def setup_periodic_tasks(sender, **kwargs):
         enforce_grace_periods_task.s(),
         name="enforce-grace-periods-hourly",
     )
+
+    if settings.billing.auto_process_renewals:
+        # Renew due subscriptions once a day
+        sender.add_periodic_task(
+            86400.0,  # 24 hours in seconds
+            process_renewals_task.s(),
+            name="process-subscription-renewals-daily",
+        )
@@ -170,8 +170,7 @@ class UsageRecord(Base, TimestampMixin, TenantMixin):  # type: ignore[misc]  # M
 
     def __repr__(self) -> str:
         return (
-            f"<UsageRecord(id={self.id}, type={self.usage_type}, "
-            f"qty={self.quantity} {self.unit})>"
+            f"<UsageRecord(id={self.id}, type={self.usage_type}, qty={self.quantity} {self.unit})>"
         )
 
 
@@ -179,7 +178,8 @@ class UsageAggregate(Base, TimestampMixin, TenantMixin):  # type: ignore[misc]
     """
     Pre-aggregated usage statistics for reporting and dashboards.
 
-    Aggregated daily/monthly to reduce query load for analytics.
+    Hourly, daily and monthly rollups are maintained as usage records are
+    written (see ``billing.usage.rollups``); usage reports read from them.
     """
 
     __tablename__ = "usage_aggregates"
@@ -260,6 +260,7 @@ class UsageAggregate(Base, TimestampMixin, TenantMixin):  # type: ignore[misc]
             "ix_usage_agg_unique",
             "tenant_id",
             "subscription_id",
+            "customer_id",
             "usage_type",
             "period_start",
             "period_type",
@@ -0,0 +1,112 @@
+"""
+Time buckets for incrementally maintained usage rollups.
+
+Every usage record is attributed to the hourly, daily and monthly bucket
+(UTC) containing its ``period_start``. ``UsageBillingService`` adds each new
+record to those three ``UsageAggregate`` rows as it is written, so a report
+window is answered from a handful of rollup rows: whole months, then whole
+days, then whole hours, with only the sub-hour edges of the window read
+from ``usage_records``.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+HOURLY = "hourly"
+DAILY = "daily"
+MONTHLY = "monthly"
+
+# Coarsest first, the order in which report windows are covered
+ROLLUP_PERIODS: tuple[str, ...] = (MONTHLY, DAILY, HOURLY)
+
+# (period type, first bucket start, end of last bucket)
+RollupSegment = tuple[str, datetime, datetime]
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def bucket_start(value: datetime, period_type: str) -> datetime:
+    """Start of the ``period_type`` bucket containing ``value``."""
+    value = _as_utc(value).replace(minute=0, second=0, microsecond=0)
+    if period_type == HOURLY:
+        return value
+    value = value.replace(hour=0)
+    if period_type == DAILY:
+        return value
+    if period_type == MONTHLY:
+        return value.replace(day=1)
+    raise ValueError(f"Unknown rollup period: {period_type}")
+
+
+def bucket_end(start: datetime, period_type: str) -> datetime:
+    """End (exclusive) of the bucket starting at ``start``."""
+    if period_type == HOURLY:
+        return start + timedelta(hours=1)
+    if period_type == DAILY:
+        return start + timedelta(days=1)
+    if period_type == MONTHLY:
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+        return start.replace(month=start.month + 1)
+    raise ValueError(f"Unknown rollup period: {period_type}")
+
+
+def is_bucket(period_start: datetime, period_end: datetime, period_type: str) -> bool:
+    """Whether ``[period_start, period_end)`` is exactly one ``period_type`` bucket."""
+    start = bucket_start(period_start, period_type)
+    return start == _as_utc(period_start) and bucket_end(start, period_type) == _as_utc(period_end)
+
+
+def _next_boundary(value: datetime, period_type: str) -> datetime:
+    start = bucket_start(value, period_type)
+    return start if start == value else bucket_end(start, period_type)
+
+
+def plan_window(
+    period_start: datetime, period_end: datetime
+) -> tuple[list[RollupSegment], list[tuple[datetime, datetime]]]:
+    """
+    Split ``[period_start, period_end)`` into whole rollup buckets.
+
+    Returns the rollup segments to read from ``usage_aggregates`` and the
+    sub-hour ranges at the edges that must be read from ``usage_records``.
+    """
+    segments: list[RollupSegment] = []
+    raw: list[tuple[datetime, datetime]] = []
+
+    def cover(start: datetime, end: datetime, level: int) -> None:
+        if start >= end:
+            return
+        if level == len(ROLLUP_PERIODS):
+            raw.append((start, end))
+            return
+        period_type = ROLLUP_PERIODS[level]
+        first = _next_boundary(start, period_type)
+        last = bucket_start(end, period_type)
+        if first >= last:
+            cover(start, end, level + 1)
+            return
+        segments.append((period_type, first, last))
+        cover(start, first, level + 1)
+        cover(last, end, level + 1)
+
+    cover(_as_utc(period_start), _as_utc(period_end), 0)
+    return segments, raw
+
+
+__all__ = [
+    "DAILY",
+    "HOURLY",
+    "MONTHLY",
+    "ROLLUP_PERIODS",
+    "RollupSegment",
+    "bucket_end",
+    "bucket_start",
+    "is_bucket",
+    "plan_window",
+]
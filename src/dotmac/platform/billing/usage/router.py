@@ -24,7 +24,7 @@ from dotmac.platform.billing.usage.service import UsageBillingService
 from dotmac.platform.core.exceptions import EntityNotFoundError, ValidationError
 from dotmac.platform.database import get_async_session
 
-from .models import BilledStatus, UsageAggregate, UsageRecord, UsageType
+from .models import BilledStatus, UsageAggregate, UsageType
 from .schemas import (
     UsageAggregateResponse,
     UsageRecordCreate,
@@ -211,17 +211,13 @@ async def bulk_create_usage_records(
     service = UsageBillingService(db)
 
     try:
-        usage_records: list[UsageRecord] = []
         currency = await resolve_usage_currency(request, db, tenant_id)
-
-        for record_data in bulk_data.records:
-            usage_record = await service.create_usage_record(
-                tenant_id=tenant_id,
-                data=record_data,
-                currency=currency,
-                created_by=getattr(current_user, "user_id", None),
-            )
-            usage_records.append(usage_record)
+        usage_records = await service.create_usage_records(
+            tenant_id=tenant_id,
+            items=bulk_data.records,
+            currency=currency,
+            created_by=getattr(current_user, "user_id", None),
+        )
 
         await db.commit()
 
@@ -4,18 +4,27 @@ Usage billing domain service.
 Provides a cohesive API for creating and managing usage records,
 handling billing state transitions, computing aggregates, and
 generating usage reports for metered services.
+
+Aggregation runs in the database. Every write also maintains the hourly,
+daily and monthly ``UsageAggregate`` rollups of the record (see
+``billing.usage.rollups``) with ``INSERT ... ON CONFLICT DO UPDATE``, and
+usage reports are answered from those rollups.
 """
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from datetime import UTC, datetime
 from decimal import ROUND_HALF_UP, Decimal
-from uuid import UUID
+from typing import Any
+from uuid import UUID, uuid4
 
 import structlog
-from sqlalchemy import and_, select
+from sqlalchemy import ColumnElement, and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from dotmac.platform.billing.settings.service import BillingSettingsService
 from dotmac.platform.billing.usage.models import (
@@ -24,6 +33,13 @@ from dotmac.platform.billing.usage.models import (
     UsageRecord,
     UsageType,
 )
+from dotmac.platform.billing.usage.rollups import (
+    ROLLUP_PERIODS,
+    bucket_end,
+    bucket_start,
+    is_bucket,
+    plan_window,
+)
 from dotmac.platform.billing.usage.schemas import (
     UsageRecordCreate,
     UsageRecordUpdate,
@@ -37,6 +53,22 @@ from dotmac.platform.core.exceptions import EntityNotFoundError, ValidationError
 UTC = UTC
 logger = structlog.get_logger(__name__)
 
+# Unique key of a usage aggregate (ix_usage_agg_unique)
+_AGGREGATE_KEY = (
+    "tenant_id",
+    "subscription_id",
+    "customer_id",
+    "usage_type",
+    "period_start",
+    "period_type",
+)
+
+# Rows per multi-row upsert, keeps bind parameters under driver limits
+_UPSERT_CHUNK = 1000
+
+# (tenant, subscription, customer, usage type, period type, bucket start)
+RollupKey = tuple[str, str, str, UsageType, str, datetime]
+
 
 class UsageBillingService:
     """Service that encapsulates usage-record lifecycle and reporting logic."""
@@ -68,8 +100,44 @@ class UsageBillingService:
         self._validate_usage_record_input(data)
 
         resolved_currency = await self._resolve_currency(tenant_id, currency)
-        total_amount = self._calculate_total_amount(data.quantity, data.unit_price)
+        record = self._build_usage_record(tenant_id, data, resolved_currency, created_by)
+
+        self.db.add(record)
+        await self.db.flush()
+        await self._add_to_rollups([record])
+        return record
+
+    async def create_usage_records(
+        self,
+        tenant_id: str,
+        items: Sequence[UsageRecordCreate],
+        *,
+        currency: str | None = None,
+        created_by: str | None = None,
+    ) -> list[UsageRecord]:
+        """Create usage records in one flush and one rollup upsert (bulk imports)."""
+        for data in items:
+            self._validate_usage_record_input(data)
+
+        resolved_currency = await self._resolve_currency(tenant_id, currency)
+        records = [
+            self._build_usage_record(tenant_id, data, resolved_currency, created_by)
+            for data in items
+        ]
 
+        self.db.add_all(records)
+        await self.db.flush()
+        await self._add_to_rollups(records)
+        return records
+
+    def _build_usage_record(
+        self,
+        tenant_id: str,
+        data: UsageRecordCreate,
+        currency: str,
+        created_by: str | None,
+    ) -> UsageRecord:
+        total_amount = self._calculate_total_amount(data.quantity, data.unit_price)
         record = UsageRecord(
             tenant_id=tenant_id,
             subscription_id=data.subscription_id,
@@ -79,7 +147,7 @@ class UsageBillingService:
             unit=data.unit,
             unit_price=Decimal(data.unit_price),
             total_amount=total_amount,
-            currency=resolved_currency,
+            currency=currency,
             period_start=data.period_start,
             period_end=data.period_end,
             billed_status=BilledStatus.PENDING,
@@ -92,9 +160,6 @@ class UsageBillingService:
 
         if created_by and hasattr(record, "created_by"):
             record.created_by = created_by  # type: ignore[attr-defined]
-
-        self.db.add(record)
-        await self.db.flush()
         return record
 
     async def update_usage_record(
@@ -136,6 +201,8 @@ class UsageBillingService:
             record.updated_by = updated_by  # type: ignore[attr-defined]
 
         await self.db.flush()
+        if update.quantity is not None or update.unit_price is not None:
+            await self._refresh_rollups([record])
         return record
 
     async def delete_usage_record(self, tenant_id: str, record_id: UUID) -> None:
@@ -147,6 +214,7 @@ class UsageBillingService:
 
         await self.db.delete(record)
         await self.db.flush()
+        await self._refresh_rollups([record])
 
     # ------------------------------------------------------------------ #
     # Retrieval helpers
@@ -177,20 +245,17 @@ class UsageBillingService:
         offset: int = 0,
     ) -> list[UsageRecord]:
         """List usage records with optional filters."""
-        stmt = select(UsageRecord).where(UsageRecord.tenant_id == tenant_id)
-
-        if subscription_id:
-            stmt = stmt.where(UsageRecord.subscription_id == subscription_id)
-        if customer_id:
-            stmt = stmt.where(UsageRecord.customer_id == str(customer_id))
-        if usage_type:
-            stmt = stmt.where(UsageRecord.usage_type == usage_type)
-        if billed_status:
-            stmt = stmt.where(UsageRecord.billed_status == billed_status)
-        if period_start:
-            stmt = stmt.where(UsageRecord.period_start >= period_start)
-        if period_end:
-            stmt = stmt.where(UsageRecord.period_end <= period_end)
+        stmt = select(UsageRecord).where(
+            *self._record_filters(
+                tenant_id,
+                subscription_id=subscription_id,
+                customer_id=customer_id,
+                usage_type=usage_type,
+                billed_status=billed_status,
+                period_start=period_start,
+                period_end=period_end,
+            )
+        )
 
         stmt = stmt.order_by(UsageRecord.created_at.desc())
         if limit is not None:
@@ -276,32 +341,62 @@ class UsageBillingService:
         usage_type: UsageType | None = None,
     ) -> UsageAggregate | None:
         """
-        Aggregate usage for a period and persist/update UsageAggregate.
+        Aggregate usage for a period in the database and upsert UsageAggregate.
+
+        Records are attributed to the period by ``period_start`` and summed
+        per usage type. Hourly, daily and monthly periods must be exactly one
+        rollup bucket; aggregating one recomputes it from the records.
 
-        Returns the aggregate record or None when no usage matches.
+        Returns the aggregate for ``usage_type`` (the one with the most
+        records when no type is given) or None when no usage matches.
         """
-        records = await self.list_usage_records(
-            tenant_id,
-            subscription_id=subscription_id,
-            customer_id=customer_id,
-            usage_type=usage_type,
-            period_start=period_start,
-            period_end=period_end,
-        )
+        if period_type in ROLLUP_PERIODS and not is_bucket(period_start, period_end, period_type):
+            raise ValidationError(f"A {period_type} aggregate must cover exactly one period")
 
-        if not records:
+        customer_id_value = str(customer_id) if customer_id else None
+        stmt = (
+            select(UsageRecord.usage_type, *self._record_totals())
+            .where(
+                *self._record_filters(
+                    tenant_id,
+                    subscription_id=subscription_id,
+                    customer_id=customer_id_value,
+                    usage_type=usage_type,
+                ),
+                UsageRecord.period_start >= period_start,
+                UsageRecord.period_start < period_end,
+            )
+            .group_by(UsageRecord.usage_type)
+        )
+        rows = (await self.db.execute(stmt)).all()
+        if not rows:
             return None
 
-        aggregate_usage_type = usage_type or records[0].usage_type
-        total_quantity = sum((record.quantity for record in records), Decimal("0"))
-        total_amount = sum(int(record.total_amount or 0) for record in records)
-        record_count = len(records)
-        min_quantity = min((record.quantity for record in records), default=None)
-        max_quantity = max((record.quantity for record in records), default=None)
+        await self._upsert_aggregates(
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "subscription_id": subscription_id,
+                    "customer_id": customer_id_value,
+                    "usage_type": row.usage_type,
+                    "period_type": period_type,
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    "total_quantity": Decimal(row.total_quantity),
+                    "total_amount": int(row.total_amount or 0),
+                    "record_count": int(row.record_count),
+                    "min_quantity": row.min_quantity,
+                    "max_quantity": row.max_quantity,
+                }
+                for row in rows
+            ],
+            increment=False,
+        )
 
-        customer_id_value = str(customer_id) if customer_id else None
-        stmt = select(UsageAggregate).where(
-            and_(
+        aggregate_usage_type = usage_type or max(rows, key=lambda row: row.record_count).usage_type
+        result = await self.db.execute(
+            select(UsageAggregate)
+            .where(
                 UsageAggregate.tenant_id == tenant_id,
                 UsageAggregate.subscription_id == subscription_id,
                 UsageAggregate.customer_id == customer_id_value,
@@ -309,78 +404,51 @@ class UsageBillingService:
                 UsageAggregate.period_start == period_start,
                 UsageAggregate.period_type == period_type,
             )
+            .execution_options(populate_existing=True)
         )
-        existing_result = await self.db.execute(stmt)
-        aggregate = existing_result.scalar_one_or_none()
-
-        if not aggregate:
-            aggregate = UsageAggregate(
-                tenant_id=tenant_id,
-                subscription_id=subscription_id,
-                customer_id=customer_id_value,
-                usage_type=aggregate_usage_type,
-                period_type=period_type,
-                period_start=period_start,
-                period_end=period_end,
-                total_quantity=Decimal("0"),
-                total_amount=0,
-                record_count=0,
-            )
-            self.db.add(aggregate)
-
-        aggregate.total_quantity = total_quantity
-        aggregate.total_amount = total_amount
-        aggregate.record_count = record_count
-        aggregate.period_end = period_end
-        aggregate.min_quantity = min_quantity
-        aggregate.max_quantity = max_quantity
-
-        await self.db.flush()
-        return aggregate
+        return result.scalar_one_or_none()
 
     async def generate_usage_report(
         self,
         tenant_id: str,
         request: UsageReportRequest,
     ) -> UsageReport:
-        """Generate usage report for the specified window."""
-        records = await self.list_usage_records(
+        """
+        Generate usage report for the specified window.
+
+        Usage is attributed to the window by record ``period_start``. Whole
+        months, days and hours are read from the rollups; only the sub-hour
+        edges of the window are aggregated from usage records.
+        """
+        totals = await self._rollup_totals(
             tenant_id,
+            request.period_start,
+            request.period_end,
             subscription_id=request.subscription_id,
             customer_id=request.customer_id,
-            period_start=request.period_start,
-            period_end=request.period_end,
+            usage_types=request.usage_types,
         )
-
-        if request.usage_types:
-            records = [r for r in records if r.usage_type in request.usage_types]
+        currency = self._default_currency
+        if totals:
+            currency = await self._report_currency(
+                tenant_id, request.subscription_id, request.customer_id
+            )
 
         usage_by_type: dict[UsageType, UsageSummary] = {}
         total_quantity = Decimal("0")
         total_amount = 0
-        currency = self._default_currency
-
-        for record in records:
-            total_quantity += Decimal(record.quantity)
-            total_amount += int(record.total_amount or 0)
-            currency = record.currency or self._default_currency
-
-            summary = usage_by_type.get(record.usage_type)
-            if not summary:
-                summary = UsageSummary(
-                    usage_type=record.usage_type,
-                    total_quantity=Decimal("0"),
-                    total_amount=0,
-                    currency=currency,
-                    record_count=0,
-                    period_start=request.period_start,
-                    period_end=request.period_end,
-                )
-                usage_by_type[record.usage_type] = summary
-
-            summary.total_quantity += Decimal(record.quantity)
-            summary.total_amount += int(record.total_amount or 0)
-            summary.record_count += 1
+        for usage_type, (quantity, amount, record_count) in totals.items():
+            total_quantity += quantity
+            total_amount += amount
+            usage_by_type[usage_type] = UsageSummary(
+                usage_type=usage_type,
+                total_quantity=quantity,
+                total_amount=amount,
+                currency=currency,
+                record_count=record_count,
+                period_start=request.period_start,
+                period_end=request.period_end,
+            )
 
         return UsageReport(
             tenant_id=tenant_id,
@@ -404,47 +472,57 @@ class UsageBillingService:
         subscription_id: str | None = None,
     ) -> UsageStats:
         """Return usage statistics for dashboards."""
-        records = await self.list_usage_records(
-            tenant_id,
-            customer_id=customer_id,
-            subscription_id=subscription_id,
-            period_start=period_start,
-            period_end=period_end,
-        )
-
-        total_records = len(records)
-        total_amount = sum(int(r.total_amount or 0) for r in records)
-        pending_amount = sum(
-            int(r.total_amount or 0)
-            for r in records
-            if r.billed_status == BilledStatus.PENDING
-        )
-        billed_amount = sum(
-            int(r.total_amount or 0)
-            for r in records
-            if r.billed_status == BilledStatus.BILLED
+        stmt = (
+            select(
+                UsageRecord.usage_type,
+                UsageRecord.billed_status,
+                func.max(UsageRecord.currency).label("currency"),
+                func.min(UsageRecord.period_start).label("first_start"),
+                func.max(UsageRecord.period_end).label("last_end"),
+                *self._record_totals(),
+            )
+            .where(
+                *self._record_filters(
+                    tenant_id,
+                    subscription_id=subscription_id,
+                    customer_id=customer_id,
+                    period_start=period_start,
+                    period_end=period_end,
+                )
+            )
+            .group_by(UsageRecord.usage_type, UsageRecord.billed_status)
         )
+        rows = (await self.db.execute(stmt)).all()
 
+        total_records = 0
+        total_amount = 0
+        pending_amount = 0
+        billed_amount = 0
         by_type: dict[str, UsageSummary] = {}
-        for record in records:
-            key = record.usage_type.value
-            currency = (record.currency or self._default_currency).upper()
+        for row in rows:
+            amount = int(row.total_amount or 0)
+            total_records += int(row.record_count)
+            total_amount += amount
+            if row.billed_status == BilledStatus.PENDING:
+                pending_amount += amount
+            elif row.billed_status == BilledStatus.BILLED:
+                billed_amount += amount
+
+            key = row.usage_type.value
             if key not in by_type:
-                summary_start = period_start or record.period_start or datetime.now(UTC)
-                summary_end = period_end or record.period_end or datetime.now(UTC)
                 by_type[key] = UsageSummary(
-                    usage_type=record.usage_type,
+                    usage_type=row.usage_type,
                     total_quantity=Decimal("0"),
                     total_amount=0,
-                    currency=currency,
+                    currency=(row.currency or self._default_currency).upper(),
                     record_count=0,
-                    period_start=summary_start,
-                    period_end=summary_end,
+                    period_start=period_start or row.first_start or datetime.now(UTC),
+                    period_end=period_end or row.last_end or datetime.now(UTC),
                 )
             summary = by_type[key]
-            summary.total_quantity += Decimal(record.quantity)
-            summary.total_amount += int(record.total_amount or 0)
-            summary.record_count += 1
+            summary.total_quantity += Decimal(row.total_quantity)
+            summary.total_amount += amount
+            summary.record_count += int(row.record_count)
 
         return UsageStats(
             total_records=total_records,
@@ -456,6 +534,337 @@ class UsageBillingService:
             period_end=period_end or datetime.now(UTC),
         )
 
+    # ------------------------------------------------------------------ #
+    # Rollups
+    # ------------------------------------------------------------------ #
+
+    async def _rollup_totals(
+        self,
+        tenant_id: str,
+        period_start: datetime,
+        period_end: datetime,
+        *,
+        subscription_id: str | None,
+        customer_id: str | None,
+        usage_types: Sequence[UsageType] | None,
+    ) -> dict[UsageType, tuple[Decimal, int, int]]:
+        """(quantity, amount, record count) per usage type for a window."""
+        segments, raw_ranges = plan_window(period_start, period_end)
+        totals: dict[UsageType, tuple[Decimal, int, int]] = {}
+
+        def add(rows: Sequence[Any]) -> None:
+            for row in rows:
+                quantity, amount, record_count = totals.get(row.usage_type, (Decimal("0"), 0, 0))
+                totals[row.usage_type] = (
+                    quantity + Decimal(row.total_quantity or 0),
+                    amount + int(row.total_amount or 0),
+                    record_count + int(row.record_count or 0),
+                )
+
+        if segments:
+            conditions: list[ColumnElement[bool]] = [
+                UsageAggregate.tenant_id == tenant_id,
+                # Rollups always carry both; NULLs are tenant-level aggregate_usage rows
+                UsageAggregate.subscription_id.is_not(None),
+                UsageAggregate.customer_id.is_not(None),
+                or_(
+                    *(
+                        and_(
+                            UsageAggregate.period_type == period_type,
+                            UsageAggregate.period_start >= start,
+                            UsageAggregate.period_start < end,
+                        )
+                        for period_type, start, end in segments
+                    )
+                ),
+            ]
+            if subscription_id:
+                conditions.append(UsageAggregate.subscription_id == subscription_id)
+            if customer_id:
+                conditions.append(UsageAggregate.customer_id == str(customer_id))
+            if usage_types:
+                conditions.append(UsageAggregate.usage_type.in_(usage_types))
+
+            stmt = (
+                select(
+                    UsageAggregate.usage_type,
+                    func.sum(UsageAggregate.total_quantity).label("total_quantity"),
+                    func.sum(UsageAggregate.total_amount).label("total_amount"),
+                    func.sum(UsageAggregate.record_count).label("record_count"),
+                )
+                .where(*conditions)
+                .group_by(UsageAggregate.usage_type)
+            )
+            add((await self.db.execute(stmt)).all())
+
+        if raw_ranges:
+            conditions = self._record_filters(
+                tenant_id, subscription_id=subscription_id, customer_id=customer_id
+            )
+            if usage_types:
+                conditions.append(UsageRecord.usage_type.in_(usage_types))
+            conditions.append(
+                or_(
+                    *(
+                        and_(UsageRecord.period_start >= start, UsageRecord.period_start < end)
+                        for start, end in raw_ranges
+                    )
+                )
+            )
+            stmt = (
+                select(UsageRecord.usage_type, *self._record_totals())
+                .where(*conditions)
+                .group_by(UsageRecord.usage_type)
+            )
+            add((await self.db.execute(stmt)).all())
+
+        return totals
+
+    async def _report_currency(
+        self, tenant_id: str, subscription_id: str | None, customer_id: str | None
+    ) -> str:
+        stmt = (
+            select(UsageRecord.currency)
+            .where(
+                *self._record_filters(
+                    tenant_id, subscription_id=subscription_id, customer_id=customer_id
+                ),
+                UsageRecord.currency.is_not(None),
+            )
+            .limit(1)
+        )
+        currency = (await self.db.execute(stmt)).scalar_one_or_none()
+        return currency or self._default_currency
+
+    @staticmethod
+    def _rollup_keys(records: Sequence[UsageRecord]) -> list[RollupKey]:
+        keys: list[RollupKey] = []
+        for record in records:
+            if record.period_start is None:
+                # Not attributable to a period
+                continue
+            for period_type in ROLLUP_PERIODS:
+                keys.append(
+                    (
+                        record.tenant_id,
+                        record.subscription_id or "",
+                        record.customer_id or "",
+                        record.usage_type,
+                        period_type,
+                        bucket_start(record.period_start, period_type),
+                    )
+                )
+        return keys
+
+    @staticmethod
+    def _rollup_row(key: RollupKey) -> dict[str, Any]:
+        tenant_id, subscription_id, customer_id, usage_type, period_type, start = key
+        return {
+            "tenant_id": tenant_id,
+            "subscription_id": subscription_id,
+            "customer_id": customer_id,
+            "usage_type": usage_type,
+            "period_type": period_type,
+            "period_start": start,
+            "period_end": bucket_end(start, period_type),
+        }
+
+    async def _add_to_rollups(self, records: Sequence[UsageRecord]) -> None:
+        """Add new records to their hourly, daily and monthly rollups."""
+        deltas: dict[RollupKey, dict[str, Any]] = {}
+        for record in records:
+            quantity = Decimal(record.quantity)
+            amount = int(record.total_amount or 0)
+            for key in self._rollup_keys([record]):
+                row = deltas.get(key)
+                if row is None:
+                    deltas[key] = {
+                        **self._rollup_row(key),
+                        "total_quantity": quantity,
+                        "total_amount": amount,
+                        "record_count": 1,
+                        "min_quantity": quantity,
+                        "max_quantity": quantity,
+                    }
+                    continue
+                row["total_quantity"] += quantity
+                row["total_amount"] += amount
+                row["record_count"] += 1
+                row["min_quantity"] = min(row["min_quantity"], quantity)
+                row["max_quantity"] = max(row["max_quantity"], quantity)
+
+        if deltas:
+            await self._upsert_aggregates(list(deltas.values()), increment=True)
+
+    async def _refresh_rollups(self, records: Sequence[UsageRecord]) -> None:
+        """Recompute the rollups of records that were changed or deleted."""
+        values: list[dict[str, Any]] = []
+        for key in sorted(set(self._rollup_keys(records))):
+            tenant_id, subscription_id, customer_id, usage_type, period_type, start = key
+            stmt = select(*self._record_totals()).where(
+                UsageRecord.tenant_id == tenant_id,
+                self._matches_dimension(UsageRecord.subscription_id, subscription_id),
+                self._matches_dimension(UsageRecord.customer_id, customer_id),
+                UsageRecord.usage_type == usage_type,
+                UsageRecord.period_start >= start,
+                UsageRecord.period_start < bucket_end(start, period_type),
+            )
+            totals = (await self.db.execute(stmt)).one()
+
+            if not totals.record_count:
+                await self.db.execute(
+                    delete(UsageAggregate).where(
+                        UsageAggregate.tenant_id == tenant_id,
+                        UsageAggregate.subscription_id == subscription_id,
+                        UsageAggregate.customer_id == customer_id,
+                        UsageAggregate.usage_type == usage_type,
+                        UsageAggregate.period_start == start,
+                        UsageAggregate.period_type == period_type,
+                    )
+                )
+                continue
+
+            values.append(
+                {
+                    **self._rollup_row(key),
+                    "total_quantity": Decimal(totals.total_quantity),
+                    "total_amount": int(totals.total_amount or 0),
+                    "record_count": int(totals.record_count),
+                    "min_quantity": totals.min_quantity,
+                    "max_quantity": totals.max_quantity,
+                }
+            )
+
+        if values:
+            await self._upsert_aggregates(values, increment=False)
+
+    async def _upsert_aggregates(self, values: list[dict[str, Any]], *, increment: bool) -> None:
+        """
+        Insert aggregates or merge them into existing rows with the same key.
+
+        ``increment`` adds the values to existing totals (new records);
+        otherwise they replace them (recomputed totals).
+        """
+        insert = self._upsert_insert()
+        keyed: list[dict[str, Any]] = []
+        for row in values:
+            if (
+                insert is not None
+                and row["subscription_id"] is not None
+                and row["customer_id"] is not None
+            ):
+                keyed.append(row)
+            else:
+                # NULL dimensions never conflict in a unique index
+                await self._merge_aggregate(row, increment=increment)
+        if len(keyed) < len(values):
+            await self.db.flush()
+        if insert is None or not keyed:
+            return
+
+        # Same lock order in every writer, so concurrent upserts cannot deadlock
+        keyed.sort(key=lambda row: tuple(str(row[name]) for name in _AGGREGATE_KEY))
+        table = UsageAggregate.__table__
+        now = datetime.now(UTC)
+        for offset in range(0, len(keyed), _UPSERT_CHUNK):
+            chunk = [
+                {"id": uuid4(), "created_at": now, "updated_at": now, **row}
+                for row in keyed[offset : offset + _UPSERT_CHUNK]
+            ]
+            stmt = insert(table).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[name] for name in _AGGREGATE_KEY],
+                set_=self._conflict_updates(stmt.excluded, increment=increment),
+            )
+            await self.db.execute(stmt)
+
+    def _conflict_updates(self, excluded: Any, *, increment: bool) -> dict[str, Any]:
+        table = UsageAggregate.__table__
+        if not increment:
+            return {
+                name: excluded[name]
+                for name in (
+                    "period_end",
+                    "total_quantity",
+                    "total_amount",
+                    "record_count",
+                    "min_quantity",
+                    "max_quantity",
+                    "updated_at",
+                )
+            }
+
+        least: Callable[..., Any]
+        greatest: Callable[..., Any]
+        if self._dialect_name() == "postgresql":
+            least, greatest = func.least, func.greatest
+        else:
+            # SQLite's multi-argument min()/max() are scalar functions
+            least, greatest = func.min, func.max
+        return {
+            "total_quantity": table.c.total_quantity + excluded.total_quantity,
+            "total_amount": func.coalesce(table.c.total_amount, 0) + excluded.total_amount,
+            "record_count": table.c.record_count + excluded.record_count,
+            "min_quantity": least(
+                func.coalesce(table.c.min_quantity, excluded.min_quantity), excluded.min_quantity
+            ),
+            "max_quantity": greatest(
+                func.coalesce(table.c.max_quantity, excluded.max_quantity), excluded.max_quantity
+            ),
+            "updated_at": excluded.updated_at,
+        }
+
+    async def _merge_aggregate(self, row: dict[str, Any], *, increment: bool) -> None:
+        """Select-then-write upsert for dialects without ON CONFLICT and NULL keys."""
+        stmt = select(UsageAggregate).where(
+            *(getattr(UsageAggregate, name) == row[name] for name in _AGGREGATE_KEY)
+        )
+        aggregate = (await self.db.execute(stmt)).scalar_one_or_none()
+        if aggregate is None:
+            self.db.add(UsageAggregate(**row))
+            return
+
+        if not increment:
+            for name, value in row.items():
+                setattr(aggregate, name, value)
+            return
+
+        aggregate.total_quantity = Decimal(aggregate.total_quantity) + row["total_quantity"]
+        aggregate.total_amount = int(aggregate.total_amount or 0) + row["total_amount"]
+        aggregate.record_count += row["record_count"]
+        aggregate.min_quantity = min(
+            aggregate.min_quantity if aggregate.min_quantity is not None else row["min_quantity"],
+            row["min_quantity"],
+        )
+        aggregate.max_quantity = max(
+            aggregate.max_quantity if aggregate.max_quantity is not None else row["max_quantity"],
+            row["max_quantity"],
+        )
+
+    @staticmethod
+    def _matches_dimension(
+        column: InstrumentedAttribute[str | None], value: str
+    ) -> ColumnElement[bool]:
+        # Rollups store a missing subscription or customer as ""
+        if value:
+            return column == value
+        return or_(column.is_(None), column == "")
+
+    def _upsert_insert(self) -> Callable[..., Any] | None:
+        """Dialect ``insert`` construct supporting ON CONFLICT, if any."""
+        dialect = self._dialect_name()
+        if dialect == "postgresql":
+            return pg_insert
+        if dialect == "sqlite":
+            return sqlite_insert
+        return None
+
+    def _dialect_name(self) -> str | None:
+        try:
+            return str(self.db.get_bind().dialect.name)
+        except Exception:
+            return None
+
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
@@ -487,6 +896,44 @@ class UsageBillingService:
 
         return self._default_currency
 
+    @staticmethod
+    def _record_filters(
+        tenant_id: str,
+        *,
+        subscription_id: str | None = None,
+        customer_id: str | None = None,
+        usage_type: UsageType | None = None,
+        billed_status: BilledStatus | None = None,
+        period_start: datetime | None = None,
+        period_end: datetime | None = None,
+    ) -> list[ColumnElement[bool]]:
+        """WHERE conditions shared by record listing and aggregation."""
+        conditions: list[ColumnElement[bool]] = [UsageRecord.tenant_id == tenant_id]
+        if subscription_id:
+            conditions.append(UsageRecord.subscription_id == subscription_id)
+        if customer_id:
+            conditions.append(UsageRecord.customer_id == str(customer_id))
+        if usage_type:
+            conditions.append(UsageRecord.usage_type == usage_type)
+        if billed_status:
+            conditions.append(UsageRecord.billed_status == billed_status)
+        if period_start:
+            conditions.append(UsageRecord.period_start >= period_start)
+        if period_end:
+            conditions.append(UsageRecord.period_end <= period_end)
+        return conditions
+
+    @staticmethod
+    def _record_totals() -> tuple[ColumnElement[Any], ...]:
+        """Aggregate columns over usage records (one row per group)."""
+        return (
+            func.coalesce(func.sum(UsageRecord.quantity), 0).label("total_quantity"),
+            func.coalesce(func.sum(UsageRecord.total_amount), 0).label("total_amount"),
+            func.count(UsageRecord.id).label("record_count"),
+            func.min(UsageRecord.quantity).label("min_quantity"),
+            func.max(UsageRecord.quantity).label("max_quantity"),
+        )
+
     @staticmethod
     def _calculate_total_amount(quantity: Decimal, unit_price: Decimal) -> int:
         """Convert quantity * unit_price to cents using bankers rounding."""
@@ -26,6 +26,7 @@ from dotmac.platform.billing.subscriptions.models import (
     SubscriptionUpdateRequest,
 )
 from dotmac.platform.billing.subscriptions.service import SubscriptionService
+from dotmac.platform.core.http_pool import get_http_client
 from dotmac.platform.webhooks.events import get_event_bus
 from dotmac.platform.webhooks.models import WebhookEvent
 
@@ -737,18 +738,18 @@ class PayPalWebhookHandler(WebhookHandler):
             access_token = await self._get_paypal_access_token()
 
             # Make verification request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    verification_url,
-                    json=verification_data,
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=10.0,
-                )
+            client = get_http_client(verification_url)
+            response = await client.post(
+                verification_url,
+                json=verification_data,
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                    "Content-Type": "application/json",
+                },
+                timeout=10.0,
+            )
 
-                return self._handle_verification_response(response, is_sandbox)
+            return self._handle_verification_response(response, is_sandbox)
 
         except Exception as e:
             logger.error(f"Failed to verify PayPal signature: {e}")
@@ -778,25 +779,25 @@ class PayPalWebhookHandler(WebhookHandler):
         credentials = f"{self.config.paypal.client_id}:{self.config.paypal.client_secret}"
         encoded_credentials = base64.b64encode(credentials.encode()).decode()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                auth_url,
-                data={"grant_type": "client_credentials"},
-                headers={
-                    "Authorization": f"Basic {encoded_credentials}",
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                timeout=10.0,
-            )
+        client = get_http_client(auth_url)
+        response = await client.post(
+            auth_url,
+            data={"grant_type": "client_credentials"},
+            headers={
+                "Authorization": f"Basic {encoded_credentials}",
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+            timeout=10.0,
+        )
 
-            if response.status_code == 200:
-                token_data = response.json()
-                access_token: str = token_data.get("access_token", "")
-                if not access_token:
-                    raise Exception("PayPal access token not found in response")
-                return access_token
-            else:
-                raise Exception(f"Failed to get PayPal access token: {response.status_code}")
+        if response.status_code == 200:
+            token_data = response.json()
+            access_token: str = token_data.get("access_token", "")
+            if not access_token:
+                raise Exception("PayPal access token not found in response")
+            return access_token
+        else:
+            raise Exception(f"Failed to get PayPal access token: {response.status_code}")
 
     def _extract_event_type(self, data: dict[str, Any], headers: dict[str, str]) -> str:
         """Extract PayPal event type"""
@@ -19,7 +19,17 @@ from dotmac.platform.cache.models import (
     CacheStatistics,
     CacheStrategy,
 )
+from dotmac.platform.cache.serializers import (
+    CacheSerializer,
+    JSONSerializer,
+    MsgpackSerializer,
+    OrjsonSerializer,
+    PickleSerializer,
+    SerializerRegistry,
+    default_registry,
+)
 from dotmac.platform.cache.service import CacheService, get_cache_service
+from dotmac.platform.core.cache_stampede import StampedeProtection
 
 __all__ = [
     # Models
@@ -31,6 +41,14 @@ __all__ = [
     # Service
     "CacheService",
     "get_cache_service",
+    # Serializers
+    "CacheSerializer",
+    "JSONSerializer",
+    "MsgpackSerializer",
+    "OrjsonSerializer",
+    "PickleSerializer",
+    "SerializerRegistry",
+    "default_registry",
     # Decorators
     "cached",
     "cache_aside",
@@ -38,4 +56,6 @@ __all__ = [
     "cache_result_per_user",
     "cache_result_per_tenant",
     "memoize",
+    # Stampede protection
+    "StampedeProtection",
 ]
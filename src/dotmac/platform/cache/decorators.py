@@ -16,6 +16,11 @@ import structlog
 
 from dotmac.platform.cache.models import CacheNamespace
 from dotmac.platform.cache.service import get_cache_service
+from dotmac.platform.core.cache_stampede import (
+    StampedeProtection,
+    check_protection,
+    get_stampede_guard,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -29,6 +34,7 @@ def cached(
     include_tenant: bool = True,
     include_user: bool = False,
     key_builder: Callable[..., Any] | None = None,
+    stampede: StampedeProtection | None = None,
 ) -> Callable[..., Any]:
     """
     Decorator to cache function results.
@@ -45,9 +51,13 @@ def cached(
         key_prefix: Optional key prefix (defaults to function name)
         include_tenant: Include tenant_id in cache key
         include_user: Include user_id in cache key
+        stampede: Opt into single-flight, lease, XFetch and stale-while-revalidate
+            (async functions only)
     """
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        check_protection(func, stampede)
+
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
             cache = get_cache_service()
@@ -66,6 +76,23 @@ def cached(
             # Extract tenant_id for isolation
             tenant_id = _extract_tenant_id(args, kwargs) if include_tenant else None
 
+            if stampede is not None:
+
+                async def read() -> Any:
+                    return await cache.get(cache_key, namespace, tenant_id)
+
+                async def write(entry: Any, entry_ttl: int | None) -> None:
+                    await cache.set(cache_key, entry, namespace, tenant_id, entry_ttl)
+
+                return await get_stampede_guard().fetch(
+                    f"{namespace}:{tenant_id or '-'}:{cache_key}",
+                    lambda: func(*args, **kwargs),
+                    read=read,
+                    write=write,
+                    ttl=ttl,
+                    protection=stampede,
+                )
+
             # Try to get from cache
             cached_value = await cache.get(cache_key, namespace, tenant_id)
 
@@ -0,0 +1,244 @@
+"""
+Cache Serializers.
+
+Pluggable value encodings for CacheService, selectable per CacheNamespace.
+
+Available serializers:
+- ``json``: stdlib JSON (default, always available)
+- ``orjson``: faster JSON, used when the ``orjson`` package is installed
+- ``msgpack``: compact binary encoding, used when ``msgpack`` is installed
+- ``pickle``: arbitrary Python objects, restricted to an allowlist of classes
+  on load so cached bytes can never import arbitrary code
+
+JSON-compatible serializers write plain payloads so entries stay readable by
+older workers; binary serializers prefix a small header naming the encoding.
+"""
+
+import io
+import json
+import pickle  # nosec B403 - loads are restricted to an allowlist
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore[assignment]
+
+
+def default_encoder(value: Any) -> Any:
+    """
+    Provide safe fallbacks for objects commonly cached in the application.
+
+    Raises TypeError for unsupported objects so the encoder surfaces the issue.
+    """
+    if hasattr(value, "model_dump") and callable(value.model_dump):
+        return value.model_dump()
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class CacheSerializer(ABC):
+    """
+    Base class for cache serializers.
+
+    Attributes:
+        name: Registry name used in namespace configuration
+        format_id: One-byte identifier stored in the payload header
+        json_compatible: Payloads are plain JSON and written without a header
+    """
+
+    name: str = ""
+    format_id: int = 0
+    json_compatible: bool = False
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value for storage."""
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """Decode a stored payload."""
+
+
+class JSONSerializer(CacheSerializer):
+    """Stdlib JSON serializer."""
+
+    name = "json"
+    format_id = 1
+    json_compatible = True
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=default_encoder, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload.decode("utf-8"))
+
+
+class OrjsonSerializer(CacheSerializer):
+    """orjson serializer; output is interchangeable with JSONSerializer."""
+
+    name = "orjson"
+    format_id = 2
+    json_compatible = True
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=default_encoder, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackSerializer(CacheSerializer):
+    """MessagePack serializer."""
+
+    name = "msgpack"
+    format_id = 3
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=default_encoder, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+DEFAULT_PICKLE_ALLOWLIST = frozenset(
+    {
+        "builtins.complex",
+        "builtins.frozenset",
+        "builtins.set",
+        "collections.OrderedDict",
+        "datetime.date",
+        "datetime.datetime",
+        "datetime.time",
+        "datetime.timedelta",
+        "datetime.timezone",
+        "decimal.Decimal",
+        "uuid.SafeUUID",
+        "uuid.UUID",
+    }
+)
+
+
+class _AllowlistUnpickler(pickle.Unpickler):  # nosec B301
+    def __init__(self, payload: bytes, allowed: frozenset[str]) -> None:
+        super().__init__(io.BytesIO(payload))
+        self._allowed = allowed
+
+    def find_class(self, module: str, name: str) -> Any:
+        if f"{module}.{name}" in self._allowed or f"{module}.*" in self._allowed:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in cached data")
+
+
+class PickleSerializer(CacheSerializer):
+    """
+    Pickle serializer restricted to allowlisted classes on load.
+
+    Args:
+        allowed: Extra ``module.Class`` (or ``module.*``) entries to allow
+            on top of DEFAULT_PICKLE_ALLOWLIST
+    """
+
+    name = "pickle"
+    format_id = 4
+
+    def __init__(self, allowed: Iterable[str] = ()) -> None:
+        self.allowed = DEFAULT_PICKLE_ALLOWLIST | frozenset(allowed)
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, payload: bytes) -> Any:
+        return _AllowlistUnpickler(payload, self.allowed).load()
+
+
+class SerializerRegistry:
+    """Serializers available to CacheService, by name and by format id."""
+
+    def __init__(self) -> None:
+        self._by_name: dict[str, CacheSerializer] = {}
+        self._by_id: dict[int, CacheSerializer] = {}
+
+    def register(self, serializer: CacheSerializer) -> None:
+        """Register a serializer, replacing any with the same name."""
+        if not 0 < serializer.format_id < 256:
+            raise ValueError("format_id must fit in one byte and be non-zero")
+        existing = self._by_id.get(serializer.format_id)
+        if existing is not None and existing.name != serializer.name:
+            raise ValueError(
+                f"format_id {serializer.format_id} is already used by '{existing.name}'"
+            )
+        self._by_name[serializer.name] = serializer
+        self._by_id[serializer.format_id] = serializer
+
+    def get(self, name: str) -> CacheSerializer:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown cache serializer '{name}'. Available: {', '.join(sorted(self._by_name))}"
+            ) from None
+
+    def by_format_id(self, format_id: int) -> CacheSerializer | None:
+        return self._by_id.get(format_id)
+
+    def names(self) -> list[str]:
+        return sorted(self._by_name)
+
+
+_OPTIONAL_SERIALIZERS: tuple[Callable[[], CacheSerializer], ...] = (
+    OrjsonSerializer,
+    MsgpackSerializer,
+)
+
+
+def default_registry(pickle_allowlist: Iterable[str] = ()) -> SerializerRegistry:
+    """Build a registry with every serializer whose dependency is installed."""
+    registry = SerializerRegistry()
+    registry.register(JSONSerializer())
+    registry.register(PickleSerializer(pickle_allowlist))
+    for factory in _OPTIONAL_SERIALIZERS:
+        try:
+            registry.register(factory())
+        except RuntimeError:
+            continue
+    return registry
+
+
+__all__ = [
+    "CacheSerializer",
+    "DEFAULT_PICKLE_ALLOWLIST",
+    "JSONSerializer",
+    "MsgpackSerializer",
+    "OrjsonSerializer",
+    "PickleSerializer",
+    "SerializerRegistry",
+    "default_encoder",
+    "default_registry",
+]
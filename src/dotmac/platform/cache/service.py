@@ -2,24 +2,39 @@
 Cache Service.
 
 Redis-backed caching with multiple strategies and patterns.
+
+Values are encoded by the serializer configured for their namespace (see
+``cache.serializers``) and compressed once they reach
+``settings.redis.cache_compress_min_bytes``. Payload layout:
+
+- JSON-compatible serializers: the JSON bytes, or their zlib stream
+- other serializers: ``0x00``, format id, flags (bit 0 = zlib), payload
 """
 
 import hashlib
-import json
+import time
 import zlib
-from dataclasses import asdict, is_dataclass
-from datetime import UTC, date, datetime
-from enum import Enum
+from collections.abc import Mapping
 from typing import Any, TypedDict
 
 import structlog
 
 from dotmac.platform.cache.models import CacheNamespace
+from dotmac.platform.cache.serializers import (
+    CacheSerializer,
+    SerializerRegistry,
+    default_encoder,
+    default_registry,
+)
 from dotmac.platform.redis_client import RedisClientType
 from dotmac.platform.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+HEADER_MARKER = 0x00
+HEADER_SIZE = 3
+FLAG_ZLIB = 0x01
+
 _default_cache_service: "CacheService | None" = None
 
 
@@ -34,10 +49,59 @@ class CacheService:
         total_hit_latency: float
         total_miss_latency: float
 
-    def __init__(self, redis: RedisClientType | None = None):
-        """Initialize cache service."""
+    class SerializerStats(TypedDict):
+        hits: int
+        misses: int
+        total_hit_latency: float
+        total_miss_latency: float
+        encodes: int
+        decodes: int
+        total_encode_time: float
+        total_decode_time: float
+        raw_bytes: int
+        stored_bytes: int
+        compressed: int
+
+    def __init__(
+        self,
+        redis: RedisClientType | None = None,
+        *,
+        serializers: SerializerRegistry | None = None,
+        namespace_serializers: Mapping[CacheNamespace | str, str] | None = None,
+        default_serializer: str = "json",
+        batch_size: int | None = None,
+        compress_min_bytes: int | None = None,
+    ):
+        """
+        Initialize cache service.
+
+        Args:
+            redis: Redis client (created from settings on first use if None)
+            serializers: Serializer registry (all installed serializers if None)
+            namespace_serializers: Serializer name per namespace
+                (``settings.redis.cache_serializers`` if None)
+            default_serializer: Serializer for namespaces without an entry
+            batch_size: Keys per batch in bulk operations
+            compress_min_bytes: Compress payloads at least this large (0 disables)
+        """
         self.redis = redis
         self._local_stats: dict[str, CacheService.NamespaceStats] = {}
+        self._serializer_stats: dict[str, CacheService.SerializerStats] = {}
+
+        self.serializers = serializers or default_registry(settings.redis.cache_pickle_allowlist)
+        self._default_serializer = self.serializers.get(default_serializer)
+        self._namespace_serializers: dict[str, CacheSerializer] = {}
+        if namespace_serializers is None:
+            namespace_serializers = settings.redis.cache_serializers
+        for namespace, name in namespace_serializers.items():
+            self.set_namespace_serializer(namespace, name)
+
+        self.batch_size = max(1, batch_size or settings.redis.cache_batch_size)
+        self.compress_min_bytes = (
+            settings.redis.cache_compress_min_bytes
+            if compress_min_bytes is None
+            else compress_min_bytes
+        )
 
     async def _get_redis(self) -> RedisClientType:
         """Get Redis connection."""
@@ -66,6 +130,15 @@ class CacheService:
         else:
             return f"cache:global:{namespace_str}:{key}"
 
+    def set_namespace_serializer(self, namespace: CacheNamespace | str, name: str) -> None:
+        """Select the serializer used for new values written to ``namespace``."""
+        ns = namespace.value if isinstance(namespace, CacheNamespace) else namespace
+        self._namespace_serializers[ns] = self.serializers.get(name)
+
+    def _serializer_for(self, namespace: CacheNamespace | str) -> CacheSerializer:
+        ns = namespace.value if isinstance(namespace, CacheNamespace) else namespace
+        return self._namespace_serializers.get(ns, self._default_serializer)
+
     def _hash_key(self, key: str) -> str:
         """Hash long keys to keep them reasonable length."""
         if len(key) > 200:
@@ -96,11 +169,11 @@ class CacheService:
         cache_key = self._generate_key(namespace, self._hash_key(key), tenant_id)
 
         try:
-            start_time = datetime.now(UTC)
+            start_time = time.perf_counter()
 
             value = await redis.get(cache_key)
 
-            latency = (datetime.now(UTC) - start_time).total_seconds() * 1000
+            latency = (time.perf_counter() - start_time) * 1000
 
             if value is None:
                 self._record_miss(namespace, latency)
@@ -108,9 +181,9 @@ class CacheService:
                 return default
 
             # Deserialize
-            deserialized = self._deserialize(value)
+            deserialized, serializer = self._decode(value, namespace)
 
-            self._record_hit(namespace, latency)
+            self._record_hit(namespace, latency, serializer)
             logger.debug("Cache hit", key=cache_key, namespace=namespace)
 
             return deserialized
@@ -126,7 +199,7 @@ class CacheService:
         namespace: CacheNamespace | str = CacheNamespace.API_RESPONSE,
         tenant_id: str | None = None,
         ttl: int | None = None,
-        compress: bool = False,
+        compress: bool | None = None,
     ) -> bool:
         """
         Set value in cache.
@@ -137,7 +210,8 @@ class CacheService:
             namespace: Cache namespace
             tenant_id: Tenant ID for isolation
             ttl: Time-to-live in seconds (None = no expiration)
-            compress: Whether to compress value
+            compress: Force (True) or skip (False) compression; None compresses
+                payloads of at least ``compress_min_bytes``
 
         Returns:
             True if successful
@@ -146,12 +220,7 @@ class CacheService:
         cache_key = self._generate_key(namespace, self._hash_key(key), tenant_id)
 
         try:
-            # Serialize
-            serialized = self._serialize(value)
-
-            # Compress if requested
-            if compress:
-                serialized = zlib.compress(serialized)
+            serialized = self._serialize(value, namespace, compress)
 
             # Set with optional TTL
             if ttl:
@@ -280,17 +349,15 @@ class CacheService:
         try:
             deleted_count = 0
 
-            # Scan for matching keys
-            cursor = 0
-            while True:
-                cursor, keys = await redis.scan(cursor, match=cache_pattern, count=100)
-
-                if keys:
-                    deleted = await redis.delete(*keys)
-                    deleted_count += deleted
-
-                if cursor == 0:
-                    break
+            # SCAN and UNLINK (non-blocking delete) in batches of batch_size keys
+            pending: list[Any] = []
+            async for key in redis.scan_iter(match=cache_pattern, count=self.batch_size):
+                pending.append(key)
+                if len(pending) >= self.batch_size:
+                    deleted_count += await redis.unlink(*pending)
+                    pending.clear()
+            if pending:
+                deleted_count += await redis.unlink(*pending)
 
             self._record_delete(namespace, deleted_count)
             logger.info(
@@ -320,7 +387,15 @@ class CacheService:
         namespace: CacheNamespace | str = CacheNamespace.API_RESPONSE,
         tenant_id: str | None = None,
     ) -> dict[str, Any]:
-        """Get multiple values from cache."""
+        """
+        Get multiple values from cache.
+
+        Keys are fetched with one MGET per ``batch_size`` keys, all sent in a
+        single pipeline round trip.
+        """
+        if not keys:
+            return {}
+
         redis = await self._get_redis()
 
         try:
@@ -328,15 +403,21 @@ class CacheService:
                 self._generate_key(namespace, self._hash_key(key), tenant_id) for key in keys
             ]
 
-            values = await redis.mget(cache_keys)
+            start_time = time.perf_counter()
+            async with redis.pipeline(transaction=False) as pipe:
+                for start in range(0, len(cache_keys), self.batch_size):
+                    pipe.mget(cache_keys[start : start + self.batch_size])
+                chunks = await pipe.execute()
+            latency = (time.perf_counter() - start_time) * 1000 / len(keys)
 
             result = {}
+            values = (value for chunk in chunks for value in chunk)
             for key, value in zip(keys, values, strict=False):
                 if value is not None:
-                    result[key] = self._deserialize(value)
-                    self._record_hit(namespace, 0)
+                    result[key], serializer = self._decode(value, namespace)
+                    self._record_hit(namespace, latency, serializer)
                 else:
-                    self._record_miss(namespace, 0)
+                    self._record_miss(namespace, latency)
 
             return result
 
@@ -350,22 +431,33 @@ class CacheService:
         namespace: CacheNamespace | str = CacheNamespace.API_RESPONSE,
         tenant_id: str | None = None,
         ttl: int | None = None,
+        compress: bool | None = None,
     ) -> bool:
-        """Set multiple values in cache."""
+        """
+        Set multiple values in cache.
+
+        Writes are pipelined without MULTI/EXEC and flushed every
+        ``batch_size`` keys, so a large call is not applied atomically.
+        """
+        if not items:
+            return True
+
         redis = await self._get_redis()
 
         try:
-            # Use pipeline for atomic multi-set
-            async with redis.pipeline() as pipe:
-                for key, value in items.items():
+            async with redis.pipeline(transaction=False) as pipe:
+                for count, (key, value) in enumerate(items.items(), start=1):
                     cache_key = self._generate_key(namespace, self._hash_key(key), tenant_id)
-                    serialized = self._serialize(value)
+                    serialized = self._serialize(value, namespace, compress)
 
                     if ttl:
                         pipe.setex(cache_key, ttl, serialized)
                     else:
                         pipe.set(cache_key, serialized)
 
+                    if count % self.batch_size == 0:
+                        await pipe.execute()
+
                 await pipe.execute()
 
             self._record_set(namespace, len(items))
@@ -377,6 +469,35 @@ class CacheService:
             logger.error("Cache set_many error", error=str(e))
             return False
 
+    async def delete_many(
+        self,
+        keys: list[str],
+        namespace: CacheNamespace | str = CacheNamespace.API_RESPONSE,
+        tenant_id: str | None = None,
+    ) -> int:
+        """Delete multiple keys with one UNLINK per ``batch_size`` keys in a pipeline."""
+        if not keys:
+            return 0
+
+        redis = await self._get_redis()
+
+        try:
+            cache_keys = [
+                self._generate_key(namespace, self._hash_key(key), tenant_id) for key in keys
+            ]
+            async with redis.pipeline(transaction=False) as pipe:
+                for start in range(0, len(cache_keys), self.batch_size):
+                    pipe.unlink(*cache_keys[start : start + self.batch_size])
+                deleted = sum(await pipe.execute())
+
+            self._record_delete(namespace, deleted)
+            logger.debug("Cache delete_many", count=deleted, namespace=namespace)
+            return deleted
+
+        except Exception as e:
+            logger.error("Cache delete_many error", error=str(e))
+            return 0
+
     async def increment(
         self,
         key: str,
@@ -406,46 +527,102 @@ class CacheService:
         """Decrement counter in cache."""
         return await self.increment(key, -amount, namespace, tenant_id)
 
-    def _serialize(self, value: Any) -> bytes:
+    def _serialize(
+        self,
+        value: Any,
+        namespace: CacheNamespace | str = CacheNamespace.API_RESPONSE,
+        compress: bool | None = None,
+    ) -> bytes:
         """
-        Serialize value for storage using JSON only.
+        Serialize value for storage with the namespace's serializer.
 
         Raises:
-            ValueError: If the value cannot be represented safely as JSON.
+            ValueError: If the serializer cannot represent the value.
         """
+        serializer = self._serializer_for(namespace)
+        start_time = time.perf_counter()
         try:
-            json_payload = json.dumps(
-                value, default=self._json_default_encoder, separators=(",", ":")
-            )
-        except (TypeError, ValueError) as exc:
+            payload = serializer.dumps(value)
+        except Exception as exc:
             raise ValueError(
-                f"Cannot cache non-JSON-serializable value of type {type(value).__name__}. "
-                "Use a Pydantic model, dataclass, or convert the value to JSON-safe primitives."
+                f"Cannot cache value of type {type(value).__name__} with the "
+                f"'{serializer.name}' serializer. Use a Pydantic model, dataclass, "
+                "or convert the value to JSON-safe primitives."
             ) from exc
-
-        return json_payload.encode("utf-8")
-
-    def _deserialize(self, value: bytes) -> Any:
+        raw_size = len(payload)
+
+        flags = 0
+        if compress or (compress is None and 0 < self.compress_min_bytes <= raw_size):
+            compressed = zlib.compress(payload)
+            # Keep forced compression even if it does not pay off
+            if compress or len(compressed) < raw_size:
+                payload = compressed
+                flags |= FLAG_ZLIB
+
+        if not serializer.json_compatible:
+            payload = bytes((HEADER_MARKER, serializer.format_id, flags)) + payload
+
+        stats = self._serializer_stats_for(serializer.name)
+        stats["encodes"] += 1
+        stats["total_encode_time"] += (time.perf_counter() - start_time) * 1000
+        stats["raw_bytes"] += raw_size
+        stats["stored_bytes"] += len(payload)
+        if flags & FLAG_ZLIB:
+            stats["compressed"] += 1
+
+        return payload
+
+    def _deserialize(
+        self, value: bytes, namespace: CacheNamespace | str = CacheNamespace.API_RESPONSE
+    ) -> Any:
         """Deserialize value from storage."""
+        return self._decode(value, namespace)[0]
+
+    def _decode(
+        self, value: bytes, namespace: CacheNamespace | str
+    ) -> tuple[Any, CacheSerializer | None]:
+        """Deserialize a stored payload, returning the value and the serializer used."""
+        start_time = time.perf_counter()
         raw_value = value
 
-        if self._is_compressed(raw_value):
+        if raw_value[:1] == bytes((HEADER_MARKER,)) and len(raw_value) >= HEADER_SIZE:
+            serializer = self.serializers.by_format_id(raw_value[1])
+            if serializer is None:
+                logger.error("Unknown cache serializer", format_id=raw_value[1])
+                return None, None
+            compressed = bool(raw_value[2] & FLAG_ZLIB)
+            raw_value = raw_value[HEADER_SIZE:]
+        else:
+            # Plain JSON payload, possibly zlib-compressed
+            serializer = self._serializer_for(namespace)
+            if not serializer.json_compatible:
+                serializer = self.serializers.get("json")
+            compressed = self._is_compressed(raw_value)
+
+        if compressed:
             try:
                 raw_value = zlib.decompress(raw_value)
             except zlib.error as exc:
                 logger.error("Cache decompress error", error=str(exc))
-                return None
+                return None, serializer
 
         try:
-            return json.loads(raw_value.decode("utf-8"))
-        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
-            logger.error("Corrupted cache data", error=str(exc))
-            return None
+            result = serializer.loads(raw_value)
+        except Exception as exc:
+            logger.error("Corrupted cache data", error=str(exc), serializer=serializer.name)
+            return None, serializer
+
+        stats = self._serializer_stats_for(serializer.name)
+        stats["decodes"] += 1
+        stats["total_decode_time"] += (time.perf_counter() - start_time) * 1000
+        return result, serializer
 
     @staticmethod
     def _is_compressed(value: bytes) -> bool:
         """Detect if a payload looks like zlib-compressed data."""
-        return len(value) >= 2 and value[:2] == b"\x78\x9c"
+        # zlib header: deflate method byte 0x78 and a check value divisible by 31.
+        # JSON text never starts with 0x78 ("x").
+        return len(value) >= 2 and value[0] == 0x78 and ((value[0] << 8) | value[1]) % 31 == 0
 
     @staticmethod
     def _json_default_encoder(value: Any) -> Any:
@@ -454,23 +631,38 @@ class CacheService:
 
         Raises TypeError for unsupported objects so json.dumps surfaces the issue.
         """
-        if hasattr(value, "model_dump") and callable(value.model_dump):
-            return value.model_dump()
-        if is_dataclass(value) and not isinstance(value, type):
-            return asdict(value)
-        if isinstance(value, datetime):
-            return value.isoformat()
-        if isinstance(value, date):
-            return value.isoformat()
-        if isinstance(value, Enum):
-            return value.value
-
-        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
-
-    def _record_hit(self, namespace: CacheNamespace | str, latency_ms: float) -> None:
+        return default_encoder(value)
+
+    def _serializer_stats_for(self, name: str) -> "CacheService.SerializerStats":
+        if name not in self._serializer_stats:
+            self._serializer_stats[name] = CacheService.SerializerStats(
+                hits=0,
+                misses=0,
+                total_hit_latency=0.0,
+                total_miss_latency=0.0,
+                encodes=0,
+                decodes=0,
+                total_encode_time=0.0,
+                total_decode_time=0.0,
+                raw_bytes=0,
+                stored_bytes=0,
+                compressed=0,
+            )
+        return self._serializer_stats[name]
+
+    def _record_hit(
+        self,
+        namespace: CacheNamespace | str,
+        latency_ms: float,
+        serializer: CacheSerializer | None = None,
+    ) -> None:
         """Record cache hit for statistics."""
         ns = namespace.value if isinstance(namespace, CacheNamespace) else namespace
 
+        serializer_stats = self._serializer_stats_for((serializer or self._serializer_for(ns)).name)
+        serializer_stats["hits"] += 1
+        serializer_stats["total_hit_latency"] += latency_ms
+
         if ns not in self._local_stats:
             self._local_stats[ns] = CacheService.NamespaceStats(
                 hits=0,
@@ -488,6 +680,11 @@ class CacheService:
         """Record cache miss for statistics."""
         ns = namespace.value if isinstance(namespace, CacheNamespace) else namespace
 
+        # Misses are attributed to the serializer the namespace is configured with
+        serializer_stats = self._serializer_stats_for(self._serializer_for(ns).name)
+        serializer_stats["misses"] += 1
+        serializer_stats["total_miss_latency"] += latency_ms
+
         if ns not in self._local_stats:
             self._local_stats[ns] = CacheService.NamespaceStats(
                 hits=0,
@@ -559,9 +756,45 @@ class CacheService:
 
         return stats
 
+    def get_serializer_stats(self) -> dict[str, dict[str, Any]]:
+        """Get accumulated statistics broken down by serializer."""
+        stats = {}
+
+        for name, data in self._serializer_stats.items():
+            total_requests = data["hits"] + data["misses"]
+            hit_rate = (data["hits"] / total_requests * 100) if total_requests > 0 else 0
+
+            stats[name] = {
+                "total_requests": total_requests,
+                "cache_hits": data["hits"],
+                "cache_misses": data["misses"],
+                "hit_rate": round(hit_rate, 2),
+                "avg_hit_latency_ms": round(
+                    data["total_hit_latency"] / data["hits"] if data["hits"] else 0, 3
+                ),
+                "avg_miss_latency_ms": round(
+                    data["total_miss_latency"] / data["misses"] if data["misses"] else 0, 3
+                ),
+                "encodes": data["encodes"],
+                "decodes": data["decodes"],
+                "avg_encode_ms": round(
+                    data["total_encode_time"] / data["encodes"] if data["encodes"] else 0, 3
+                ),
+                "avg_decode_ms": round(
+                    data["total_decode_time"] / data["decodes"] if data["decodes"] else 0, 3
+                ),
+                "compressed": data["compressed"],
+                "compression_ratio": round(
+                    data["stored_bytes"] / data["raw_bytes"] if data["raw_bytes"] else 1.0, 3
+                ),
+            }
+
+        return stats
+
     def reset_stats(self) -> None:
         """Reset accumulated statistics."""
         self._local_stats = {}
+        self._serializer_stats = {}
 
 
 def get_cache_service(redis: RedisClientType | None = None) -> CacheService:
@@ -8,8 +8,10 @@ enables tracing and metrics when the application starts.
 from typing import Any
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from kombu import Queue
 
+from dotmac.platform.core.http_pool import reset_http_client_registry
 from dotmac.platform.core.tasks import init_celery_instrumentation
 from dotmac.platform.settings import settings
 
@@ -81,6 +83,14 @@ def setup_celery_instrumentation(sender: Any, **kwargs: Any) -> None:
         )
 
 
+# Pooled HTTP clients must not cross a fork: each worker process builds its own
+@worker_process_init.connect  # type: ignore[misc]
+@worker_process_shutdown.connect  # type: ignore[misc]
+def reset_http_clients(**kwargs: Any) -> None:
+    """Drop outbound HTTP clients inherited from the parent or left by tasks."""
+    reset_http_client_registry()
+
+
 # Log worker startup
 @celery_app.on_after_finalize.connect  # type: ignore[misc]
 def setup_periodic_tasks(sender: Any, **kwargs: Any) -> None:
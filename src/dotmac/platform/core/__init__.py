@@ -24,6 +24,7 @@ from dotmac.platform.core.aggregate_root import (
     ValueObject,
 )
 from dotmac.platform.core.cache_decorators import CacheTier, cached_result
+from dotmac.platform.core.cache_stampede import StampedeProtection
 from dotmac.platform.core.caching import get_redis, redis_client
 from dotmac.platform.core.distributed_locks import DistributedLock
 from dotmac.platform.core.domain_event_dispatcher import (
@@ -113,6 +114,7 @@ __all__ = [
     "get_redis",
     "CacheTier",
     "cached_result",
+    "StampedeProtection",
     # Tasks
     "celery_app",
     "idempotent_task",
@@ -0,0 +1,131 @@
+"""
+Pure ASGI Middleware Helpers
+
+BaseHTTPMiddleware runs the downstream app in a separate task and pipes the
+response body through a memory stream. With ten of them stacked, that is a
+fixed per-request cost on every endpoint and it breaks streaming responses.
+
+The helpers here let a middleware run as a plain ASGI callable while sharing
+its request handling with the BaseHTTPMiddleware implementation:
+
+- ``ASGIMiddleware``: base class for middleware written directly against ASGI
+- ``BeforeRequestASGIMixin``: runs an existing middleware's ``process_request``
+  hook as pure ASGI (for middleware that only acts before the handler)
+- ``wrap_response_start``: observe or mutate the ``http.response.start`` message
+
+Select the implementation with ``settings.middleware_mode`` ("base_http" or "asgi").
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from fastapi import HTTPException, Request, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ResponseStartHook = Callable[[Message], None]
+
+
+class ASGIMiddleware:
+    """Base class for pure ASGI HTTP middleware."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.handle_http(scope, receive, send)
+
+    async def handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an HTTP request. Subclasses override this."""
+        await self.app(scope, receive, send)
+
+
+class BeforeRequestASGIMixin:
+    """
+    Run a middleware's ``process_request`` hook as pure ASGI.
+
+    ``process_request`` receives the request and returns either ``None`` to
+    continue down the stack or a Response to short-circuit. HTTPExceptions
+    raised by the hook are rendered with the application's standard error
+    format instead of escaping to the server error handler.
+
+    Mix in before the BaseHTTPMiddleware subclass so this ``__call__`` wins::
+
+        class TenantASGIMiddleware(BeforeRequestASGIMixin, TenantMiddleware): ...
+    """
+
+    app: ASGIApp
+
+    if TYPE_CHECKING:
+        # Provided by the middleware class; declared for type checking only so
+        # the mixin, first in the MRO, does not shadow it at runtime
+        async def process_request(self, request: Request) -> Response | None: ...
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        try:
+            early_response = await self.process_request(request)
+        except HTTPException as exc:
+            early_response = await http_exception_response(request, exc)
+
+        if early_response is not None:
+            await early_response(scope, receive, send)
+            return
+
+        await self.app(scope, replay_body(request, receive), send)
+
+
+async def http_exception_response(request: Request, exc: HTTPException) -> Response:
+    """Render an HTTPException raised outside the router."""
+    from dotmac.platform.core.exception_handlers import http_exception_handler
+
+    return await http_exception_handler(request, exc)
+
+
+def replay_body(request: Request, receive: Receive) -> Receive:
+    """
+    Return a receive callable that replays a body already read by middleware.
+
+    If the middleware never touched the body, the original receive is returned.
+    """
+    body: bytes | None = getattr(request, "_body", None)
+    if body is None:
+        return receive
+
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+def wrap_response_start(send: Send, hook: ResponseStartHook) -> Send:
+    """Call ``hook`` with the ``http.response.start`` message before it is sent."""
+
+    async def wrapped(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            hook(message)
+        await send(message)
+
+    return wrapped
+
+
+def set_header(message: Message, name: str, value: str) -> None:
+    """Set (replace) a response header on an ``http.response.start`` message."""
+    raw_name = name.lower().encode("latin-1")
+    headers: list[Any] = [
+        (key, val) for key, val in message.get("headers", []) if key.lower() != raw_name
+    ]
+    headers.append((raw_name, value.encode("latin-1")))
+    message["headers"] = headers
@@ -15,6 +15,11 @@ from unittest.mock import Base as _MockBase
 
 import structlog
 
+from dotmac.platform.core.cache_stampede import (
+    StampedeProtection,
+    check_protection,
+    get_stampede_guard,
+)
 from dotmac.platform.core.caching import cache_get, cache_set
 
 logger = structlog.get_logger(__name__)
@@ -37,6 +42,7 @@ def cached_result(
     key_prefix: str = "",
     key_params: list[str] | None = None,
     tier: CacheTier = CacheTier.L2_REDIS,
+    stampede: StampedeProtection | None = None,
 ) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
     """
     Decorator for caching function results.
@@ -46,6 +52,7 @@ def cached_result(
         key_prefix: Prefix for cache key
         key_params: Parameters to include in cache key
         tier: Cache tier to use
+        stampede: Opt into single-flight, lease, XFetch and stale-while-revalidate
 
     Example:
         @cached_result(ttl=3600, key_prefix="user", key_params=["user_id"])
@@ -55,6 +62,7 @@ def cached_result(
     """
 
     def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        check_protection(func, stampede)
         signature = inspect.signature(func)
 
         def _default_cache_key(*args: P.args, **kwargs: P.kwargs) -> str:
@@ -97,6 +105,26 @@ def cached_result(
                 cache_key = _default_cache_key(*args, **kwargs)
 
             # Only L2_REDIS is supported for now (L1 would need instance-specific cache)
+            if tier == CacheTier.L2_REDIS and stampede is not None:
+
+                async def read() -> object:
+                    return cache_get(cache_key)
+
+                async def write(entry: object, entry_ttl: int | None) -> None:
+                    cache_set(cache_key, entry, ttl=entry_ttl)
+
+                return cast(
+                    R,
+                    await get_stampede_guard().fetch(
+                        cache_key,
+                        lambda: func(*args, **kwargs),
+                        read=read,
+                        write=write,
+                        ttl=ttl,
+                        protection=stampede,
+                    ),
+                )
+
             if tier == CacheTier.L2_REDIS:
                 cached_value = cast(R | None, cache_get(cache_key))
                 if cached_value is not None:
@@ -0,0 +1,332 @@
+"""
+Cache stampede protection.
+
+Shared by the caching decorators so that a hot key expiring does not send
+every concurrent caller to the loader at once:
+
+- Single-flight: concurrent misses for a key in one process share one load.
+- Lease: a short Redis lock (``core.distributed_locks``) lets one process
+  recompute while the others wait briefly for the fresh value.
+- XFetch: probabilistic early expiration; a caller may refresh a value
+  shortly before it expires, weighted by how long the value took to compute.
+- Stale-while-revalidate: an expired value is kept for ``stale_ttl`` seconds
+  and served while one background task refreshes it. The refresh re-runs the
+  loader after the caller has moved on, so it is refused for functions that
+  take a (request-scoped) database session.
+
+Protected entries are stored in an envelope holding the value, its compute
+time and its logical expiry, so any cache backend can be used.
+"""
+
+import asyncio
+import inspect
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from dotmac.platform.core.distributed_locks import release_lock, try_lock
+
+logger = structlog.get_logger(__name__)
+
+ENVELOPE_MARKER = "__stampede__"
+LEASE_KEY_PREFIX = "cache-lease"
+SESSION_PARAMETER_NAMES = frozenset({"db", "db_session", "session"})
+
+_MISSING: Any = object()
+
+CacheReader = Callable[[], Awaitable[Any]]
+CacheWriter = Callable[[Any, int | None], Awaitable[Any]]
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class StampedeProtection:
+    """
+    Stampede protection options for a cached function.
+
+    Attributes:
+        single_flight: Share one in-process load between concurrent misses
+        lease_ttl: Seconds a cross-process recompute lease is held (0 disables)
+        lease_wait: Max seconds to wait for another process's recompute
+        xfetch_beta: XFetch aggressiveness; >1 refreshes earlier (0 disables)
+        stale_ttl: Seconds an expired value may still be served while it is
+            refreshed in the background (0 disables stale-while-revalidate);
+            not allowed for functions taking a database session
+    """
+
+    single_flight: bool = True
+    lease_ttl: int = 10
+    lease_wait: float = 2.0
+    xfetch_beta: float = 1.0
+    stale_ttl: int = 0
+
+    def storage_ttl(self, ttl: int | None) -> int | None:
+        """Physical TTL for an entry whose logical TTL is ``ttl``."""
+        return None if ttl is None else ttl + self.stale_ttl
+
+    def refresh_early(self, delta: float, expires_at: float, now: float) -> bool:
+        """XFetch: decide whether to recompute before ``expires_at``."""
+        if self.xfetch_beta <= 0 or delta <= 0:
+            return False
+        # -log(U) for U in (0, 1] is an exponential variate
+        return now - delta * self.xfetch_beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _takes_session(func: Callable[..., Any]) -> bool:
+    for name, param in inspect.signature(func).parameters.items():
+        annotation = param.annotation
+        type_name = (
+            annotation if isinstance(annotation, str) else getattr(annotation, "__name__", "")
+        )
+        if name in SESSION_PARAMETER_NAMES or "Session" in type_name:
+            return True
+    return False
+
+
+def check_protection(func: Callable[..., Any], protection: StampedeProtection | None) -> None:
+    """
+    Validate ``protection`` for a cached function when it is decorated.
+
+    Raises:
+        ValueError: If stale-while-revalidate is requested for a function that
+            takes a database session; its background refresh would reuse the
+            caller's session after it has been closed or returned to the pool.
+    """
+    if protection is not None and protection.stale_ttl > 0 and _takes_session(func):
+        raise ValueError(
+            f"stale-while-revalidate cannot be used on {func.__qualname__}: "
+            "it takes a database session the background refresh would outlive"
+        )
+
+
+def wrap_entry(value: Any, delta: float, ttl: int | None) -> dict[str, Any]:
+    """Build the stored envelope for a freshly computed value."""
+    return {
+        ENVELOPE_MARKER: 1,
+        "v": value,
+        "d": round(delta, 6),
+        "e": None if ttl is None else time.time() + ttl,
+    }
+
+
+def unwrap_entry(entry: Any) -> tuple[Any, float, float | None] | None:
+    """Return ``(value, delta, expires_at)`` for an envelope, else None."""
+    if isinstance(entry, dict) and entry.get(ENVELOPE_MARKER) == 1 and "v" in entry:
+        return entry["v"], float(entry.get("d") or 0.0), entry.get("e")
+    return None
+
+
+class StampedeGuard:
+    """Process-wide coordinator for stampede-protected cache reads."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task[Any]] = set()
+        # Skip the lease for a while after Redis errors instead of paying for them per miss
+        self._lease_disabled_until = 0.0
+
+    async def fetch(
+        self,
+        key: str,
+        loader: Loader,
+        *,
+        read: CacheReader,
+        write: CacheWriter,
+        ttl: int | None,
+        protection: StampedeProtection,
+    ) -> Any:
+        """
+        Read ``key`` through the cache with stampede protection.
+
+        Args:
+            key: Identity of the entry (single-flight and lease key)
+            loader: Computes the value on a miss
+            read: Reads the stored entry from the cache backend
+            write: Stores ``(entry, ttl)`` in the cache backend
+            ttl: Logical time-to-live of the value in seconds
+            protection: Protection options
+        """
+        entry = await read()
+        if entry is not None:
+            unwrapped = unwrap_entry(entry)
+            if unwrapped is None:
+                # Entry written without protection; serve it as-is
+                return entry
+
+            value, delta, expires_at = unwrapped
+            now = time.time()
+            if expires_at is None or (
+                now < expires_at and not protection.refresh_early(delta, expires_at, now)
+            ):
+                return value
+
+            if protection.stale_ttl > 0:
+                self._schedule_refresh(key, loader, read, write, ttl, protection, value)
+                return value
+
+            if now < expires_at:
+                # Early refresh: recompute only if nobody else is, otherwise keep serving
+                return await self._load(key, loader, read, write, ttl, protection, fallback=value)
+
+        return await self._load(key, loader, read, write, ttl, protection)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Loader,
+        read: CacheReader,
+        write: CacheWriter,
+        ttl: int | None,
+        protection: StampedeProtection,
+        fallback: Any = _MISSING,
+    ) -> Any:
+        if not protection.single_flight:
+            return await self._load_with_lease(key, loader, read, write, ttl, protection, fallback)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            if fallback is not _MISSING:
+                return fallback
+            # Shield so a cancelled follower does not cancel the shared load
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load_with_lease(key, loader, read, write, ttl, protection, fallback)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved: there may be no followers waiting on it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_with_lease(
+        self,
+        key: str,
+        loader: Loader,
+        read: CacheReader,
+        write: CacheWriter,
+        ttl: int | None,
+        protection: StampedeProtection,
+        fallback: Any,
+    ) -> Any:
+        lease_key = f"{LEASE_KEY_PREFIX}:{key}"
+        token, held_elsewhere = await self._acquire_lease(lease_key, protection)
+
+        if held_elsewhere:
+            if fallback is not _MISSING:
+                return fallback
+            value = await self._wait_for_value(read, protection)
+            if value is not _MISSING:
+                return value
+            logger.debug("cache.stampede.lease_wait_timeout", key=key)
+
+        try:
+            return await self._compute(loader, write, ttl, protection)
+        finally:
+            if token is not None:
+                try:
+                    await release_lock(lease_key, token)
+                except Exception as e:
+                    logger.debug("cache.stampede.lease_release_failed", key=key, error=str(e))
+
+    async def _acquire_lease(
+        self, lease_key: str, protection: StampedeProtection
+    ) -> tuple[str | None, bool]:
+        """Return ``(token, held_elsewhere)``; a None token means run without a lease."""
+        if protection.lease_ttl <= 0 or time.monotonic() < self._lease_disabled_until:
+            return None, False
+        try:
+            token = await try_lock(lease_key, timeout=protection.lease_ttl)
+        except Exception as e:
+            logger.debug("cache.stampede.lease_unavailable", error=str(e))
+            self._lease_disabled_until = time.monotonic() + 30.0
+            return None, False
+        return token, token is None
+
+    async def _wait_for_value(self, read: CacheReader, protection: StampedeProtection) -> Any:
+        """Poll the cache until another process stores a fresh value."""
+        deadline = time.monotonic() + protection.lease_wait
+        delay = 0.02
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, 0.2)
+            unwrapped = unwrap_entry(await read())
+            if unwrapped is None:
+                continue
+            value, _, expires_at = unwrapped
+            if expires_at is None or expires_at > time.time():
+                return value
+        return _MISSING
+
+    async def _compute(
+        self, loader: Loader, write: CacheWriter, ttl: int | None, protection: StampedeProtection
+    ) -> Any:
+        started = time.monotonic()
+        value = await loader()
+        if value is not None:
+            entry = wrap_entry(value, time.monotonic() - started, ttl)
+            await write(entry, protection.storage_ttl(ttl))
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        loader: Loader,
+        read: CacheReader,
+        write: CacheWriter,
+        ttl: int | None,
+        protection: StampedeProtection,
+        stale_value: Any,
+    ) -> None:
+        """Refresh ``key`` in the background unless a refresh is already running."""
+        if key in self._refreshing or key in self._inflight:
+            return
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                await self._load(key, loader, read, write, ttl, protection, fallback=stale_value)
+            except Exception as e:
+                logger.warning("cache.stampede.refresh_failed", key=key, error=str(e))
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+_stampede_guard: StampedeGuard | None = None
+
+
+def get_stampede_guard() -> StampedeGuard:
+    """Return the process-wide stampede guard."""
+    global _stampede_guard
+    if _stampede_guard is None:
+        _stampede_guard = StampedeGuard()
+    return _stampede_guard
+
+
+__all__ = [
+    "StampedeGuard",
+    "StampedeProtection",
+    "check_protection",
+    "get_stampede_guard",
+    "unwrap_entry",
+    "wrap_entry",
+]
@@ -6,7 +6,6 @@ for all HTTP clients.
 """
 
 import asyncio
-import hashlib
 from collections.abc import Awaitable, Callable
 from typing import Any, ClassVar, cast
 from urllib.parse import urljoin
@@ -22,21 +21,21 @@ from tenacity import (
     wait_exponential,
 )
 
+from dotmac.platform.core.http_pool import get_http_client
+
 logger = structlog.get_logger(__name__)
 
 
 class RobustHTTPClient:
     """
     Base class for robust HTTP clients with:
-    - Connection pooling (persistent httpx.AsyncClient)
+    - Connection pooling (shared per-origin clients from ``core.http_pool``)
     - Retry logic with exponential backoff (tenacity)
     - Circuit breakers (pybreaker)
     - Tenant-aware structured logging
     - Configurable timeouts per operation
     """
 
-    # Class-level connection pool (one client per tenant + service combo)
-    _client_pool: ClassVar[dict[str, httpx.AsyncClient]] = {}
     _circuit_breakers: ClassVar[dict[str, CircuitBreaker]] = {}
 
     def __init__(
@@ -70,8 +69,8 @@ class RobustHTTPClient:
             max_retries: Maximum retry attempts
             circuit_breaker_threshold: Failures before opening circuit
             circuit_breaker_timeout: Seconds before trying again after circuit opens
-            max_connections: Maximum concurrent connections
-            max_keepalive_connections: Maximum keep-alive connections
+            max_connections: Unused; per-host limits come from ``settings.http_client``
+            max_keepalive_connections: Unused; see ``max_connections``
         """
         self.service_name = service_name
         self.base_url = base_url.rstrip("/") + "/"
@@ -101,35 +100,6 @@ class RobustHTTPClient:
         else:
             self.logger = logger.bind(service=service_name)
 
-        # Connection pooling key
-        # Fixed: Include auth material in pool key to prevent credential reuse across different auth contexts
-        # This ensures that rotating tokens, switching auth methods, or different tenant credentials
-        # each get their own httpx.AsyncClient instance with correct authentication
-        self.auth_key = self._create_auth_key(api_token, username, password)
-        pool_key = f"{service_name}:{tenant_id or 'default'}:{base_url}:{self.auth_key}"
-
-        # Create or reuse HTTP client (connection pooling)
-        if pool_key not in self._client_pool:
-            self._client_pool[pool_key] = httpx.AsyncClient(
-                base_url=self.base_url,
-                headers=self.headers,
-                auth=self.auth,
-                verify=verify_ssl,
-                timeout=httpx.Timeout(default_timeout, connect=5.0),
-                limits=httpx.Limits(
-                    max_connections=max_connections,
-                    max_keepalive_connections=max_keepalive_connections,
-                ),
-                follow_redirects=True,
-            )
-            self.logger.debug(
-                "http_client.pool.created",
-                pool_key=pool_key,
-                max_connections=max_connections,
-            )
-
-        self.client = self._client_pool[pool_key]
-
         # Create or reuse circuit breaker
         breaker_key = f"{service_name}:{tenant_id or 'default'}"
         if breaker_key not in self._circuit_breakers:
@@ -148,41 +118,34 @@ class RobustHTTPClient:
 
         self.circuit_breaker = self._circuit_breakers[breaker_key]
 
-    @staticmethod
-    def _create_auth_key(
-        api_token: str | None,
-        username: str | None,
-        password: str | None,
-    ) -> str:
+    @property
+    def client(self) -> httpx.AsyncClient:
         """
-        Create a secure hash key for authentication credentials.
-
-        This key is used in the connection pool key to ensure that different
-        credentials get separate httpx.AsyncClient instances, preventing
-        credential reuse when tokens rotate or auth methods change.
-
-        Args:
-            api_token: Bearer token
-            username: Basic auth username
-            password: Basic auth password
+        Pooled client for ``base_url``, shared with every other caller of that origin.
 
-        Returns:
-            8-character hash of the auth credentials (or "none" if no auth)
+        Headers and credentials are sent per request, so tenants and services
+        with different credentials share connections but never auth state.
         """
-        if api_token:
-            # Hash the bearer token
-            auth_str = f"bearer:{api_token}"
-        elif username and password:
-            # Hash the username:password combo
-            auth_str = f"basic:{username}:{password}"
-        else:
-            # No authentication
-            return "none"
+        return get_http_client(self.base_url, verify=self.verify_ssl)
 
-        # Create SHA256 hash and take first 8 characters for pool key
-        # This provides sufficient uniqueness while keeping pool keys readable
-        auth_hash = hashlib.sha256(auth_str.encode()).hexdigest()[:8]
-        return auth_hash
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, Any] | None,
+        json: dict[str, Any] | None,
+        timeout: float,
+    ) -> Awaitable[httpx.Response]:
+        return self.client.request(
+            method=method,
+            url=url,
+            params=params,
+            json=json,
+            headers=self.headers,
+            auth=self.auth if self.auth is not None else httpx.USE_CLIENT_DEFAULT,
+            timeout=timeout,
+            follow_redirects=True,
+        )
 
     class _CircuitBreakerListener(
         CircuitBreakerListener
@@ -357,13 +320,7 @@ class RobustHTTPClient:
                         max_retries=self.max_retries,
                     )
 
-                response = await self.client.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json,
-                    timeout=timeout,
-                )
+                response = await self._send(method, url, params, json, timeout)
 
                 # Retry on 5xx errors
                 if response.status_code >= 500:
@@ -415,13 +372,7 @@ class RobustHTTPClient:
         timeout: float,
     ) -> Any:
         """Make single request without retry."""
-        response = await self.client.request(
-            method=method,
-            url=url,
-            params=params,
-            json=json,
-            timeout=timeout,
-        )
+        response = await self._send(method, url, params, json, timeout)
 
         response.raise_for_status()
 
@@ -431,23 +382,17 @@ class RobustHTTPClient:
         return response.json()
 
     async def close(self) -> None:
-        """Close HTTP client and cleanup resources."""
-        # Fixed: Include auth_key in pool key to match the key used in __init__
-        pool_key = (
-            f"{self.service_name}:{self.tenant_id or 'default'}:{self.base_url}:{self.auth_key}"
-        )
-        if pool_key in self._client_pool:
-            await self._client_pool[pool_key].aclose()
-            del self._client_pool[pool_key]
-            self.logger.debug("http_client.closed", pool_key=pool_key)
+        """
+        Release this client.
+
+        Connections belong to the shared pool and stay open for other callers;
+        they are closed by ``close_http_client_registry`` at shutdown.
+        """
+        self.logger.debug("http_client.closed", base_url=self.base_url)
 
     @classmethod
     async def close_all(cls) -> None:
-        """Close all pooled HTTP clients."""
-        for key, client in list(cls._client_pool.items()):
-            await client.aclose()
-            logger.debug("http_client.pool.closed", pool_key=key)
-        cls._client_pool.clear()
+        """Reset circuit breakers (pooled connections are closed with the registry)."""
         cls._circuit_breakers.clear()
 
     def __del__(self) -> None:
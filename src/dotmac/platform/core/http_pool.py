@@ -0,0 +1,394 @@
+"""
+Process-wide registry of pooled outbound HTTP clients.
+
+Outbound integrations (webhooks, notification channels, alert delivery,
+payment providers, OAuth) share one ``httpx.AsyncClient`` per destination
+origin, TLS configuration and profile instead of opening a client per call,
+so TCP/TLS connections (and HTTP/2 streams, when ``h2`` is installed) are
+reused between requests.
+
+A profile sets the timeouts and per-host connection limits. ``default``,
+``fast`` and ``slow`` come from ``settings.http_client``; subsystems can
+register their own with ``register_profile``.
+
+Shared clients never store cookies: a ``Set-Cookie`` from one caller's
+response must not ride along on another caller's request (say, a webhook
+of a different tenant) to the same origin.
+
+Clients belong to the event loop that created them. When the registry is
+used from a new loop (e.g. a Celery task running ``asyncio.run``), it starts
+a fresh set of clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+from prometheus_client import Gauge, Histogram
+
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+http_pool_in_flight = Gauge(
+    "dotmac_http_pool_requests_in_flight",
+    "Outbound HTTP requests holding a pooled connection",
+    ["profile"],
+)
+
+http_pool_wait = Histogram(
+    "dotmac_http_pool_wait_seconds",
+    "Time an outbound HTTP request waited for a pooled connection",
+    ["profile"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+)
+
+# First trace events after a request leaves the pool queue with a connection
+_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+@dataclass(frozen=True)
+class HttpClientProfile:
+    """Timeouts and per-host connection limits for a family of clients."""
+
+    timeout: float
+    connect_timeout: float
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    http2: bool = True
+
+    @property
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+    @property
+    def httpx_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+@dataclass(frozen=True)
+class HttpClientKey:
+    """What makes two callers able to share a client."""
+
+    origin: str
+    verify: bool | str = True
+    cert: str | tuple[str, str] | None = None
+    profile: str = "default"
+
+
+@dataclass
+class PoolStats:
+    """Request and connection-wait counters for one pooled client."""
+
+    requests: int = 0
+    in_flight: int = 0
+    waits: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.waits += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+def _default_profiles() -> dict[str, HttpClientProfile]:
+    config = settings.http_client
+
+    def profile(timeout: float) -> HttpClientProfile:
+        return HttpClientProfile(
+            timeout=timeout,
+            connect_timeout=config.connect_timeout,
+            max_connections=config.max_connections_per_host,
+            max_keepalive_connections=config.max_keepalive_per_host,
+            keepalive_expiry=config.keepalive_expiry,
+            http2=config.http2,
+        )
+
+    return {
+        "default": profile(config.default_timeout),
+        "fast": profile(config.fast_timeout),
+        "slow": profile(config.slow_timeout),
+    }
+
+
+def _cookieless_jar() -> CookieJar:
+    """Cookie jar that accepts no cookie, for clients shared between callers."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def origin_of(url: str) -> str:
+    """``scheme://host:port`` of ``url``, with the default port filled in."""
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return f"{parts.scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response body that releases the in-flight slot when closed."""
+
+    def __init__(self, stream: Any, release: Any) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a pooled transport to count in-flight requests and connection waits.
+
+    The wait ends at the first httpcore trace event sent once the request
+    holds a connection: opening a new one or writing headers on a reused one.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: PoolStats, profile: str) -> None:
+        self._transport = transport
+        self._stats = stats
+        self._in_flight = http_pool_in_flight.labels(profile=profile)
+        self._wait = http_pool_wait.labels(profile=profile)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        started = time.perf_counter()
+        acquired = False
+        previous_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and event_name in _ACQUIRED_EVENTS:
+                acquired = True
+                waited = time.perf_counter() - started
+                stats.record_wait(waited)
+                self._wait.observe(waited)
+            if previous_trace is not None:
+                await previous_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        stats.requests += 1
+        stats.in_flight += 1
+        self._in_flight.inc()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                stats.in_flight -= 1
+                self._in_flight.dec()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_MeteredStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def connection_counts(self) -> tuple[int, int]:
+        """(open, idle) connections, when the underlying pool exposes them."""
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+@dataclass
+class _PooledClient:
+    client: httpx.AsyncClient
+    transport: MeteredTransport
+    stats: PoolStats = field(default_factory=PoolStats)
+
+
+class HttpClientRegistry:
+    """Shared outbound HTTP clients keyed by origin, TLS config and profile."""
+
+    def __init__(self, profiles: dict[str, HttpClientProfile] | None = None) -> None:
+        self._profiles = profiles if profiles is not None else _default_profiles()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._clients: dict[HttpClientKey, _PooledClient] = {}
+
+    def register_profile(self, name: str, profile: HttpClientProfile) -> None:
+        """Add or replace a profile (applies to clients created afterwards)."""
+        self._profiles[name] = profile
+
+    def has_profile(self, name: str) -> bool:
+        return name in self._profiles
+
+    def profile(self, name: str) -> HttpClientProfile:
+        try:
+            return self._profiles[name]
+        except KeyError:
+            raise ValueError(f"Unknown HTTP client profile: {name}") from None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.debug("http_pool.rebound", clients=len(self._clients))
+        self._loop = loop
+        self._clients = {}
+
+    def client(
+        self,
+        url: str,
+        *,
+        profile: str = "default",
+        verify: bool | str = True,
+        cert: str | tuple[str, str] | None = None,
+    ) -> httpx.AsyncClient:
+        """
+        Pooled client for the origin of ``url``.
+
+        The client has no base URL, headers or auth: callers pass absolute
+        URLs and their credentials per request, so clients are safe to share.
+        ``verify`` and ``cert`` are the usual httpx TLS options.
+        """
+        self._bind_loop()
+        key = HttpClientKey(origin=origin_of(url), verify=verify, cert=cert, profile=profile)
+        pooled = self._clients.get(key)
+        if pooled is None or pooled.client.is_closed:
+            pooled = self._create(key)
+            self._clients[key] = pooled
+        return pooled.client
+
+    def _create(self, key: HttpClientKey) -> _PooledClient:
+        client_profile = self.profile(key.profile)
+        http2 = client_profile.http2 and HTTP2_AVAILABLE
+        stats = PoolStats()
+        transport = MeteredTransport(
+            httpx.AsyncHTTPTransport(
+                verify=key.verify,
+                cert=key.cert,
+                http2=http2,
+                limits=client_profile.httpx_limits,
+            ),
+            stats,
+            key.profile,
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=client_profile.httpx_timeout,
+            follow_redirects=False,
+            cookies=_cookieless_jar(),
+        )
+        logger.debug(
+            "http_pool.client_created", origin=key.origin, profile=key.profile, http2=http2
+        )
+        return _PooledClient(client=client, transport=transport, stats=stats)
+
+    def stats(self, profile: str | None = None) -> list[dict[str, Any]]:
+        """Per-client pool metrics: in-flight requests, idle connections and wait times."""
+        result = []
+        for key, pooled in self._clients.items():
+            if profile is not None and key.profile != profile:
+                continue
+            connections, idle = pooled.transport.connection_counts()
+            stats = pooled.stats
+            result.append(
+                {
+                    "origin": key.origin,
+                    "profile": key.profile,
+                    "requests": stats.requests,
+                    "in_flight": stats.in_flight,
+                    "connections": connections,
+                    "idle": idle,
+                    "wait_avg_ms": (stats.wait_total / stats.waits * 1000 if stats.waits else 0.0),
+                    "wait_max_ms": stats.wait_max * 1000,
+                }
+            )
+        return result
+
+    def reset(self) -> None:
+        """Forget every client without closing it (e.g. in a forked worker)."""
+        self._loop = None
+        self._clients = {}
+
+    async def aclose(self, profile: str | None = None) -> None:
+        """Close every client (or only those of ``profile``) created on the running loop."""
+        if profile is None:
+            clients, self._clients = list(self._clients.values()), {}
+            self._loop = None
+        else:
+            keys = [key for key in self._clients if key.profile == profile]
+            clients = [self._clients.pop(key) for key in keys]
+        for pooled in clients:
+            try:
+                await pooled.client.aclose()
+            except Exception as e:
+                logger.debug("http_pool.close_failed", error=str(e))
+
+
+_registry: HttpClientRegistry | None = None
+
+
+def get_http_client_registry() -> HttpClientRegistry:
+    """Get the process-wide HTTP client registry."""
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry()
+    return _registry
+
+
+def get_http_client(
+    url: str,
+    *,
+    profile: str = "default",
+    verify: bool | str = True,
+    cert: str | tuple[str, str] | None = None,
+) -> httpx.AsyncClient:
+    """Shortcut for ``get_http_client_registry().client(...)``."""
+    return get_http_client_registry().client(url, profile=profile, verify=verify, cert=cert)
+
+
+async def close_http_client_registry() -> None:
+    """Close pooled clients (application shutdown)."""
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
+
+
+def reset_http_client_registry() -> None:
+    """Drop pooled clients without closing them (Celery worker process start/stop)."""
+    global _registry
+    if _registry is not None:
+        _registry.reset()
+        _registry = None
@@ -0,0 +1,91 @@
+"""
+Cross-worker cache invalidation over Redis pub/sub.
+
+``InvalidationListener`` keeps a subscription to an invalidation channel open
+in a background task and hands every message to a callback. Messages
+published while a worker is disconnected are lost, so after each (re)subscribe
+``on_connect`` runs first and the owner drops whatever it has cached.
+Connection errors are retried with exponential backoff.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import structlog
+
+from dotmac.platform.redis_client import RedisClientType
+
+logger = structlog.get_logger(__name__)
+
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+
+class InvalidationListener:
+    """Background pub/sub subscription applying invalidation messages."""
+
+    def __init__(
+        self,
+        channel: str,
+        on_message: Callable[[str | bytes], None],
+        on_connect: Callable[[], None],
+        *,
+        name: str,
+    ) -> None:
+        self.channel = channel
+        self.name = name
+        self._on_message = on_message
+        self._on_connect = on_connect
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, redis: RedisClientType) -> None:
+        """Start listening on ``redis`` unless already running."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._listen(redis))
+
+    async def stop(self) -> None:
+        """Cancel the listener and wait for it to finish."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _listen(self, redis: RedisClientType) -> None:
+        backoff = INITIAL_BACKOFF
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected
+                self._on_connect()
+                backoff = INITIAL_BACKOFF
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "invalidation_listener.error",
+                    listener=self.name,
+                    channel=self.channel,
+                    error=str(e),
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+            finally:
+                try:
+                    await pubsub.aclose()  # type: ignore[attr-defined]  # stubs predate aclose
+                except Exception:
+                    pass
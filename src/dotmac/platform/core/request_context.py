@@ -13,7 +13,9 @@ from contextvars import ContextVar
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from dotmac.platform.core.asgi_middleware import ASGIMiddleware, set_header, wrap_response_start
 
 logger = logging.getLogger(__name__)
 
@@ -237,6 +239,101 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             raise
 
 
+class RequestContextASGIMiddleware(ASGIMiddleware):
+    """
+    Pure ASGI variant of RequestContextMiddleware (see ``settings.middleware_mode``).
+
+    Context variables are set in the same task that runs the endpoint, and
+    response headers are added to ``http.response.start`` without buffering.
+    """
+
+    def __init__(self, app: ASGIApp, enable_logging: bool = True):
+        super().__init__(app)
+        self.enable_logging = enable_logging
+
+    async def handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request = Request(scope)
+        request_id = request.headers.get("X-Request-ID") or f"req_{uuid.uuid4().hex[:16]}"
+        set_request_id(request_id)
+        correlation_id = request.headers.get("X-Correlation-ID") or f"corr_{uuid.uuid4().hex[:16]}"
+        set_correlation_id(correlation_id)
+        trace_id = request.headers.get("X-Trace-ID") or request.headers.get("traceparent")
+        if trace_id:
+            set_trace_id(trace_id)
+
+        if hasattr(request.state, "user_id"):
+            set_user_id(request.state.user_id)
+        if hasattr(request.state, "tenant_id"):
+            set_tenant_id(request.state.tenant_id)
+
+        start_time = time.time()
+        log_context = {
+            "request_id": request_id,
+            "correlation_id": correlation_id,
+            "trace_id": trace_id,
+            "method": request.method,
+            "path": request.url.path,
+        }
+
+        if self.enable_logging:
+            logger.info(
+                f"Request started: {request.method} {request.url.path}",
+                extra={
+                    **log_context,
+                    "query_params": str(request.query_params),
+                    "user_id": get_user_id(),
+                    "tenant_id": get_tenant_id(),
+                },
+            )
+
+        status_code = 500
+
+        def on_response_start(message: Message) -> None:
+            nonlocal status_code
+            status_code = message["status"]
+            set_header(message, "X-Request-ID", request_id)
+            set_header(message, "X-Correlation-ID", correlation_id)
+            if trace_id:
+                set_header(message, "X-Trace-ID", trace_id)
+
+        try:
+            await self.app(scope, receive, wrap_response_start(send, on_response_start))
+        except Exception as exc:
+            self._refresh_identity(request)
+            logger.exception(
+                f"Request failed: {request.method} {request.url.path}",
+                extra={
+                    **log_context,
+                    "duration_ms": round((time.time() - start_time) * 1000, 2),
+                    "user_id": get_user_id(),
+                    "tenant_id": get_tenant_id(),
+                    "exception_type": type(exc).__name__,
+                },
+            )
+            raise
+
+        self._refresh_identity(request)
+        if self.enable_logging:
+            logger.info(
+                f"Request completed: {request.method} {request.url.path}",
+                extra={
+                    **log_context,
+                    "status_code": status_code,
+                    "duration_ms": round((time.time() - start_time) * 1000, 2),
+                    "user_id": get_user_id(),
+                    "tenant_id": get_tenant_id(),
+                },
+            )
+
+    @staticmethod
+    def _refresh_identity(request: Request) -> None:
+        """Pick up user/tenant set by auth middleware or dependencies."""
+        if hasattr(request.state, "user_id"):
+            set_user_id(request.state.user_id)
+        if hasattr(request.state, "tenant_id"):
+            set_tenant_id(request.state.tenant_id)
+
+
 class ContextLoggingFilter(logging.Filter):
     """
     Logging filter to inject request context into log records.
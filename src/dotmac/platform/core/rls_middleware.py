@@ -28,6 +28,8 @@ from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from dotmac.platform.core.asgi_middleware import BeforeRequestASGIMixin
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,9 +116,29 @@ class RLSMiddleware(BaseHTTPMiddleware):
         Returns:
             Response from the route handler
         """
+        await self.process_request(request)
+
+        # Process the request
+        response = await call_next(request)
+
+        # Reset RLS context after request (optional, as each request gets new session)
+        # await self._reset_rls_context(request)
+
+        return response
+
+    async def process_request(self, request: Request) -> Response | None:
+        """
+        Set RLS context for a request before it reaches the route handler.
+
+        Args:
+            request: The incoming HTTP request
+
+        Returns:
+            None (RLS setup never short-circuits the request)
+        """
         # Skip RLS for health checks and public endpoints
         if self._should_skip_rls(request):
-            return await call_next(request)
+            return None
 
         # Extract tenant and user context
         tenant_id: str | None = None
@@ -149,13 +171,7 @@ class RLSMiddleware(BaseHTTPMiddleware):
             # Continue with request even if RLS setup fails
             # RLS policies will restrict access if context not set
 
-        # Process the request
-        response = await call_next(request)
-
-        # Reset RLS context after request (optional, as each request gets new session)
-        # await self._reset_rls_context(request)
-
-        return response
+        return None
 
     def _should_skip_rls(self, request: Request) -> bool:
         """
@@ -367,6 +383,10 @@ class RLSMiddleware(BaseHTTPMiddleware):
         pass
 
 
+class RLSASGIMiddleware(BeforeRequestASGIMixin, RLSMiddleware):
+    """Pure ASGI variant of RLSMiddleware (see ``settings.middleware_mode``)."""
+
+
 class RLSContextManager:
     """
     Context manager for setting RLS context in background tasks and scripts.
@@ -0,0 +1,251 @@
+"""
+Two-tier snapshot cache.
+
+``SnapshotCache`` holds compiled snapshots keyed by a scope (a user, a
+tenant):
+
+- L1: small per-process TTL + LRU cache, so a hot scope never leaves the
+  process.
+- L2: async Redis shared by all workers, so a cold worker does not have to
+  hit the database.
+
+Concurrent misses for the same key share a single load (single-flight).
+Invalidation drops the local entries, unlinks the Redis keys and broadcasts
+the scope over pub/sub so every worker drops its L1 copy immediately instead
+of waiting for the TTL. Loads that started before an invalidation are not
+cached. Invalidations tied to a database change can be repeated once the
+session commits, so a load racing the transaction cannot re-cache old data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+from uuid import UUID
+
+import structlog
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from dotmac.platform.core.invalidation import InvalidationListener
+from dotmac.platform.redis_client import RedisClientType, redis_manager
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATE_ALL = "*"
+
+
+class CacheableSnapshot(Protocol):
+    def to_cache_payload(self) -> Any: ...
+
+
+class SnapshotCache[S: CacheableSnapshot]:
+    """Per-process L1 in front of async Redis, invalidated over pub/sub."""
+
+    def __init__(
+        self,
+        *,
+        key_prefix: str,
+        channel: str,
+        ttl: int,
+        local_ttl: float,
+        local_max_size: int,
+        redis: RedisClientType | None = None,
+    ) -> None:
+        self.key_prefix = key_prefix
+        self.channel = channel
+        self.ttl = ttl
+
+        self._local: TTLCache[str, S] | None = (
+            TTLCache(maxsize=local_max_size, ttl=local_ttl)
+            if local_max_size > 0 and local_ttl > 0
+            else None
+        )
+        self._redis_override = redis
+        self._inflight: dict[str, asyncio.Future[S]] = {}
+        # Bumped on invalidation so loads that started earlier are not cached
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+        self._pending: set[asyncio.Task[None]] = set()
+        self._listener = InvalidationListener(
+            channel, self.handle_message, self.invalidate_local, name=key_prefix
+        )
+
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.loads = 0
+
+    def redis_keys(self, scope: str) -> tuple[str, ...]:
+        """Every Redis (and L1) key holding a snapshot for ``scope``."""
+        return (f"{self.key_prefix}:{scope}",)
+
+    def _redis(self) -> RedisClientType | None:
+        if self._redis_override is not None:
+            return self._redis_override
+        try:
+            return redis_manager.get_client()
+        except RuntimeError:
+            # Redis not initialised (CLI tools, tests): run with L1 only
+            return None
+
+    def _generation(self, scope: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(scope, 0)
+
+    async def fetch(
+        self,
+        scope: str,
+        key: str,
+        loader: Callable[[], Awaitable[S]],
+        decode: Callable[[Any], S | None],
+    ) -> S:
+        """
+        Return the snapshot cached under ``key``, loading it at most once.
+
+        ``key`` must be one of ``redis_keys(scope)``. ``loader`` produces the
+        snapshot on a miss; ``decode`` rebuilds one from the JSON payload
+        stored in Redis (returning ``None`` for unusable payloads).
+        """
+        if self._local is not None:
+            value = self._local.get(key)
+            if value is not None:
+                self.local_hits += 1
+                return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Shield so a cancelled follower does not cancel the shared load
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[S] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(scope, key, loader, decode)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved: there may be no followers waiting on it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(
+        self,
+        scope: str,
+        key: str,
+        loader: Callable[[], Awaitable[S]],
+        decode: Callable[[Any], S | None],
+    ) -> S:
+        generation = self._generation(scope)
+        redis = self._redis()
+
+        value = None
+        if redis is not None:
+            try:
+                raw = await redis.get(key)
+                if raw is not None:
+                    value = decode(json.loads(raw))
+            except Exception as e:
+                logger.debug("snapshot_cache.get_failed", key=key, error=str(e))
+            if value is not None:
+                self.remote_hits += 1
+
+        if value is None:
+            value = await loader()
+            self.loads += 1
+            if redis is not None and self.ttl > 0 and generation == self._generation(scope):
+                try:
+                    payload = json.dumps(value.to_cache_payload())
+                    await redis.set(key, payload, ex=self.ttl)
+                except Exception as e:
+                    logger.debug("snapshot_cache.set_failed", key=key, error=str(e))
+
+        if self._local is not None and generation == self._generation(scope):
+            self._local[key] = value
+        return value
+
+    def invalidate_local(self, scope: UUID | str | None = None) -> None:
+        """Drop L1 entries for one scope, or for every scope."""
+        if scope is None:
+            self._epoch += 1
+            self._generations.clear()
+            if self._local is not None:
+                self._local.clear()
+            return
+
+        scope = str(scope)
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        if self._local is not None:
+            for key in self.redis_keys(scope):
+                self._local.pop(key, None)
+
+    async def invalidate(self, scope: UUID | str | None = None) -> None:
+        """Drop a scope's (or every) snapshot locally, in Redis and on all workers."""
+        self.invalidate_local(scope)
+        redis = self._redis()
+        if redis is None:
+            return
+
+        try:
+            if scope is None:
+                batch: list[Any] = []
+                async for key in redis.scan_iter(match=f"{self.key_prefix}:*", count=500):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        await redis.unlink(*batch)
+                        batch.clear()
+                if batch:
+                    await redis.unlink(*batch)
+            else:
+                await redis.unlink(*self.redis_keys(str(scope)))
+            await redis.publish(self.channel, INVALIDATE_ALL if scope is None else str(scope))
+        except Exception as e:
+            logger.warning("snapshot_cache.invalidate_failed", cache=self.key_prefix, error=str(e))
+
+    def invalidate_after_commit(
+        self, session: AsyncSession, scope: UUID | str | None = None
+    ) -> None:
+        """Invalidate a scope's (or every) snapshot once ``session`` commits."""
+
+        def on_commit(_: Session) -> None:
+            self.invalidate_local(scope)
+            try:
+                task = asyncio.get_running_loop().create_task(self.invalidate(scope))
+            except RuntimeError:
+                return
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+        try:
+            event.listen(session.sync_session, "after_commit", on_commit, once=True)
+        except Exception as e:
+            logger.debug(
+                "snapshot_cache.after_commit_unavailable", cache=self.key_prefix, error=str(e)
+            )
+
+    def handle_message(self, data: str | bytes) -> None:
+        """Apply an invalidation message (a scope, or ``*`` for every scope)."""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        self.invalidate_local(None if data == INVALIDATE_ALL else data)
+
+    def clear(self) -> None:
+        """Drop every L1 entry without touching Redis."""
+        self.invalidate_local(None)
+
+    async def start_listener(self, redis: RedisClientType) -> None:
+        """Start the background pub/sub listener for invalidations."""
+        self._listener.start(redis)
+
+    async def stop_listener(self) -> None:
+        """Stop the background pub/sub listener."""
+        await self._listener.stop()
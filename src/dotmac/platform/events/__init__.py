@@ -10,7 +10,7 @@ Key Features:
 - Event persistence for audit and replay
 - Dead letter queue for failed events
 - Tenant isolation
-- Redis-based pub/sub for distributed systems
+- Redis pub/sub or Redis Streams (consumer groups, replay) for distributed systems
 """
 
 from .bus import EventBus, get_event_bus, reset_event_bus
@@ -21,6 +21,7 @@ from .handlers import register_all_handlers
 from .listeners import register_all_listeners
 from .models import Event, EventMetadata, EventPriority, EventStatus
 from .storage import EventStorage
+from .streams import RedisStreamTransport
 
 __all__ = [
     # Core
@@ -34,6 +35,8 @@ __all__ = [
     "EventStatus",
     # Storage
     "EventStorage",
+    # Transport
+    "RedisStreamTransport",
     # Decorators
     "subscribe",
     # Dependencies
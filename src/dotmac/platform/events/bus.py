@@ -1,7 +1,10 @@
 """Core event bus implementation with dependency injection."""
 
 import asyncio
+import heapq
+import itertools
 import json
+import time
 from collections import defaultdict
 from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
@@ -9,6 +12,7 @@ from fnmatch import fnmatch
 from typing import Any, Protocol
 
 import structlog
+from prometheus_client import Gauge, Histogram
 
 from dotmac.platform.events.exceptions import (
     EventError,
@@ -16,6 +20,8 @@ from dotmac.platform.events.exceptions import (
 )
 from dotmac.platform.events.models import Event, EventPriority, EventStatus
 from dotmac.platform.events.storage import EventStorage
+from dotmac.platform.events.streams import RedisStreamTransport, StreamEntry
+from dotmac.platform.settings import settings
 from dotmac.platform.tenant import get_current_tenant_id, set_current_tenant_id
 
 logger = structlog.get_logger(__name__)
@@ -23,6 +29,32 @@ logger = structlog.get_logger(__name__)
 # Type alias for event handlers
 EventHandler = Callable[[Event], Awaitable[None]]
 
+# Queues are drained highest priority first
+PRIORITY_ORDER: tuple[EventPriority, ...] = (
+    EventPriority.CRITICAL,
+    EventPriority.HIGH,
+    EventPriority.NORMAL,
+    EventPriority.LOW,
+)
+
+event_handler_duration = Histogram(
+    "dotmac_event_handler_duration_seconds",
+    "Event handler execution time in seconds",
+    ["handler", "outcome"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+
+event_queue_depth = Gauge(
+    "dotmac_event_queue_depth",
+    "Handler runs waiting in the event bus queues",
+    ["priority"],
+)
+
+event_retries_pending = Gauge(
+    "dotmac_event_retries_pending",
+    "Handler retries waiting for their backoff delay",
+)
+
 
 class RedisClient(Protocol):
     """Protocol for Redis client to avoid direct dependencies."""
@@ -40,6 +72,76 @@ class RedisClient(Protocol):
         ...
 
 
+class RetryScheduler:
+    """
+    Runs callbacks after a delay without holding the caller open.
+
+    Pending callbacks live in a heap ordered by due time and are released by a
+    single background task, so thousands of backoffs cost one sleeping task.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Callable[[], Awaitable[None]]]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, delay: float, callback: Callable[[], Awaitable[None]]) -> None:
+        """Run ``callback`` in a background task after ``delay`` seconds."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        heapq.heappush(self._heap, (loop.time() + delay, next(self._sequence), callback))
+        event_retries_pending.set(len(self._heap))
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            wait = self._heap[0][0] - loop.time()
+            if wait > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+                continue
+
+            _, _, callback = heapq.heappop(self._heap)
+            event_retries_pending.set(len(self._heap))
+            task = loop.create_task(self._invoke(callback))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    async def _invoke(callback: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await callback()
+        except Exception as e:
+            logger.error("Scheduled event retry failed", error=str(e), exc_info=True)
+
+    async def stop(self) -> int:
+        """Cancel the scheduler; returns the number of callbacks dropped."""
+        dropped = len(self._heap)
+        self._heap.clear()
+        event_retries_pending.set(0)
+        for task in (self._task, *self._running):
+            if task is not None and not task.done():
+                task.cancel()
+        self._task = None
+        return dropped
+
+
 class EventBus:
     """
     Asynchronous event bus for pub/sub messaging with dependency injection.
@@ -52,6 +154,22 @@ class EventBus:
     - Priority-based processing
     - Tenant isolation
 
+    Once ``start()`` has been called, ``publish`` only enqueues handler runs
+    into bounded per-priority queues drained by a worker pool; publishers wait
+    only while the queue for their priority is full. Before ``start()`` (tests,
+    scripts, Celery tasks) handlers run inline as part of ``publish``. Failed
+    handlers are retried with exponential backoff: by a RetryScheduler once
+    started, inline (so ``publish`` waits out the backoff) before that.
+
+    With a ``RedisStreamTransport`` the bus is distributed and durable:
+    ``publish`` appends the event to a Redis stream and a consumer loop
+    started by ``start()`` runs handlers for batches read with XREADGROUP,
+    acknowledging each entry once all of its handlers have succeeded. Every
+    process in the consumer group shares the stream; entries with a failed
+    handler or abandoned by a dead worker stay pending and are reclaimed with
+    XAUTOCLAIM, and entries delivered more than ``max_deliveries`` times are
+    moved to a dead-letter stream.
+
     Design Pattern: Uses dependency injection for better testability
     """
 
@@ -60,6 +178,9 @@ class EventBus:
         storage: EventStorage | None = None,
         redis_client: RedisClient | None = None,
         enable_persistence: bool = True,
+        worker_count: int | None = None,
+        queue_size: int | None = None,
+        transport: RedisStreamTransport | None = None,
     ):
         """
         Initialize event bus with injected dependencies.
@@ -68,6 +189,9 @@ class EventBus:
             storage: Event storage for persistence (injected)
             redis_client: Redis client for distributed pub/sub (injected)
             enable_persistence: Whether to persist events
+            worker_count: Handler workers started by ``start()``
+            queue_size: Max queued handler runs per priority level
+            transport: Redis stream transport replacing pub/sub (injected)
         """
         # In-memory handlers registry
         self._handlers: dict[str, list[EventHandler]] = defaultdict(list)
@@ -77,15 +201,30 @@ class EventBus:
         self._storage = storage or EventStorage(use_redis=redis_client is not None)
         self._redis = redis_client
         self._enable_persistence = enable_persistence
-
-        # Background task for processing
-        self._processing_task: asyncio.Task[None] | None = None
+        self._transport = transport
+
+        # Background handler dispatch
+        config = settings.event_bus
+        self._worker_count = max(1, worker_count or config.worker_count)
+        self._queue_size = max(1, queue_size or config.queue_size)
+        self._queues: dict[EventPriority, asyncio.Queue[tuple[EventHandler, Event]]] = {}
+        self._ready = asyncio.Semaphore(0)
+        self._workers: list[asyncio.Task[None]] = []
+        self._retries = RetryScheduler()
+        self._handled = 0
+        self._failed = 0
+        # Handler runs per event that have neither completed nor given up, and
+        # events with a run that gave up: dead-lettered once their last run settles
+        self._open_runs: dict[str, int] = {}
+        self._given_up: set[str] = set()
         self._running = False
+        self._consumer: asyncio.Task[None] | None = None
 
         logger.info(
             "EventBus initialized",
             persistence=enable_persistence,
             redis=self._redis is not None,
+            transport="streams" if transport else "pubsub",
         )
 
     async def publish(
@@ -142,12 +281,16 @@ class EventBus:
             if self._enable_persistence:
                 await self._storage.save_event(event)
 
-            # Publish to local handlers
-            await self._publish_local(event)
+            if self._transport:
+                # Handlers run wherever a consumer in the group reads the entry
+                await self._publish_stream(event)
+            else:
+                # Publish to local handlers
+                await self._publish_local(event)
 
-            # Publish to Redis if enabled
-            if self._redis:
-                await self._publish_redis(event)
+                # Publish to Redis if enabled
+                if self._redis:
+                    await self._publish_redis(event)
 
             event.published_at = event.created_at
             return event
@@ -163,12 +306,7 @@ class EventBus:
 
     async def _publish_local(self, event: Event) -> None:
         """Publish event to local in-memory handlers."""
-        handlers: list[EventHandler] = list(self._handlers.get(event.event_type, []))
-
-        if self._pattern_handlers:
-            for pattern, pattern_handlers in self._pattern_handlers.items():
-                if fnmatch(event.event_type, pattern):
-                    handlers.extend(pattern_handlers)
+        handlers = self._resolve_handlers(event)
 
         if not handlers:
             logger.debug("No local handlers for event", event_type=event.event_type)
@@ -178,12 +316,111 @@ class EventBus:
             "Publishing to local handlers",
             event_type=event.event_type,
             handler_count=len(handlers),
+            queued=self._running,
         )
 
-        # Execute handlers concurrently
+        self._open(event, len(handlers))
+        if self._running:
+            for handler in handlers:
+                await self._enqueue(handler, event)
+            return
+
+        # Not started: execute handlers concurrently before returning
         tasks = [self._execute_handler(handler, event) for handler in handlers]
         await asyncio.gather(*tasks, return_exceptions=True)
 
+    def _resolve_handlers(self, event: Event) -> list[EventHandler]:
+        """Exact-type handlers followed by matching pattern handlers."""
+        handlers: list[EventHandler] = list(self._handlers.get(event.event_type, []))
+
+        if self._pattern_handlers:
+            for pattern, pattern_handlers in self._pattern_handlers.items():
+                if fnmatch(event.event_type, pattern):
+                    handlers.extend(pattern_handlers)
+
+        return handlers
+
+    async def _enqueue(self, handler: EventHandler, event: Event) -> None:
+        """
+        Queue a handler run, waiting while the priority queue is full.
+
+        Raises:
+            EventPublishError: If no queue space frees up within publish_timeout
+        """
+        queue = self._queues[event.priority]
+        timeout = settings.event_bus.publish_timeout
+        try:
+            if timeout > 0:
+                await asyncio.wait_for(queue.put((handler, event)), timeout=timeout)
+            else:
+                await queue.put((handler, event))
+        except TimeoutError as e:
+            raise EventPublishError(
+                f"Event queue for priority '{event.priority.value}' is full"
+            ) from e
+
+        event_queue_depth.labels(priority=event.priority.value).set(queue.qsize())
+        self._ready.release()
+
+    def _dequeue(self) -> tuple[EventHandler, Event] | None:
+        """Take the next handler run from the highest-priority non-empty queue."""
+        for priority in PRIORITY_ORDER:
+            queue = self._queues[priority]
+            if not queue.empty():
+                item = queue.get_nowait()
+                event_queue_depth.labels(priority=priority.value).set(queue.qsize())
+                return item
+        return None
+
+    async def _worker(self) -> None:
+        """Drain handler runs until cancelled."""
+        while True:
+            await self._ready.acquire()
+            item = self._dequeue()
+            if item is None:
+                continue
+
+            handler, event = item
+            try:
+                await self._execute_handler(handler, event)
+            except Exception as e:
+                logger.error("Event worker error", event_id=event.event_id, error=str(e))
+            finally:
+                self._queues[event.priority].task_done()
+
+    async def _dispatch(self, handler: EventHandler, event: Event) -> None:
+        """Run a single handler through the queues when started, inline otherwise."""
+        if self._running:
+            await self._enqueue(handler, event)
+        else:
+            await self._execute_handler(handler, event)
+
+    async def _schedule_retry(self, handler: EventHandler, event: Event) -> None:
+        """
+        Re-run ``handler`` after an exponential backoff.
+
+        A started bus hands the retry to the RetryScheduler so the caller is
+        not held open. Before ``start()`` nothing keeps background tasks alive
+        (a Celery task's ``asyncio.run`` ends with its publish), so the retry
+        runs inline instead.
+        """
+        config = settings.event_bus
+        delay = min(config.retry_base_delay * 2 ** (event.retry_count - 1), config.retry_max_delay)
+
+        logger.info(
+            "Retrying event",
+            event_id=event.event_id,
+            handler=handler.__name__,
+            retry_count=event.retry_count,
+            delay=delay,
+        )
+        if self._running:
+            self._retries.schedule(delay, lambda: self._dispatch(handler, event))
+            return
+
+        await asyncio.sleep(delay)
+        await self._execute_handler(handler, event)
+
     async def _publish_redis(self, event: Event) -> None:
         """Publish event to Redis pub/sub."""
         if not self._redis:
@@ -198,13 +435,84 @@ class EventBus:
             logger.warning("Failed to publish to Redis", error=str(e))
             # Don't fail the whole publish if Redis is unavailable
 
-    async def _execute_handler(self, handler: EventHandler, event: Event) -> None:
+    async def _publish_stream(self, event: Event) -> None:
+        """Append event to the Redis stream, handling it locally if that fails."""
+        assert self._transport is not None
+        try:
+            message_id = await self._transport.add(event)
+            logger.debug("Added to event stream", message_id=message_id, event_id=event.event_id)
+        except Exception as e:
+            logger.warning("Failed to add event to stream, handling locally", error=str(e))
+            await self._publish_local(event)
+
+    async def _deliver_batch(self, entries: list[StreamEntry]) -> None:
+        """
+        Run handlers for a batch of stream entries, then acknowledge them together.
+
+        Entries with a failed handler are left pending rather than retried in
+        memory, so XAUTOCLAIM redelivers them even if this worker dies; the
+        transport dead-letters them once they exceed ``max_deliveries``.
+        """
+        assert self._transport is not None
+        runs: list[Awaitable[bool]] = []
+        run_entries: list[str] = []
+        for message_id, event in entries:
+            handlers = self._resolve_handlers(event)
+            self._open(event, len(handlers))
+            for handler in handlers:
+                runs.append(self._execute_handler(handler, event, retry=False))
+                run_entries.append(message_id)
+        results = await asyncio.gather(*runs, return_exceptions=True)
+        failed = {
+            message_id
+            for message_id, succeeded in zip(run_entries, results, strict=True)
+            if succeeded is not True
+        }
+        await self._transport.ack(
+            [message_id for message_id, _ in entries if message_id not in failed]
+        )
+
+    async def _consume(self) -> None:
+        """Read stream batches for this consumer until cancelled."""
+        assert self._transport is not None
+        config = settings.event_bus
+        loop = asyncio.get_running_loop()
+        next_claim = loop.time()
+
+        while True:
+            try:
+                if loop.time() >= next_claim:
+                    next_claim = loop.time() + config.claim_interval
+                    claimed = await self._transport.claim_stale()
+                    if claimed:
+                        await self._deliver_batch(claimed)
+
+                entries = await self._transport.read()
+                if entries:
+                    await self._deliver_batch(entries)
+                else:
+                    # Yield even when the client returned without blocking.
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event stream consumer error", error=str(e), exc_info=True)
+                await asyncio.sleep(1.0)
+
+    async def _execute_handler(
+        self, handler: EventHandler, event: Event, retry: bool = True
+    ) -> bool:
         """
         Execute an event handler with error handling.
 
         Args:
             handler: Event handler function
             event: Event to process
+            retry: Schedule a retry (or give up) on failure; stream deliveries
+                pass False and rely on redelivery instead
+
+        Returns:
+            Whether the handler succeeded
         """
         event.mark_processing()
 
@@ -217,8 +525,13 @@ class EventBus:
             previous_tenant = get_current_tenant_id()
             set_current_tenant_id(str(tenant_id))
 
+        started = time.perf_counter()
         try:
             await handler(event)
+            event_handler_duration.labels(handler=handler.__name__, outcome="success").observe(
+                time.perf_counter() - started
+            )
+            self._handled += 1
             event.mark_completed()
 
             logger.info(
@@ -231,7 +544,14 @@ class EventBus:
             if self._enable_persistence:
                 await self._storage.update_event(event)
 
+            await self._settle(event, gave_up=False)
+            return True
+
         except Exception as e:
+            event_handler_duration.labels(handler=handler.__name__, outcome="failure").observe(
+                time.perf_counter() - started
+            )
+            self._failed += 1
             error_msg = f"Handler {handler.__name__} failed: {str(e)}"
             event.mark_failed(error_msg)
 
@@ -249,14 +569,52 @@ class EventBus:
                 await self._storage.update_event(event)
 
             # Retry if possible
-            if event.is_retryable:
-                logger.info("Retrying event", event_id=event.event_id)
-                await asyncio.sleep(2**event.retry_count)  # Exponential backoff
-                await self._execute_handler(handler, event)
+            if not retry:
+                await self._settle(event, gave_up=False)
+            elif event.is_retryable:
+                await self._schedule_retry(handler, event)
+            else:
+                await self._settle(event, gave_up=True)
+            return False
         finally:
             if tenant_id:
                 set_current_tenant_id(previous_tenant)
 
+    def _open(self, event: Event, runs: int) -> None:
+        """Track ``runs`` new handler runs for an event."""
+        if runs:
+            self._open_runs[event.event_id] = self._open_runs.get(event.event_id, 0) + runs
+
+    async def _settle(self, event: Event, gave_up: bool) -> None:
+        """
+        Close one handler run of an event.
+
+        Once every run has completed or given up, an event with a run that
+        gave up is dead-lettered, once, however many of its handlers failed.
+        """
+        event_id = event.event_id
+        if gave_up:
+            self._given_up.add(event_id)
+        remaining = self._open_runs.pop(event_id, 1) - 1
+        if remaining > 0:
+            self._open_runs[event_id] = remaining
+            return
+        if event_id not in self._given_up:
+            return
+
+        self._given_up.discard(event_id)
+        if not self._transport:
+            return
+        event.status = EventStatus.DEAD_LETTER
+        try:
+            await self._transport.dead_letter(event)
+        except Exception as dead_letter_error:
+            logger.warning(
+                "Failed to dead-letter event",
+                event_id=event.event_id,
+                error=str(dead_letter_error),
+            )
+
     def subscribe(
         self,
         event_type: str,
@@ -361,29 +719,117 @@ class EventBus:
         event.retry_count = 0
         event.error_message = None
 
-        await self._publish_local(event)
+        if self._transport:
+            await self._publish_stream(event)
+        else:
+            await self._publish_local(event)
+
+    async def replay_dead_letters(self, limit: int = 100) -> int:
+        """
+        Re-publish events from the dead-letter stream.
+
+        Args:
+            limit: Maximum number of dead-lettered events to replay
+
+        Returns:
+            Number of events replayed
+        """
+        if not self._transport:
+            return 0
+
+        entries = await self._transport.dead_letters(limit)
+        for _, event in entries:
+            event.status = EventStatus.PENDING
+            event.retry_count = 0
+            event.error_message = None
+            await self._transport.add(event)
+        await self._transport.remove_dead_letters([message_id for message_id, _ in entries])
+
+        logger.info("Replayed dead-lettered events", count=len(entries))
+        return len(entries)
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Snapshot of dispatch state for health checks and admin endpoints."""
+        return {
+            "running": self._running,
+            "transport": "streams" if self._transport else "pubsub",
+            "consumer": self._consumer is not None and not self._consumer.done(),
+            "workers": len(self._workers),
+            "queue_capacity": self._queue_size,
+            "queue_depth": {
+                priority.value: self._queues[priority].qsize() if self._queues else 0
+                for priority in PRIORITY_ORDER
+            },
+            "pending_retries": len(self._retries),
+            "handled": self._handled,
+            "failed": self._failed,
+        }
 
     async def start(self) -> None:
         """Start background event processing."""
         if self._running:
             return
 
+        self._queues = {
+            priority: asyncio.Queue(maxsize=self._queue_size) for priority in PRIORITY_ORDER
+        }
+        self._ready = asyncio.Semaphore(0)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"event-bus-worker-{index}")
+            for index in range(self._worker_count)
+        ]
         self._running = True
-        logger.info("EventBus started")
 
-    async def stop(self) -> None:
-        """Stop background event processing."""
+        if self._transport and not self._transport.available:
+            logger.warning("Redis streams unavailable, falling back to pub/sub event bus")
+            self._transport = None
+
+        if self._transport:
+            await self._transport.ensure_group()
+            self._consumer = asyncio.create_task(self._consume(), name="event-bus-stream-consumer")
+
+        logger.info("EventBus started", workers=self._worker_count, queue_size=self._queue_size)
+
+    async def stop(self, drain_timeout: float | None = None) -> None:
+        """
+        Stop background event processing.
+
+        New events are handled inline from this point on; queued handler runs
+        get up to ``drain_timeout`` seconds to finish before workers are cancelled.
+        """
         if not self._running:
             return
 
         self._running = False
 
-        if self._processing_task:
-            self._processing_task.cancel()
-            try:
-                await self._processing_task
-            except asyncio.CancelledError:
-                pass
+        # Stop reading first; unacknowledged entries are reclaimed by other workers
+        if self._consumer is not None:
+            self._consumer.cancel()
+            await asyncio.gather(self._consumer, return_exceptions=True)
+            self._consumer = None
+
+        timeout = settings.event_bus.drain_timeout if drain_timeout is None else drain_timeout
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues.values())),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            logger.warning(
+                "EventBus stopped with queued handler runs",
+                dropped=sum(queue.qsize() for queue in self._queues.values()),
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for priority in PRIORITY_ORDER:
+            event_queue_depth.labels(priority=priority.value).set(0)
+
+        dropped_retries = await self._retries.stop()
+        if dropped_retries:
+            logger.warning("EventBus stopped with pending retries", dropped=dropped_retries)
 
         logger.info("EventBus stopped")
 
@@ -422,10 +868,16 @@ def get_event_bus(
                 logger.info("Redis not available, using in-memory event bus")
                 redis_client = None
 
+        transport = None
+        if settings.event_bus.transport == "streams":
+            # Uses the shared Redis client, checked once the bus starts
+            transport = RedisStreamTransport()
+
         _event_bus = EventBus(
             storage=storage,
             redis_client=redis_client,
             enable_persistence=enable_persistence,
+            transport=transport,
         )
 
     return _event_bus
@@ -1,36 +1,123 @@
 """Event persistence storage."""
 
 import json
+from collections.abc import Iterable, Sequence
+from typing import Any
 
 import structlog
 
-from dotmac.platform.core.caching import get_redis
 from dotmac.platform.events.models import Event, EventStatus
+from dotmac.platform.redis_client import RedisClientType, redis_manager
 
 logger = structlog.get_logger(__name__)
 
 
 INDEX_TTL_SECONDS = 86400 * 7
 
+# Ids read per ZREVRANGE page when filters have to be applied after the index
+QUERY_PAGE_SIZE = 200
+# Upper bound on index entries scanned by a single filtered query
+QUERY_MAX_SCAN = 10_000
+
+# Writes the event body and every index in one round trip.
+# KEYS[1]: event body, KEYS[2..ARGV[5]+1]: indices to add the event to,
+# remaining KEYS: status indices the event may have been in before.
+# ARGV: body, ttl, event id, score, number of indices to add to
+_SAVE_EVENT_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+local add_count = tonumber(ARGV[5])
+for i = 2, add_count + 1 do
+    redis.call('ZADD', KEYS[i], ARGV[4], ARGV[3])
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+for i = add_count + 2, #KEYS do
+    redis.call('ZREM', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+
+def _shared_redis_client() -> RedisClientType | None:
+    """The application's shared async Redis client, or None until it is initialised."""
+    try:
+        return redis_manager.get_client()
+    except RuntimeError:
+        return None
+
+
+def _serialize(event: Event) -> str:
+    """Compact JSON form: unset optional fields are omitted."""
+    return json.dumps(event.model_dump(mode="json", exclude_none=True), separators=(",", ":"))
+
 
 class EventStorage:
     """
     Event storage for persistence and querying.
 
-    Supports both Redis and in-memory storage backends.
+    Supports both Redis and in-memory storage backends. The Redis backend is
+    fully async: each save is a single script call that writes the compact
+    event body and its type/status/tenant/all indices atomically, and queries
+    read ids with ZREVRANGE and bodies with one MGET per page.
     """
 
-    def __init__(self, use_redis: bool = True) -> None:
+    def __init__(self, use_redis: bool = True, redis: RedisClientType | None = None) -> None:
         """
         Initialize event storage.
 
         Args:
             use_redis: Whether to use Redis for storage
+            redis: Async Redis client (the shared client if not provided)
         """
-        self._redis = get_redis() if use_redis else None
+        self._redis: Any = redis
+        self._use_redis = use_redis
+        self._save_script: Any = None
         self._memory_store: dict[str, Event] = {}
 
-        logger.debug("EventStorage initialized", backend="redis" if self._redis else "memory")
+        backend = "redis" if use_redis or redis is not None else "memory"
+        logger.debug("EventStorage initialized", backend=backend)
+
+    def _client(self) -> Any:
+        """The injected client, else the shared one once Redis is initialised."""
+        if self._redis is not None or not self._use_redis:
+            return self._redis
+        return _shared_redis_client()
+
+    @staticmethod
+    def _event_key(event_id: str) -> str:
+        return f"event:{event_id}"
+
+    @staticmethod
+    def _deserialize(value: bytes | str) -> Event:
+        return Event.from_dict(json.loads(value))
+
+    def _save_args(self, event: Event) -> tuple[list[str], list[Any]]:
+        """Keys and arguments for the save script."""
+        add_keys = [
+            f"events:status:{event.status.value}",
+            f"events:type:{event.event_type}",
+            "events:all",
+        ]
+        if event.metadata.tenant_id:
+            add_keys.append(f"events:tenant:{event.metadata.tenant_id}")
+        stale_status_keys = [
+            f"events:status:{status.value}" for status in EventStatus if status != event.status
+        ]
+
+        keys = [self._event_key(event.event_id), *add_keys, *stale_status_keys]
+        args = [
+            _serialize(event),
+            INDEX_TTL_SECONDS,
+            event.event_id,
+            event.created_at.timestamp(),
+            len(add_keys),
+        ]
+        return keys, args
+
+    def _script(self, redis: Any) -> Any:
+        # Scripts are bound to the client they were registered on
+        if self._save_script is None or self._save_script.registered_client is not redis:
+            self._save_script = redis.register_script(_SAVE_EVENT_SCRIPT)
+        return self._save_script
 
     async def save_event(self, event: Event) -> None:
         """
@@ -39,72 +126,42 @@ class EventStorage:
         Args:
             event: Event to save
         """
-        if self._redis:
+        redis = self._client()
+        if redis:
             try:
-                existing_event = await self.get_event(event.event_id)
-                if existing_event:
-                    self._remove_from_indices(existing_event)
-
-                key = f"event:{event.event_id}"
-                value = json.dumps(event.to_dict())
-                self._redis.setex(key, INDEX_TTL_SECONDS, value)  # 7 days TTL
-
-                # Add to indices
-                self._add_to_indices(event)
+                keys, args = self._save_args(event)
+                await self._script(redis)(keys=keys, args=args)
             except Exception as e:
                 logger.warning("Failed to save event to Redis", error=str(e))
                 self._memory_store[event.event_id] = event
         else:
             self._memory_store[event.event_id] = event
 
-    def _add_to_indices(self, event: Event) -> None:
-        """Add event to type, status, tenant, and all-events indices."""
-        if not self._redis:
-            return
-
-        try:
-            # Index by type
-            type_key = f"events:type:{event.event_type}"
-            self._redis.zadd(type_key, {event.event_id: event.created_at.timestamp()})
-            self._redis.expire(type_key, INDEX_TTL_SECONDS)
-
-            # Index by status
-            status_key = f"events:status:{event.status.value}"
-            self._redis.zadd(status_key, {event.event_id: event.created_at.timestamp()})
-            self._redis.expire(status_key, INDEX_TTL_SECONDS)
-
-            # Index by tenant if available
-            if event.metadata.tenant_id:
-                tenant_key = f"events:tenant:{event.metadata.tenant_id}"
-                self._redis.zadd(tenant_key, {event.event_id: event.created_at.timestamp()})
-                self._redis.expire(tenant_key, INDEX_TTL_SECONDS)
-
-            # Global index for fetching all events (newest first)
-            all_key = "events:all"
-            self._redis.zadd(all_key, {event.event_id: event.created_at.timestamp()})
-            self._redis.expire(all_key, INDEX_TTL_SECONDS)
-        except Exception as e:
-            logger.warning("Failed to update event indices", error=str(e))
+    async def save_events(self, events: Sequence[Event]) -> None:
+        """
+        Save several events in one pipelined round trip.
 
-    def _remove_from_indices(self, event: Event) -> None:
-        """Remove event from existing indices prior to update."""
-        if not self._redis:
+        Args:
+            events: Events to save
+        """
+        if not events:
             return
 
-        try:
-            type_key = f"events:type:{event.event_type}"
-            self._redis.zrem(type_key, event.event_id)
-
-            status_key = f"events:status:{event.status.value}"
-            self._redis.zrem(status_key, event.event_id)
-
-            if event.metadata.tenant_id:
-                tenant_key = f"events:tenant:{event.metadata.tenant_id}"
-                self._redis.zrem(tenant_key, event.event_id)
+        redis = self._client()
+        if redis:
+            try:
+                script = self._script(redis)
+                async with redis.pipeline(transaction=False) as pipe:
+                    for event in events:
+                        keys, args = self._save_args(event)
+                        await script(keys=keys, args=args, client=pipe)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                logger.warning("Failed to save events to Redis", error=str(e), count=len(events))
 
-            self._redis.zrem("events:all", event.event_id)
-        except Exception as e:
-            logger.warning("Failed to remove event from indices", error=str(e))
+        for event in events:
+            self._memory_store[event.event_id] = event
 
     async def get_event(self, event_id: str) -> Event | None:
         """
@@ -116,18 +173,43 @@ class EventStorage:
         Returns:
             Event or None if not found
         """
-        if self._redis:
+        redis = self._client()
+        if redis:
             try:
-                key = f"event:{event_id}"
-                value = self._redis.get(key)
+                value = await redis.get(self._event_key(event_id))
                 if value:
-                    data = json.loads(value)
-                    return Event.from_dict(data)
+                    return self._deserialize(value)
             except Exception as e:
                 logger.warning("Failed to get event from Redis", error=str(e))
 
         return self._memory_store.get(event_id)
 
+    async def get_events(self, event_ids: Iterable[str]) -> list[Event]:
+        """
+        Get several events by ID with a single MGET, preserving order.
+
+        Missing or expired events are skipped.
+        """
+        ids = [self._decode_event_id(event_id) for event_id in event_ids]
+        if not ids:
+            return []
+
+        redis = self._client()
+        if redis:
+            try:
+                values = await redis.mget([self._event_key(event_id) for event_id in ids])
+                events = []
+                for event_id, value in zip(ids, values, strict=False):
+                    if value:
+                        events.append(self._deserialize(value))
+                    elif event_id in self._memory_store:
+                        events.append(self._memory_store[event_id])
+                return events
+            except Exception as e:
+                logger.warning("Failed to get events from Redis", error=str(e))
+
+        return [self._memory_store[event_id] for event_id in ids if event_id in self._memory_store]
+
     async def update_event(self, event: Event) -> None:
         """
         Update event in storage.
@@ -156,7 +238,7 @@ class EventStorage:
         Returns:
             List of matching events
         """
-        if self._redis:
+        if self._client():
             return await self._query_redis(event_type, status, tenant_id, limit)
         else:
             return await self._query_memory(event_type, status, tenant_id, limit)
@@ -206,24 +288,31 @@ class EventStorage:
         limit: int,
     ) -> list[Event]:
         """Query events from Redis."""
-        if not self._redis:
+        redis = self._client()
+        if not redis or limit <= 0:
             return []
 
         try:
             # Determine which index to use
             index_key = self._determine_index_key(event_type, status, tenant_id)
-
-            # Get event IDs from index (newest first)
-            event_ids = self._redis.zrevrange(index_key, 0, limit - 1)
-
-            # Fetch events
-            events = []
-            for event_id in event_ids:
-                decoded_id = self._decode_event_id(event_id)
-                event = await self.get_event(decoded_id)
-
-                if event and self._event_matches_filters(event, event_type, status, tenant_id):
-                    events.append(event)
+            filtered = sum(1 for value in (event_type, status, tenant_id) if value) > 1
+            page_size = max(limit, QUERY_PAGE_SIZE) if filtered else limit
+
+            events: list[Event] = []
+            start = 0
+            while len(events) < limit and start < QUERY_MAX_SCAN:
+                # Event IDs from the index (newest first), then bodies in one MGET
+                event_ids = await redis.zrevrange(index_key, start, start + page_size - 1)
+                if not event_ids:
+                    break
+
+                for event in await self.get_events(event_ids):
+                    if self._event_matches_filters(event, event_type, status, tenant_id):
+                        events.append(event)
+
+                if len(event_ids) < page_size:
+                    break
+                start += page_size
 
             return events[:limit]
 
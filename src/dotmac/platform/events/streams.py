@@ -0,0 +1,218 @@
+"""Redis Streams transport for the event bus."""
+
+import json
+import os
+import socket
+from typing import Any
+
+import structlog
+
+from dotmac.platform.events.models import Event
+from dotmac.platform.events.storage import _serialize, _shared_redis_client
+from dotmac.platform.redis_client import RedisClientType
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Stream entry field holding the serialized event
+EVENT_FIELD = b"event"
+
+StreamEntry = tuple[str, Event]
+
+
+def _default_consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisStreamTransport:
+    """
+    Durable event delivery over a Redis stream.
+
+    Events are appended with XADD (trimmed to roughly ``stream_maxlen``) and
+    read in batches by a consumer group, so every worker pool in the group
+    shares the load and each entry is delivered to one consumer. Entries stay
+    pending until acknowledged; entries left pending by a dead consumer are
+    reclaimed with XAUTOCLAIM and moved to a dead-letter stream once they
+    have been delivered ``max_deliveries`` times.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClientType | None = None,
+        stream_key: str | None = None,
+        group: str | None = None,
+        consumer: str | None = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            redis: Async Redis client (the shared client if not provided)
+            stream_key: Stream events are added to
+            group: Consumer group name
+            consumer: Consumer name within the group (defaults to host-pid)
+        """
+        config = settings.event_bus
+        self._redis: Any = redis
+        self.stream_key = stream_key or config.stream_key
+        self.dead_letter_key = config.dead_letter_stream_key
+        self.group = group or config.consumer_group
+        self.consumer = consumer or _default_consumer_name()
+        self._group_ready = False
+
+    def _client(self) -> Any:
+        """The injected client, else the shared one once Redis is initialised."""
+        return self._redis if self._redis is not None else _shared_redis_client()
+
+    @property
+    def available(self) -> bool:
+        return self._client() is not None
+
+    def _parse(self, entries: list[Any]) -> tuple[list[StreamEntry], list[str]]:
+        """Split raw entries into decoded events and ids of unreadable entries."""
+        events: list[StreamEntry] = []
+        invalid: list[str] = []
+        for raw_id, fields in entries:
+            message_id = _decode(raw_id)
+            if not fields:
+                # Entry was trimmed or deleted while pending
+                invalid.append(message_id)
+                continue
+            body = fields.get(EVENT_FIELD) or fields.get(EVENT_FIELD.decode())
+            try:
+                events.append((message_id, Event.from_dict(json.loads(body))))
+            except Exception as e:
+                logger.error(
+                    "Discarding unreadable stream entry", message_id=message_id, error=str(e)
+                )
+                invalid.append(message_id)
+        return events, invalid
+
+    async def ensure_group(self) -> None:
+        """Create the stream and consumer group if they do not exist yet."""
+        if self._group_ready:
+            return
+        try:
+            await self._client().xgroup_create(self.stream_key, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def add(self, event: Event, stream_key: str | None = None) -> str:
+        """
+        Append an event to the stream.
+
+        Returns:
+            Stream entry id
+        """
+        message_id = await self._client().xadd(
+            stream_key or self.stream_key,
+            {EVENT_FIELD: _serialize(event)},
+            maxlen=settings.event_bus.stream_maxlen,
+            approximate=True,
+        )
+        return _decode(message_id)
+
+    async def read(
+        self, count: int | None = None, block_ms: int | None = None
+    ) -> list[StreamEntry]:
+        """
+        Read the next batch of new entries for this consumer.
+
+        Waits up to ``block_ms`` (default ``read_block_ms``) for entries to
+        arrive; ``0`` returns immediately. BLOCK is omitted in that case, since
+        XREADGROUP treats ``BLOCK 0`` as "wait forever".
+        """
+        config = settings.event_bus
+        block = config.read_block_ms if block_ms is None else block_ms
+        response = await self._client().xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream_key: ">"},
+            count=count or config.read_count,
+            block=block if block > 0 else None,
+        )
+        if not response:
+            return []
+
+        events, invalid = self._parse(response[0][1])
+        if invalid:
+            await self.ack(invalid)
+        return events
+
+    async def ack(self, message_ids: list[str]) -> None:
+        """Acknowledge processed entries."""
+        if message_ids:
+            await self._client().xack(self.stream_key, self.group, *message_ids)
+
+    async def claim_stale(self, count: int | None = None) -> list[StreamEntry]:
+        """
+        Take over entries another consumer left unacknowledged.
+
+        Entries delivered more than ``max_deliveries`` times are moved to the
+        dead-letter stream instead of being returned.
+        """
+        config = settings.event_bus
+        response = await self._client().xautoclaim(
+            self.stream_key,
+            self.group,
+            self.consumer,
+            min_idle_time=config.claim_idle_ms,
+            start_id="0-0",
+            count=count or config.read_count,
+        )
+        events, invalid = self._parse(response[1])
+        if invalid:
+            await self.ack(invalid)
+        if not events:
+            return []
+
+        pending = await self._client().xpending_range(
+            self.stream_key,
+            self.group,
+            min=events[0][0],
+            max=events[-1][0],
+            count=len(events),
+            consumername=self.consumer,
+        )
+        deliveries = {_decode(entry["message_id"]): entry["times_delivered"] for entry in pending}
+
+        claimed: list[StreamEntry] = []
+        for message_id, event in events:
+            if deliveries.get(message_id, 0) > config.max_deliveries:
+                event.error_message = f"Undelivered after {config.max_deliveries} attempts"
+                await self.dead_letter(event, message_id)
+            else:
+                claimed.append((message_id, event))
+
+        if claimed:
+            logger.info("Reclaimed stale stream entries", count=len(claimed))
+        return claimed
+
+    async def dead_letter(self, event: Event, message_id: str | None = None) -> None:
+        """Move an event to the dead-letter stream, acknowledging its entry if given."""
+        await self.add(event, stream_key=self.dead_letter_key)
+        if message_id:
+            await self.ack([message_id])
+        logger.warning(
+            "Event dead-lettered",
+            event_id=event.event_id,
+            event_type=event.event_type,
+            stream=self.dead_letter_key,
+        )
+
+    async def dead_letters(self, limit: int = 100) -> list[StreamEntry]:
+        """Oldest entries in the dead-letter stream."""
+        entries = await self._client().xrange(self.dead_letter_key, count=limit)
+        events, _ = self._parse(entries)
+        return events
+
+    async def remove_dead_letters(self, message_ids: list[str]) -> None:
+        """Delete entries from the dead-letter stream."""
+        if message_ids:
+            await self._client().xdel(self.dead_letter_key, *message_ids)
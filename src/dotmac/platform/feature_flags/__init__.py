@@ -10,12 +10,15 @@ from .core import (
     RedisUnavailableError,
     clear_cache,
     delete_flag,
+    evaluate_all,
     feature_flag,
     get_flag_status,
     get_variant,
     is_enabled,
     list_flags,
     set_flag,
+    start_flag_listener,
+    stop_flag_listener,
     sync_from_redis,
 )
 from .router import feature_flags_router
@@ -27,11 +30,14 @@ __all__ = [
     "delete_flag",
     "list_flags",
     "get_variant",
+    "evaluate_all",
     "feature_flag",
     # Management functions
     "get_flag_status",
     "clear_cache",
     "sync_from_redis",
+    "start_flag_listener",
+    "stop_flag_listener",
     # Exceptions
     "FeatureFlagError",
     "RedisUnavailableError",
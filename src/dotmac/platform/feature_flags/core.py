@@ -3,27 +3,177 @@ Simple feature flags using Redis  # type: ignore[misc] + cache - no bloat.
 
 Provides a lightweight feature flag system with Redis  # type: ignore[misc] backend and in-memory cache.
 Supports simple on/off flags, context-based evaluation, and A/B testing.
+
+Every worker keeps a snapshot of all flags, loaded whole with one HGETALL.
+Each write bumps a version key and publishes the new version, so other
+workers reload on the next evaluation. The version key is also polled every
+few seconds in case a message was missed. A flag missing from a loaded
+snapshot does not exist, so unknown flags cost no Redis round trip.
+
+Flag rules are compiled into one closure per flag when the flag is cached:
+attribute matches on the evaluation context, a tenant allowlist and a
+percentage rollout.
 """
 
 import inspect
 import json
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping
+from dataclasses import dataclass
 from hashlib import sha256
 from typing import Any, TypeVar
 
 import redis.asyncio as redis
 import structlog
-from cachetools import TTLCache  # noqa: PGH003
 
+from dotmac.platform.core.invalidation import InvalidationListener
 from dotmac.platform.redis_client import RedisClientType
 from dotmac.platform.settings import settings
 
 logger = structlog.get_logger(__name__)
 
-# In-memory cache for fast lookups
-_flag_cache: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=1000, ttl=60)  # 1 minute TTL
+FLAGS_KEY = "feature_flags"
+VERSION_KEY = "feature_flags:version"
+INVALIDATION_CHANNEL = "feature_flags:invalidate"
+
+# Seconds between version key checks (pub/sub usually reloads sooner)
+VERSION_CHECK_INTERVAL = 5.0
+
+FlagEvaluator = Callable[[Mapping[str, Any] | None], bool]
+
+
+@dataclass(frozen=True)
+class CompiledFlag:
+    """A normalized flag and its compiled evaluation rule."""
+
+    name: str
+    data: dict[str, Any]
+    evaluate: FlagEvaluator
+
+
+def _always(result: bool) -> FlagEvaluator:
+    def evaluate(context: Mapping[str, Any] | None) -> bool:
+        return result
+
+    return evaluate
+
+
+def _rollout_bucket(name: str, key: Any) -> float:
+    """Stable bucket in [0, 100) for a rollout key."""
+    digest = sha256(f"{name}:rollout:{key}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % 10000 / 100
+
+
+def _compile_rule(name: str, flag_data: Mapping[str, Any]) -> FlagEvaluator:
+    """Compile a normalized flag's conditions into one closure."""
+    if not flag_data.get("enabled", False):
+        return _always(False)
+
+    checks: list[FlagEvaluator] = []
+
+    attributes = tuple(
+        (key, value)
+        for key, value in flag_data.get("context", {}).items()
+        if not key.startswith("_")
+    )
+    if attributes:
+
+        def match_attributes(context: Mapping[str, Any] | None) -> bool:
+            # Attribute conditions only apply when a context is given
+            if not context:
+                return True
+            return all(context.get(key) == value for key, value in attributes)
+
+        checks.append(match_attributes)
+
+    allowlist = flag_data.get("tenant_allowlist")
+    if allowlist is not None:
+        tenants = frozenset(str(tenant) for tenant in allowlist)
+
+        def match_tenant(context: Mapping[str, Any] | None) -> bool:
+            return context is not None and str(context.get("tenant_id")) in tenants
+
+        checks.append(match_tenant)
+
+    percentage = flag_data.get("rollout_percentage")
+    if percentage is not None:
+        percentage = float(percentage)
+
+        def match_rollout(context: Mapping[str, Any] | None) -> bool:
+            if percentage >= 100:
+                return True
+            key = (context or {}).get("user_id") or (context or {}).get("tenant_id")
+            return key is not None and _rollout_bucket(name, key) < percentage
+
+        checks.append(match_rollout)
+
+    if not checks:
+        return _always(True)
+    if len(checks) == 1:
+        return checks[0]
+
+    def match_all(context: Mapping[str, Any] | None) -> bool:
+        return all(check(context) for check in checks)
+
+    return match_all
+
+
+class FlagSnapshot(MutableMapping[str, dict[str, Any]]):
+    """
+    The worker's copy of every flag, compiled for evaluation.
+
+    Maps flag names to normalized flag data. ``version`` is the Redis flag
+    version the snapshot was loaded at; ``loaded`` is false until the first
+    full load, and ``clear()`` resets it.
+    """
+
+    def __init__(self) -> None:
+        self._flags: dict[str, CompiledFlag] = {}
+        self.version: int | None = None
+        self.loaded = False
+        self.stale = False
+        self.checked_at = 0.0
+
+    def __getitem__(self, name: str) -> dict[str, Any]:
+        return self._flags[name].data
+
+    def __setitem__(self, name: str, raw_flag: dict[str, Any]) -> None:
+        self._flags[name] = compile_flag(name, raw_flag)
+
+    def __delitem__(self, name: str) -> None:
+        del self._flags[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flags)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def compiled(self, name: str) -> CompiledFlag | None:
+        return self._flags.get(name)
+
+    def compiled_flags(self) -> list[CompiledFlag]:
+        return list(self._flags.values())
+
+    def replace(self, flags: dict[str, CompiledFlag], version: int | None) -> None:
+        """Swap in a freshly loaded set of flags."""
+        self._flags = flags
+        self.version = version
+        self.loaded = True
+        self.stale = False
+        self.checked_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._flags = {}
+        self.version = None
+        self.loaded = False
+        self.stale = False
+        self.checked_at = 0.0
+
+
+# In-memory snapshot for fast lookups
+_flag_cache = FlagSnapshot()
 _redis_client: RedisClientType | None = None
 _redis_available: bool | None = None  # Cache Redis  # type: ignore[misc] availability check
 
@@ -132,19 +282,108 @@ def _normalize_flag_data(raw: dict[str, Any]) -> dict[str, Any]:
         if legacy_key in normalized_context and target_key not in normalized_metadata:
             normalized_metadata[target_key] = normalized_context.pop(legacy_key)
 
-    return {
+    normalized: dict[str, Any] = {
         "enabled": bool(raw.get("enabled", False)),
         "context": normalized_context,
         "metadata": normalized_metadata,
         "updated_at": raw.get("updated_at", int(time.time())),
     }
+    if raw.get("rollout_percentage") is not None:
+        normalized["rollout_percentage"] = float(raw["rollout_percentage"])
+    if raw.get("tenant_allowlist") is not None:
+        normalized["tenant_allowlist"] = [str(tenant) for tenant in raw["tenant_allowlist"]]
+    return normalized
+
+
+def compile_flag(name: str, raw_flag: Mapping[str, Any]) -> CompiledFlag:
+    """Normalize a flag and compile its rule."""
+    normalized = _normalize_flag_data(dict(raw_flag))
+    return CompiledFlag(name=name, data=normalized, evaluate=_compile_rule(name, normalized))
 
 
 def _cache_flag(name: str, raw_flag: dict[str, Any]) -> dict[str, Any]:
     """Store normalized flag data in cache and return it."""
-    normalized = _normalize_flag_data(raw_flag)
-    _flag_cache[name] = normalized
-    return normalized
+    _flag_cache[name] = raw_flag
+    return _flag_cache[name]
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _as_version(value: Any) -> int | None:
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(value, int | str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _compile_all(raw_flags: Mapping[Any, Any]) -> dict[str, CompiledFlag]:
+    compiled: dict[str, CompiledFlag] = {}
+    for name, flag_json in raw_flags.items():
+        name = _decode(name)
+        try:
+            compiled[name] = compile_flag(name, json.loads(_decode(flag_json)))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            logger.warning("Skipped invalid flag data", flag=name)
+    return compiled
+
+
+async def _load_snapshot(client: RedisClientType) -> int:
+    """Replace the local snapshot with every flag in Redis. Returns the flag count."""
+    # Version first: a write landing in between only causes one more reload
+    version = _as_version(await client.get(VERSION_KEY))
+    flags = _compile_all(await client.hgetall(FLAGS_KEY))
+    _flag_cache.replace(flags, version)
+    return len(flags)
+
+
+async def _refresh_snapshot(force: bool = False) -> None:
+    """Reload the snapshot if it was never loaded or its version changed."""
+    client = await get_redis_client()
+    if client is None:
+        return
+
+    snapshot = _flag_cache
+    snapshot.checked_at = time.monotonic()
+    snapshot.stale = False
+    try:
+        if not force and snapshot.loaded:
+            version = _as_version(await client.get(VERSION_KEY))
+            if version == snapshot.version:
+                return
+        await _load_snapshot(client)
+    except Exception as e:
+        logger.warning(
+            "Failed to load flags from Redis, using cached snapshot",
+            error=str(e),
+        )
+
+
+async def _current_snapshot(name: str | None = None) -> FlagSnapshot:
+    """The local snapshot, refreshed first when it may be out of date."""
+    snapshot = _flag_cache
+    if snapshot.loaded:
+        if snapshot.stale or time.monotonic() - snapshot.checked_at >= VERSION_CHECK_INTERVAL:
+            await _refresh_snapshot()
+    elif name is None or name not in snapshot:
+        await _refresh_snapshot(force=True)
+    return snapshot
+
+
+async def _bump_version(client: RedisClientType) -> None:
+    """Record a flag change and tell every worker about it."""
+    version = _as_version(await client.incr(VERSION_KEY))
+    if version is None:
+        return
+    if _flag_cache.loaded and _flag_cache.version == version - 1:
+        # Nothing else changed since our load: the local copy is current
+        _flag_cache.version = version
+    await client.publish(INVALIDATION_CHANNEL, str(version))
 
 
 async def set_flag(
@@ -152,14 +391,28 @@ async def set_flag(
     enabled: bool,
     context: dict[str, Any] | None = None,
     metadata: dict[str, Any] | None = None,
+    *,
+    rollout_percentage: float | None = None,
+    tenant_allowlist: Iterable[str] | None = None,
 ) -> None:
-    """Set feature flag value."""
-    flag_data = {
+    """
+    Set feature flag value.
+
+    ``context`` entries must match the evaluation context. With
+    ``tenant_allowlist`` only the listed ``tenant_id``s get the flag, and
+    ``rollout_percentage`` enables it for a stable share of ``user_id``s
+    (or ``tenant_id``s).
+    """
+    flag_data: dict[str, Any] = {
         "enabled": enabled,
         "context": dict(context or {}),
         "metadata": dict(metadata or {}),
         "updated_at": int(time.time()),
     }
+    if rollout_percentage is not None:
+        flag_data["rollout_percentage"] = rollout_percentage
+    if tenant_allowlist is not None:
+        flag_data["tenant_allowlist"] = list(tenant_allowlist)
 
     # Always update cache
     _cache_flag(name, flag_data)
@@ -168,7 +421,8 @@ async def set_flag(
     client = await get_redis_client()
     if client:
         try:
-            await client.hset("feature_flags", name, json.dumps(flag_data))
+            await client.hset(FLAGS_KEY, name, json.dumps(flag_data))
+            await _bump_version(client)
             logger.info(
                 "Feature flag updated in Redis  # type: ignore[misc] and cache",
                 flag=name,
@@ -190,50 +444,22 @@ async def set_flag(
 
 async def is_enabled(name: str, context: dict[str, Any] | None = None) -> bool:
     """Check if feature flag is enabled."""
-    # Check cache first
-    flag_data: dict[str, Any] | None
-    if name in _flag_cache:
-        flag_data = _flag_cache[name]
-    else:
-        # Try to get from Redis  # type: ignore[misc] if available
-        client = await get_redis_client()
-        flag_data = None
-
-        if client:
-            try:
-                flag_json = await client.hget("feature_flags", name)
-                if flag_json:
-                    raw_flag_data = json.loads(flag_json)
-                    flag_data = _cache_flag(name, raw_flag_data)
-            except Exception as e:
-                logger.warning(
-                    "Failed to get flag from Redis  # type: ignore[misc], checking cache only",
-                    flag=name,
-                    error=str(e),
-                )
-
-        # If not found in Redis  # type: ignore[misc] or Redis  # type: ignore[misc] unavailable, check if we have a default
-        if not flag_data:
-            logger.debug("Feature flag not found, defaulting to False", flag=name)
-            return False
-
-    enabled: bool = flag_data.get("enabled", False)
-
-    # Simple context matching (can be extended)
-    flag_context: dict[str, Any] = dict(flag_data.get("context", {}))
-    if context and flag_context:
-        # Check if all flag context conditions match
-        for key, value in flag_context.items():
-            if key.startswith("_"):
-                continue
-            if context.get(key) != value:
-                enabled = False
-                break
+    flag = (await _current_snapshot(name)).compiled(name)
+    if flag is None:
+        logger.debug("Feature flag not found, defaulting to False", flag=name)
+        return False
 
+    enabled = flag.evaluate(context)
     logger.debug("Feature flag checked", flag=name, enabled=enabled, context=context)
     return enabled
 
 
+async def evaluate_all(context: dict[str, Any] | None = None) -> dict[str, bool]:
+    """Evaluate every flag for one context, refreshing the snapshot at most once."""
+    snapshot = await _current_snapshot()
+    return {flag.name: flag.evaluate(context) for flag in snapshot.compiled_flags()}
+
+
 async def get_variant(name: str, context: dict[str, Any] | None = None) -> str:
     """Get A/B test variant. Returns 'control' if flag disabled."""
     if not await is_enabled(name, context):
@@ -260,16 +486,12 @@ async def list_flags() -> dict[str, dict[str, Any]]:
     client = await get_redis_client()
     if client:
         try:
-            flags = await client.hgetall("feature_flags")
+            flags = await client.hgetall(FLAGS_KEY)
 
             for name, flag_json in flags.items():
-                if isinstance(name, bytes):
-                    name = name.decode()
-                if isinstance(flag_json, bytes):
-                    flag_json = flag_json.decode()
-
+                name = _decode(name)
                 try:
-                    raw_flag = json.loads(flag_json)
+                    raw_flag = json.loads(_decode(flag_json))
                     flag_data = _cache_flag(name, raw_flag)
                     result[name] = flag_data
                 except json.JSONDecodeError:
@@ -302,8 +524,10 @@ async def delete_flag(name: str) -> bool:
     client = await get_redis_client()
     if client:
         try:
-            deleted_count = await client.hdel("feature_flags", name)
+            deleted_count = await client.hdel(FLAGS_KEY, name)
             deleted_from_redis = bool(deleted_count)
+            if deleted_from_redis:
+                await _bump_version(client)
         except Exception as e:
             logger.warning(
                 "Failed to delete flag from Redis  # type: ignore[misc]", flag=name, error=str(e)
@@ -332,8 +556,9 @@ async def get_flag_status() -> dict[str, Any]:
         "redis_available": redis_available,
         "redis_url": getattr(settings.redis, "redis_url", None) if redis_available else None,
         "cache_size": cache_size,
-        "cache_maxsize": _flag_cache.maxsize,
-        "cache_ttl": _flag_cache.ttl,
+        # The snapshot holds every flag and is refreshed on version changes
+        "cache_maxsize": cache_size,
+        "cache_ttl": int(VERSION_CHECK_INTERVAL),
         "total_flags": cache_size,
     }
 
@@ -341,7 +566,7 @@ async def get_flag_status() -> dict[str, Any]:
         client = await get_redis_client()
         if client:
             try:
-                redis_flags = await client.hlen("feature_flags")
+                redis_flags = await client.hlen(FLAGS_KEY)
                 status["redis_flags"] = redis_flags
                 status["total_flags"] = max(cache_size, redis_flags)
             except Exception as e:
@@ -357,37 +582,53 @@ async def clear_cache() -> None:
 
 
 async def sync_from_redis() -> int:
-    """Sync all flags from Redis  # type: ignore[misc] to cache. Returns number of flags synced."""
+    """Reload the whole flag snapshot from Redis. Returns number of flags synced."""
     client = await get_redis_client()
     if not client:
-        logger.warning("Cannot sync from Redis  # type: ignore[misc]: not available")
+        logger.warning("Cannot sync from Redis: not available")
         return 0
 
     try:
-        flags = await client.hgetall("feature_flags")
-        synced_count = 0
-
-        for name, flag_json in flags.items():
-            if isinstance(name, bytes):
-                name = name.decode()
-            if isinstance(flag_json, bytes):
-                flag_json = flag_json.decode()
-
-            try:
-                raw_flag = json.loads(flag_json)
-                _cache_flag(name, raw_flag)
-                synced_count += 1
-            except json.JSONDecodeError:
-                logger.warning("Skipped invalid flag data during sync", flag=name)
-
-        logger.info("Synced flags from Redis  # type: ignore[misc] to cache", count=synced_count)
+        synced_count = await _load_snapshot(client)
+        logger.info("Synced flags from Redis to cache", count=synced_count)
         return synced_count
 
     except Exception as e:
-        logger.error("Failed to sync flags from Redis  # type: ignore[misc]", error=str(e))
+        logger.error("Failed to sync flags from Redis", error=str(e))
         return 0
 
 
+def handle_invalidation(data: str | bytes) -> None:
+    """Apply a flag version broadcast by another worker."""
+    if _as_version(data) != _flag_cache.version:
+        _flag_cache.stale = True
+
+
+def _mark_stale() -> None:
+    # Changes may have been missed while disconnected
+    _flag_cache.stale = True
+
+
+_listener = InvalidationListener(
+    INVALIDATION_CHANNEL, handle_invalidation, _mark_stale, name="feature_flags"
+)
+
+
+async def start_flag_listener() -> None:
+    """Start the background pub/sub listener for flag changes."""
+    if _listener.running:
+        return
+    client = await get_redis_client()
+    if client is None:
+        return
+    _listener.start(client)
+
+
+async def stop_flag_listener() -> None:
+    """Stop the background pub/sub listener."""
+    await _listener.stop()
+
+
 # Convenience decorators
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -485,7 +726,7 @@ def feature_flag(flag_name: str, default: bool = False) -> Callable[[F], F]:
 # async def experimental_function():
 #     return "This only runs if flag is enabled"
 #
-# # For even simpler cases, use Redis  # type: ignore[misc] directly:
+# # For even simpler cases, use Redis directly:
 # import redis.asyncio as redis
 # client = redis.from_url("redis://localhost")
 # await client.hset("flags", "my_flag", "true")
@@ -16,6 +16,7 @@ from dotmac.platform.auth.core import UserInfo, get_current_user_optional
 from dotmac.platform.feature_flags import (
     clear_cache,
     delete_flag,
+    evaluate_all,
     get_flag_status,
     get_variant,
     is_enabled,
@@ -38,6 +39,8 @@ def _build_flag_response(flag_name: str, flag_data: dict[str, Any]) -> "FeatureF
         description=metadata.get("description"),
         updated_at=flag_data.get("updated_at", 0),
         created_at=metadata.get("created_at"),
+        rollout_percentage=flag_data.get("rollout_percentage"),
+        tenant_allowlist=flag_data.get("tenant_allowlist"),
     )
 
 
@@ -62,6 +65,12 @@ class FeatureFlagRequest(BaseModel):  # BaseModel resolves to Any in isolation
     description: str | None = Field(
         None, max_length=500, description="Human-readable description of the flag"
     )
+    rollout_percentage: float | None = Field(
+        None, ge=0, le=100, description="Share of users (or tenants) the flag is enabled for"
+    )
+    tenant_allowlist: list[str] | None = Field(
+        None, max_length=1000, description="Only these tenants get the flag"
+    )
 
     @field_validator("context")
     @classmethod
@@ -82,6 +91,8 @@ class FeatureFlagResponse(BaseModel):  # BaseModel resolves to Any in isolation
     description: str | None = Field(None, description="Flag description")
     updated_at: int = Field(description="Last updated timestamp")
     created_at: int | None = Field(None, description="Creation timestamp")
+    rollout_percentage: float | None = Field(None, description="Rollout percentage")
+    tenant_allowlist: list[str] | None = Field(None, description="Allowed tenants")
 
 
 class FeatureFlagCheckRequest(BaseModel):  # BaseModel resolves to Any in isolation
@@ -104,6 +115,23 @@ class FeatureFlagCheckResponse(BaseModel):  # BaseModel resolves to Any in isola
     checked_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
+class FeatureFlagEvaluateRequest(BaseModel):  # BaseModel resolves to Any in isolation
+    """Request model for evaluating every flag at once."""
+
+    model_config = ConfigDict()
+
+    context: dict[str, Any] | None = Field(None, description="Context for flag evaluation")
+
+
+class FeatureFlagEvaluateResponse(BaseModel):  # BaseModel resolves to Any in isolation
+    """Response model for evaluating every flag at once."""
+
+    model_config = ConfigDict()
+
+    flags: dict[str, bool] = Field(description="Flag name to whether it is enabled")
+    evaluated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
 class FlagStatusResponse(BaseModel):  # BaseModel resolves to Any in isolation
     """Response model for feature flag system status."""
 
@@ -173,6 +201,8 @@ async def check_flag(
         context = request.context or {}
         context["user_id"] = user.user_id
         context["user_roles"] = user.roles
+        # Never from the request body: tenant allowlists must not be spoofable
+        context["tenant_id"] = user.tenant_id
 
         enabled = await is_enabled(request.flag_name, context)
         variant = await get_variant(request.flag_name, context)
@@ -188,6 +218,32 @@ async def check_flag(
         )
 
 
+@feature_flags_router.post("/flags/evaluate", response_model=FeatureFlagEvaluateResponse)
+async def evaluate_flags(
+    request: FeatureFlagEvaluateRequest,
+    current_user: UserInfo | None = Depends(get_current_user_optional),
+) -> FeatureFlagEvaluateResponse:
+    """Evaluate every feature flag for the current user in one call."""
+    try:
+        user = _require_authenticated_user(current_user)
+
+        context = request.context or {}
+        context["user_id"] = user.user_id
+        context["user_roles"] = user.roles
+        context["tenant_id"] = user.tenant_id
+
+        return FeatureFlagEvaluateResponse(flags=await evaluate_all(context))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to evaluate feature flags", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to evaluate feature flags",
+        )
+
+
 @feature_flags_router.post("/flags/bulk", response_model=BulkFlagUpdateResponse)
 async def bulk_update_flags(
     request: BulkFlagUpdateRequest,
@@ -233,7 +289,14 @@ async def bulk_update_flags(
                 if flag_request.description is not None:
                     metadata["description"] = flag_request.description
 
-                await set_flag(flag_name, flag_request.enabled, context, metadata)
+                await set_flag(
+                    flag_name,
+                    flag_request.enabled,
+                    context,
+                    metadata,
+                    rollout_percentage=flag_request.rollout_percentage,
+                    tenant_allowlist=flag_request.tenant_allowlist,
+                )
                 existing_flags[flag_name] = {
                     "enabled": flag_request.enabled,
                     "context": context,
@@ -254,8 +317,7 @@ async def bulk_update_flags(
 
         return BulkFlagUpdateResponse(
             message=(
-                f"Bulk update completed: {success_count} succeeded, "
-                f"{len(failed_flags)} failed"
+                f"Bulk update completed: {success_count} succeeded, {len(failed_flags)} failed"
             ),
             success_count=success_count,
             failed_count=len(failed_flags),
@@ -314,7 +376,14 @@ async def create_or_update_flag(
         metadata["updated_at"] = now
         metadata["updated_by"] = user.user_id
 
-        await set_flag(flag_name, request.enabled, context, metadata)
+        await set_flag(
+            flag_name,
+            request.enabled,
+            context,
+            metadata,
+            rollout_percentage=request.rollout_percentage,
+            tenant_allowlist=request.tenant_allowlist,
+        )
 
         updated_flag = (await list_flags()).get(
             flag_name,
@@ -19,6 +19,7 @@ from .service import (
     StorageBackend,
     get_storage_service,
 )
+from .streaming import FileStream, FileStreamResponse, FileTooLargeError
 
 __all__ = [
     # MinIO specific
@@ -34,6 +35,10 @@ __all__ = [
     "MemoryFileStorage",
     "MinIOFileStorage",
     "get_storage_service",
+    # Streaming
+    "FileStream",
+    "FileStreamResponse",
+    "FileTooLargeError",
     "register_storage_plugin",
     "list_storage_plugins",
     # Router
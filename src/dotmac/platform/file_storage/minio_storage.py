@@ -5,7 +5,7 @@ Simple MinIO storage client for file management.
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import BinaryIO
+from typing import Any, BinaryIO
 
 import structlog
 from minio import Minio
@@ -122,6 +122,58 @@ class MinIOStorage:
             logger.error(f"Failed to save file {object_name}: {e}")
             raise
 
+    def save_stream(
+        self,
+        file_path: str,
+        content: Any,
+        tenant_id: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = 16 * 1024 * 1024,
+        num_parallel_uploads: int = 4,
+    ) -> str:
+        """
+        Save a stream of unknown length to MinIO.
+
+        ``content`` only needs ``read(size)``. Files larger than ``part_size``
+        go up as a multipart upload with ``num_parallel_uploads`` parts in
+        flight, so memory stays around ``part_size * num_parallel_uploads``.
+        """
+        object_name = self._get_object_name(file_path, tenant_id)
+
+        try:
+            self.client.put_object(
+                self.bucket,
+                object_name,
+                content,
+                length=-1,
+                content_type=content_type,
+                part_size=part_size,
+                num_parallel_uploads=num_parallel_uploads,
+            )
+            logger.info(f"Saved file: {object_name}")
+            return object_name
+
+        except S3Error as e:
+            logger.error(f"Failed to save file {object_name}: {e}")
+            raise
+
+    def open_range(self, file_path: str, tenant_id: str, offset: int = 0, length: int = 0) -> Any:
+        """
+        Open a byte range of a file for streaming (``length=0`` reads to the end).
+
+        The caller must ``close()`` and ``release_conn()`` the response.
+        """
+        object_name = self._get_object_name(file_path, tenant_id)
+
+        try:
+            return self.client.get_object(self.bucket, object_name, offset=offset, length=length)
+
+        except S3Error as e:
+            if "NoSuchKey" in str(e):
+                raise FileNotFoundError(f"File not found: {object_name}")
+            logger.error(f"Failed to open file {object_name}: {e}")
+            raise
+
     def get_file(self, file_path: str, tenant_id: str) -> bytes:
         """Get a file from MinIO."""
         object_name = self._get_object_name(file_path, tenant_id)
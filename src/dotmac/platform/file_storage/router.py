@@ -5,6 +5,7 @@ Provides REST endpoints for file storage operations.
 """
 
 import posixpath
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import Any
 
@@ -32,6 +33,14 @@ from dotmac.platform.file_storage.service import (
     FileStorageService,
     get_storage_service,
 )
+from dotmac.platform.file_storage.streaming import (
+    FileStreamResponse,
+    FileTooLargeError,
+    RangeNotSatisfiableError,
+    etag_matches,
+    parse_range,
+)
+from dotmac.platform.settings import settings
 from dotmac.platform.tenant import get_current_tenant_id
 from dotmac.platform.webhooks.events import get_event_bus
 from dotmac.platform.webhooks.models import WebhookEvent
@@ -97,6 +106,12 @@ def _resolve_tenant_id(request: Request, current_user: UserInfo) -> str:
     )
 
 
+async def _read_upload(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    """Read an upload in chunks (Starlette spools multipart bodies to disk)."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 # Request/Response Models
 class FileUploadResponse(BaseModel):  # BaseModel resolves to Any in isolation
     """File upload response."""
@@ -145,21 +160,15 @@ async def upload_file(
     """
     Upload a file to storage.
     """
+    max_size = settings.storage.max_upload_size
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size is {max_size / 1024 / 1024}MB",
+    )
     try:
-        # Validate file size (e.g., max 100MB)
-        max_size = 100 * 1024 * 1024  # 100MB
-        file_size = 0
-        contents = await file.read()
-        file_size = len(contents)
-
-        if file_size > max_size:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size is {max_size / 1024 / 1024}MB",
-            )
-
-        # Reset file position
-        await file.seek(0)
+        # Reject early when the multipart parser already knows the size
+        if isinstance(file.size, int) and file.size > max_size:
+            raise too_large
 
         # Generate file path
         tenant_id = _resolve_tenant_id(request, current_user)
@@ -167,10 +176,10 @@ async def upload_file(
         if not path:
             path = f"uploads/{tenant_id}/{current_user.user_id}/{datetime.now(UTC).strftime('%Y/%m/%d')}"
 
-        # Store file
+        # Stream the file into storage; the size limit is enforced while reading
         service = storage_service
-        file_id = await service.store_file(
-            file_data=contents,
+        stored = await service.store_file_stream(
+            _read_upload(file, settings.storage.stream_chunk_size),
             file_name=file.filename or "unnamed",
             content_type=file.content_type or "application/octet-stream",
             path=path,
@@ -180,7 +189,10 @@ async def upload_file(
                 "original_filename": file.filename,
             },
             tenant_id=tenant_id,
+            max_size=max_size,
         )
+        file_id = stored.file_id
+        file_size = stored.file_size
 
         # Publish webhook event
         try:
@@ -212,6 +224,8 @@ async def upload_file(
         )
     except HTTPException:
         raise
+    except FileTooLargeError as exc:
+        raise too_large from exc
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -234,52 +248,72 @@ async def download_file(
 ) -> Response:
     """
     Download a file from storage.
+
+    The file is streamed. ``Range`` requests get a 206 with a single byte
+    range, and ``If-None-Match`` matching the checksum ETag gets a 304.
     """
     try:
         tenant_id = _resolve_tenant_id(request, current_user)
 
         service = storage_service
-        file_data, metadata = await service.retrieve_file(file_id, tenant_id)
+        stream = await service.open_file(file_id, tenant_id)
 
-        if file_data is None:
+        if stream is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File {file_id} not found",
             )
 
-        # Return actual file content
-        content_type = (
-            metadata.get("content_type", "application/octet-stream")
-            if metadata
-            else "application/octet-stream"
-        )
-        file_name = metadata.get("file_name", "download") if metadata else "download"
+        metadata = stream.metadata
+        content_type = metadata.get("content_type") or "application/octet-stream"
+        file_name = metadata.get("file_name") or "download"
+        headers = {"Accept-Ranges": "bytes"}
+        etag = stream.etag
+        if etag:
+            headers["ETag"] = etag
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        status_code = status.HTTP_200_OK
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or if_range == etag):
+            try:
+                byte_range = parse_range(range_header, stream.size)
+            except RangeNotSatisfiableError:
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Requested range not satisfiable",
+                    headers={"Content-Range": f"bytes */{stream.size}"},
+                ) from None
+            if byte_range is not None:
+                stream = stream.with_range(*byte_range)
+                status_code = status.HTTP_206_PARTIAL_CONTENT
+                headers["Content-Range"] = f"bytes {stream.start}-{stream.last}/{stream.size}"
+
+        # Publish webhook event once per download, not for every later range
+        if stream.start == 0:
+            try:
+                await get_event_bus().publish(
+                    event_type=WebhookEvent.FILE_DOWNLOADED.value,
+                    event_data={
+                        "file_id": file_id,
+                        "file_name": file_name,
+                        "file_size": stream.size,
+                        "content_type": content_type,
+                        "downloaded_by": current_user.user_id,
+                        "downloaded_at": datetime.now(UTC).isoformat(),
+                    },
+                    tenant_id=tenant_id,
+                    db=db,
+                )
+            except Exception as e:
+                logger.warning("Failed to publish file.downloaded event", error=str(e))
 
-        # Publish webhook event
-        try:
-            await get_event_bus().publish(
-                event_type=WebhookEvent.FILE_DOWNLOADED.value,
-                event_data={
-                    "file_id": file_id,
-                    "file_name": file_name,
-                    "file_size": len(file_data),
-                    "content_type": content_type,
-                    "downloaded_by": current_user.user_id,
-                    "downloaded_at": datetime.now(UTC).isoformat(),
-                },
-                tenant_id=tenant_id,
-                db=db,
-            )
-        except Exception as e:
-            logger.warning("Failed to publish file.downloaded event", error=str(e))
-
-        return Response(
-            content=file_data,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{file_name}"',
-                "Content-Length": str(len(file_data)),
-            },
+        headers["Content-Disposition"] = f'attachment; filename="{file_name}"'
+        return FileStreamResponse(
+            stream, status_code=status_code, headers=headers, media_type=content_type
         )
     except HTTPException:
         raise
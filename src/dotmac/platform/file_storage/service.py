@@ -5,14 +5,20 @@ Provides a unified interface for file storage operations with support for:
 - Local filesystem storage
 - MinIO/S3 storage
 - In-memory storage for testing
+
+Every backend also stores from and reads into chunk streams (``store_stream``
+and ``open_stream``), so large files never sit in memory whole.
 """
 
+import asyncio
 import hashlib
 import json
+import os
 import re
 import shutil
 import tempfile
 import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
 from datetime import UTC, datetime
 from io import BytesIO
 from pathlib import Path
@@ -24,6 +30,14 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from ..settings import settings
 from .factory import get_storage_backend
+from .streaming import (
+    BlockingChunkReader,
+    DigestingChunks,
+    FileStream,
+    iter_bytes,
+    limit_size,
+    read_file_range,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -256,37 +270,60 @@ class LocalFileStorage:
         tenant_id: str | None = None,
     ) -> str:
         """Store a file."""
-        file_id = str(uuid.uuid4())
-
-        # Calculate checksum
-        checksum = hashlib.sha256(file_data).hexdigest()
+        stored = await self.store_stream(
+            iter_bytes(file_data, settings.storage.stream_chunk_size),
+            file_name=file_name,
+            content_type=content_type,
+            path=path,
+            metadata=metadata,
+            tenant_id=tenant_id,
+        )
+        return stored.file_id
 
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_name: str,
+        content_type: str,
+        path: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        tenant_id: str | None = None,
+    ) -> FileMetadata:
+        """Store a file from a chunk stream, hashing it on the way to disk."""
+        file_id = str(uuid.uuid4())
         tenant_id = self._sanitize_tenant_id(tenant_id)
 
-        # Save file
         file_path = self._get_file_path(file_id, tenant_id)
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(file_path, "wb") as f:
-            f.write(file_data)
+        # Write to a sibling file and rename, so readers never see a partial file
+        partial_path = file_path.with_name(f"{file_id}.part")
+        digesting = DigestingChunks(chunks)
+        try:
+            with open(partial_path, "wb") as f:
+                async for chunk in digesting:
+                    await asyncio.to_thread(f.write, chunk)
+            os.replace(partial_path, file_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
 
-        # Create and save metadata
         file_metadata = FileMetadata(
             file_id=file_id,
             file_name=file_name,
-            file_size=len(file_data),
+            file_size=digesting.size,
             content_type=content_type,
             created_at=datetime.now(UTC),
             updated_at=datetime.now(UTC),
             path=path,
             metadata=metadata or {},
-            checksum=checksum,
+            checksum=digesting.checksum,
             tenant_id=tenant_id,
         )
         self._save_metadata(file_id, file_metadata)
 
-        logger.info(f"Stored file {file_id} ({file_name}) - {len(file_data)} bytes")
-        return file_id
+        logger.info(f"Stored file {file_id} ({file_name}) - {digesting.size} bytes")
+        return file_metadata
 
     async def retrieve(
         self, file_id: str, tenant_id: str | None = None
@@ -315,6 +352,30 @@ class LocalFileStorage:
                 "file_size": len(file_data),
             }
 
+    async def open_stream(self, file_id: str, tenant_id: str | None = None) -> FileStream | None:
+        """Open a file for chunked reads; ``local_path`` allows zero-copy sends."""
+        tenant_id = self._sanitize_tenant_id(tenant_id)
+        file_path = self._get_file_path(file_id, tenant_id)
+
+        try:
+            size = file_path.stat().st_size
+        except FileNotFoundError:
+            logger.warning(f"File not found: {file_id}")
+            return None
+
+        metadata = self._load_metadata(file_id)
+        chunk_size = settings.storage.stream_chunk_size
+
+        def read(start: int, end: int) -> AsyncGenerator[bytes]:
+            return read_file_range(file_path, start, end, chunk_size)
+
+        return FileStream(
+            metadata=metadata.to_dict() if metadata else {"file_id": file_id, "file_size": size},
+            size=size,
+            reader=read,
+            local_path=file_path,
+        )
+
     async def delete(self, file_id: str, tenant_id: str | None = None) -> bool:
         """Delete a file."""
         tenant_id = self._sanitize_tenant_id(tenant_id)
@@ -505,6 +566,27 @@ class MemoryFileStorage:
 
         return None, None
 
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_name: str,
+        content_type: str,
+        path: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        tenant_id: str | None = None,
+    ) -> FileMetadata:
+        """Store a file from a chunk stream (held in memory)."""
+        data = b"".join([chunk async for chunk in chunks])
+        file_id = await self.store(data, file_name, content_type, path, metadata, tenant_id)
+        return self.metadata[file_id]
+
+    async def open_stream(self, file_id: str, tenant_id: str | None = None) -> FileStream | None:
+        """Open a file for chunked reads."""
+        file_data, metadata = await self.retrieve(file_id, tenant_id)
+        if file_data is None or metadata is None:
+            return None
+        return FileStream.from_bytes(file_data, metadata, settings.storage.stream_chunk_size)
+
     async def delete(self, file_id: str, tenant_id: str | None = None) -> bool:
         """Delete a file from memory."""
         metadata = self.metadata.get(file_id)
@@ -863,6 +945,103 @@ class MinIOFileStorage:
             logger.warning(f"File not found in MinIO: {file_id}")
             return None, None
 
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_name: str,
+        content_type: str,
+        path: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        tenant_id: str | None = None,
+    ) -> FileMetadata:
+        """
+        Store a file in MinIO from a chunk stream.
+
+        The MinIO SDK reads the stream from a worker thread and uploads it as
+        a multipart upload with parts sent in parallel; the checksum is
+        computed as chunks pass through.
+        """
+        file_id = str(uuid.uuid4())
+        tenant_id = tenant_id or "default"
+        full_path = f"{path}/{file_id}/{file_name}" if path else f"{file_id}/{file_name}"
+        config = settings.storage
+
+        digesting = DigestingChunks(chunks)
+        reader = BlockingChunkReader()
+        upload = asyncio.ensure_future(
+            asyncio.to_thread(
+                self.client.save_stream,
+                file_path=full_path,
+                content=reader,
+                tenant_id=tenant_id,
+                content_type=content_type,
+                part_size=max(config.multipart_part_size, 5 * 1024 * 1024),
+                num_parallel_uploads=config.multipart_concurrency,
+            )
+        )
+        try:
+            await reader.feed(digesting, upload)
+        except BaseException:
+            # The reader raises in the upload thread, which aborts the multipart upload
+            try:
+                await upload
+            except Exception as exc:
+                logger.debug("Aborted MinIO stream upload", file_id=file_id, error=str(exc))
+            raise
+        await upload
+
+        file_metadata = FileMetadata(
+            file_id=file_id,
+            file_name=file_name,
+            file_size=digesting.size,
+            content_type=content_type,
+            created_at=datetime.now(UTC),
+            updated_at=datetime.now(UTC),
+            path=path,
+            metadata=metadata or {},
+            checksum=digesting.checksum,
+            tenant_id=tenant_id,
+        )
+        self.metadata_store[file_id] = file_metadata
+        self._persist_metadata_record(file_metadata)
+
+        logger.info(f"Stored file {file_id} ({file_name}) in MinIO - {digesting.size} bytes")
+        return file_metadata
+
+    async def open_stream(self, file_id: str, tenant_id: str | None = None) -> FileStream | None:
+        """Open a file for chunked reads; each read is a ranged GET."""
+        metadata = self.metadata_store.get(file_id)
+        if not metadata:
+            metadata = self._load_metadata_from_storage(file_id)
+            if not metadata:
+                return None
+
+        if tenant_id and metadata.tenant_id != tenant_id:
+            return None
+
+        object_tenant = metadata.tenant_id or "default"
+        if metadata.path:
+            full_path = f"{metadata.path}/{file_id}/{metadata.file_name}"
+        else:
+            full_path = f"{file_id}/{metadata.file_name}"
+        chunk_size = settings.storage.stream_chunk_size
+
+        async def read(start: int, end: int) -> AsyncGenerator[bytes]:
+            if end < start:
+                return
+            response = await asyncio.to_thread(
+                self.client.open_range, full_path, object_tenant, start, end - start + 1
+            )
+            try:
+                body = response.stream(chunk_size)
+                while chunk := await asyncio.to_thread(next, body, b""):
+                    yield chunk
+            finally:
+                response.close()
+                response.release_conn()
+
+        return FileStream(metadata=metadata.to_dict(), size=metadata.file_size, reader=read)
+
     async def delete(self, file_id: str, tenant_id: str | None = None) -> bool:
         """Delete a file from MinIO."""
         requested_tenant = tenant_id
@@ -1114,6 +1293,59 @@ class FileStorageService:
             tenant_id=tenant_id,
         )
 
+    async def store_file_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_name: str,
+        content_type: str,
+        path: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        tenant_id: str | None = None,
+        max_size: int | None = None,
+    ) -> FileMetadata:
+        """
+        Store a file from a chunk stream and return its metadata.
+
+        Raises ``FileTooLargeError`` once more than ``max_size`` bytes arrive;
+        the partial file is discarded.
+        """
+        if max_size is not None:
+            chunks = limit_size(chunks, max_size)
+
+        store_stream = getattr(self.backend, "store_stream", None)
+        if store_stream is not None:
+            stored: FileMetadata = await store_stream(
+                chunks,
+                file_name=file_name,
+                content_type=content_type,
+                path=path,
+                metadata=metadata,
+                tenant_id=tenant_id,
+            )
+            return stored
+
+        # Backend plugins without streaming support get the whole file
+        file_data = b"".join([chunk async for chunk in chunks])
+        file_id = await self.backend.store(
+            file_data=file_data,
+            file_name=file_name,
+            content_type=content_type,
+            path=path,
+            metadata=metadata,
+            tenant_id=tenant_id,
+        )
+        return FileMetadata(
+            file_id=file_id,
+            file_name=file_name,
+            file_size=len(file_data),
+            content_type=content_type,
+            created_at=datetime.now(UTC),
+            path=path,
+            metadata=metadata or {},
+            checksum=hashlib.sha256(file_data).hexdigest(),
+            tenant_id=tenant_id,
+        )
+
     async def retrieve_file(
         self, file_id: str, tenant_id: str | None = None
     ) -> tuple[bytes | None, dict[str, Any] | None]:
@@ -1121,6 +1353,20 @@ class FileStorageService:
         safe_file_id = self._ensure_valid_file_id(file_id)
         return await self.backend.retrieve(safe_file_id, tenant_id)
 
+    async def open_file(self, file_id: str, tenant_id: str | None = None) -> FileStream | None:
+        """Open a file for streaming; use ``FileStream.with_range`` to read part of it."""
+        safe_file_id = self._ensure_valid_file_id(file_id)
+
+        open_stream = getattr(self.backend, "open_stream", None)
+        if open_stream is not None:
+            stream: FileStream | None = await open_stream(safe_file_id, tenant_id)
+            return stream
+
+        file_data, metadata = await self.backend.retrieve(safe_file_id, tenant_id)
+        if file_data is None:
+            return None
+        return FileStream.from_bytes(file_data, metadata or {}, settings.storage.stream_chunk_size)
+
     async def delete_file(self, file_id: str, tenant_id: str | None = None) -> bool:
         """Delete a file by ID."""
         safe_file_id = self._ensure_valid_file_id(file_id)
@@ -0,0 +1,310 @@
+"""
+Streaming primitives for file storage.
+
+Uploads arrive as async iterators of byte chunks and downloads leave as a
+``FileStream`` that reads a byte range lazily, so no code path needs a
+whole file in memory. ``FileStreamResponse`` sends a ``FileStream`` to the
+client, handing local files to the server for ``sendfile`` when it supports
+the ASGI zero-copy extension.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import queue
+import re
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Callable, Mapping
+from contextlib import aclosing
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import IO, Any
+
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+ChunkReader = Callable[[int, int], AsyncGenerator[bytes]]
+
+_RANGE_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+_ZERO_COPY = "http.response.zerocopysend"
+
+
+class FileTooLargeError(ValueError):
+    """An upload exceeded the allowed size."""
+
+
+class RangeNotSatisfiableError(ValueError):
+    """A ``Range`` header selects no byte of the file."""
+
+
+@dataclass(frozen=True)
+class FileStream:
+    """
+    An opened stored file, read lazily.
+
+    Iterating yields bytes ``start`` to ``end`` (inclusive) of a file of
+    ``size`` bytes; nothing is read from the backend before that. When the
+    bytes live on local disk, ``local_path`` points at them.
+    """
+
+    metadata: dict[str, Any]
+    size: int
+    reader: ChunkReader
+    start: int = 0
+    end: int | None = None
+    local_path: Path | None = None
+
+    @property
+    def last(self) -> int:
+        """Index of the last byte served."""
+        return self.size - 1 if self.end is None else self.end
+
+    @property
+    def length(self) -> int:
+        return max(0, self.last - self.start + 1)
+
+    @property
+    def is_partial(self) -> bool:
+        return self.start > 0 or self.last < self.size - 1
+
+    @property
+    def etag(self) -> str | None:
+        checksum = self.metadata.get("checksum")
+        return f'"{checksum}"' if checksum else None
+
+    def with_range(self, start: int, end: int) -> FileStream:
+        return replace(self, start=start, end=end)
+
+    def chunks(self) -> AsyncGenerator[bytes]:
+        return self.reader(self.start, self.last)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.chunks()
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, metadata: dict[str, Any], chunk_size: int = 1024 * 1024
+    ) -> FileStream:
+        """Stream over bytes already in memory (backends without streaming support)."""
+
+        async def read(start: int, end: int) -> AsyncGenerator[bytes]:
+            view = memoryview(data)
+            for offset in range(start, end + 1, chunk_size):
+                yield bytes(view[offset : min(offset + chunk_size, end + 1)])
+
+        return cls(metadata=metadata, size=len(data), reader=read)
+
+
+async def iter_bytes(data: bytes, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Chunk iterator over in-memory bytes."""
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset : offset + chunk_size]
+
+
+async def iter_file(handle: IO[bytes], chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Chunk iterator over the rest of an open binary file, read off the event loop."""
+    while chunk := await asyncio.to_thread(handle.read, chunk_size):
+        yield chunk
+
+
+async def limit_size(chunks: AsyncIterator[bytes], max_size: int) -> AsyncIterator[bytes]:
+    """Pass chunks through, raising ``FileTooLargeError`` past ``max_size`` bytes."""
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > max_size:
+            raise FileTooLargeError(f"File too large. Maximum size is {max_size} bytes")
+        yield chunk
+
+
+class DigestingChunks:
+    """Wraps a chunk iterator, computing size and SHA-256 as chunks pass through."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[bytes]:
+        async for chunk in self._chunks:
+            self._digest.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    @property
+    def checksum(self) -> str:
+        return self._digest.hexdigest()
+
+
+async def read_file_range(
+    path: Path, start: int, end: int, chunk_size: int = 1024 * 1024
+) -> AsyncGenerator[bytes]:
+    """Read bytes ``start``..``end`` of a local file in chunks, off the event loop."""
+    remaining = end - start + 1
+    if remaining <= 0:
+        return
+    handle = await asyncio.to_thread(open, path, "rb")
+    try:
+        await asyncio.to_thread(handle.seek, start)
+        while remaining > 0:
+            chunk = await asyncio.to_thread(handle.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
+
+
+class BlockingChunkReader:
+    """
+    File-like ``read()`` over chunks fed from the event loop.
+
+    Lets blocking clients (the MinIO SDK) consume an async upload from a
+    worker thread. The queue is bounded, so at most ``max_chunks`` chunks
+    wait between the producer and the reader.
+    """
+
+    _POLL = 0.5
+
+    def __init__(self, max_chunks: int = 4) -> None:
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._eof = False
+        self._error: BaseException | None = None
+
+    async def feed(self, chunks: AsyncIterable[bytes], consumer: asyncio.Future[Any]) -> None:
+        """
+        Push every chunk, then end-of-file; stop early if ``consumer`` finished.
+
+        A consumer that failed before reading everything has its exception
+        re-raised here.
+        """
+        try:
+            async for chunk in chunks:
+                await self._put(chunk, consumer)
+            await self._put(None, consumer)
+        except BaseException as exc:
+            self._error = exc
+            raise
+
+    async def _put(self, item: bytes | None, consumer: asyncio.Future[Any]) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self._queue.put, item, True, self._POLL)
+                return
+            except queue.Full:
+                if consumer.done():
+                    error = None if consumer.cancelled() else consumer.exception()
+                    if error is not None:
+                        raise error from None
+                    raise RuntimeError("Upload consumer stopped reading") from None
+
+    def read(self, size: int = -1) -> bytes:
+        while (size < 0 or len(self._buffer) < size) and not self._eof:
+            if self._error is not None:
+                raise OSError("Upload aborted") from self._error
+            try:
+                item = self._queue.get(timeout=self._POLL)
+            except queue.Empty:
+                continue
+            if item is None:
+                self._eof = True
+            else:
+                self._buffer += item
+        if size < 0 or size > len(self._buffer):
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Resolve a ``Range`` header to an inclusive ``(start, end)`` byte range.
+
+    Returns None when the header should be ignored (not a single byte range),
+    and raises ``RangeNotSatisfiableError`` when it selects no byte.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    match = _RANGE_RE.match(spec)
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.group(1), match.group(2)
+    if first == "":
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(0, size - suffix), size - 1
+
+    start = int(first)
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    if start >= size or end < start:
+        raise RangeNotSatisfiableError(header)
+    return start, end
+
+
+def etag_matches(header: str | None, etag: str | None) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison)."""
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+class FileStreamResponse(Response):
+    """Response that streams a ``FileStream``, zero-copy for local files when possible."""
+
+    def __init__(
+        self,
+        stream: FileStream,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+    ) -> None:
+        self.stream = stream
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        headers = dict(headers or {})
+        headers.setdefault("Content-Length", str(stream.length))
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope.get("method") == "HEAD" or self.stream.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        path = self.stream.local_path
+        if path is not None and _ZERO_COPY in scope.get("extensions", {}):
+            with open(path, "rb") as handle:
+                await send(
+                    {
+                        "type": _ZERO_COPY,
+                        "file": handle,
+                        "offset": self.stream.start,
+                        "count": self.stream.length,
+                        "more_body": False,
+                    }
+                )
+            return
+
+        async with aclosing(self.stream.chunks()) as chunks:
+            async for chunk in chunks:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
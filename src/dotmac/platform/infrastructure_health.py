@@ -12,6 +12,7 @@ from enum import Enum
 
 import httpx
 
+from dotmac.platform.core.http_pool import get_http_client
 from dotmac.platform.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -202,15 +203,15 @@ async def check_http_endpoint(
         # Only disable SSL verification for HTTPS in non-production environments
         # Production deployments should use valid SSL certificates
         verify_ssl = protocol != "https" or settings.is_production
-        async with httpx.AsyncClient(timeout=timeout, verify=verify_ssl) as client:
-            response = await client.get(url)
-            elapsed_ms = (time.time() - start_time) * 1000
-
-            # Consider 2xx and 3xx as healthy
-            if 200 <= response.status_code < 400:
-                return True, f"HTTP {response.status_code}", elapsed_ms
-            else:
-                return False, f"HTTP {response.status_code}", elapsed_ms
+        client = get_http_client(url, verify=verify_ssl)
+        response = await client.get(url, timeout=timeout)
+        elapsed_ms = (time.time() - start_time) * 1000
+
+        # Consider 2xx and 3xx as healthy
+        if 200 <= response.status_code < 400:
+            return True, f"HTTP {response.status_code}", elapsed_ms
+        else:
+            return False, f"HTTP {response.status_code}", elapsed_ms
 
     except httpx.TimeoutException:
         elapsed_ms = (time.time() - start_time) * 1000
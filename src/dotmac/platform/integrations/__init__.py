@@ -479,7 +479,7 @@ class OpenExchangeRatesIntegration(CurrencyIntegration):
         if self._status != IntegrationStatus.READY or not self._app_id:
             raise RuntimeError("OpenExchangeRates integration not ready")
 
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         params = {
             "app_id": self._app_id,
@@ -493,10 +493,10 @@ class OpenExchangeRatesIntegration(CurrencyIntegration):
             params["symbols"] = ",".join(sorted({c.upper() for c in target_currencies}))
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self._base_url, params=params)
-                response.raise_for_status()
-                payload = response.json()
+            client = get_http_client(self._base_url, profile="fast")
+            response = await client.get(self._base_url, params=params)
+            response.raise_for_status()
+            payload = response.json()
         except Exception as exc:
             logger.error(
                 "Failed to fetch exchange rates",
@@ -11,7 +11,13 @@ from fastapi import HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from dotmac.platform.db import get_session
+from dotmac.platform.db import AsyncSessionLocal
+from dotmac.platform.licensing.entitlements import (
+    EntitlementSnapshot,
+    RoutePrefixTrie,
+    get_entitlement_cache,
+    load_entitlement_snapshot,
+)
 from dotmac.platform.licensing.service_framework import (
     FeatureNotEntitledError,
     LicensingFrameworkService,
@@ -336,22 +342,14 @@ class FeatureEntitlementMiddleware(BaseHTTPMiddleware):
         """
         super().__init__(app)
         self.route_module_map = route_module_map
+        self._routes = RoutePrefixTrie(route_module_map)
 
     async def dispatch(
         self, request: Request, call_next: Callable[[Request], Awaitable[Any]]
     ) -> Any:
         """Process request."""
-        # Check if route requires entitlement
-        path = request.url.path
-        module_config = None
-
-        # Find matching route (longest prefix match)
-        for route_prefix, config in sorted(
-            self.route_module_map.items(), key=lambda x: len(x[0]), reverse=True
-        ):
-            if path.startswith(route_prefix):
-                module_config = config
-                break
+        # Check if route requires entitlement (longest prefix match)
+        module_config = self._routes.match(request.url.path)
 
         if module_config:
             module_code, capability_code = module_config
@@ -359,30 +357,28 @@ class FeatureEntitlementMiddleware(BaseHTTPMiddleware):
             # Extract tenant from request state (set by auth middleware)
             tenant = cast("Tenant | None", getattr(request.state, "tenant", None))
             if tenant:
-                # Get database session
-                async for session in get_session():
-                    db = cast(AsyncSession, session)
-                    service = LicensingFrameworkService(db)
-                    entitled = await service.check_feature_entitlement(
-                        tenant_id=tenant.id,
-                        module_code=module_code,
-                        capability_code=capability_code,
+                snapshot = await get_entitlement_cache().get_or_load(
+                    tenant.id, lambda: self._load_snapshot(tenant.id)
+                )
+                if not snapshot.is_entitled(module_code, capability_code):
+                    feature_name = (
+                        f"{module_code}.{capability_code}" if capability_code else module_code
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN,
+                        detail=f"Feature not entitled: {feature_name}. Please upgrade your plan.",
                     )
-
-                    if not entitled:
-                        feature_name = (
-                            f"{module_code}.{capability_code}" if capability_code else module_code
-                        )
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail=f"Feature not entitled: {feature_name}. Please upgrade your plan.",
-                        )
-                    break
 
         # Continue processing
         response = await call_next(request)
         return response
 
+    @staticmethod
+    async def _load_snapshot(tenant_id: UUID) -> EntitlementSnapshot:
+        """Build the tenant's snapshot; only runs on a cache miss."""
+        async with AsyncSessionLocal() as session:
+            return await load_entitlement_snapshot(session, tenant_id)
+
 
 # ========================================================================
 # DEPENDENCY INJECTION HELPERS
@@ -0,0 +1,315 @@
+"""
+Tenant entitlement snapshots.
+
+``check_feature_entitlement`` used to run four sequential queries
+(subscription, module, subscription module, capability) for every entitled
+request. An ``EntitlementSnapshot`` answers every check for a tenant from
+memory: the enabled module codes of its current subscription with their
+expiry, and the active capability codes of each module. It is built with one
+joined query.
+
+Snapshots live in a per-process TTL cache in front of Redis, with
+single-flight loading. Subscription and add-on changes drop the tenant's
+snapshot locally and in Redis, and broadcast the tenant id over pub/sub so
+every worker drops its copy.
+
+``RoutePrefixTrie`` compiles the middleware's route map once, so the
+longest matching prefix is found in one walk over the request path.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dotmac.platform.core.snapshot_cache import SnapshotCache
+from dotmac.platform.licensing.framework import (
+    FeatureModule,
+    ModuleCapability,
+    SubscriptionModule,
+    SubscriptionStatus,
+    TenantSubscription,
+)
+from dotmac.platform.redis_client import RedisClientType
+from dotmac.platform.settings import settings
+
+INVALIDATION_CHANNEL = "licensing:entitlements:invalidate"
+KEY_PREFIX = "licensing:entitlements"
+
+# PAST_DUE keeps access during the grace period
+ENTITLED_STATUSES = (
+    SubscriptionStatus.TRIAL,
+    SubscriptionStatus.ACTIVE,
+    SubscriptionStatus.PAST_DUE,
+)
+
+
+# ========================================================================
+# SNAPSHOTS
+# ========================================================================
+
+
+@dataclass(frozen=True)
+class EntitlementSnapshot:
+    """Everything needed to answer feature entitlement checks for one tenant."""
+
+    tenant_id: str
+    subscription_id: str | None = None
+    # module_code -> expiry as a POSIX timestamp (None never expires)
+    modules: Mapping[str, float | None] = field(default_factory=dict)
+    # module_code -> active capability codes
+    capabilities: Mapping[str, frozenset[str]] = field(default_factory=dict)
+
+    def is_entitled(
+        self,
+        module_code: str,
+        capability_code: str | None = None,
+        now: float | None = None,
+    ) -> bool:
+        if module_code not in self.modules:
+            return False
+
+        expires_at = self.modules[module_code]
+        if expires_at is not None and expires_at < (time.time() if now is None else now):
+            return False
+
+        if capability_code:
+            return capability_code in self.capabilities.get(module_code, ())
+        return True
+
+    def to_cache_payload(self) -> dict[str, Any]:
+        return {
+            "tenant_id": self.tenant_id,
+            "subscription_id": self.subscription_id,
+            "modules": dict(self.modules),
+            "capabilities": {module: sorted(codes) for module, codes in self.capabilities.items()},
+        }
+
+    @classmethod
+    def from_cache_payload(cls, payload: Any) -> EntitlementSnapshot | None:
+        try:
+            return cls(
+                tenant_id=str(payload["tenant_id"]),
+                subscription_id=payload.get("subscription_id"),
+                modules={
+                    str(module): None if expires_at is None else float(expires_at)
+                    for module, expires_at in payload["modules"].items()
+                },
+                capabilities={
+                    str(module): frozenset(codes)
+                    for module, codes in payload["capabilities"].items()
+                },
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+
+async def load_entitlement_snapshot(db: AsyncSession, tenant_id: UUID | str) -> EntitlementSnapshot:
+    """Build a tenant's snapshot from its current subscription in one query."""
+    tenant_key = str(tenant_id)
+    current_subscription = (
+        select(TenantSubscription.id)
+        .where(
+            and_(
+                TenantSubscription.tenant_id == tenant_key,
+                TenantSubscription.status.in_(ENTITLED_STATUSES),
+            )
+        )
+        .order_by(TenantSubscription.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            TenantSubscription.id,
+            FeatureModule.module_code,
+            SubscriptionModule.expires_at,
+            ModuleCapability.capability_code,
+        )
+        .select_from(TenantSubscription)
+        .outerjoin(
+            SubscriptionModule,
+            and_(
+                SubscriptionModule.subscription_id == TenantSubscription.id,
+                SubscriptionModule.is_enabled,
+            ),
+        )
+        .outerjoin(FeatureModule, FeatureModule.id == SubscriptionModule.module_id)
+        .outerjoin(
+            ModuleCapability,
+            and_(
+                ModuleCapability.module_id == FeatureModule.id,
+                ModuleCapability.is_active,
+            ),
+        )
+        .where(TenantSubscription.id == current_subscription)
+    )
+
+    subscription_id: str | None = None
+    modules: dict[str, float | None] = {}
+    capabilities: dict[str, set[str]] = {}
+    for row_subscription_id, module_code, expires_at, capability_code in result.all():
+        subscription_id = str(row_subscription_id)
+        if module_code is None:
+            continue
+
+        expiry = _timestamp(expires_at)
+        if module_code not in modules:
+            modules[module_code] = expiry
+        else:
+            # The same module enabled twice: the later expiry wins
+            current = modules[module_code]
+            if current is not None:
+                modules[module_code] = None if expiry is None else max(current, expiry)
+
+        codes = capabilities.setdefault(module_code, set())
+        if capability_code is not None:
+            codes.add(capability_code)
+
+    return EntitlementSnapshot(
+        tenant_id=tenant_key,
+        subscription_id=subscription_id,
+        modules=modules,
+        capabilities={module: frozenset(codes) for module, codes in capabilities.items()},
+    )
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # SQLite hands back naive UTC datetimes
+        return value.replace(tzinfo=UTC).timestamp()
+    return value.timestamp()
+
+
+# ========================================================================
+# CACHE
+# ========================================================================
+
+
+class EntitlementCache(SnapshotCache[EntitlementSnapshot]):
+    """Per-process L1 in front of async Redis for tenant entitlement snapshots."""
+
+    def __init__(
+        self,
+        ttl: int | None = None,
+        local_ttl: float | None = None,
+        local_max_size: int | None = None,
+        redis: RedisClientType | None = None,
+    ) -> None:
+        licensing = settings.licensing
+        super().__init__(
+            key_prefix=KEY_PREFIX,
+            channel=INVALIDATION_CHANNEL,
+            ttl=licensing.entitlement_cache_ttl if ttl is None else ttl,
+            local_ttl=licensing.entitlement_local_cache_ttl if local_ttl is None else local_ttl,
+            local_max_size=(
+                licensing.entitlement_local_cache_size if local_max_size is None else local_max_size
+            ),
+            redis=redis,
+        )
+        self._invalidation_hooks: list[Callable[[str | None], None]] = []
+
+    @staticmethod
+    def redis_key(tenant_id: UUID | str) -> str:
+        return f"{KEY_PREFIX}:{tenant_id}"
+
+    async def get_or_load(
+        self,
+        tenant_id: UUID | str,
+        loader: Callable[[], Awaitable[EntitlementSnapshot]],
+    ) -> EntitlementSnapshot:
+        """Return the tenant's snapshot, calling ``loader`` at most once on a miss."""
+        return await self.fetch(
+            str(tenant_id),
+            self.redis_key(tenant_id),
+            loader,
+            EntitlementSnapshot.from_cache_payload,
+        )
+
+    def add_invalidation_hook(self, hook: Callable[[str | None], None]) -> None:
+        """Call ``hook(tenant_id)`` (``None`` for every tenant) on each invalidation."""
+        self._invalidation_hooks.append(hook)
+
+    def invalidate_local(self, scope: UUID | str | None = None) -> None:
+        """Drop L1 snapshots for one tenant, or for every tenant."""
+        for hook in self._invalidation_hooks:
+            hook(None if scope is None else str(scope))
+        super().invalidate_local(scope)
+
+
+_entitlement_cache: EntitlementCache | None = None
+
+
+def get_entitlement_cache() -> EntitlementCache:
+    """Return the process-wide tenant entitlement cache."""
+    global _entitlement_cache
+    if _entitlement_cache is None:
+        _entitlement_cache = EntitlementCache()
+    return _entitlement_cache
+
+
+# ========================================================================
+# ROUTE MATCHING
+# ========================================================================
+
+
+class _TrieNode[T]:
+    __slots__ = ("children", "has_value", "value")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode[T]] = {}
+        self.has_value = False
+        self.value: T | None = None
+
+
+class RoutePrefixTrie[T]:
+    """
+    Longest-prefix lookup over route prefixes.
+
+    Matching follows ``str.startswith``: ``/api/v1/billing`` matches
+    ``/api/v1/billing/invoices`` (and ``/api/v1/billingx``), and the longest
+    matching prefix wins.
+    """
+
+    def __init__(self, routes: Mapping[str, T]) -> None:
+        self._root: _TrieNode[T] = _TrieNode()
+        for prefix, value in routes.items():
+            node = self._root
+            for char in prefix:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode()
+                node = child
+            node.has_value = True
+            node.value = value
+
+    def match(self, path: str) -> T | None:
+        """Value of the longest prefix of ``path``, or ``None``."""
+        node = self._root
+        matched = node.value if node.has_value else None
+        for char in path:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            if node.has_value:
+                matched = node.value
+        return matched
+
+
+__all__ = [
+    "EntitlementCache",
+    "EntitlementSnapshot",
+    "RoutePrefixTrie",
+    "get_entitlement_cache",
+    "load_entitlement_snapshot",
+]
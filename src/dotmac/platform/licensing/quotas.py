@@ -0,0 +1,695 @@
+"""
+Redis-backed quota counters.
+
+``consume_quota`` used to run four SELECTs and then lock the tenant's
+``SubscriptionQuotaUsage`` row with ``SELECT ... FOR UPDATE`` until commit,
+so every API call of a busy tenant queued on that one row. With the quota
+engine the hot path is:
+
+- the tenant's quota allocations (current subscription, plan allocation,
+  quota definition), loaded with one joined query and kept in a
+  per-process TTL cache that is dropped whenever the tenant's entitlements
+  are invalidated;
+- one Lua script per consumption that rolls the period over if it ended,
+  checks the limit and increments the counter atomically.
+
+Counters live in Redis hashes keyed by subscription and quota. A counter
+missing from Redis (first use, eviction, a flushed Redis) is seeded from the
+usage row, so the database stays the durable copy.
+
+Usage is written back to ``SubscriptionQuotaUsage`` in batches. Consumptions
+mark their counter dirty in a shared Redis set and append a usage log entry
+to a Redis list. A flusher on every worker copies the absolute counter values
+and the log entries into the database in one transaction. Only after the
+commit does it trim the log and clear the dirty marks, and a mark is cleared
+only if the counter has not changed since it was read. A worker that
+crashes mid-flush therefore loses nothing: the next flush on any worker
+picks the same keys up again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+import structlog
+from cachetools import TTLCache
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dotmac.platform.db import async_session_maker
+from dotmac.platform.licensing.entitlements import get_entitlement_cache
+from dotmac.platform.licensing.framework import (
+    FeatureUsageLog,
+    PlanQuotaAllocation,
+    QuotaDefinition,
+    SubscriptionQuotaUsage,
+    SubscriptionStatus,
+    TenantSubscription,
+)
+from dotmac.platform.redis_client import RedisClientType, redis_manager
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "licensing:quota"
+DIRTY_KEY = f"{KEY_PREFIX}:dirty"
+LOG_KEY = f"{KEY_PREFIX}:log"
+FLUSH_LOCK_KEY = f"{KEY_PREFIX}:flush_lock"
+
+QUOTA_STATUSES = (SubscriptionStatus.TRIAL, SubscriptionStatus.ACTIVE)
+
+# Counter hash fields: u = usage, s/e = period start/end (epoch seconds,
+# e = 0 never rolls over), a = allocation, r = overage rate, v = version.
+
+# KEYS[1] - counter hash
+# KEYS[2] - dirty set
+# ARGV[1] - quantity (negative to release)
+# ARGV[2] - allocated quantity (-1 = unlimited)
+# ARGV[3] - overage allowed ('1' / '0')
+# ARGV[4] - now (epoch seconds)
+# ARGV[5] - end of the period starting now (0 = no reset period)
+# ARGV[6] - overage rate
+# ARGV[7] - counter TTL in seconds
+# Returns {status, usage}: 1 consumed, 0 over the limit, -1 counter missing.
+CONSUME_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'u', 'e')
+if not state[1] then
+    return {-1, 0}
+end
+local usage = tonumber(state[1])
+local period_end = tonumber(state[2]) or 0
+local now = tonumber(ARGV[4])
+if period_end > 0 and period_end <= now then
+    usage = 0
+    redis.call('HSET', KEYS[1], 'u', 0, 's', ARGV[4], 'e', ARGV[5])
+    redis.call('HINCRBY', KEYS[1], 'v', 1)
+    redis.call('SADD', KEYS[2], KEYS[1])
+end
+
+local quantity = tonumber(ARGV[1])
+local allocated = tonumber(ARGV[2])
+if quantity > 0 and allocated ~= -1 and usage + quantity > allocated and ARGV[3] ~= '1' then
+    return {0, usage}
+end
+
+usage = usage + quantity
+if usage < 0 then
+    usage = 0
+end
+redis.call('HSET', KEYS[1], 'u', usage, 'a', allocated, 'r', ARGV[6])
+redis.call('HINCRBY', KEYS[1], 'v', 1)
+redis.call('SADD', KEYS[2], KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[7]))
+return {1, usage}
+"""
+
+# KEYS[1] - counter hash
+# ARGV[1..5] - usage, period start, period end, allocated, overage rate
+# ARGV[6] - counter TTL in seconds
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('HSET', KEYS[1], 'u', ARGV[1], 's', ARGV[2], 'e', ARGV[3],
+        'a', ARGV[4], 'r', ARGV[5], 'v', 0)
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[6]))
+end
+return 1
+"""
+
+# KEYS[1] - dirty set
+# KEYS[2] - counter hash
+# ARGV[1] - version that was written to the database
+CLEAR_DIRTY_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'v') == ARGV[1] then
+    return redis.call('SREM', KEYS[1], KEYS[2])
+end
+return 0
+"""
+
+
+def quota_period_end(start: datetime, reset_period: str | None) -> datetime:
+    """Calculate when a quota period starting at ``start`` ends."""
+    if not reset_period:
+        return start  # Treat as no-op period; effectively unlimited
+
+    normalized = reset_period.strip().upper()
+    if normalized == "MONTHLY":
+        # Next month, same day
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+        return start.replace(month=start.month + 1)
+    if normalized == "QUARTERLY":
+        # Add 3 months
+        month = start.month + 3
+        year = start.year
+        while month > 12:
+            month -= 12
+            year += 1
+        return start.replace(year=year, month=month)
+    if normalized in ("ANNUAL", "ANNUALLY"):
+        return start.replace(year=start.year + 1)
+
+    return start
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        # SQLite hands back naive UTC datetimes
+        return value.replace(tzinfo=UTC).timestamp()
+    return value.timestamp()
+
+
+def _as_str(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+# ========================================================================
+# ALLOCATIONS
+# ========================================================================
+
+
+@dataclass(frozen=True)
+class QuotaAllocation:
+    """A quota as allocated to a subscription by its plan."""
+
+    subscription_id: UUID
+    quota_id: UUID
+    quota_code: str
+    allocated: int  # -1 = unlimited
+    allow_overage: bool
+    overage_rate: float
+    soft_limit: int | None
+    reset_period: str | None
+
+    @property
+    def counter_key(self) -> str:
+        return f"{KEY_PREFIX}:{self.subscription_id}:{self.quota_id}"
+
+    def overage(self, usage: int) -> int:
+        """Usage past the allocation (0 for unlimited quotas)."""
+        return max(0, usage - self.allocated) if self.allocated != -1 else 0
+
+    def next_period_end(self, now: float) -> float:
+        """End of a period starting at ``now`` (0 when the quota never resets)."""
+        if not self.reset_period:
+            return 0.0
+        start = datetime.fromtimestamp(now, UTC)
+        end = quota_period_end(start, self.reset_period)
+        return end.timestamp() if end > start else 0.0
+
+
+@dataclass(frozen=True)
+class TenantQuotaAllocations:
+    """The quotas of a tenant's current (trial or active) subscription."""
+
+    tenant_id: str
+    subscription_id: UUID | None = None
+    quotas: Mapping[str, QuotaAllocation] = field(default_factory=dict)
+
+
+async def load_quota_allocations(db: AsyncSession, tenant_id: UUID | str) -> TenantQuotaAllocations:
+    """Load a tenant's quota allocations in one query."""
+    tenant_key = str(tenant_id)
+    current_subscription = (
+        select(TenantSubscription.id)
+        .where(
+            and_(
+                TenantSubscription.tenant_id == tenant_key,
+                TenantSubscription.status.in_(QUOTA_STATUSES),
+            )
+        )
+        .order_by(TenantSubscription.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(
+            TenantSubscription.id,
+            QuotaDefinition.id,
+            QuotaDefinition.quota_code,
+            QuotaDefinition.reset_period,
+            QuotaDefinition.overage_rate,
+            PlanQuotaAllocation.included_quantity,
+            PlanQuotaAllocation.allow_overage,
+            PlanQuotaAllocation.overage_rate_override,
+            PlanQuotaAllocation.soft_limit,
+        )
+        .select_from(TenantSubscription)
+        .outerjoin(PlanQuotaAllocation, PlanQuotaAllocation.plan_id == TenantSubscription.plan_id)
+        .outerjoin(QuotaDefinition, QuotaDefinition.id == PlanQuotaAllocation.quota_id)
+        .where(TenantSubscription.id == current_subscription)
+    )
+
+    subscription_id: UUID | None = None
+    quotas: dict[str, QuotaAllocation] = {}
+    for row in result.all():
+        subscription_id = row[0]
+        quota_id, quota_code, reset_period, default_rate = row[1], row[2], row[3], row[4]
+        if quota_id is None:
+            continue
+        included, allow_overage, rate_override, soft_limit = row[5], row[6], row[7], row[8]
+        quotas[quota_code] = QuotaAllocation(
+            subscription_id=subscription_id,
+            quota_id=quota_id,
+            quota_code=quota_code,
+            allocated=included,
+            allow_overage=bool(allow_overage),
+            overage_rate=float(rate_override or default_rate or 0.0),
+            soft_limit=soft_limit,
+            reset_period=reset_period,
+        )
+
+    return TenantQuotaAllocations(
+        tenant_id=tenant_key, subscription_id=subscription_id, quotas=quotas
+    )
+
+
+# ========================================================================
+# ENGINE
+# ========================================================================
+
+
+@dataclass(frozen=True)
+class QuotaCounterResult:
+    """Outcome of an atomic counter update."""
+
+    allowed: bool
+    usage: int  # Usage after the update, or the current usage when refused
+
+
+class QuotaEngine:
+    """
+    Quota counters in Redis with batched write-behind to the database.
+
+    Usage:
+        engine = get_quota_engine()
+        if engine.enabled:
+            allocations = await engine.allocations(db, tenant_id)
+            result = await engine.consume(db, allocations.quotas["api_calls"], 1)
+    """
+
+    def __init__(
+        self,
+        redis: RedisClientType | None = None,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        *,
+        allocation_ttl: float | None = None,
+        counter_ttl: int | None = None,
+        flush_interval: float | None = None,
+        flush_batch_size: int | None = None,
+    ) -> None:
+        config = settings.licensing
+        if allocation_ttl is None:
+            allocation_ttl = config.quota_allocation_cache_ttl
+        self.counter_ttl = config.quota_counter_ttl if counter_ttl is None else counter_ttl
+        self.flush_interval = (
+            config.quota_flush_interval if flush_interval is None else flush_interval
+        )
+        self.flush_batch_size = (
+            config.quota_flush_batch_size if flush_batch_size is None else flush_batch_size
+        )
+
+        self._allocations: TTLCache[str, TenantQuotaAllocations] | None = (
+            TTLCache(maxsize=config.quota_allocation_cache_size, ttl=allocation_ttl)
+            if allocation_ttl > 0 and config.quota_allocation_cache_size > 0
+            else None
+        )
+        self._redis_override = redis
+        self._session_factory = session_factory or async_session_maker
+        self._scripts: dict[str, Any] = {}
+        self._scripts_client: Any = None
+        self._flusher_task: asyncio.Task[None] | None = None
+
+    # ------------------------------------------------------------------
+    # Redis
+    # ------------------------------------------------------------------
+
+    def _redis(self) -> RedisClientType | None:
+        if self._redis_override is not None:
+            return self._redis_override
+        try:
+            return redis_manager.get_client()
+        except RuntimeError:
+            # Redis not initialised (CLI tools, tests): use the row-lock path
+            return None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether consumptions should go through Redis counters."""
+        return settings.licensing.quota_counters_enabled and self._redis() is not None
+
+    def _script(self, redis: RedisClientType, name: str, source: str) -> Any:
+        if self._scripts_client is not redis:
+            self._scripts = {}
+            self._scripts_client = redis
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = redis.register_script(source)
+        return script
+
+    def _require_redis(self) -> RedisClientType:
+        redis = self._redis()
+        if redis is None:
+            raise RuntimeError("Quota counters need Redis")
+        return redis
+
+    # ------------------------------------------------------------------
+    # Allocations
+    # ------------------------------------------------------------------
+
+    async def allocations(self, db: AsyncSession, tenant_id: UUID | str) -> TenantQuotaAllocations:
+        """The tenant's allocations, from the per-process cache when fresh."""
+        key = str(tenant_id)
+        if self._allocations is not None:
+            cached = self._allocations.get(key)
+            if cached is not None:
+                return cached
+
+        allocations = await load_quota_allocations(db, key)
+        if self._allocations is not None:
+            self._allocations[key] = allocations
+        return allocations
+
+    def invalidate_allocations(self, tenant_id: UUID | str | None = None) -> None:
+        """Drop cached allocations for one tenant, or for every tenant."""
+        if self._allocations is None:
+            return
+        if tenant_id is None:
+            self._allocations.clear()
+        else:
+            self._allocations.pop(str(tenant_id), None)
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    async def consume(
+        self,
+        db: AsyncSession,
+        allocation: QuotaAllocation,
+        quantity: int = 1,
+        *,
+        log: Mapping[str, Any] | None = None,
+    ) -> QuotaCounterResult:
+        """
+        Atomically add ``quantity`` to the counter unless it would exceed the limit.
+
+        A negative ``quantity`` releases usage (never below zero). ``log`` is
+        buffered as a ``FeatureUsageLog`` row for the next flush, with the
+        resulting ``overage`` and ``overage_charge`` added to its metadata.
+        """
+        redis = self._require_redis()
+        script = self._script(redis, "consume", CONSUME_SCRIPT)
+        key = allocation.counter_key
+
+        for _ in range(2):
+            now = time.time()
+            status, usage = await script(
+                keys=[key, DIRTY_KEY],
+                args=[
+                    quantity,
+                    allocation.allocated,
+                    "1" if allocation.allow_overage else "0",
+                    f"{now:.6f}",
+                    f"{allocation.next_period_end(now):.6f}",
+                    allocation.overage_rate,
+                    self.counter_ttl,
+                ],
+            )
+            if int(status) != -1:
+                break
+            await self._seed(db, redis, allocation)
+        else:
+            raise RuntimeError(f"Quota counter {key} could not be seeded")
+
+        result = QuotaCounterResult(allowed=int(status) == 1, usage=int(usage))
+        if result.allowed and log is not None:
+            overage = allocation.overage(result.usage)
+            entry = {
+                **log,
+                "metadata": {
+                    "overage": overage,
+                    "overage_charge": overage * allocation.overage_rate,
+                    **log.get("metadata", {}),
+                },
+            }
+            try:
+                await redis.rpush(LOG_KEY, json.dumps(entry, default=str))
+            except Exception as e:
+                logger.warning("licensing.quota.log_buffer_failed", key=key, error=str(e))
+        return result
+
+    async def usage(self, db: AsyncSession, allocation: QuotaAllocation) -> int:
+        """Current usage in the counter's period, without changing it."""
+        redis = self._require_redis()
+        key = allocation.counter_key
+        state = await redis.hmget(key, ["u", "e"])
+        if state[0] is None:
+            await self._seed(db, redis, allocation)
+            state = await redis.hmget(key, ["u", "e"])
+            if state[0] is None:
+                return 0
+
+        period_end = float(state[1] or 0)
+        if 0 < period_end <= time.time():
+            return 0
+        return int(state[0])
+
+    async def _seed(
+        self, db: AsyncSession, redis: RedisClientType, allocation: QuotaAllocation
+    ) -> None:
+        """Initialise a missing counter from the usage row."""
+        result = await db.execute(
+            select(
+                SubscriptionQuotaUsage.current_usage,
+                SubscriptionQuotaUsage.period_start,
+                SubscriptionQuotaUsage.period_end,
+            ).where(
+                and_(
+                    SubscriptionQuotaUsage.subscription_id == allocation.subscription_id,
+                    SubscriptionQuotaUsage.quota_id == allocation.quota_id,
+                )
+            )
+        )
+        row = result.first()
+        now = time.time()
+        if row is None:
+            usage, period_start, period_end = 0, now, allocation.next_period_end(now)
+        else:
+            usage = row[0]
+            period_start = _timestamp(row[1])
+            # Quotas without a reset period never roll over
+            period_end = _timestamp(row[2]) if allocation.reset_period else 0.0
+            if period_end and period_end <= now:
+                usage, period_start, period_end = 0, now, allocation.next_period_end(now)
+
+        await self._script(redis, "seed", SEED_SCRIPT)(
+            keys=[allocation.counter_key],
+            args=[
+                usage,
+                f"{period_start:.6f}",
+                f"{period_end:.6f}",
+                allocation.allocated,
+                allocation.overage_rate,
+                self.counter_ttl,
+            ],
+        )
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> int:
+        """
+        Write dirty counters and buffered usage logs to the database.
+
+        Returns the number of counters written. Safe to run on every worker:
+        a Redis lock keeps flushes from overlapping.
+        """
+        redis = self._redis()
+        if redis is None:
+            return 0
+
+        token = uuid4().hex
+        lock_ttl_ms = max(int(self.flush_interval * 1000) * 6, 30_000)
+        if not await redis.set(FLUSH_LOCK_KEY, token, nx=True, px=lock_ttl_ms):
+            return 0
+
+        written = 0
+        try:
+            while True:
+                counters, logs = await self._flush_batch(redis)
+                written += counters
+                if max(counters, logs) < self.flush_batch_size:
+                    break
+        finally:
+            if _as_str(await redis.get(FLUSH_LOCK_KEY) or "") == token:
+                await redis.delete(FLUSH_LOCK_KEY)
+        if written:
+            logger.debug("licensing.quota.flushed", counters=written)
+        return written
+
+    async def _flush_batch(self, redis: RedisClientType) -> tuple[int, int]:
+        dirty: dict[str, None] = {}
+        async for key in redis.sscan_iter(DIRTY_KEY, count=self.flush_batch_size):
+            dirty[_as_str(key)] = None
+            if len(dirty) >= self.flush_batch_size:
+                break
+        keys = list(dirty)
+        logs = await redis.lrange(LOG_KEY, 0, self.flush_batch_size - 1)
+        if not keys and not logs:
+            return 0, 0
+
+        pipe = redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(key, ["u", "s", "e", "a", "r", "v"])
+        states = await pipe.execute() if keys else []
+
+        counters: dict[tuple[UUID, UUID], tuple[str, list[Any]]] = {}
+        stale: list[str] = []
+        for key, state in zip(keys, states, strict=True):
+            if state[0] is None:
+                # Expired or evicted: nothing left to write
+                stale.append(key)
+                continue
+            subscription_id, quota_id = key.rsplit(":", 2)[-2:]
+            counters[(UUID(subscription_id), UUID(quota_id))] = (key, state)
+
+        async with self._session_factory() as session:
+            if counters:
+                await self._write_counters(session, counters)
+            session.add_all(self._usage_logs(logs))
+            await session.commit()
+
+        # Only after the commit: anything changed since it was read stays dirty
+        if logs:
+            await redis.ltrim(LOG_KEY, len(logs), -1)
+        clear = self._script(redis, "clear_dirty", CLEAR_DIRTY_SCRIPT)
+        pipe = redis.pipeline(transaction=False)
+        for key, state in counters.values():
+            await clear(keys=[DIRTY_KEY, key], args=[_as_str(state[5])], client=pipe)
+        if stale:
+            pipe.srem(DIRTY_KEY, *stale)
+        await pipe.execute()
+        return len(keys), len(logs)
+
+    async def _write_counters(
+        self,
+        session: AsyncSession,
+        counters: Mapping[tuple[UUID, UUID], tuple[str, list[Any]]],
+    ) -> None:
+        subscription_ids = {subscription_id for subscription_id, _ in counters}
+        result = await session.execute(
+            select(SubscriptionQuotaUsage).where(
+                SubscriptionQuotaUsage.subscription_id.in_(subscription_ids)
+            )
+        )
+        rows = {(row.subscription_id, row.quota_id): row for row in result.scalars().all()}
+
+        for (subscription_id, quota_id), (_, state) in counters.items():
+            usage, allocated, rate = int(state[0]), int(state[3]), float(state[4])
+            period_start = datetime.fromtimestamp(float(state[1]), UTC)
+            period_end_ts = float(state[2] or 0)
+            # Usage rows of quotas that never reset end where they start
+            period_end = (
+                datetime.fromtimestamp(period_end_ts, UTC) if period_end_ts else period_start
+            )
+            overage = max(0, usage - allocated) if allocated != -1 else 0
+
+            row = rows.get((subscription_id, quota_id))
+            if row is None:
+                row = SubscriptionQuotaUsage(
+                    id=uuid4(), subscription_id=subscription_id, quota_id=quota_id
+                )
+                session.add(row)
+            row.allocated_quantity = allocated
+            row.current_usage = usage
+            row.period_start = period_start
+            row.period_end = period_end
+            row.overage_quantity = overage
+            row.overage_charges = overage * rate
+
+    @staticmethod
+    def _usage_logs(entries: list[Any]) -> list[FeatureUsageLog]:
+        logs = []
+        for raw in entries:
+            try:
+                entry = json.loads(raw)
+                logs.append(
+                    FeatureUsageLog(
+                        id=uuid4(),
+                        tenant_id=entry["tenant_id"],
+                        module_id=UUID(entry["quota_id"]),
+                        capability_code=None,
+                        user_id=None,
+                        action=entry.get("action", "quota.consume"),
+                        resource_type="quota",
+                        resource_id=entry["quota_code"],
+                        extra_metadata=entry.get("metadata", {}),
+                        created_at=datetime.fromtimestamp(entry["at"], UTC),
+                    )
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("licensing.quota.bad_log_entry", error=str(e))
+        return logs
+
+    async def start_flusher(self) -> None:
+        """Start the background write-behind loop."""
+        if self._flusher_task is not None and not self._flusher_task.done():
+            return
+        self._flusher_task = asyncio.create_task(self._flush_loop())
+
+    async def stop_flusher(self) -> None:
+        """Stop the write-behind loop and flush what is left."""
+        task, self._flusher_task = self._flusher_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning("licensing.quota.final_flush_failed", error=str(e))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("licensing.quota.flush_failed", error=str(e))
+
+
+_quota_engine: QuotaEngine | None = None
+
+
+def get_quota_engine() -> QuotaEngine:
+    """Return the process-wide quota engine."""
+    global _quota_engine
+    if _quota_engine is None:
+        _quota_engine = QuotaEngine()
+        # Subscription changes invalidate entitlements; allocations follow them
+        get_entitlement_cache().add_invalidation_hook(_quota_engine.invalidate_allocations)
+    return _quota_engine
+
+
+__all__ = [
+    "QuotaAllocation",
+    "QuotaCounterResult",
+    "QuotaEngine",
+    "TenantQuotaAllocations",
+    "get_quota_engine",
+    "load_quota_allocations",
+    "quota_period_end",
+]
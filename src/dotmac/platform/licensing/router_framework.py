@@ -21,13 +21,12 @@ from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-logger = structlog.get_logger(__name__)
-
 from dotmac.platform.auth.core import UserInfo
 from dotmac.platform.auth.dependencies import get_current_user
 from dotmac.platform.auth.platform_admin import require_platform_admin
 from dotmac.platform.auth.rbac_dependencies import require_any_role
 from dotmac.platform.db import get_async_session
+from dotmac.platform.licensing.entitlements import get_entitlement_cache
 from dotmac.platform.licensing.framework import (
     FeatureModule,
     PlanModule,
@@ -81,6 +80,8 @@ from dotmac.platform.licensing.service_framework import (
 from dotmac.platform.tenant.dependencies import get_current_tenant
 from dotmac.platform.tenant.models import Tenant
 
+logger = structlog.get_logger(__name__)
+
 router = APIRouter(prefix="/licensing", tags=["Licensing Framework"])
 
 
@@ -292,6 +293,9 @@ async def update_feature_module(
     await db.commit()
     await db.refresh(module)
 
+    # Snapshots are keyed by module code
+    await get_entitlement_cache().invalidate()
+
     # Reload with capabilities
     result = await db.execute(
         select(FeatureModule)
@@ -732,9 +736,7 @@ async def get_current_subscription(
         .options(
             selectinload(TenantSubscription.plan),
             selectinload(TenantSubscription.active_modules).selectinload(SubscriptionModule.module),
-            selectinload(TenantSubscription.quota_usage).selectinload(
-                SubscriptionQuotaUsage.quota
-            ),
+            selectinload(TenantSubscription.quota_usage).selectinload(SubscriptionQuotaUsage.quota),
         )
         .where(
             TenantSubscription.tenant_id == tenant.id,
@@ -1067,10 +1069,16 @@ class LicensingCharts(BaseModel):
 
     model_config = ConfigDict()
 
-    subscriptions_by_status: list[LicensingChartDataPoint] = Field(description="Subscriptions by status")
-    subscriptions_by_plan: list[LicensingChartDataPoint] = Field(description="Subscriptions by plan")
+    subscriptions_by_status: list[LicensingChartDataPoint] = Field(
+        description="Subscriptions by status"
+    )
+    subscriptions_by_plan: list[LicensingChartDataPoint] = Field(
+        description="Subscriptions by plan"
+    )
     modules_by_category: list[LicensingChartDataPoint] = Field(description="Modules by category")
-    subscription_trend: list[LicensingChartDataPoint] = Field(description="Monthly subscription trend")
+    subscription_trend: list[LicensingChartDataPoint] = Field(
+        description="Monthly subscription trend"
+    )
 
 
 class LicensingAlert(BaseModel):
@@ -1159,8 +1167,12 @@ async def get_licensing_dashboard(
         # Subscription counts
         subscription_counts_query = select(
             func.count(TenantSubscription.id).label("total"),
-            func.sum(case((TenantSubscription.status == SubscriptionStatus.ACTIVE.value, 1), else_=0)).label("active"),
-            func.sum(case((TenantSubscription.status == SubscriptionStatus.TRIAL.value, 1), else_=0)).label("trial"),
+            func.sum(
+                case((TenantSubscription.status == SubscriptionStatus.ACTIVE.value, 1), else_=0)
+            ).label("active"),
+            func.sum(
+                case((TenantSubscription.status == SubscriptionStatus.TRIAL.value, 1), else_=0)
+            ).label("trial"),
         )
         subscription_counts_result = await db.execute(subscription_counts_query)
         subscription_counts = subscription_counts_result.one()
@@ -1190,10 +1202,14 @@ async def get_licensing_dashboard(
         ]
 
         # Subscriptions by plan
-        plan_query = select(
-            ServicePlan.plan_name,
-            func.count(TenantSubscription.id),
-        ).join(ServicePlan, TenantSubscription.plan_id == ServicePlan.id).group_by(ServicePlan.plan_name)
+        plan_query = (
+            select(
+                ServicePlan.plan_name,
+                func.count(TenantSubscription.id),
+            )
+            .join(ServicePlan, TenantSubscription.plan_id == ServicePlan.id)
+            .group_by(ServicePlan.plan_name)
+        )
         plan_result = await db.execute(plan_query)
         subscriptions_by_plan = [
             LicensingChartDataPoint(label=row[0] if row[0] else "Unknown Plan", value=row[1])
@@ -1201,10 +1217,14 @@ async def get_licensing_dashboard(
         ]
 
         # Modules by category
-        category_query = select(
-            FeatureModule.category,
-            func.count(FeatureModule.id),
-        ).where(FeatureModule.is_active.is_(True)).group_by(FeatureModule.category)
+        category_query = (
+            select(
+                FeatureModule.category,
+                func.count(FeatureModule.id),
+            )
+            .where(FeatureModule.is_active.is_(True))
+            .group_by(FeatureModule.category)
+        )
         category_result = await db.execute(category_query)
         modules_by_category = [
             LicensingChartDataPoint(label=row[0] if row[0] else "uncategorized", value=row[1])
@@ -1224,10 +1244,12 @@ async def get_licensing_dashboard(
             month_count_result = await db.execute(month_count_query)
             month_count = month_count_result.scalar() or 0
 
-            subscription_trend.append(LicensingChartDataPoint(
-                label=month_date.strftime("%b %Y"),
-                value=month_count,
-            ))
+            subscription_trend.append(
+                LicensingChartDataPoint(
+                    label=month_date.strftime("%b %Y"),
+                    value=month_count,
+                )
+            )
 
         charts = LicensingCharts(
             subscriptions_by_status=subscriptions_by_status,
@@ -1249,13 +1271,15 @@ async def get_licensing_dashboard(
         expiring_trials = trial_expiring_result.scalar() or 0
 
         if expiring_trials > 0:
-            alerts.append(LicensingAlert(
-                type="warning",
-                title="Expiring Trials",
-                message=f"{expiring_trials} trial(s) expiring in the next 7 days",
-                count=expiring_trials,
-                action_url="/licensing/subscriptions?status=trial",
-            ))
+            alerts.append(
+                LicensingAlert(
+                    type="warning",
+                    title="Expiring Trials",
+                    message=f"{expiring_trials} trial(s) expiring in the next 7 days",
+                    count=expiring_trials,
+                    action_url="/licensing/subscriptions?status=trial",
+                )
+            )
 
         # Past due subscriptions
         past_due_query = select(func.count(TenantSubscription.id)).where(
@@ -1265,13 +1289,15 @@ async def get_licensing_dashboard(
         past_due_count = past_due_result.scalar() or 0
 
         if past_due_count > 0:
-            alerts.append(LicensingAlert(
-                type="error",
-                title="Past Due Subscriptions",
-                message=f"{past_due_count} subscription(s) are past due",
-                count=past_due_count,
-                action_url="/licensing/subscriptions?status=past_due",
-            ))
+            alerts.append(
+                LicensingAlert(
+                    type="error",
+                    title="Past Due Subscriptions",
+                    message=f"{past_due_count} subscription(s) are past due",
+                    count=past_due_count,
+                    action_url="/licensing/subscriptions?status=past_due",
+                )
+            )
 
         # ========== RECENT ACTIVITY ==========
         recent_subscriptions_query = (
@@ -18,6 +18,10 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from dotmac.platform.licensing.entitlements import (
+    get_entitlement_cache,
+    load_entitlement_snapshot,
+)
 from dotmac.platform.licensing.framework import (
     BillingCycle,
     EventType,
@@ -36,6 +40,11 @@ from dotmac.platform.licensing.framework import (
     SubscriptionStatus,
     TenantSubscription,
 )
+from dotmac.platform.licensing.quotas import (
+    QuotaAllocation,
+    get_quota_engine,
+    quota_period_end,
+)
 
 
 class ModuleResolutionError(Exception):
@@ -134,6 +143,9 @@ class LicensingFrameworkService:
         self.db.add(capability)
         await self.db.commit()
         await self.db.refresh(capability)
+
+        # Any tenant may have this module
+        await get_entitlement_cache().invalidate()
         return capability
 
     async def get_module_with_dependencies(
@@ -283,9 +295,7 @@ class LicensingFrameworkService:
         ) -> None:
             existing = added_modules.get(module_id)
             if existing:
-                existing.included_by_default = (
-                    existing.included_by_default or included_by_default
-                )
+                existing.included_by_default = existing.included_by_default or included_by_default
                 existing.is_optional_addon = existing.is_optional_addon or is_optional_addon
                 if override_price is not None:
                     existing.override_price = override_price
@@ -641,32 +651,12 @@ class LicensingFrameworkService:
 
         await self.db.commit()
         await self.db.refresh(subscription)
+        await get_entitlement_cache().invalidate(tenant_id)
         return subscription
 
     def _calculate_quota_period_end(self, start: datetime, reset_period: str | None) -> datetime:
         """Calculate when quota period ends based on reset period."""
-        if not reset_period:
-            return start  # Treat as no-op period; effectively unlimited
-
-        normalized = reset_period.strip().upper()
-        if normalized == "MONTHLY":
-            # Next month, same day
-            if start.month == 12:
-                return start.replace(year=start.year + 1, month=1)
-            else:
-                return start.replace(month=start.month + 1)
-        elif normalized == "QUARTERLY":
-            # Add 3 months
-            month = start.month + 3
-            year = start.year
-            while month > 12:
-                month -= 12
-                year += 1
-            return start.replace(year=year, month=month)
-        elif normalized in ("ANNUAL", "ANNUALLY"):
-            return start.replace(year=start.year + 1)
-
-        return start
+        return quota_period_end(start, reset_period)
 
     def _add_months(self, start: datetime, months: int) -> datetime:
         """Add months to a datetime, clamping to end-of-month when needed."""
@@ -745,6 +735,7 @@ class LicensingFrameworkService:
             existing.source = "ADDON"
             existing.addon_price = pm.override_price if pm.override_price else pm.module.base_price
             await self.db.commit()
+            await get_entitlement_cache().invalidate(subscription.tenant_id)
             return existing
 
         # Activate add-on
@@ -777,6 +768,7 @@ class LicensingFrameworkService:
 
         await self.db.commit()
         await self.db.refresh(sub_module)
+        await get_entitlement_cache().invalidate(subscription.tenant_id)
         return sub_module
 
     async def remove_addon_from_subscription(
@@ -788,7 +780,10 @@ class LicensingFrameworkService:
         """Remove an add-on module from subscription."""
         result = await self.db.execute(
             select(SubscriptionModule)
-            .options(selectinload(SubscriptionModule.module))
+            .options(
+                selectinload(SubscriptionModule.module),
+                selectinload(SubscriptionModule.subscription),
+            )
             .where(
                 and_(
                     SubscriptionModule.subscription_id == subscription_id,
@@ -817,7 +812,9 @@ class LicensingFrameworkService:
         )
         self.db.add(event)
 
+        tenant_id = sub_module.subscription.tenant_id
         await self.db.commit()
+        await get_entitlement_cache().invalidate(tenant_id)
 
     # ========================================================================
     # FEATURE ENTITLEMENT ENFORCEMENT
@@ -830,68 +827,10 @@ class LicensingFrameworkService:
         capability_code: str | None = None,
     ) -> bool:
         """Check if tenant has access to a specific feature module or capability."""
-        # Get active subscription
-        result = await self.db.execute(
-            select(TenantSubscription)
-            .where(
-                and_(
-                    TenantSubscription.tenant_id == tenant_id,
-                    TenantSubscription.status.in_(
-                        [
-                            SubscriptionStatus.TRIAL,
-                            SubscriptionStatus.ACTIVE,
-                            SubscriptionStatus.PAST_DUE,  # Grace period
-                        ]
-                    ),
-                )
-            )
-            .order_by(TenantSubscription.created_at.desc())
+        snapshot = await get_entitlement_cache().get_or_load(
+            tenant_id, lambda: load_entitlement_snapshot(self.db, tenant_id)
         )
-        subscription = result.scalar_one_or_none()
-        if not subscription:
-            return False
-
-        # Get module
-        result = await self.db.execute(
-            select(FeatureModule).where(FeatureModule.module_code == module_code)
-        )
-        module = result.scalar_one_or_none()
-        if not module:
-            return False
-
-        # Check if module is active in subscription
-        result = await self.db.execute(
-            select(SubscriptionModule).where(
-                and_(
-                    SubscriptionModule.subscription_id == subscription.id,
-                    SubscriptionModule.module_id == module.id,
-                    SubscriptionModule.is_enabled,
-                )
-            )
-        )
-        sub_module = result.scalar_one_or_none()
-        if not sub_module:
-            return False
-
-        # Check if expired (trial or promotional)
-        if sub_module.expires_at and sub_module.expires_at < datetime.now(UTC):
-            return False
-
-        # If checking specific capability
-        if capability_code:
-            result = await self.db.execute(
-                select(ModuleCapability).where(
-                    and_(
-                        ModuleCapability.module_id == module.id,
-                        ModuleCapability.capability_code == capability_code,
-                        ModuleCapability.is_active,
-                    )
-                )
-            )
-            capability = result.scalar_one_or_none()
-            return capability is not None
-
-        return True
+        return snapshot.is_entitled(module_code, capability_code)
 
     async def get_entitled_capabilities(self, tenant_id: UUID) -> dict[str, list[str]]:
         """Get all capabilities tenant has access to, grouped by module."""
@@ -963,6 +902,21 @@ class LicensingFrameworkService:
                 "overage_rate": float,
             }
         """
+        quota_engine = get_quota_engine()
+        if quota_engine.enabled:
+            allocations = await quota_engine.allocations(self.db, tenant_id)
+            if allocations.subscription_id is None:
+                raise FeatureNotEntitledError("No active subscription")
+            quota_allocation = allocations.quotas.get(quota_code)
+            if quota_allocation is None:
+                await self._require_quota_definition(quota_code)
+                return self._quota_not_allocated()
+            return self._quota_availability(
+                quota_allocation,
+                await quota_engine.usage(self.db, quota_allocation),
+                requested_quantity,
+            )
+
         # Get active subscription
         result = await self.db.execute(
             select(TenantSubscription)
@@ -1003,14 +957,7 @@ class LicensingFrameworkService:
         allocation = result.scalar_one_or_none()
         if not allocation:
             # Quota not included in plan
-            return {
-                "allowed": False,
-                "allocated": 0,
-                "current": 0,
-                "available": 0,
-                "overage_allowed": False,
-                "overage_rate": 0.0,
-            }
+            return self._quota_not_allocated()
 
         # Get current usage
         result = await self.db.execute(
@@ -1051,22 +998,50 @@ class LicensingFrameworkService:
             usage.overage_charges = 0.0
             await self.db.flush()
 
-        # Calculate availability
-        allocated = allocation.included_quantity
+        return self._quota_availability(
+            QuotaAllocation(
+                subscription_id=subscription.id,
+                quota_id=quota.id,
+                quota_code=quota_code,
+                allocated=allocation.included_quantity,
+                allow_overage=allocation.allow_overage,
+                overage_rate=allocation.overage_rate_override or quota.overage_rate,
+                soft_limit=allocation.soft_limit,
+                reset_period=quota.reset_period,
+            ),
+            usage.current_usage,
+            requested_quantity,
+        )
+
+    @staticmethod
+    def _quota_not_allocated() -> dict[str, Any]:
+        return {
+            "allowed": False,
+            "allocated": 0,
+            "current": 0,
+            "available": 0,
+            "overage_allowed": False,
+            "overage_rate": 0.0,
+        }
+
+    @staticmethod
+    def _quota_availability(
+        allocation: QuotaAllocation, current: int, requested_quantity: int
+    ) -> dict[str, Any]:
+        """Availability of ``requested_quantity`` given ``current`` usage."""
+        allocated = allocation.allocated
         if allocated == -1:
             # Unlimited
             return {
                 "allowed": True,
                 "allocated": -1,
-                "current": usage.current_usage,
+                "current": current,
                 "available": -1,
                 "overage_allowed": False,
                 "overage_rate": 0.0,
             }
 
-        available = allocated - usage.current_usage
-        overage_rate = allocation.overage_rate_override or quota.overage_rate
-
+        available = allocated - current
         if available >= requested_quantity:
             allowed = True
         elif allocation.allow_overage:
@@ -1077,13 +1052,20 @@ class LicensingFrameworkService:
         return {
             "allowed": allowed,
             "allocated": allocated,
-            "current": usage.current_usage,
+            "current": current,
             "available": available,
             "overage_allowed": allocation.allow_overage,
-            "overage_rate": overage_rate,
+            "overage_rate": allocation.overage_rate,
             "soft_limit": allocation.soft_limit,
         }
 
+    async def _require_quota_definition(self, quota_code: str) -> None:
+        result = await self.db.execute(
+            select(QuotaDefinition.id).where(QuotaDefinition.quota_code == quota_code)
+        )
+        if result.scalar_one_or_none() is None:
+            raise ValueError(f"Quota definition for '{quota_code}' not found")
+
     async def consume_quota(
         self,
         tenant_id: UUID,
@@ -1102,6 +1084,58 @@ class LicensingFrameworkService:
                 "overage_charge": float,
             }
         """
+        quota_engine = get_quota_engine()
+        if not quota_engine.enabled:
+            return await self._consume_quota_row_lock(tenant_id, quota_code, quantity, metadata)
+
+        allocations = await quota_engine.allocations(self.db, tenant_id)
+        if allocations.subscription_id is None:
+            raise ValueError(f"Subscription not found for tenant {tenant_id}")
+        allocation = allocations.quotas.get(quota_code)
+        if allocation is None:
+            await self._require_quota_definition(quota_code)
+            raise QuotaExceededError(
+                f"Quota {quota_code} exceeded. Allocated: 0, Current: 0, Requested: {quantity}"
+            )
+
+        result = await quota_engine.consume(
+            self.db,
+            allocation,
+            quantity,
+            log={
+                "tenant_id": str(tenant_id),
+                "quota_id": str(allocation.quota_id),
+                "quota_code": quota_code,
+                "at": datetime.now(UTC).timestamp(),
+                "metadata": {
+                    "subscription_id": str(allocation.subscription_id),
+                    "quantity": quantity,
+                    **(metadata or {}),
+                },
+            },
+        )
+        if not result.allowed:
+            raise QuotaExceededError(
+                f"Quota {quota_code} exceeded. Allocated: {allocation.allocated}, "
+                f"Current: {result.usage}, Requested: {quantity}"
+            )
+
+        overage = allocation.overage(result.usage)
+        return {
+            "success": True,
+            "new_usage": result.usage,
+            "overage": overage,
+            "overage_charge": overage * allocation.overage_rate,
+        }
+
+    async def _consume_quota_row_lock(
+        self,
+        tenant_id: UUID,
+        quota_code: str,
+        quantity: int = 1,
+        metadata: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Consume quota under a row lock on the usage row (no Redis)."""
         # Get subscription and usage with row-level locking to prevent races
         result = await self.db.execute(
             select(TenantSubscription)
@@ -1235,6 +1269,14 @@ class LicensingFrameworkService:
         quantity: int = 1,
     ) -> None:
         """Release quota (e.g., when user is deleted)."""
+        quota_engine = get_quota_engine()
+        if quota_engine.enabled:
+            allocations = await quota_engine.allocations(self.db, tenant_id)
+            quota_allocation = allocations.quotas.get(quota_code)
+            if quota_allocation is not None:
+                await quota_engine.consume(self.db, quota_allocation, -quantity)
+                return
+
         # Get subscription and usage
         result = await self.db.execute(
             select(TenantSubscription)
@@ -19,33 +19,56 @@ from slowapi.errors import RateLimitExceeded
 from starlette.responses import Response
 
 from dotmac.platform.api.app_boundary_middleware import (
+    AppBoundaryASGIMiddleware,
     AppBoundaryMiddleware,
+    SingleTenantASGIMiddleware,
     SingleTenantMiddleware,
 )
-from dotmac.platform.auth.csrf import CSRFMiddleware
-from dotmac.platform.audit import AuditContextMiddleware
+from dotmac.platform.auth.csrf import CSRFASGIMiddleware, CSRFMiddleware
+from dotmac.platform.audit import AuditContextASGIMiddleware, AuditContextMiddleware
 from dotmac.platform.auth.billing_permissions import ensure_billing_rbac
 from dotmac.platform.auth.bootstrap import ensure_default_admin_user
 from dotmac.platform.auth.exceptions import AuthError, get_http_status
 from dotmac.platform.auth.partner_permissions import ensure_partner_rbac
+from dotmac.platform.auth.permission_cache import get_permission_cache
+from dotmac.platform.billing.cache import get_billing_cache
+from dotmac.platform.billing.invoicing.pdf_batch import close_invoice_pdf_renderer
 from dotmac.platform.core.exception_handlers import register_exception_handlers
+from dotmac.platform.core.http_pool import close_http_client_registry
 from dotmac.platform.core.rate_limiting import get_limiter
-from dotmac.platform.core.request_context import RequestContextMiddleware, configure_context_logging
-from dotmac.platform.core.rls_middleware import RLSContextManager, RLSMiddleware
+from dotmac.platform.core.request_context import (
+    RequestContextASGIMiddleware,
+    RequestContextMiddleware,
+    configure_context_logging,
+)
+from dotmac.platform.core.rls_middleware import (
+    RLSASGIMiddleware,
+    RLSContextManager,
+    RLSMiddleware,
+)
 from dotmac.platform.db import AsyncSessionLocal, init_db
+from dotmac.platform.events.bus import get_event_bus
+from dotmac.platform.feature_flags.core import start_flag_listener, stop_flag_listener
 from dotmac.platform.infrastructure_health import run_startup_health_checks
+from dotmac.platform.licensing.entitlements import get_entitlement_cache
+from dotmac.platform.licensing.quotas import get_quota_engine
 from dotmac.platform.monitoring.error_middleware import (
+    ErrorTrackingASGIMiddleware,
     ErrorTrackingMiddleware,
+    RequestMetricsASGIMiddleware,
     RequestMetricsMiddleware,
 )
 from dotmac.platform.monitoring.health_checks import HealthChecker, ensure_infrastructure_running
 from dotmac.platform.platform_app import platform_app
+from dotmac.platform.rate_limit.rule_index import get_rule_index
 from dotmac.platform.redis_client import init_redis, redis_manager, shutdown_redis
 from dotmac.platform.routers import get_api_info, register_routers
 from dotmac.platform.secrets import load_secrets_from_vault_sync
 from dotmac.platform.settings import settings
 from dotmac.platform.telemetry import setup_telemetry
-from dotmac.platform.tenant import TenantMiddleware
+from dotmac.platform.tenant import TenantASGIMiddleware, TenantMiddleware
+from dotmac.platform.webhooks.pool import close_webhook_client_pool
+from dotmac.platform.webhooks.routing import get_routing_index
 
 
 def rate_limit_handler(request: Request, exc: Exception) -> Response:
@@ -217,6 +240,62 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
         print(f"Redis initialization failed: {e}")
         raise
 
+    # Listen for rate limit rule changes so compiled rule indexes stay in sync
+    try:
+        await get_rule_index().start_listener(redis_manager.get_client())
+        logger.info("rate_limit.rule_index.listener_started", emoji="✅")
+    except Exception as e:
+        logger.warning("rate_limit.rule_index.listener_failed", error=str(e), emoji="⚠️")
+
+    # Listen for RBAC changes so per-process permission caches drop stale snapshots
+    try:
+        await get_permission_cache().start_listener(redis_manager.get_client())
+        logger.info("rbac.permission_cache.listener_started", emoji="✅")
+    except Exception as e:
+        logger.warning("rbac.permission_cache.listener_failed", error=str(e), emoji="⚠️")
+
+    # Listen for billing cache invalidations so every worker drops stale L1 entries
+    try:
+        await get_billing_cache().start_listener(redis_manager.get_client())
+        logger.info("billing.cache.listener_started", emoji="✅")
+    except Exception as e:
+        logger.warning("billing.cache.listener_failed", error=str(e), emoji="⚠️")
+
+    # Listen for webhook subscription changes so event routing indexes stay in sync
+    try:
+        await get_routing_index().start_listener(redis_manager.get_client())
+        logger.info("webhooks.routing.listener_started", emoji="✅")
+    except Exception as e:
+        logger.warning("webhooks.routing.listener_failed", error=str(e), emoji="⚠️")
+
+    # Listen for subscription/add-on changes so entitlement snapshots stay in sync
+    try:
+        await get_entitlement_cache().start_listener(redis_manager.get_client())
+        logger.info("licensing.entitlements.listener_started", emoji="✅")
+    except Exception as e:
+        logger.warning("licensing.entitlements.listener_failed", error=str(e), emoji="⚠️")
+
+    # Reload feature flag snapshots as soon as another worker changes a flag
+    try:
+        await start_flag_listener()
+        logger.info("feature_flags.listener_started", emoji="✅")
+    except Exception as e:
+        logger.warning("feature_flags.listener_failed", error=str(e), emoji="⚠️")
+
+    # Write Redis quota counters back to the database (and pick up crashed workers' leftovers)
+    try:
+        await get_quota_engine().start_flusher()
+        logger.info("licensing.quota.flusher_started", emoji="✅")
+    except Exception as e:
+        logger.warning("licensing.quota.flusher_failed", error=str(e), emoji="⚠️")
+
+    # Run event handlers on a worker pool so publishing requests do not wait for them
+    try:
+        await get_event_bus().start()
+        logger.info("events.bus.started", emoji="✅")
+    except Exception as e:
+        logger.warning("events.bus.start_failed", error=str(e), emoji="⚠️")
+
     # Seed RBAC permissions/roles after database init
     try:
         async with AsyncSessionLocal() as session:
@@ -246,6 +325,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     logger.info("service.shutdown.begin", emoji="👋")
     print("Shutting down")
 
+    await get_rule_index().stop_listener()
+    await get_permission_cache().stop_listener()
+    await get_billing_cache().stop_listener()
+    await get_routing_index().stop_listener()
+    await get_entitlement_cache().stop_listener()
+    await stop_flag_listener()
+    await get_quota_engine().stop_flusher()
+    await get_event_bus().stop()
+    await close_webhook_client_pool()
+    await close_http_client_registry()
+    close_invoice_pdf_renderer()
+
     # Cleanup Redis connections
     try:
         await shutdown_redis()
@@ -291,37 +382,43 @@ def create_application() -> FastAPI:
     allowed_hosts = settings.trusted_hosts if settings.trusted_hosts else ["*"]
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts)
 
+    # Pure ASGI variants avoid the per-layer task and body stream of BaseHTTPMiddleware
+    use_asgi = settings.middleware_mode == "asgi"
+
     # Add request context middleware VERY early in the chain
     # This generates correlation IDs and manages request-scoped context
-    app.add_middleware(RequestContextMiddleware, enable_logging=True)
+    app.add_middleware(
+        RequestContextASGIMiddleware if use_asgi else RequestContextMiddleware,
+        enable_logging=True,
+    )
 
     # Add error tracking middleware (should be early in the chain)
     # Tracks HTTP errors and exceptions in Prometheus
     if settings.observability.enable_metrics:
-        app.add_middleware(ErrorTrackingMiddleware)
-        app.add_middleware(RequestMetricsMiddleware)
+        app.add_middleware(ErrorTrackingASGIMiddleware if use_asgi else ErrorTrackingMiddleware)
+        app.add_middleware(RequestMetricsASGIMiddleware if use_asgi else RequestMetricsMiddleware)
 
     # Add tenant middleware BEFORE other middleware
     # This ensures tenant context is set before boundary checks
-    app.add_middleware(TenantMiddleware)
+    app.add_middleware(TenantASGIMiddleware if use_asgi else TenantMiddleware)
 
     # Add CSRF protection for cookie-authenticated requests
-    app.add_middleware(CSRFMiddleware)
+    app.add_middleware(CSRFASGIMiddleware if use_asgi else CSRFMiddleware)
 
     # Add Row-Level Security middleware RIGHT AFTER tenant context is set
     # This enforces tenant data isolation at the database level
-    app.add_middleware(RLSMiddleware)
+    app.add_middleware(RLSASGIMiddleware if use_asgi else RLSMiddleware)
 
     # Add single-tenant middleware if in single-tenant mode
     # This automatically sets fixed tenant_id from config
     if settings.DEPLOYMENT_MODE == "single_tenant":
-        app.add_middleware(SingleTenantMiddleware)
+        app.add_middleware(SingleTenantASGIMiddleware if use_asgi else SingleTenantMiddleware)
 
     # Add audit context middleware before boundary enforcement so user context is available
-    app.add_middleware(AuditContextMiddleware)
+    app.add_middleware(AuditContextASGIMiddleware if use_asgi else AuditContextMiddleware)
 
     # Add app boundary middleware to enforce platform/tenant route separation
-    app.add_middleware(AppBoundaryMiddleware)
+    app.add_middleware(AppBoundaryASGIMiddleware if use_asgi else AppBoundaryMiddleware)
 
     # Configure CORS last so it wraps responses generated by upstream middleware.
     if settings.cors.enabled:
@@ -8,12 +8,14 @@ from __future__ import annotations
 
 import time
 from collections.abc import Awaitable, Callable
+from typing import Any
 
 import structlog
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from dotmac.platform.core.asgi_middleware import ASGIMiddleware, wrap_response_start
 from dotmac.platform.monitoring.error_tracking import (
     track_exception,
     track_http_error,
@@ -22,6 +24,37 @@ from dotmac.platform.monitoring.error_tracking import (
 logger = structlog.get_logger(__name__)
 
 
+_REQUEST_METRICS: tuple[Any, Any] | None = None
+
+
+def _request_metrics() -> tuple[Any, Any]:
+    """Create the request counter/histogram once per process."""
+    global _REQUEST_METRICS
+    if _REQUEST_METRICS is None:
+        # Import here to avoid circular imports
+        from prometheus_client import Counter, Histogram
+
+        _REQUEST_METRICS = (
+            Counter(
+                "dotmac_http_requests_total",
+                "Total HTTP requests",
+                ["method", "endpoint", "status_code", "tenant_id"],
+            ),
+            Histogram(
+                "dotmac_http_request_duration_seconds",
+                "HTTP request duration in seconds",
+                ["method", "endpoint", "tenant_id"],
+                buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+            ),
+        )
+    return _REQUEST_METRICS
+
+
+def _state_tenant_id(request: Request) -> str:
+    tenant_id_raw = getattr(request.state, "tenant_id", None)
+    return tenant_id_raw if isinstance(tenant_id_raw, str) else "unknown"
+
+
 class ErrorTrackingMiddleware(BaseHTTPMiddleware):
     """Middleware to track HTTP errors and exceptions in Prometheus."""
 
@@ -106,21 +139,7 @@ class RequestMetricsMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp):
         """Initialize middleware."""
         super().__init__(app)
-        # Import here to avoid circular imports
-        from prometheus_client import Counter, Histogram
-
-        self.requests_total = Counter(
-            "dotmac_http_requests_total",
-            "Total HTTP requests",
-            ["method", "endpoint", "status_code", "tenant_id"],
-        )
-
-        self.request_duration = Histogram(
-            "dotmac_http_request_duration_seconds",
-            "HTTP request duration in seconds",
-            ["method", "endpoint", "tenant_id"],
-            buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
-        )
+        self.requests_total, self.request_duration = _request_metrics()
 
     async def dispatch(
         self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
@@ -173,3 +192,93 @@ class RequestMetricsMiddleware(BaseHTTPMiddleware):
             ).observe(duration)
 
             raise
+
+
+class ErrorTrackingASGIMiddleware(ASGIMiddleware):
+    """Pure ASGI variant of ErrorTrackingMiddleware (see ``settings.middleware_mode``)."""
+
+    async def handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        start_time = time.time()
+        request = Request(scope)
+        status_code = 0
+
+        def on_response_start(message: Message) -> None:
+            nonlocal status_code
+            status_code = message["status"]
+
+        try:
+            await self.app(scope, receive, wrap_response_start(send, on_response_start))
+        except Exception as e:
+            tenant_id = _state_tenant_id(request)
+            track_exception(
+                exception=e,
+                module="api",
+                endpoint=ErrorTrackingMiddleware._route_path(request),
+                tenant_id=tenant_id,
+            )
+            logger.error(
+                "http.exception",
+                method=request.method,
+                path=request.url.path,
+                exception_type=type(e).__name__,
+                exception=str(e),
+                tenant_id=tenant_id,
+                duration_ms=(time.time() - start_time) * 1000,
+                exc_info=True,
+            )
+            raise
+
+        if status_code >= 400:
+            tenant_id = _state_tenant_id(request)
+            track_http_error(
+                method=request.method,
+                endpoint=ErrorTrackingMiddleware._route_path(request),
+                status_code=status_code,
+                tenant_id=tenant_id,
+            )
+            logger.warning(
+                "http.error",
+                method=request.method,
+                path=request.url.path,
+                status_code=status_code,
+                tenant_id=tenant_id,
+                duration_ms=(time.time() - start_time) * 1000,
+            )
+
+
+class RequestMetricsASGIMiddleware(ASGIMiddleware):
+    """Pure ASGI variant of RequestMetricsMiddleware (see ``settings.middleware_mode``)."""
+
+    def __init__(self, app: ASGIApp):
+        super().__init__(app)
+        self.requests_total, self.request_duration = _request_metrics()
+
+    async def handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        start_time = time.time()
+        request = Request(scope)
+        status_code = 500
+
+        def on_response_start(message: Message) -> None:
+            nonlocal status_code
+            status_code = message["status"]
+
+        try:
+            await self.app(scope, receive, wrap_response_start(send, on_response_start))
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            # The route is resolved by the router, so read it after the call
+            endpoint = ErrorTrackingMiddleware._route_path(request)
+            tenant_id = _state_tenant_id(request)
+            self.requests_total.labels(
+                method=request.method,
+                endpoint=endpoint,
+                status_code=status_code,
+                tenant_id=tenant_id,
+            ).inc()
+            self.request_duration.labels(
+                method=request.method,
+                endpoint=endpoint,
+                tenant_id=tenant_id,
+            ).observe(time.time() - start_time)
@@ -277,7 +277,7 @@ class ObservabilityService:
         page_size: int = 50,
     ) -> TracesResponse:
         """Fetch distributed traces from Jaeger."""
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         try:
             # Build Jaeger API query parameters
@@ -292,14 +292,14 @@ class ObservabilityService:
                 params["minDuration"] = f"{min_duration}us"  # Jaeger uses microseconds
 
             # Query Jaeger API
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.jaeger_url}/api/traces",
-                    params=params,
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                jaeger_data = response.json()
+            client = get_http_client(self.jaeger_url)
+            response = await client.get(
+                f"{self.jaeger_url}/api/traces",
+                params=params,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            jaeger_data = response.json()
 
             # Convert Jaeger traces to our format
             traces = []
@@ -329,13 +329,13 @@ class ObservabilityService:
 
     async def get_trace_details(self, trace_id: str) -> TraceData | None:
         """Get detailed span information for a trace."""
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.jaeger_url}/api/traces/{trace_id}")
-                response.raise_for_status()
-                jaeger_data = response.json()
+            client = get_http_client(self.jaeger_url, profile="fast")
+            response = await client.get(f"{self.jaeger_url}/api/traces/{trace_id}")
+            response.raise_for_status()
+            jaeger_data = response.json()
 
             trace_payloads = jaeger_data.get("data", [])
             if not trace_payloads:
@@ -356,7 +356,9 @@ class ObservabilityService:
                         name=span.get("operationName", "unknown"),
                         service=process.get("serviceName", "unknown"),
                         duration=int(span.get("duration", 0) / 1000),
-                        start_time=datetime.fromtimestamp(span.get("startTime", 0) / 1_000_000, tz=UTC),
+                        start_time=datetime.fromtimestamp(
+                            span.get("startTime", 0) / 1_000_000, tz=UTC
+                        ),
                         attributes=self._tags_to_attributes(span.get("tags")),
                     )
                 )
@@ -452,23 +454,23 @@ class ObservabilityService:
 
     async def get_service_map(self) -> ServiceMapResponse:
         """Get service dependency map."""
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         end_ts = int(datetime.now(UTC).timestamp() * 1000)
         lookback_ms = int(os.getenv("OBSERVABILITY_DEPENDENCY_LOOKBACK_MS", "3600000"))
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.jaeger_url}/api/dependencies",
-                    params={
-                        "endTs": end_ts,
-                        "lookback": lookback_ms,
-                    },
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                payload = response.json()
+            client = get_http_client(self.jaeger_url)
+            response = await client.get(
+                f"{self.jaeger_url}/api/dependencies",
+                params={
+                    "endTs": end_ts,
+                    "lookback": lookback_ms,
+                },
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            payload = response.json()
 
             dependencies_data = payload.get("data", [])
             services: set[str] = set()
@@ -538,8 +540,7 @@ class ObservabilityService:
         percentiles: list[PerformanceMetrics] = []
         for percentile in (0.5, 0.75, 0.9, 0.95, 0.99):
             query = (
-                f"histogram_quantile({percentile}, "
-                f"sum(rate({histogram_metric}[{window}])) by (le))"
+                f"histogram_quantile({percentile}, sum(rate({histogram_metric}[{window}])) by (le))"
             )
             try:
                 payload = await client.query(query)
@@ -587,7 +588,7 @@ class ObservabilityService:
             "OBSERVABILITY_ERROR_QUERY",
             (
                 "topk(5, sum(rate("
-                f"{request_metric}{{{status_label}=~\"5..\"}}[{window}]))"
+                f'{request_metric}{{{status_label}=~"5.."}}[{window}]))'
                 f" by ({status_label}, {route_label}))"
             ),
         )
@@ -172,7 +172,7 @@ class PushChannelProvider(NotificationChannelProvider):
             ValueError: If OneSignal not configured
             Exception: If OneSignal API call fails
         """
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         # Get OneSignal credentials
         app_id = self.config.get("onesignal_app_id")
@@ -196,14 +196,14 @@ class PushChannelProvider(NotificationChannelProvider):
         }
 
         # Send request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://onesignal.com/api/v1/notifications",
-                json=onesignal_payload,
-                headers=headers,
-                timeout=10.0,
-            )
-            response.raise_for_status()
+        client = get_http_client("https://onesignal.com/api/v1/notifications")
+        response = await client.post(
+            "https://onesignal.com/api/v1/notifications",
+            json=onesignal_payload,
+            headers=headers,
+            timeout=10.0,
+        )
+        response.raise_for_status()
 
         self.logger.debug(
             "push.onesignal.sent",
@@ -292,7 +292,7 @@ class PushChannelProvider(NotificationChannelProvider):
             ValueError: If HTTP API not configured
             Exception: If HTTP request fails
         """
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         # Get HTTP API configuration
         api_url = self.config.get("http_api_url")
@@ -313,14 +313,14 @@ class PushChannelProvider(NotificationChannelProvider):
         }
 
         # Send HTTP request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                api_url,
-                json=http_payload,
-                headers=headers,
-                timeout=10.0,
-            )
-            response.raise_for_status()
+        client = get_http_client(api_url)
+        response = await client.post(
+            api_url,
+            json=http_payload,
+            headers=headers,
+            timeout=10.0,
+        )
+        response.raise_for_status()
 
         self.logger.debug(
             "push.http.sent",
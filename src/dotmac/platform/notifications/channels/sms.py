@@ -182,7 +182,7 @@ class SMSChannelProvider(NotificationChannelProvider):
             ValueError: If HTTP API not configured
             Exception: If HTTP request fails
         """
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         # Get HTTP API configuration
         api_url = self.config.get("http_api_url")
@@ -203,14 +203,14 @@ class SMSChannelProvider(NotificationChannelProvider):
         }
 
         # Send HTTP request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                api_url,
-                json=payload,
-                headers=headers,
-                timeout=10.0,
-            )
-            response.raise_for_status()
+        client = get_http_client(api_url)
+        response = await client.post(
+            api_url,
+            json=payload,
+            headers=headers,
+            timeout=10.0,
+        )
+        response.raise_for_status()
 
         self.logger.debug(
             "sms.http.sent",
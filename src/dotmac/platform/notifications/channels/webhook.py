@@ -101,7 +101,7 @@ class WebhookChannelProvider(NotificationChannelProvider):
         Raises:
             Exception: If HTTP request fails
         """
-        import httpx
+        from dotmac.platform.core.http_pool import get_http_client
 
         # Prepare headers
         headers = {
@@ -120,17 +120,17 @@ class WebhookChannelProvider(NotificationChannelProvider):
         headers.update(custom_headers)
 
         # Send HTTP POST request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=self.config.get("timeout", 10.0),
-            )
+        client = get_http_client(url)
+        response = await client.post(
+            url,
+            json=payload,
+            headers=headers,
+            timeout=self.config.get("timeout", 10.0),
+        )
 
-            # Check response status
-            if response.status_code not in [200, 201, 202, 204]:
-                raise Exception(f"Webhook returned status {response.status_code}: {response.text}")
+        # Check response status
+        if response.status_code not in [200, 201, 202, 204]:
+            raise Exception(f"Webhook returned status {response.status_code}: {response.text}")
 
         self.logger.debug(
             "webhook.http.sent",
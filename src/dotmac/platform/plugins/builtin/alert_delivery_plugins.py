@@ -152,7 +152,7 @@ class WebhookAlertPlugin(AlertDeliveryProvider):
             )
 
         try:
-            import httpx
+            from dotmac.platform.core.http_pool import get_http_client
 
             start_time = datetime.now(UTC)
 
@@ -161,8 +161,8 @@ class WebhookAlertPlugin(AlertDeliveryProvider):
                 headers["Authorization"] = self.auth_header
 
             # Send a test ping (HEAD or OPTIONS if supported)
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.options(self.webhook_url, headers=headers)
+            client = get_http_client(self.webhook_url)
+            response = await client.options(self.webhook_url, headers=headers, timeout=self.timeout)
 
             end_time = datetime.now(UTC)
             response_time_ms = (end_time - start_time).total_seconds() * 1000
@@ -261,7 +261,7 @@ class WebhookAlertPlugin(AlertDeliveryProvider):
             raise RuntimeError("Webhook plugin not configured")
 
         try:
-            import httpx
+            from dotmac.platform.core.http_pool import get_http_client
 
             headers = {"Content-Type": "application/json", **self.custom_headers}
             if self.auth_header:
@@ -279,12 +279,13 @@ class WebhookAlertPlugin(AlertDeliveryProvider):
             last_error = None
             for attempt in range(self.retry_count):
                 try:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.post(
-                            self.webhook_url,
-                            json=payload,
-                            headers=headers,
-                        )
+                    client = get_http_client(self.webhook_url)
+                    response = await client.post(
+                        self.webhook_url,
+                        json=payload,
+                        headers=headers,
+                        timeout=self.timeout,
+                    )
 
                     if response.status_code < 300:
                         logger.info(
@@ -443,7 +444,7 @@ class SlackAlertPlugin(AlertDeliveryProvider):
         try:
             await self.configure(config)
 
-            import httpx
+            from dotmac.platform.core.http_pool import get_http_client
 
             test_payload = {
                 "text": ":test_tube: DotMac Alert Plugin Test",
@@ -454,11 +455,12 @@ class SlackAlertPlugin(AlertDeliveryProvider):
             if self.channel:
                 test_payload["channel"] = self.channel
 
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    self.webhook_url,  # type: ignore
-                    json=test_payload,
-                )
+            webhook_url = self.webhook_url
+            if not webhook_url:
+                raise ValueError("webhook_url is required")
+
+            client = get_http_client(webhook_url)
+            response = await client.post(webhook_url, json=test_payload)
 
             end_time = datetime.now(UTC)
             response_time_ms = (end_time - start_time).total_seconds() * 1000
@@ -535,7 +537,7 @@ class SlackAlertPlugin(AlertDeliveryProvider):
             raise RuntimeError("Slack plugin not configured")
 
         try:
-            import httpx
+            from dotmac.platform.core.http_pool import get_http_client
 
             severity = alert.get("severity", "warning")
             emoji = self._severity_to_emoji(severity)
@@ -593,8 +595,8 @@ class SlackAlertPlugin(AlertDeliveryProvider):
             if self.channel:
                 payload["channel"] = self.channel
 
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(self.webhook_url, json=payload)
+            client = get_http_client(self.webhook_url)
+            response = await client.post(self.webhook_url, json=payload)
 
             if response.status_code == 200 and response.text == "ok":
                 logger.info(f"Alert delivered to Slack: {alert.get('alert_id')}")
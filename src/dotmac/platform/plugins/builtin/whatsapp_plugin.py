@@ -12,6 +12,8 @@ from uuid import uuid4
 
 import httpx
 
+from dotmac.platform.core.http_pool import get_http_client
+
 from ..interfaces import NotificationProvider
 from ..schema import (
     FieldSpec,
@@ -290,19 +292,19 @@ class WhatsAppProvider(NotificationProvider):
             # Send message via WhatsApp Business API
             url = f"{self.base_url}/{self.business_account_id}/messages"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
+            client = get_http_client(url)
+            response = await client.post(url, json=payload, headers=headers)
+            response.raise_for_status()
 
-                result = response.json()
-                message_id = result.get("messages", [{}])[0].get("id")
+            result = response.json()
+            message_id = result.get("messages", [{}])[0].get("id")
 
-                if message_id:
-                    logger.info(f"WhatsApp message sent successfully: {message_id}")
-                    return True
-                else:
-                    logger.error(f"Failed to send WhatsApp message: {result}")
-                    return False
+            if message_id:
+                logger.info(f"WhatsApp message sent successfully: {message_id}")
+                return True
+            else:
+                logger.error(f"Failed to send WhatsApp message: {result}")
+                return False
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error sending WhatsApp message: {e}")
@@ -332,28 +334,28 @@ class WhatsAppProvider(NotificationProvider):
                 "Authorization": f"Bearer {self.api_token}",
             }
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+            client = get_http_client(url, profile="fast")
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
 
-                business_info = response.json()
+            business_info = response.json()
 
-                duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
+            duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
 
-                return PluginHealthCheck(
-                    plugin_instance_id=uuid4(),  # Temporary ID for standalone use
-                    status="healthy",
-                    message="WhatsApp Business API is accessible",
-                    details={
-                        "business_account_id": self.business_account_id,
-                        "phone_number": self.phone_number,
-                        "sandbox_mode": self.sandbox_mode,
-                        "api_accessible": True,
-                        "business_name": business_info.get("name", "Unknown"),
-                    },
-                    timestamp=datetime.now(UTC).isoformat(),
-                    response_time_ms=duration_ms,
-                )
+            return PluginHealthCheck(
+                plugin_instance_id=uuid4(),  # Temporary ID for standalone use
+                status="healthy",
+                message="WhatsApp Business API is accessible",
+                details={
+                    "business_account_id": self.business_account_id,
+                    "phone_number": self.phone_number,
+                    "sandbox_mode": self.sandbox_mode,
+                    "api_accessible": True,
+                    "business_name": business_info.get("name", "Unknown"),
+                },
+                timestamp=datetime.now(UTC).isoformat(),
+                response_time_ms=duration_ms,
+            )
 
         except httpx.HTTPError as e:
             duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
@@ -418,25 +420,25 @@ class WhatsAppProvider(NotificationProvider):
                 "Authorization": f"Bearer {api_token}",
             }
 
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+            client = get_http_client(url)
+            response = await client.get(url, headers=headers, timeout=15.0)
+            response.raise_for_status()
 
-                business_info = response.json()
+            business_info = response.json()
 
-                duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
-                return PluginTestResult(
-                    success=True,
-                    message="Connection successful",
-                    details={
-                        "business_account_id": business_account_id,
-                        "business_name": business_info.get("name", "Unknown"),
-                        "status": "verified",
-                        "api_version": api_version,
-                    },
-                    timestamp=datetime.now(UTC).isoformat(),
-                    response_time_ms=duration_ms,
-                )
+            duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
+            return PluginTestResult(
+                success=True,
+                message="Connection successful",
+                details={
+                    "business_account_id": business_account_id,
+                    "business_name": business_info.get("name", "Unknown"),
+                    "status": "verified",
+                    "api_version": api_version,
+                },
+                timestamp=datetime.now(UTC).isoformat(),
+                response_time_ms=duration_ms,
+            )
 
         except httpx.HTTPStatusError as e:
             duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
@@ -1,7 +1,8 @@
 """
 Rate Limiting Module.
 
-Redis-backed rate limiting with sliding window algorithm.
+Redis-backed rate limiting with sliding log, sliding window counter and
+GCRA algorithms evaluated atomically in a single script call.
 """
 
 from dotmac.platform.rate_limit.decorators import (
@@ -11,6 +12,12 @@ from dotmac.platform.rate_limit.decorators import (
     rate_limit_per_ip,
     rate_limit_per_minute,
 )
+from dotmac.platform.rate_limit.limiter import (
+    LimitResult,
+    LimitSpec,
+    RateLimitAlgorithm,
+    ScriptedRateLimiter,
+)
 from dotmac.platform.rate_limit.middleware import RateLimitMiddleware
 from dotmac.platform.rate_limit.models import (
     RateLimitAction,
@@ -19,6 +26,11 @@ from dotmac.platform.rate_limit.models import (
     RateLimitScope,
     RateLimitWindow,
 )
+from dotmac.platform.rate_limit.rule_index import (
+    CompiledRateLimitRule,
+    RateLimitRuleIndex,
+    get_rule_index,
+)
 from dotmac.platform.rate_limit.service import RateLimitExceeded, RateLimitService
 
 __all__ = [
@@ -28,9 +40,18 @@ __all__ = [
     "RateLimitAction",
     "RateLimitScope",
     "RateLimitWindow",
+    # Limiter
+    "RateLimitAlgorithm",
+    "ScriptedRateLimiter",
+    "LimitSpec",
+    "LimitResult",
     # Service
     "RateLimitService",
     "RateLimitExceeded",
+    # Rule index
+    "CompiledRateLimitRule",
+    "RateLimitRuleIndex",
+    "get_rule_index",
     # Middleware
     "RateLimitMiddleware",
     # Decorators
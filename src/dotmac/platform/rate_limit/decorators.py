@@ -7,7 +7,6 @@ Decorators for fine-grained rate limiting on specific endpoints.
 import hashlib
 import ipaddress
 from collections.abc import Callable
-from datetime import UTC, datetime
 from functools import wraps
 from typing import Any
 from uuid import UUID
@@ -16,6 +15,13 @@ import redis.asyncio as aioredis
 import structlog
 from fastapi import HTTPException, Request, status
 
+from dotmac.platform.rate_limit.limiter import (
+    LimitResult,
+    LimitSpec,
+    RateLimitAlgorithm,
+    ScriptedRateLimiter,
+    resolve_algorithm,
+)
 from dotmac.platform.rate_limit.models import RateLimitAction, RateLimitScope, RateLimitWindow
 from dotmac.platform.settings import settings
 
@@ -47,72 +53,50 @@ async def _get_redis() -> aioredis.Redis:
     return _redis_pool
 
 
-async def _check_rate_limit_redis(
-    tenant_id: str,
-    scope: RateLimitScope,
-    identifier: str,
-    max_requests: int,
-    window_seconds: int,
-    endpoint: str,
-) -> tuple[bool, int]:
-    """
-    Check rate limit directly against Redis without database session.
+_limiter: ScriptedRateLimiter | None = None
 
-    This avoids the database connection exhaustion issue for public endpoints.
 
-    Args:
-        tenant_id: Tenant identifier
-        scope: Rate limit scope
-        identifier: Unique identifier (IP, user ID, etc.)
-        max_requests: Maximum requests allowed
-        window_seconds: Time window in seconds
-        endpoint: API endpoint path
-
-    Returns:
-        Tuple of (is_allowed, current_count)
-    """
-    redis = await _get_redis()
-
-    # Generate key (same logic as RateLimitService)
-    key_parts = [tenant_id, scope.value, identifier, endpoint]
-    key_str = ":".join(key_parts)
-    id_hash = hashlib.md5(key_str.encode(), usedforsecurity=False).hexdigest()[:16]
-    key = f"ratelimit:{tenant_id}:{scope.value}:{id_hash}"
+async def _get_limiter() -> ScriptedRateLimiter:
+    """Get the scripted limiter bound to the shared rate limiting pool."""
+    global _limiter
 
-    # Use Redis sorted set for sliding window
-    now = datetime.now(UTC).timestamp()
-    window_start = now - window_seconds
+    if _limiter is None:
+        _limiter = ScriptedRateLimiter(await _get_redis())
 
-    # Remove old entries outside window
-    await redis.zremrangebyscore(key, 0, window_start)
+    return _limiter
 
-    # Count current entries in window
-    current_count = await redis.zcount(key, window_start, now)
 
-    # Check limit
-    is_allowed = current_count < max_requests
-
-    return is_allowed, current_count
-
-
-async def _increment_rate_limit_redis(
+async def _acquire_rate_limit_redis(
     tenant_id: str,
     scope: RateLimitScope,
     identifier: str,
+    max_requests: int,
     window_seconds: int,
     endpoint: str,
-) -> None:
+    algorithm: RateLimitAlgorithm,
+    enforce: bool = True,
+) -> LimitResult:
     """
-    Increment rate limit counter in Redis without database session.
+    Check and record a request directly against Redis without database session.
+
+    The check and the increment happen atomically in one script call, which
+    avoids the database connection exhaustion issue for public endpoints and
+    prevents concurrent requests from overshooting the limit.
 
     Args:
         tenant_id: Tenant identifier
         scope: Rate limit scope
         identifier: Unique identifier (IP, user ID, etc.)
+        max_requests: Maximum requests allowed
         window_seconds: Time window in seconds
         endpoint: API endpoint path
+        algorithm: Rate limiting algorithm
+        enforce: Skip recording the request when the limit is exceeded
+
+    Returns:
+        Limit evaluation result
     """
-    redis = await _get_redis()
+    limiter = await _get_limiter()
 
     # Generate key (same logic as RateLimitService)
     key_parts = [tenant_id, scope.value, identifier, endpoint]
@@ -120,13 +104,18 @@ async def _increment_rate_limit_redis(
     id_hash = hashlib.md5(key_str.encode(), usedforsecurity=False).hexdigest()[:16]
     key = f"ratelimit:{tenant_id}:{scope.value}:{id_hash}"
 
-    now = datetime.now(UTC).timestamp()
-
-    # Add current request to sorted set
-    await redis.zadd(key, {str(now): now})
-
-    # Set expiration to window + 60 seconds buffer
-    await redis.expire(key, window_seconds + 60)
+    (result,) = await limiter.acquire(
+        [
+            LimitSpec(
+                key=ScriptedRateLimiter.storage_key(key, algorithm),
+                limit=max_requests,
+                window_seconds=window_seconds,
+                algorithm=algorithm,
+                enforce=enforce,
+            )
+        ]
+    )
+    return result
 
 
 def rate_limit(
@@ -134,6 +123,7 @@ def rate_limit(
     window: RateLimitWindow = RateLimitWindow.MINUTE,
     scope: RateLimitScope = RateLimitScope.PER_USER,
     action: RateLimitAction = RateLimitAction.BLOCK,
+    algorithm: RateLimitAlgorithm | None = None,
 ) -> Callable[..., Any]:
     """
     Decorator to apply rate limiting to a specific endpoint.
@@ -149,7 +139,11 @@ def rate_limit(
         window: Time window for rate limit
         scope: Scope of rate limit (per user, per IP, etc.)
         action: Action to take when limit exceeded
+        algorithm: Rate limiting algorithm (defaults to settings.rate_limit.algorithm)
     """
+    resolved_algorithm = algorithm or resolve_algorithm(
+        settings.rate_limit.algorithm, RateLimitAlgorithm.SLIDING_LOG
+    )
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
@@ -213,18 +207,22 @@ def rate_limit(
                 # (e.g., PER_USER scope but no user, or IP is unknown)
                 return await func(*args, **kwargs)
 
-            # Check rate limit using Redis directly (no database session)
-            is_allowed, current_count = await _check_rate_limit_redis(
+            # Check and record atomically using Redis directly (no database session)
+            result = await _acquire_rate_limit_redis(
                 tenant_id=tenant_id,
                 scope=scope,
                 identifier=identifier,
                 max_requests=max_requests,
                 window_seconds=window_seconds,
                 endpoint=endpoint,
+                algorithm=resolved_algorithm,
+                enforce=action != RateLimitAction.LOG_ONLY,
             )
+            current_count = result.current_count
 
-            if not is_allowed:
+            if not result.allowed:
                 if action == RateLimitAction.BLOCK:
+                    retry_after = result.retry_after_seconds
                     raise HTTPException(
                         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                         detail={
@@ -232,9 +230,9 @@ def rate_limit(
                             "message": f"Rate limit exceeded: {current_count}/{max_requests} per {window.value}",
                             "limit": max_requests,
                             "window": window.value,
-                            "retry_after": window_seconds,
+                            "retry_after": retry_after,
                         },
-                        headers={"Retry-After": str(window_seconds)},
+                        headers={"Retry-After": str(retry_after)},
                     )
                 elif action == RateLimitAction.LOG_ONLY:
                     # Just log and continue
@@ -245,19 +243,7 @@ def rate_limit(
                         limit=max_requests,
                     )
 
-            # Execute function
-            result = await func(*args, **kwargs)
-
-            # Increment counter using Redis directly (no database session)
-            await _increment_rate_limit_redis(
-                tenant_id=tenant_id,
-                scope=scope,
-                identifier=identifier,
-                window_seconds=window_seconds,
-                endpoint=endpoint,
-            )
-
-            return result
+            return await func(*args, **kwargs)
 
         return wrapper
 
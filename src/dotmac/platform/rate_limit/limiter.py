@@ -0,0 +1,252 @@
+"""
+Scripted Rate Limiter.
+
+Atomic, single round-trip rate limiting backed by a server-side Lua script.
+All limits that apply to a request are checked and recorded in one EVALSHA,
+so concurrent bursts cannot overshoot a limit between check and increment.
+
+Supported algorithms:
+- ``sliding_log``: exact sliding window, one sorted-set member per request
+- ``sliding_window``: weighted two-window counter, O(1) memory per key
+- ``gcra``: generic cell rate algorithm (token bucket), O(1) memory per key
+"""
+
+import math
+import time
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import IntEnum, StrEnum
+from typing import Any
+
+import structlog
+
+from dotmac.platform.redis_client import RedisClientType
+
+logger = structlog.get_logger(__name__)
+
+
+class RateLimitAlgorithm(StrEnum):
+    """Rate limiting algorithm."""
+
+    SLIDING_LOG = "sliding_log"  # Exact, one ZSET member per request
+    SLIDING_WINDOW = "sliding_window"  # Approximate, two counters per key
+    GCRA = "gcra"  # Token bucket, single timestamp per key
+
+
+class LimitMode(IntEnum):
+    """How the script treats the evaluated limits."""
+
+    CHECK = 0  # Evaluate only
+    ACQUIRE = 1  # Record in every limit unless an enforced limit is exceeded
+    RECORD = 2  # Record unconditionally
+
+
+@dataclass(frozen=True, slots=True)
+class LimitSpec:
+    """A single limit to evaluate."""
+
+    key: str
+    limit: int
+    window_seconds: int
+    algorithm: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_LOG
+    enforce: bool = True  # Exceeding this limit blocks recording of the request
+
+
+@dataclass(frozen=True, slots=True)
+class LimitResult:
+    """Outcome of evaluating a LimitSpec."""
+
+    allowed: bool
+    current_count: int  # Requests counted before this one
+    retry_after: float  # Seconds until the next request would be allowed
+
+    @property
+    def retry_after_seconds(self) -> int:
+        """Retry-After header value (whole seconds, at least 1 when blocked)."""
+        if self.allowed:
+            return 0
+        return max(1, math.ceil(self.retry_after))
+
+
+# KEYS[i]  - storage key of limit i
+# ARGV[1]  - current time (seconds, float)
+# ARGV[2]  - mode (0 = check, 1 = acquire, 2 = record)
+# ARGV[3]  - request nonce (keeps sliding log members unique)
+# ARGV[4 + 4(i-1) .. 7 + 4(i-1)] - algorithm, limit, window, enforce for limit i
+# Returns {allowed, count, retry_after_ms} per limit.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local mode = tonumber(ARGV[2])
+local nonce = ARGV[3]
+local results = {}
+local writes = {}
+local blocked = false
+
+for i, key in ipairs(KEYS) do
+    local base = 3 + (i - 1) * 4
+    local algorithm = ARGV[base + 1]
+    local limit = tonumber(ARGV[base + 2])
+    local window = tonumber(ARGV[base + 3])
+    local enforce = ARGV[base + 4] == '1'
+    local count = 0
+    local retry_after = 0
+    local allowed = true
+
+    if algorithm == 'sliding_window' then
+        local current = math.floor(now / window)
+        local state = redis.call('HMGET', key, 'w', 'c', 'p')
+        local stored = tonumber(state[1])
+        local cur, prev = 0, 0
+        if stored == current then
+            cur = tonumber(state[2]) or 0
+            prev = tonumber(state[3]) or 0
+        elseif stored == current - 1 then
+            prev = tonumber(state[2]) or 0
+        end
+        local remaining_window = (current + 1) * window - now
+        local weighted = prev * (remaining_window / window) + cur
+        count = math.floor(weighted)
+        if weighted + 1 > limit then
+            allowed = false
+            retry_after = remaining_window
+            if prev > 0 and cur + 1 <= limit then
+                local decay = (weighted + 1 - limit) * window / prev
+                if decay < retry_after then
+                    retry_after = decay
+                end
+            end
+        end
+        writes[i] = function()
+            redis.call('HSET', key, 'w', current, 'c', cur + 1, 'p', prev)
+            redis.call('EXPIRE', key, math.ceil(window * 2))
+        end
+    elseif algorithm == 'gcra' then
+        local emission = window / limit
+        local tat = tonumber(redis.call('GET', key)) or now
+        if tat < now then
+            tat = now
+        end
+        local new_tat = tat + emission
+        local allow_at = new_tat - window
+        count = math.ceil((tat - now) / emission - 1e-9)
+        if now < allow_at then
+            allowed = false
+            retry_after = allow_at - now
+        end
+        writes[i] = function()
+            redis.call('SET', key, string.format('%.6f', new_tat), 'PX',
+                math.ceil((new_tat - now) * 1000) + 1000)
+        end
+    else
+        redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+        count = redis.call('ZCARD', key)
+        if count >= limit then
+            allowed = false
+            local oldest = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+            if oldest[2] then
+                retry_after = tonumber(oldest[2]) + window - now
+            else
+                retry_after = window
+            end
+        end
+        writes[i] = function()
+            redis.call('ZADD', key, now, string.format('%.6f', now) .. ':' .. nonce)
+            redis.call('EXPIRE', key, math.ceil(window) + 60)
+        end
+    end
+
+    if not allowed and enforce then
+        blocked = true
+    end
+    results[i] = {allowed and 1 or 0, count, math.ceil(retry_after * 1000)}
+end
+
+if mode == 2 or (mode == 1 and not blocked) then
+    for i = 1, #KEYS do
+        writes[i]()
+    end
+end
+
+return results
+"""
+
+
+class ScriptedRateLimiter:
+    """Evaluates rate limits atomically with one EVALSHA per call."""
+
+    def __init__(self, redis: RedisClientType):
+        """Initialize limiter and register the Lua script with the client."""
+        self.redis = redis
+        self._script: Any = redis.register_script(RATE_LIMIT_SCRIPT)
+
+    @staticmethod
+    def storage_key(base_key: str, algorithm: RateLimitAlgorithm) -> str:
+        """
+        Get the storage key for an algorithm.
+
+        Sliding log keeps the bare key so existing sorted sets stay valid;
+        other algorithms get a suffix so switching never hits WRONGTYPE.
+        """
+        if algorithm == RateLimitAlgorithm.SLIDING_LOG:
+            return base_key
+        return f"{base_key}:{algorithm.value}"
+
+    async def evaluate(
+        self,
+        specs: Sequence[LimitSpec],
+        mode: LimitMode = LimitMode.ACQUIRE,
+        now: float | None = None,
+    ) -> list[LimitResult]:
+        """Evaluate all limits in a single script call."""
+        if not specs:
+            return []
+
+        args: list[Any] = [
+            repr(time.time() if now is None else now),
+            int(mode),
+            uuid.uuid4().hex,
+        ]
+        for spec in specs:
+            args.extend(
+                [
+                    spec.algorithm.value,
+                    spec.limit,
+                    spec.window_seconds,
+                    1 if spec.enforce else 0,
+                ]
+            )
+
+        raw = await self._script(keys=[spec.key for spec in specs], args=args)
+
+        return [
+            LimitResult(
+                allowed=bool(int(allowed)),
+                current_count=int(count),
+                retry_after=int(retry_after_ms) / 1000,
+            )
+            for allowed, count, retry_after_ms in raw
+        ]
+
+    async def check(self, specs: Sequence[LimitSpec]) -> list[LimitResult]:
+        """Evaluate limits without recording the request."""
+        return await self.evaluate(specs, LimitMode.CHECK)
+
+    async def acquire(self, specs: Sequence[LimitSpec]) -> list[LimitResult]:
+        """Check and record the request unless an enforced limit is exceeded."""
+        return await self.evaluate(specs, LimitMode.ACQUIRE)
+
+    async def record(self, specs: Sequence[LimitSpec]) -> list[LimitResult]:
+        """Record the request against every limit without enforcing."""
+        return await self.evaluate(specs, LimitMode.RECORD)
+
+
+def resolve_algorithm(value: Any, default: RateLimitAlgorithm) -> RateLimitAlgorithm:
+    """Coerce a configured algorithm name, falling back to ``default``."""
+    if value is None:
+        return default
+    try:
+        return RateLimitAlgorithm(value)
+    except ValueError:
+        logger.warning("rate_limit.unknown_algorithm", algorithm=value)
+        return default
@@ -42,11 +42,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         called_next = False
 
         try:
-            # Check rate limit
+            # Check and record the request against all rules in one round-trip
             async for db in get_async_session(request=request):
                 service = RateLimitService(db)
 
-                is_allowed, rule_applied, current_count = await service.check_rate_limit(
+                is_allowed, rule_applied, current_count, retry_after = await service.acquire(
                     tenant_id=tenant_id,
                     endpoint=endpoint,
                     method=method,
@@ -56,9 +56,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 )
 
                 if not is_allowed and rule_applied:
-                    # Calculate retry-after
-                    retry_after = rule_applied.window_seconds
-
                     # Commit the violation log
                     await db.commit()
 
@@ -75,29 +72,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         headers={"Retry-After": str(retry_after)},
                     )
 
+                # Commit any log-only violation before handing off
+                await db.commit()
+
                 # Process request
                 called_next = True
                 response = await call_next(request)
 
-                # Increment counter for successful requests
-                if 200 <= response.status_code < 400:
-                    await service.increment(
-                        tenant_id=tenant_id,
-                        endpoint=endpoint,
-                        user_id=user_id,
-                        ip_address=ip_address,
-                        api_key_id=api_key_id,
-                    )
-
                 # Add rate limit headers
                 if rule_applied:
                     remaining = max(0, rule_applied.max_requests - current_count - 1)
-                    retry_after = rule_applied.window_seconds
                     response.headers["X-RateLimit-Limit"] = str(rule_applied.max_requests)
                     response.headers["X-RateLimit-Remaining"] = str(remaining)
-                    response.headers["X-RateLimit-Reset"] = str(retry_after)
-
-                await db.commit()
+                    response.headers["X-RateLimit-Reset"] = str(rule_applied.window_seconds)
 
                 return response
 
@@ -153,6 +153,8 @@ async def create_rate_limit_rule(
     await db.commit()
     await db.refresh(rule)
 
+    await service.invalidate_rules(rule.tenant_id)
+
     return rule
 
 
@@ -265,6 +267,8 @@ async def update_rate_limit_rule(
     await db.commit()
     await db.refresh(rule)
 
+    await service.invalidate_rules(rule.tenant_id)
+
     return rule
 
 
@@ -299,6 +303,8 @@ async def delete_rate_limit_rule(
     rule.deleted_at = datetime.now(UTC)
     await db.commit()
 
+    await RateLimitService(db).invalidate_rules(rule.tenant_id)
+
 
 @router.get(
     "/status",
@@ -352,9 +358,7 @@ async def reset_rate_limit(
             detail="Tenant ID is required",
         )
 
-    success = await service.reset_limit(
-        tenant_id=tenant_id, rule_id=rule_id, identifier=identifier
-    )
+    success = await service.reset_limit(tenant_id=tenant_id, rule_id=rule_id, identifier=identifier)
 
     if not success:
         raise HTTPException(
@@ -0,0 +1,317 @@
+"""
+Compiled Rate Limit Rule Index.
+
+In-process, per-tenant index of rate limit rules. Rules are loaded from the
+database once per tenant, endpoint patterns are precompiled and bucketed in a
+literal-prefix trie, and exemption lists are frozen into sets. Rule changes
+bump a Redis version key and are broadcast over pub/sub so every worker drops
+its stale index.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import structlog
+
+from dotmac.platform.core.invalidation import InvalidationListener
+from dotmac.platform.rate_limit.limiter import RateLimitAlgorithm, resolve_algorithm
+from dotmac.platform.rate_limit.models import (
+    RateLimitAction,
+    RateLimitRule,
+    RateLimitScope,
+    RateLimitWindow,
+)
+from dotmac.platform.redis_client import RedisClientType
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "ratelimit:rules:invalidate"
+VERSION_KEY_PREFIX = "ratelimit:rules:version"
+
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRateLimitRule:
+    """Immutable, session-independent snapshot of a RateLimitRule."""
+
+    id: UUID
+    name: str
+    scope: RateLimitScope
+    endpoint_pattern: str | None
+    max_requests: int
+    window: RateLimitWindow
+    window_seconds: int
+    action: RateLimitAction
+    priority: int
+    exempt_user_ids: frozenset[str]
+    exempt_ip_addresses: frozenset[str]
+    exempt_api_keys: frozenset[str]
+    algorithm: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_LOG
+    config: dict[str, Any] = field(default_factory=dict, compare=False, hash=False)
+    matcher: re.Pattern[str] | None = field(default=None, compare=False, hash=False)
+
+    @classmethod
+    def from_model(cls, rule: RateLimitRule) -> "CompiledRateLimitRule":
+        """Build a snapshot from an ORM rule, compiling its endpoint pattern."""
+        matcher: re.Pattern[str] | None = None
+        if rule.endpoint_pattern is not None and rule.scope != RateLimitScope.GLOBAL:
+            matcher = re.compile(rule.endpoint_pattern)
+
+        config = dict(rule.config or {})
+        default_algorithm = resolve_algorithm(
+            settings.rate_limit.algorithm, RateLimitAlgorithm.SLIDING_LOG
+        )
+
+        return cls(
+            id=rule.id,
+            name=rule.name,
+            scope=rule.scope,
+            endpoint_pattern=rule.endpoint_pattern,
+            max_requests=rule.max_requests,
+            window=rule.window,
+            window_seconds=rule.window_seconds,
+            action=rule.action,
+            priority=rule.priority,
+            exempt_user_ids=frozenset(rule.exempt_user_ids or ()),
+            exempt_ip_addresses=frozenset(rule.exempt_ip_addresses or ()),
+            exempt_api_keys=frozenset(rule.exempt_api_keys or ()),
+            algorithm=resolve_algorithm(config.get("algorithm"), default_algorithm),
+            config=config,
+            matcher=matcher,
+        )
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Return the literal text every match of ``pattern`` must start with.
+
+    Patterns are applied with ``re.match`` semantics (anchored at the start),
+    so any rule whose literal prefix is not a prefix of the endpoint can be
+    skipped without running the regex. Returns an empty string whenever the
+    prefix cannot be determined safely.
+    """
+    if "|" in pattern:
+        return ""
+
+    body = pattern[1:] if pattern.startswith("^") else pattern
+    prefix: list[str] = []
+    for char in body:
+        if char in _REGEX_META:
+            # A quantifier that allows zero repetitions makes the previous char optional
+            if char in _OPTIONAL_QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return "".join(prefix)
+
+
+class _TrieNode:
+    __slots__ = ("children", "rules")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.rules: list[tuple[int, CompiledRateLimitRule]] = []
+
+
+class TenantRuleIndex:
+    """Compiled rule set for a single tenant."""
+
+    def __init__(
+        self,
+        rules: Iterable[CompiledRateLimitRule],
+        *,
+        version: int = 0,
+        match_cache_size: int = 1024,
+    ) -> None:
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._unconditional: list[tuple[int, CompiledRateLimitRule]] = []
+        self._root = _TrieNode()
+        self._match_cache: OrderedDict[str, tuple[CompiledRateLimitRule, ...]] = OrderedDict()
+        self._match_cache_size = match_cache_size
+        self.rule_count = 0
+
+        for ordinal, rule in enumerate(rules):
+            self.rule_count += 1
+            if rule.matcher is None:
+                self._unconditional.append((ordinal, rule))
+                continue
+
+            node = self._root
+            for char in literal_prefix(rule.matcher.pattern):
+                node = node.children.setdefault(char, _TrieNode())
+            node.rules.append((ordinal, rule))
+
+    def match(self, endpoint: str) -> list[CompiledRateLimitRule]:
+        """Return rules applicable to ``endpoint`` in evaluation order."""
+        cached = self._match_cache.get(endpoint)
+        if cached is not None:
+            self._match_cache.move_to_end(endpoint)
+            return list(cached)
+
+        candidates = list(self._unconditional)
+        node: _TrieNode | None = self._root
+        position = 0
+        while node is not None:
+            for ordinal, rule in node.rules:
+                if rule.matcher is not None and rule.matcher.match(endpoint):
+                    candidates.append((ordinal, rule))
+            if position >= len(endpoint):
+                break
+            node = node.children.get(endpoint[position])
+            position += 1
+
+        candidates.sort(key=lambda item: item[0])
+        matched = tuple(rule for _, rule in candidates)
+
+        self._match_cache[endpoint] = matched
+        if len(self._match_cache) > self._match_cache_size:
+            self._match_cache.popitem(last=False)
+
+        return list(matched)
+
+
+class RateLimitRuleIndex:
+    """
+    Process-wide registry of compiled per-tenant rule indexes.
+
+    The hot path (:meth:`get_or_load` on a warm tenant) performs no I/O.
+    Entries are dropped when an invalidation for the tenant arrives over
+    pub/sub, and ``max_age`` bounds staleness if the listener is not running.
+    """
+
+    def __init__(self, max_age: float | None = None, match_cache_size: int = 1024) -> None:
+        self.max_age = (
+            float(settings.rate_limit.rule_cache_ttl_seconds) if max_age is None else max_age
+        )
+        self.match_cache_size = match_cache_size
+        self._indexes: dict[str, TenantRuleIndex] = {}
+        self._load_locks: dict[str, asyncio.Lock] = {}
+        # Bumped on every local or remote invalidation; guards in-flight loads
+        self._generations: dict[str, int] = {}
+        self._remote_versions: dict[str, int] = {}
+        self._listener = InvalidationListener(
+            INVALIDATION_CHANNEL, self.handle_message, self.invalidate, name="rate_limit.rule_index"
+        )
+
+    def get(self, tenant_id: str) -> TenantRuleIndex | None:
+        """Return the cached index for a tenant if it is still fresh."""
+        index = self._indexes.get(tenant_id)
+        if index is None:
+            return None
+        if self.max_age > 0 and time.monotonic() - index.loaded_at > self.max_age:
+            self._indexes.pop(tenant_id, None)
+            return None
+        return index
+
+    async def get_or_load(
+        self,
+        tenant_id: str,
+        loader: Callable[[], Awaitable[Sequence[RateLimitRule]]],
+    ) -> TenantRuleIndex:
+        """Return the tenant index, loading it once if missing (single-flight)."""
+        index = self.get(tenant_id)
+        if index is not None:
+            return index
+
+        lock = self._load_locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            index = self.get(tenant_id)
+            if index is not None:
+                return index
+
+            generation = self._generations.get(tenant_id, 0)
+            rules = await loader()
+            index = self.build(tenant_id, rules)
+
+            # Skip caching if an invalidation landed while we were loading
+            if self._generations.get(tenant_id, 0) == generation:
+                self._indexes[tenant_id] = index
+            return index
+
+    def build(self, tenant_id: str, rules: Iterable[RateLimitRule]) -> TenantRuleIndex:
+        """Compile ORM rules into a tenant index, skipping invalid patterns."""
+        compiled: list[CompiledRateLimitRule] = []
+        for rule in rules:
+            try:
+                compiled.append(CompiledRateLimitRule.from_model(rule))
+            except re.error:
+                logger.warning(
+                    "rate_limit.invalid_pattern",
+                    rule_id=str(rule.id),
+                    endpoint_pattern=rule.endpoint_pattern,
+                )
+
+        return TenantRuleIndex(
+            compiled,
+            version=self._remote_versions.get(tenant_id, 0),
+            match_cache_size=self.match_cache_size,
+        )
+
+    def invalidate(self, tenant_id: str | None = None) -> None:
+        """Drop cached indexes for one tenant, or all tenants."""
+        if tenant_id is None:
+            for key in list(self._indexes) + list(self._generations):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._indexes.clear()
+            return
+
+        self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+        self._indexes.pop(tenant_id, None)
+
+    async def publish_invalidation(self, redis: RedisClientType, tenant_id: str) -> int:
+        """Bump the tenant's rule version and broadcast it to all workers."""
+        self.invalidate(tenant_id)
+        version = int(await redis.incr(f"{VERSION_KEY_PREFIX}:{tenant_id}"))
+        self._remote_versions[tenant_id] = version
+        await redis.publish(INVALIDATION_CHANNEL, f"{tenant_id}:{version}")
+        return version
+
+    def handle_message(self, data: str | bytes) -> None:
+        """Apply an invalidation message of the form ``<tenant_id>:<version>``."""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+
+        tenant_id, _, raw_version = data.rpartition(":")
+        if not tenant_id:
+            tenant_id, raw_version = raw_version, "0"
+        try:
+            version = int(raw_version)
+        except ValueError:
+            logger.warning("rate_limit.rule_index.bad_message", data=data)
+            return
+
+        if version and version <= self._remote_versions.get(tenant_id, 0):
+            return
+
+        self._remote_versions[tenant_id] = max(version, self._remote_versions.get(tenant_id, 0))
+        self.invalidate(tenant_id)
+        logger.debug("rate_limit.rule_index.invalidated", tenant_id=tenant_id, version=version)
+
+    async def start_listener(self, redis: RedisClientType) -> None:
+        """Start the background pub/sub listener for rule invalidations."""
+        self._listener.start(redis)
+
+    async def stop_listener(self) -> None:
+        """Stop the background pub/sub listener."""
+        await self._listener.stop()
+
+
+_rule_index: RateLimitRuleIndex | None = None
+
+
+def get_rule_index() -> RateLimitRuleIndex:
+    """Return the process-wide rate limit rule index."""
+    global _rule_index
+    if _rule_index is None:
+        _rule_index = RateLimitRuleIndex()
+    return _rule_index
@@ -1,12 +1,10 @@
 """
 Rate Limiting Service.
 
-Redis-backed rate limiting with sliding window algorithm.
+Redis-backed rate limiting with atomic, script-based limit evaluation.
 """
 
 import hashlib
-import re
-from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
@@ -14,6 +12,11 @@ import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dotmac.platform.rate_limit.limiter import (
+    LimitSpec,
+    RateLimitAlgorithm,
+    ScriptedRateLimiter,
+)
 from dotmac.platform.rate_limit.models import (
     RateLimitAction,
     RateLimitLog,
@@ -21,6 +24,11 @@ from dotmac.platform.rate_limit.models import (
     RateLimitScope,
     RateLimitWindow,
 )
+from dotmac.platform.rate_limit.rule_index import (
+    CompiledRateLimitRule,
+    RateLimitRuleIndex,
+    get_rule_index,
+)
 from dotmac.platform.redis_client import RedisClientType
 from dotmac.platform.settings import settings
 
@@ -51,10 +59,17 @@ class RateLimitExceeded(Exception):
 class RateLimitService:
     """Service for rate limiting with Redis backend."""
 
-    def __init__(self, db: AsyncSession, redis: RedisClientType | None = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis: RedisClientType | None = None,
+        rule_index: RateLimitRuleIndex | None = None,
+    ):
         """Initialize rate limit service."""
         self.db = db
         self.redis = redis  # Will be injected or created
+        self.rule_index = rule_index or get_rule_index()
+        self._limiter: ScriptedRateLimiter | None = None
 
     async def _get_redis(self) -> RedisClientType:
         """Get Redis connection."""
@@ -70,6 +85,12 @@ class RateLimitService:
             )
         return self.redis
 
+    async def _get_limiter(self) -> ScriptedRateLimiter:
+        """Get the scripted limiter bound to this service's Redis client."""
+        if self._limiter is None:
+            self._limiter = ScriptedRateLimiter(await self._get_redis())
+        return self._limiter
+
     def _get_window_seconds(self, window: RateLimitWindow) -> int:
         """Convert window enum to seconds."""
         if window == RateLimitWindow.SECOND:
@@ -104,7 +125,7 @@ class RateLimitService:
         user_id: UUID | None = None,
         ip_address: str | None = None,
         api_key_id: str | None = None,
-    ) -> tuple[bool, RateLimitRule | None, int]:
+    ) -> tuple[bool, CompiledRateLimitRule | None, int]:
         """
         Check if request should be rate limited.
 
@@ -166,6 +187,82 @@ class RateLimitService:
 
         return (True, None, 0)
 
+    async def acquire(
+        self,
+        tenant_id: str,
+        endpoint: str,
+        method: str,
+        user_id: UUID | None = None,
+        ip_address: str | None = None,
+        api_key_id: str | None = None,
+    ) -> tuple[bool, CompiledRateLimitRule | None, int, int]:
+        """
+        Check and record a request against every applicable rule atomically.
+
+        All rules are evaluated in a single script call. The request is only
+        counted when no blocking rule is exceeded, so concurrent bursts
+        cannot overshoot a limit.
+
+        Returns:
+            Tuple of (is_allowed, rule_applied, current_count, retry_after_seconds)
+        """
+        rules = await self._get_applicable_rules(tenant_id, endpoint)
+
+        plans: list[tuple[CompiledRateLimitRule, LimitSpec]] = []
+        for rule in rules:
+            if await self._is_exempt(rule, user_id, ip_address, api_key_id):
+                continue
+
+            identifier = self._get_identifier(
+                rule.scope, tenant_id, user_id, ip_address, api_key_id, endpoint
+            )
+
+            if identifier is None:
+                continue
+
+            plans.append((rule, self._limit_spec(tenant_id, rule, identifier)))
+
+        if not plans:
+            return (True, None, 0, 0)
+
+        limiter = await self._get_limiter()
+        results = await limiter.acquire([spec for _, spec in plans])
+
+        logged: tuple[CompiledRateLimitRule, int] | None = None
+        for (rule, _), result in zip(plans, results, strict=True):
+            if result.allowed:
+                continue
+
+            await self._log_violation(
+                tenant_id=tenant_id,
+                rule=rule,
+                endpoint=endpoint,
+                method=method,
+                user_id=user_id,
+                ip_address=ip_address,
+                api_key_id=api_key_id,
+                current_count=result.current_count,
+            )
+
+            if rule.action == RateLimitAction.LOG_ONLY:
+                logger.warning(
+                    "Rate limit exceeded (log only)",
+                    rule=rule.name,
+                    count=result.current_count,
+                    limit=rule.max_requests,
+                )
+                # Keep going: an enforced rule later in the list still denies
+                if logged is None:
+                    logged = (rule, result.current_count)
+                continue
+
+            # BLOCK, THROTTLE and CAPTCHA all deny; caller decides the response
+            return (False, rule, result.current_count, result.retry_after_seconds)
+
+        if logged is not None:
+            return (True, logged[0], logged[1], 0)
+        return (True, None, 0, 0)
+
     async def increment(
         self,
         tenant_id: str,
@@ -190,8 +287,15 @@ class RateLimitService:
 
             await self._increment_counter(tenant_id, rule, identifier)
 
-    async def _get_applicable_rules(self, tenant_id: str, endpoint: str) -> list[RateLimitRule]:
-        """Get rate limit rules applicable to endpoint."""
+    async def _get_applicable_rules(
+        self, tenant_id: str, endpoint: str
+    ) -> list[CompiledRateLimitRule]:
+        """Get rate limit rules applicable to endpoint from the compiled index."""
+        index = await self.rule_index.get_or_load(tenant_id, lambda: self._load_rules(tenant_id))
+        return index.match(endpoint)
+
+    async def _load_rules(self, tenant_id: str) -> list[RateLimitRule]:
+        """Load active rules for a tenant, highest priority first."""
         stmt = (
             select(RateLimitRule)
             .where(
@@ -203,29 +307,23 @@ class RateLimitService:
         )
 
         result = await self.db.execute(stmt)
-        all_rules = list(result.scalars().all())
-
-        # Filter by endpoint pattern
-        applicable_rules = []
-        for rule in all_rules:
-            if rule.endpoint_pattern is None or rule.scope == RateLimitScope.GLOBAL:
-                applicable_rules.append(rule)
-                continue
-            try:
-                if re.match(rule.endpoint_pattern, endpoint):
-                    applicable_rules.append(rule)
-            except re.error:
-                logger.warning(
-                    "rate_limit.invalid_pattern",
-                    rule_id=str(rule.id),
-                    endpoint_pattern=rule.endpoint_pattern,
-                )
-
-        return applicable_rules
+        return list(result.scalars().all())
+
+    async def invalidate_rules(self, tenant_id: str) -> None:
+        """Invalidate the compiled rule index for a tenant on every worker."""
+        try:
+            redis = await self._get_redis()
+            await self.rule_index.publish_invalidation(redis, tenant_id)
+        except Exception as e:
+            # Local index is already dropped; other workers fall back to max-age expiry
+            self.rule_index.invalidate(tenant_id)
+            logger.warning(
+                "rate_limit.rule_index.publish_failed", tenant_id=tenant_id, error=str(e)
+            )
 
     async def _is_exempt(
         self,
-        rule: RateLimitRule,
+        rule: CompiledRateLimitRule,
         user_id: UUID | None,
         ip_address: str | None,
         api_key_id: str | None,
@@ -264,52 +362,43 @@ class RateLimitService:
         else:
             return None
 
+    def _limit_spec(
+        self, tenant_id: str, rule: CompiledRateLimitRule, identifier: str
+    ) -> LimitSpec:
+        """Build the limiter spec for a rule and identifier."""
+        key = self._generate_key(tenant_id, rule.scope, identifier, str(rule.id))
+        return LimitSpec(
+            key=ScriptedRateLimiter.storage_key(key, rule.algorithm),
+            limit=rule.max_requests,
+            window_seconds=rule.window_seconds,
+            algorithm=rule.algorithm,
+            enforce=rule.action != RateLimitAction.LOG_ONLY,
+        )
+
     async def _check_limit(
-        self, tenant_id: str, rule: RateLimitRule, identifier: str
+        self, tenant_id: str, rule: CompiledRateLimitRule, identifier: str
     ) -> tuple[bool, int]:
         """
-        Check if limit is exceeded using sliding window.
+        Check if limit is exceeded without recording the request.
 
         Returns:
             Tuple of (is_allowed, current_count)
         """
-        redis = await self._get_redis()
-        key = self._generate_key(tenant_id, rule.scope, identifier, str(rule.id))
-
-        # Use Redis sorted set for sliding window
-        now = datetime.now(UTC).timestamp()
-        window_start = now - rule.window_seconds
-
-        # Remove old entries outside window
-        await redis.zremrangebyscore(key, 0, window_start)
-
-        # Count current entries in window
-        current_count = await redis.zcount(key, window_start, now)
-
-        # Check limit
-        is_allowed = current_count < rule.max_requests
-
-        return (is_allowed, current_count)
+        limiter = await self._get_limiter()
+        (result,) = await limiter.check([self._limit_spec(tenant_id, rule, identifier)])
+        return (result.allowed, result.current_count)
 
     async def _increment_counter(
-        self, tenant_id: str, rule: RateLimitRule, identifier: str
+        self, tenant_id: str, rule: CompiledRateLimitRule, identifier: str
     ) -> None:
         """Increment rate limit counter."""
-        redis = await self._get_redis()
-        key = self._generate_key(tenant_id, rule.scope, identifier, str(rule.id))
-
-        now = datetime.now(UTC).timestamp()
-
-        # Add current request to sorted set
-        await redis.zadd(key, {str(now): now})
-
-        # Set expiration to window + 60 seconds buffer
-        await redis.expire(key, rule.window_seconds + 60)
+        limiter = await self._get_limiter()
+        await limiter.record([self._limit_spec(tenant_id, rule, identifier)])
 
     async def _log_violation(
         self,
         tenant_id: str,
-        rule: RateLimitRule,
+        rule: CompiledRateLimitRule,
         endpoint: str,
         method: str,
         user_id: UUID | None,
@@ -414,7 +503,10 @@ class RateLimitService:
         redis = await self._get_redis()
         key = self._generate_key(tenant_id, rule.scope, identifier, str(rule.id))
 
-        await redis.delete(key)
+        # Clear state for every algorithm so switching algorithms cannot leave stale counters
+        await redis.delete(
+            *{ScriptedRateLimiter.storage_key(key, algorithm) for algorithm in RateLimitAlgorithm}
+        )
 
         logger.info("Rate limit reset", rule=rule.name, identifier=identifier)
 
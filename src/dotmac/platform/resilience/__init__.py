@@ -9,6 +9,7 @@ and observability.
 from .circuit_breaker import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 from .service_mesh import (
     EncryptionLevel,
+    HashRing,
     LoadBalancer,
     RetryPolicy,
     ServiceCall,
@@ -30,6 +31,7 @@ __all__ = [
     "RetryPolicy",
     "EncryptionLevel",
     "LoadBalancer",
+    "HashRing",
     "ServiceRegistry",
     "retry",
     "stop_after_attempt",
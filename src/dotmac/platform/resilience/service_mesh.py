@@ -17,10 +17,14 @@ import hashlib
 import json
 import os
 import ssl
+import struct
 import time
+from bisect import bisect_right
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
+from secrets import SystemRandom
 from typing import Any
 from uuid import uuid4
 
@@ -50,6 +54,18 @@ class ServiceMarketplace:
 
 logger = structlog.get_logger(__name__)
 
+# Points per endpoint on the consistent hash ring
+VIRTUAL_NODES = 100
+# Pools larger than this pick the lesser-loaded of two random endpoints
+# instead of scanning every endpoint
+P2C_THRESHOLD = 32
+# Weight of the newest sample in the per-endpoint latency EWMA
+LATENCY_EWMA_ALPHA = 0.2
+# Seconds a service's healthy-endpoint list is reused between selections
+HEALTHY_SET_TTL = 1.0
+
+_random = SystemRandom()
+
 
 class TrafficPolicy(str, Enum):
     """Traffic routing policies."""
@@ -59,6 +75,7 @@ class TrafficPolicy(str, Enum):
     LEAST_CONNECTIONS = "least_connections"
     CONSISTENT_HASH = "consistent_hash"
     STICKY_SESSION = "sticky_session"
+    LEAST_LOADED = "least_loaded"
 
 
 class RetryPolicy(str, Enum):
@@ -111,6 +128,73 @@ class ServiceEndpoint:
         """Get the health check URL."""
         return f"{self.protocol}://{self.host}:{self.port}{self.health_check_path}"
 
+    @property
+    def key(self) -> str:
+        """Registry key (``host:port``) for connection, health and latency data."""
+        return f"{self.host}:{self.port}"
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def _ring_points(endpoint_key: str, count: int) -> list[int]:
+    """``count`` ring positions for an endpoint, eight per 64-byte digest."""
+    points: list[int] = []
+    for block in range((count + 7) // 8):
+        digest = hashlib.blake2b(f"{endpoint_key}#{block}".encode()).digest()
+        points.extend(struct.unpack(">8Q", digest))
+    return points[:count]
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+
+    Removing an endpoint only remaps the keys it owned; every other key keeps
+    its endpoint. Built once per membership change and looked up with a
+    binary search.
+    """
+
+    def __init__(
+        self, endpoints: Sequence[ServiceEndpoint], virtual_nodes: int = VIRTUAL_NODES
+    ) -> None:
+        self.endpoints = list(endpoints)
+        points = sorted(
+            (point, index)
+            for index, endpoint in enumerate(self.endpoints)
+            for point in _ring_points(endpoint.key, virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [index for _, index in points]
+
+    def lookup(self, key: str, allowed: set[str] | None = None) -> ServiceEndpoint | None:
+        """
+        Return the endpoint owning ``key``.
+
+        With ``allowed`` (endpoint keys), walk clockwise past endpoints not
+        in it, so keys of an unhealthy endpoint spread over its neighbours.
+        """
+        if not self._hashes:
+            return None
+        count = len(self._hashes)
+        start = bisect_right(self._hashes, _hash64(key))
+        if allowed is None:
+            return self.endpoints[self._owners[start % count]]
+
+        skipped: set[int] = set()
+        for offset in range(count):
+            owner = self._owners[(start + offset) % count]
+            if owner in skipped:
+                continue
+            endpoint = self.endpoints[owner]
+            if endpoint.key in allowed:
+                return endpoint
+            skipped.add(owner)
+            if len(skipped) == len(self.endpoints):
+                break
+        return None
+
 
 @dataclass
 class TrafficRule:
@@ -216,6 +300,33 @@ class ServiceRegistry:
         self.circuit_breakers: dict[str, CircuitBreakerState] = {}
         self.connection_counts: dict[str, int] = {}
         self.health_status: dict[str, dict[str, Any]] = {}
+        self.latency_ewma: dict[str, float] = {}
+        # Bumped on every membership change so load balancers can rebuild rings
+        self.membership_versions: dict[str, int] = {}
+        # Bumped whenever an endpoint's health flips
+        self.health_version = 0
+
+    def membership_version(self, service_name: str) -> int:
+        """Version of a service's endpoint list."""
+        return self.membership_versions.get(service_name, 0)
+
+    def _bump_membership(self, service_name: str) -> None:
+        self.membership_versions[service_name] = self.membership_version(service_name) + 1
+
+    def record_health(self, endpoint_key: str, status: dict[str, Any]) -> None:
+        """Store a health check result."""
+        previous = self.health_status.get(endpoint_key, {}).get("healthy")
+        self.health_status[endpoint_key] = status
+        if previous != status.get("healthy"):
+            self.health_version += 1
+
+    def record_latency(self, endpoint_key: str, duration: float) -> None:
+        """Fold a call duration (seconds) into the endpoint's latency EWMA."""
+        current = self.latency_ewma.get(endpoint_key)
+        if current is None:
+            self.latency_ewma[endpoint_key] = duration
+        else:
+            self.latency_ewma[endpoint_key] = current + LATENCY_EWMA_ALPHA * (duration - current)
 
     def register_endpoint(self, endpoint: ServiceEndpoint) -> None:
         """Register a service endpoint."""
@@ -230,6 +341,7 @@ class ServiceRegistry:
         ]
 
         self.endpoints[endpoint.service_name].append(endpoint)
+        self._bump_membership(endpoint.service_name)
         logger.info(f"Registered endpoint: {endpoint.service_name} at {endpoint.url}")
 
     def unregister_endpoint(self, service_name: str, host: str, port: int) -> None:
@@ -240,6 +352,7 @@ class ServiceRegistry:
                 for ep in self.endpoints[service_name]
                 if not (ep.host == host and ep.port == port)
             ]
+            self._bump_membership(service_name)
             logger.info(f"Unregistered endpoint: {service_name} at {host}:{port}")
 
     def get_endpoints(self, service_name: str) -> list[ServiceEndpoint]:
@@ -270,6 +383,11 @@ class LoadBalancer:
     def __init__(self, registry: ServiceRegistry) -> None:
         self.registry = registry
         self.round_robin_counters: dict[str, int] = {}
+        self._rings: dict[str, tuple[int, HashRing]] = {}
+        # service -> (cache key, expires at, healthy endpoints, healthy keys or None if all)
+        self._healthy: dict[
+            str, tuple[tuple[int, int], float, list[ServiceEndpoint], set[str] | None]
+        ] = {}
 
     async def select_endpoint(
         self,
@@ -282,11 +400,7 @@ class LoadBalancer:
         if not endpoints:
             return None
 
-        # Filter healthy endpoints
-        healthy_endpoints = [ep for ep in endpoints if await self._is_healthy(ep)]
-        if not healthy_endpoints:
-            # Fallback to all endpoints if none are healthy
-            healthy_endpoints = endpoints
+        healthy_endpoints, allowed = await self._healthy_endpoints(service_name, endpoints)
 
         if policy == TrafficPolicy.ROUND_ROBIN:
             return self._select_round_robin(service_name, healthy_endpoints)
@@ -294,13 +408,60 @@ class LoadBalancer:
             return self._select_weighted(healthy_endpoints)
         elif policy == TrafficPolicy.LEAST_CONNECTIONS:
             return self._select_least_connections(healthy_endpoints)
+        elif policy == TrafficPolicy.LEAST_LOADED:
+            return self._select_least_loaded(healthy_endpoints)
         elif policy == TrafficPolicy.CONSISTENT_HASH:
-            return self._select_consistent_hash(healthy_endpoints, source_context or {})
+            return self._select_consistent_hash(
+                healthy_endpoints,
+                source_context or {},
+                ring=self._ring(service_name, endpoints),
+                allowed=allowed,
+            )
         elif policy == TrafficPolicy.STICKY_SESSION:
-            return self._select_sticky_session(healthy_endpoints, source_context or {})
+            return self._select_sticky_session(
+                healthy_endpoints,
+                source_context or {},
+                ring=self._ring(service_name, endpoints),
+                allowed=allowed,
+            )
         else:
             return healthy_endpoints[0]  # Default to first
 
+    async def _healthy_endpoints(
+        self, service_name: str, endpoints: list[ServiceEndpoint]
+    ) -> tuple[list[ServiceEndpoint], set[str] | None]:
+        """
+        Return the healthy endpoints and their keys (``None`` when all are usable).
+
+        Reused for ``HEALTHY_SET_TTL`` seconds unless membership or an
+        endpoint's health changes, so selections do not re-check every endpoint.
+        """
+        cache_key = (self.registry.membership_version(service_name), self.registry.health_version)
+        now = time.monotonic()
+        cached = self._healthy.get(service_name)
+        if cached is not None and cached[0] == cache_key and now < cached[1]:
+            return cached[2], cached[3]
+
+        results = await asyncio.gather(*(self._is_healthy(ep) for ep in endpoints))
+        healthy = [ep for ep, is_healthy in zip(endpoints, results, strict=True) if is_healthy]
+        allowed: set[str] | None = {ep.key for ep in healthy}
+        if not healthy or len(healthy) == len(endpoints):
+            # Fallback to all endpoints if none are healthy
+            healthy, allowed = endpoints, None
+
+        self._healthy[service_name] = (cache_key, now + HEALTHY_SET_TTL, healthy, allowed)
+        return healthy, allowed
+
+    def _ring(self, service_name: str, endpoints: list[ServiceEndpoint]) -> HashRing:
+        """Hash ring over all of a service's endpoints, rebuilt on membership changes."""
+        version = self.registry.membership_version(service_name)
+        cached = self._rings.get(service_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        ring = HashRing(endpoints)
+        self._rings[service_name] = (version, ring)
+        return ring
+
     def _select_round_robin(
         self, service_name: str, endpoints: list[ServiceEndpoint]
     ) -> ServiceEndpoint:
@@ -331,35 +492,92 @@ class LoadBalancer:
 
         return endpoints[-1]
 
+    @staticmethod
+    def _random_pair(
+        endpoints: list[ServiceEndpoint],
+    ) -> tuple[ServiceEndpoint, ServiceEndpoint]:
+        """Two distinct random endpoints."""
+        first = _random.randrange(len(endpoints))
+        second = _random.randrange(len(endpoints) - 1)
+        if second >= first:
+            second += 1
+        return endpoints[first], endpoints[second]
+
     def _select_least_connections(self, endpoints: list[ServiceEndpoint]) -> ServiceEndpoint:
-        """Select endpoint with least connections."""
+        """Select endpoint with least connections (of two random ones in large pools)."""
+        connection_counts = self.registry.connection_counts
+        if len(endpoints) > P2C_THRESHOLD:
+            first, second = self._random_pair(endpoints)
+            if connection_counts.get(second.key, 0) < connection_counts.get(first.key, 0):
+                return second
+            return first
+
         min_connections = float("inf")
         selected = endpoints[0]
 
         for endpoint in endpoints:
-            endpoint_key = f"{endpoint.host}:{endpoint.port}"
-            connections = self.registry.connection_counts.get(endpoint_key, 0)
+            connections = connection_counts.get(endpoint.key, 0)
             if connections < min_connections:
                 min_connections = connections
                 selected = endpoint
 
         return selected
 
+    def _select_least_loaded(self, endpoints: list[ServiceEndpoint]) -> ServiceEndpoint:
+        """
+        Power of two choices on latency-weighted load.
+
+        Load is in-flight calls + 1 times the endpoint's latency EWMA. An
+        endpoint without samples borrows the other candidate's latency.
+        """
+        if len(endpoints) == 1:
+            return endpoints[0]
+
+        first, second = self._random_pair(endpoints)
+        latencies = self.registry.latency_ewma
+        first_latency = latencies.get(first.key)
+        second_latency = latencies.get(second.key)
+        if first_latency is None:
+            first_latency = second_latency if second_latency is not None else 1.0
+        if second_latency is None:
+            second_latency = first_latency
+
+        connection_counts = self.registry.connection_counts
+        first_load = (connection_counts.get(first.key, 0) + 1) * first_latency
+        second_load = (connection_counts.get(second.key, 0) + 1) * second_latency
+        return second if second_load < first_load else first
+
     def _select_consistent_hash(
-        self, endpoints: list[ServiceEndpoint], source_context: dict[str, Any]
+        self,
+        endpoints: list[ServiceEndpoint],
+        source_context: dict[str, Any],
+        ring: HashRing | None = None,
+        allowed: set[str] | None = None,
     ) -> ServiceEndpoint:
         """Select endpoint using consistent hashing."""
         if not source_context:
             return endpoints[0]
 
-        # Create hash from source context (using SHA-256 instead of MD5 for security)
-        hash_input = json.dumps(source_context, sort_keys=True)
-        hash_value = int(hashlib.sha256(hash_input.encode()).hexdigest()[:16], 16)
-        index = hash_value % len(endpoints)
-        return endpoints[index]
+        hash_input = json.dumps(source_context, sort_keys=True, default=str)
+        return self._lookup_ring(endpoints, hash_input, ring, allowed)
+
+    @staticmethod
+    def _lookup_ring(
+        endpoints: list[ServiceEndpoint],
+        key: str,
+        ring: HashRing | None,
+        allowed: set[str] | None,
+    ) -> ServiceEndpoint:
+        if ring is None:
+            ring = HashRing(endpoints)
+        return ring.lookup(key, allowed) or endpoints[0]
 
     def _select_sticky_session(
-        self, endpoints: list[ServiceEndpoint], source_context: dict[str, Any]
+        self,
+        endpoints: list[ServiceEndpoint],
+        source_context: dict[str, Any],
+        ring: HashRing | None = None,
+        allowed: set[str] | None = None,
     ) -> ServiceEndpoint:
         """Select endpoint using sticky sessions with well-known context keys."""
         candidate_value: str | None = None
@@ -379,11 +597,10 @@ class LoadBalancer:
                     break
 
         if candidate_value:
-            hash_value = int(hashlib.sha256(candidate_value.encode()).hexdigest()[:16], 16)
-            return endpoints[hash_value % len(endpoints)]
+            return self._lookup_ring(endpoints, candidate_value, ring, allowed)
 
         # Fallback to consistent hash using full context (or first endpoint if empty)
-        return self._select_consistent_hash(endpoints, source_context)
+        return self._select_consistent_hash(endpoints, source_context, ring, allowed)
 
     async def _is_healthy(self, endpoint: ServiceEndpoint) -> bool:
         """Check if endpoint is healthy."""
@@ -414,22 +631,28 @@ class LoadBalancer:
                     is_healthy = response.status == 200
 
                     # Update health status
-                    self.registry.health_status[endpoint_key] = {
-                        "healthy": is_healthy,
-                        "last_check": time.time(),
-                        "status_code": response.status,
-                        "response_time_ms": 0,  # Would need timing logic
-                    }
+                    self.registry.record_health(
+                        endpoint_key,
+                        {
+                            "healthy": is_healthy,
+                            "last_check": time.time(),
+                            "status_code": response.status,
+                            "response_time_ms": 0,  # Would need timing logic
+                        },
+                    )
 
                     return is_healthy
 
         except Exception as e:
             logger.warning(f"Health check failed for {endpoint_key}: {e}")
-            self.registry.health_status[endpoint_key] = {
-                "healthy": False,
-                "last_check": time.time(),
-                "error": str(e),
-            }
+            self.registry.record_health(
+                endpoint_key,
+                {
+                    "healthy": False,
+                    "last_check": time.time(),
+                    "error": str(e),
+                },
+            )
             return False
 
 
@@ -720,7 +943,9 @@ class ServiceMesh:
                 )
 
                 circuit_breaker.record_success()
-                self._record_call_success(service_call, time.time() - start_time)
+                self._record_call_success(
+                    service_call, time.time() - start_time, endpoint_key=endpoint_key
+                )
 
                 return {
                     "status_code": response["status_code"],
@@ -822,8 +1047,13 @@ class ServiceMesh:
             )
         return 0.0
 
-    def _record_call_success(self, call: ServiceCall, duration: float) -> None:
+    def _record_call_success(
+        self, call: ServiceCall, duration: float, endpoint_key: str | None = None
+    ) -> None:
         """Record a successful service call."""
+        if endpoint_key is not None:
+            self.registry.record_latency(endpoint_key, duration)
+
         self.call_metrics["total_calls"] += 1
         self.call_metrics["successful_calls"] += 1
 
@@ -977,13 +1207,16 @@ class ServiceMesh:
                 response_time = 0  # Would need actual timing
 
                 # Update health status
-                self.registry.health_status[endpoint_key] = {
-                    "healthy": is_healthy,
-                    "last_check": time.time(),
-                    "status_code": response.status,
-                    "response_time_ms": response_time,
-                    "endpoint": endpoint.service_name,
-                }
+                self.registry.record_health(
+                    endpoint_key,
+                    {
+                        "healthy": is_healthy,
+                        "last_check": time.time(),
+                        "status_code": response.status,
+                        "response_time_ms": response_time,
+                        "endpoint": endpoint.service_name,
+                    },
+                )
 
                 # Update endpoint status
                 endpoint.status = ServiceStatus.HEALTHY if is_healthy else ServiceStatus.UNHEALTHY
@@ -995,12 +1228,15 @@ class ServiceMesh:
 
         except Exception as e:
             logger.error(f"Health check failed for {endpoint_key}: {e}")
-            self.registry.health_status[endpoint_key] = {
-                "healthy": False,
-                "last_check": time.time(),
-                "error": str(e),
-                "endpoint": endpoint.service_name,
-            }
+            self.registry.record_health(
+                endpoint_key,
+                {
+                    "healthy": False,
+                    "last_check": time.time(),
+                    "error": str(e),
+                    "endpoint": endpoint.service_name,
+                },
+            )
             endpoint.status = ServiceStatus.UNHEALTHY
             return False
 
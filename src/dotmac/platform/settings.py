@@ -251,6 +251,28 @@ class AuthSettings(BaseModel):  # BaseModel resolves to Any in isolation
         default_factory=lambda: os.getenv("JWT_USE_ASYMMETRIC", "false").lower() == "true",
         description="Feature flag: use asymmetric signing (default: false for migration)",
     )
+    jwt_claims_cache_size: int = Field(
+        default_factory=lambda: int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "4096")),
+        ge=0,
+        description="Max verified tokens kept in the in-process claims cache (0 disables)",
+    )
+
+    # RBAC permission cache
+    rbac_cache_ttl: int = Field(
+        default_factory=lambda: int(os.getenv("RBAC_CACHE_TTL", "300")),
+        ge=0,
+        description="Seconds user permission snapshots are kept in Redis",
+    )
+    rbac_local_cache_ttl: float = Field(
+        default_factory=lambda: float(os.getenv("RBAC_LOCAL_CACHE_TTL", "30")),
+        ge=0,
+        description="Seconds user permission snapshots are kept in the per-process cache",
+    )
+    rbac_local_cache_size: int = Field(
+        default_factory=lambda: int(os.getenv("RBAC_LOCAL_CACHE_SIZE", "10000")),
+        ge=0,
+        description="Max user permission snapshots in the per-process cache (0 disables)",
+    )
 
     # Session Management
     session_redis_url: str = Field(
@@ -421,6 +443,11 @@ class Settings(BaseSettings):
     port: int = Field(8000, description="Server port")
     workers: int = Field(4, description="Number of worker processes")
     reload: bool = Field(False, description="Auto-reload on changes")
+    middleware_mode: str = Field(
+        "base_http",
+        description="Middleware implementation: 'base_http' (BaseHTTPMiddleware) or 'asgi' (pure ASGI)",
+        pattern="^(base_http|asgi)$",
+    )
 
     # Security
     secret_key: str = Field(
@@ -636,6 +663,22 @@ class Settings(BaseSettings):
         session_db: int = Field(2, description="Session database number")
         pubsub_db: int = Field(3, description="Pub/sub database number")
 
+        # CacheService
+        cache_batch_size: int = Field(
+            500, description="Keys per MGET/pipeline/UNLINK batch in bulk cache operations"
+        )
+        cache_compress_min_bytes: int = Field(
+            4096, description="Compress cached values at least this large (0 disables)"
+        )
+        cache_serializers: dict[str, str] = Field(
+            default_factory=dict,
+            description="Serializer per cache namespace, e.g. {'api_response': 'orjson'}",
+        )
+        cache_pickle_allowlist: list[str] = Field(
+            default_factory=list,
+            description="Extra 'module.Class' entries the pickle cache serializer may load",
+        )
+
         @property
         def redis_url(self) -> str:
             """Build Redis URL."""
@@ -980,6 +1023,56 @@ class Settings(BaseSettings):
 
     celery: CelerySettings = CelerySettings()  # type: ignore[call-arg]
 
+    # ============================================================
+    # Event Bus
+    # ============================================================
+
+    class EventBusSettings(BaseModel):  # BaseModel resolves to Any in isolation
+        """In-process event bus dispatch configuration."""
+
+        model_config = ConfigDict()
+
+        worker_count: int = Field(4, description="Handler workers started with the event bus")
+        queue_size: int = Field(1000, description="Max queued handler runs per priority level")
+        publish_timeout: float = Field(
+            5.0, description="Max seconds publish waits for queue space (0 waits indefinitely)"
+        )
+        retry_base_delay: float = Field(2.0, description="Delay before the first handler retry")
+        retry_max_delay: float = Field(300.0, description="Upper bound for handler retry delays")
+        drain_timeout: float = Field(10.0, description="Seconds stop() waits for queued work")
+
+        # Distributed transport
+        transport: str = Field(
+            "pubsub",
+            description="Cross-process transport: pubsub (fire-and-forget) or streams",
+            pattern="^(pubsub|streams)$",
+        )
+        stream_key: str = Field("events:stream", description="Redis stream events are added to")
+        stream_maxlen: int = Field(100_000, description="Approximate max entries kept per stream")
+        consumer_group: str = Field(
+            "dotmac-platform", description="Consumer group shared by every worker pool"
+        )
+        read_count: int = Field(100, description="Max stream entries read per XREADGROUP")
+        read_block_ms: int = Field(
+            2000,
+            description=(
+                "Milliseconds XREADGROUP blocks when idle "
+                "(below the shared Redis client's socket timeout)"
+            ),
+        )
+        claim_idle_ms: int = Field(
+            60_000, description="Idle time before an unacknowledged entry is reclaimed"
+        )
+        claim_interval: float = Field(30.0, description="Seconds between XAUTOCLAIM sweeps")
+        max_deliveries: int = Field(
+            5, description="Deliveries before a reclaimed entry is dead-lettered"
+        )
+        dead_letter_stream_key: str = Field(
+            "events:stream:dead_letter", description="Redis stream for dead-lettered events"
+        )
+
+    event_bus: EventBusSettings = EventBusSettings()  # type: ignore[call-arg]
+
     # ============================================================
     # Observability & Monitoring
     # ============================================================
@@ -1060,7 +1153,31 @@ class Settings(BaseSettings):
         auto_process_renewals: bool = Field(
             False, description="Automatically process subscription renewals"
         )
+        renewal_batch_size: int = Field(
+            500, ge=1, description="Subscriptions renewed and committed per renewal batch"
+        )
+        renewal_concurrency: int = Field(
+            16, ge=1, description="Concurrent renewal webhook publications per batch"
+        )
         invoice_due_days: int = Field(30, description="Default invoice due period in days")
+        invoice_number_block_size: int = Field(
+            1,
+            ge=1,
+            description=(
+                "Invoice numbers each worker reserves per counter update (>1 enables block "
+                "allocation: fewer counter writes, numbers may have gaps and interleave)"
+            ),
+        )
+        invoice_number_pool_size: int = Field(
+            2,
+            ge=1,
+            description="Connections each worker keeps for invoice number counter updates",
+        )
+        pdf_render_workers: int = Field(
+            0,
+            ge=0,
+            description="Worker processes for batch invoice PDF rendering (0 = one per CPU core)",
+        )
         grace_period_days: int = Field(3, description="Grace period for failed payments")
         payment_retry_attempts: int = Field(3, description="Number of payment retry attempts")
         payment_retry_interval_hours: int = Field(24, description="Hours between payment retries")
@@ -1152,6 +1269,14 @@ class Settings(BaseSettings):
             None, description="Storage URL for distributed rate limiting"
         )
         key_prefix: str = Field("rate_limit", description="Key prefix for storage")
+        algorithm: str = Field(
+            "sliding_log",
+            description="Default algorithm: sliding_log, sliding_window or gcra",
+        )
+        rule_cache_ttl_seconds: int = Field(
+            300,
+            description="Max age of the in-process compiled rule index (0 = until invalidated)",
+        )
 
         # Per-endpoint limits
         endpoint_limits: dict[str, str] = Field(
@@ -1202,6 +1327,18 @@ class Settings(BaseSettings):
             description="Local storage path for dev/persistent volumes",
         )
 
+        # Streaming uploads/downloads
+        max_upload_size: int = Field(100 * 1024 * 1024, description="Max upload size in bytes")
+        stream_chunk_size: int = Field(
+            1024 * 1024, description="Chunk size for streamed uploads and downloads"
+        )
+        multipart_part_size: int = Field(
+            16 * 1024 * 1024, description="MinIO multipart part size (min 5 MiB)"
+        )
+        multipart_concurrency: int = Field(
+            4, description="MinIO multipart parts uploaded in parallel"
+        )
+
     storage: StorageSettings = StorageSettings()  # type: ignore[call-arg]
 
     # ============================================================
@@ -1286,6 +1423,32 @@ class Settings(BaseSettings):
     # Billing & Payment Integration
     # ============================================================
 
+    # ============================================================
+    # Outbound HTTP
+    # ============================================================
+
+    class HttpClientSettings(BaseModel):  # BaseModel resolves to Any in isolation
+        """Shared outbound HTTP client pools (see core.http_pool)."""
+
+        model_config = ConfigDict()
+
+        http2: bool = Field(True, description="Use HTTP/2 where possible (needs the h2 package)")
+        max_connections_per_host: int = Field(
+            50, description="Max open connections per destination host and profile"
+        )
+        max_keepalive_per_host: int = Field(
+            20, description="Idle keep-alive connections kept per destination host"
+        )
+        keepalive_expiry: float = Field(
+            30.0, description="Seconds an idle keep-alive connection is kept"
+        )
+        connect_timeout: float = Field(5.0, description="Connect timeout in seconds")
+        default_timeout: float = Field(30.0, description="Timeout of the 'default' profile")
+        fast_timeout: float = Field(10.0, description="Timeout of the 'fast' profile")
+        slow_timeout: float = Field(120.0, description="Timeout of the 'slow' profile")
+
+    http_client: HttpClientSettings = HttpClientSettings()  # type: ignore[call-arg]
+
     # ============================================================
     # Webhooks
     # ============================================================
@@ -1299,8 +1462,99 @@ class Settings(BaseSettings):
         retry_attempts: int = Field(3, description="Number of retry attempts for failed webhooks")
         timeout_seconds: int = Field(30, description="Webhook request timeout")
 
+        # Outbound delivery
+        max_concurrency: int = Field(500, description="Max in-flight deliveries per worker")
+        per_subscription_concurrency: int = Field(
+            10, description="Max in-flight deliveries per subscription"
+        )
+        pool_max_connections_per_host: int = Field(
+            20, description="Max open connections per destination host"
+        )
+        pool_max_keepalive_per_host: int = Field(
+            10, description="Idle keep-alive connections kept per destination host"
+        )
+        pool_keepalive_expiry: float = Field(
+            60.0, description="Seconds an idle keep-alive connection is kept"
+        )
+        retry_batch_size: int = Field(500, description="Due retries loaded per batch")
+        route_cache_ttl_seconds: int = Field(
+            300,
+            description="Max age of the in-process event routing index (0 = until invalidated)",
+        )
+
+        # Per-endpoint scheduling (circuit breaker, AIMD concurrency, token bucket)
+        endpoint_failure_threshold: int = Field(
+            5, description="Consecutive endpoint failures before its circuit opens"
+        )
+        endpoint_recovery_timeout: float = Field(
+            60.0, description="Seconds an open endpoint circuit waits before a probe"
+        )
+        endpoint_initial_concurrency: int = Field(
+            4, description="Starting in-flight limit per endpoint (grows additively on success)"
+        )
+        endpoint_max_concurrency: int = Field(20, description="Upper in-flight limit per endpoint")
+        endpoint_rate_per_second: float = Field(
+            50.0, description="Sustained requests per second per endpoint"
+        )
+        endpoint_burst: int = Field(50, description="Token bucket burst size per endpoint")
+        endpoint_queue_timeout: float = Field(
+            5.0, description="Max seconds a delivery waits for an endpoint before being deferred"
+        )
+        endpoint_min_defer_seconds: int = Field(
+            30, description="Minimum delay before a deferred delivery is tried again"
+        )
+        endpoint_max_deferrals: int = Field(
+            20,
+            ge=0,
+            description="Deferrals a delivery gets before each further one uses up a retry",
+        )
+
     webhooks: WebhookSettings = WebhookSettings()  # type: ignore[call-arg]
 
+    # ============================================================
+    # Licensing
+    # ============================================================
+
+    class LicensingSettings(BaseModel):  # BaseModel resolves to Any in isolation
+        """Licensing and entitlement enforcement configuration."""
+
+        model_config = ConfigDict()
+
+        entitlement_cache_ttl: int = Field(
+            300, ge=0, description="Seconds tenant entitlement snapshots are kept in Redis"
+        )
+        entitlement_local_cache_ttl: float = Field(
+            30.0,
+            ge=0,
+            description="Seconds tenant entitlement snapshots are kept in the per-process cache",
+        )
+        entitlement_local_cache_size: int = Field(
+            10000,
+            ge=0,
+            description="Max tenant entitlement snapshots in the per-process cache (0 disables)",
+        )
+        quota_counters_enabled: bool = Field(
+            True,
+            description="Count quota consumption in Redis and write usage back in batches",
+        )
+        quota_allocation_cache_ttl: float = Field(
+            30.0, ge=0, description="Seconds tenant quota allocations are kept per process"
+        )
+        quota_allocation_cache_size: int = Field(
+            10000, ge=0, description="Max tenants with cached quota allocations (0 disables)"
+        )
+        quota_counter_ttl: int = Field(
+            7 * 24 * 3600, gt=0, description="Seconds an idle quota counter is kept in Redis"
+        )
+        quota_flush_interval: float = Field(
+            5.0, gt=0, description="Seconds between quota usage write-behind flushes"
+        )
+        quota_flush_batch_size: int = Field(
+            500, gt=0, description="Counters and usage log entries written per flush batch"
+        )
+
+    licensing: LicensingSettings = LicensingSettings()  # type: ignore[call-arg]
+
     # ============================================================
     # Search & Indexing
     # ============================================================
@@ -9,11 +9,12 @@ from .config import (
     get_tenant_config,
     set_tenant_config,
 )
-from .tenant import TenantIdentityResolver, TenantMiddleware
+from .tenant import TenantASGIMiddleware, TenantIdentityResolver, TenantMiddleware
 
 __all__ = [
     "TenantIdentityResolver",
     "TenantMiddleware",
+    "TenantASGIMiddleware",
     "TenantConfiguration",
     "TenantMode",
     "get_tenant_config",
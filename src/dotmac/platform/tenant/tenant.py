@@ -13,10 +13,12 @@ import os
 from typing import Any
 
 import structlog
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from dotmac.platform.core.asgi_middleware import BeforeRequestASGIMixin
+
 from .config import TenantConfiguration, get_tenant_config
 
 logger = structlog.get_logger(__name__)
@@ -157,6 +159,16 @@ class TenantMiddleware(BaseHTTPMiddleware):
         self, request: Request, call_next: Callable[[Request], Awaitable[Any]]
     ) -> Any:
         """Process request and set tenant context."""
+        early_response = await self.process_request(request)
+        if early_response is not None:
+            return early_response
+        return await call_next(request)
+
+    async def process_request(self, request: Request) -> Response | None:
+        """Set tenant context on the request.
+
+        Returns a response to short-circuit the request, or None to continue.
+        """
         path = request.url.path
         register_paths = {"/api/v1/auth/register", "/auth/register"}
 
@@ -208,7 +220,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
                     request.state.tenant_id = tenant_override
                     set_current_tenant_id(tenant_override)
 
-            return await call_next(request)
+            return None
 
         # SECURITY: Middleware is the ONLY place that reads tenant from headers/query params
         # All subsequent resolution in request handlers must use request.state.tenant_id
@@ -323,7 +335,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
             set_current_tenant_id(fallback_tenant)
 
-        return await call_next(request)
+        return None
 
     def _resolve_platform_admin_impersonation(self, request: Request, header_value: str) -> str:
         """
@@ -423,7 +435,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
         # Try JWT tokens (Authorization header or HttpOnly cookie)
         jwt_token = self._extract_jwt_token(request)
         if jwt_token:
-            claims = self._verify_jwt_claims(jwt_token)
+            claims = self._verify_jwt_claims(jwt_token, request)
             if claims:
                 try:
                     request.state.jwt_claims = claims
@@ -461,11 +473,19 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
         return None
 
-    def _verify_jwt_claims(self, token: str) -> dict[str, Any] | None:
-        """Verify JWT token and return claims without raising upstream errors."""
+    def _verify_jwt_claims(
+        self, token: str, request: Request | None = None
+    ) -> dict[str, Any] | None:
+        """Verify JWT token and return claims without raising upstream errors.
+
+        When ``request`` is given the result is shared with later middleware
+        and dependencies for the rest of the request.
+        """
         try:
-            from dotmac.platform.auth.core import TokenType, jwt_service
+            from dotmac.platform.auth.core import TokenType, jwt_service, verify_request_token
 
+            if request is not None:
+                return verify_request_token(request, token, TokenType.ACCESS)
             return jwt_service.verify_token(token, TokenType.ACCESS)
         except Exception as exc:
             logger.debug("tenant_jwt_verification_failed", error=str(exc))
@@ -543,7 +563,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
             return True
 
         if jwt_token:
-            claims = self._verify_jwt_claims(jwt_token)
+            claims = self._verify_jwt_claims(jwt_token, request)
             if isinstance(claims, dict):
                 if claims.get("is_platform_admin", False):
                     return True
@@ -564,3 +584,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
             return tenant_from_key == tenant_id
 
         return False
+
+
+class TenantASGIMiddleware(BeforeRequestASGIMixin, TenantMiddleware):
+    """Pure ASGI variant of TenantMiddleware."""
@@ -5,11 +5,15 @@ This module provides:
 - Webhook subscription management (CRUD)
 - Event publishing via EventBus
 - Reliable webhook delivery with retries
+- Concurrent fan-out over pooled HTTP connections
+- Indexed event-type routing with wildcard patterns
+- Per-endpoint circuit breaking, adaptive concurrency and pacing
 - HMAC signature generation for security
 - Delivery logging and monitoring
 """
 
 from .delivery import WebhookDeliveryService
+from .dispatcher import WebhookDispatcher
 from .events import EventBus, get_event_bus, register_event
 from .models import (
     DeliveryStatus,
@@ -17,6 +21,8 @@ from .models import (
     WebhookEvent,
     WebhookSubscription,
 )
+from .routing import WebhookRoutingIndex, get_routing_index
+from .scheduler import EndpointScheduler, get_endpoint_scheduler
 from .service import WebhookSubscriptionService
 
 __all__ = [
@@ -29,4 +35,9 @@ __all__ = [
     "WebhookEvent",
     "WebhookSubscriptionService",
     "WebhookDeliveryService",
+    "WebhookDispatcher",
+    "WebhookRoutingIndex",
+    "get_routing_index",
+    "EndpointScheduler",
+    "get_endpoint_scheduler",
 ]
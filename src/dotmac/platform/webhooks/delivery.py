@@ -6,6 +6,7 @@ import hashlib
 import hmac
 import time
 import uuid
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -13,23 +14,51 @@ import httpx
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dotmac.platform.settings import settings
+
 from .models import (
     DeliveryStatus,
     WebhookDelivery,
     WebhookEventPayload,
     WebhookSubscription,
 )
+from .pool import WebhookClientPool, get_webhook_client_pool
+from .scheduler import EndpointScheduler, get_endpoint_scheduler, parse_retry_after
 from .service import WebhookSubscriptionService
 
 logger = structlog.get_logger(__name__)
 
+# Retry delays: 5min, 1hr, 6hrs
+RETRY_DELAYS = (300, 3600, 21600)  # seconds
+
+
+@dataclass(slots=True)
+class DeliveryAttempt:
+    """Outcome of one HTTP delivery attempt."""
+
+    status_code: int | None = None
+    response_body: str | None = None
+    duration_ms: int = 0
+    error: str | None = None
+    # Seconds the endpoint asked us to wait (Retry-After), or the deferral delay
+    retry_after: float | None = None
+    # Not sent: the endpoint scheduler refused it (circuit open, throttled)
+    deferred: bool = False
+
 
 class WebhookDeliveryService:
     """Service for delivering webhooks with retry logic."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        client_pool: WebhookClientPool | None = None,
+        scheduler: EndpointScheduler | None = None,
+    ) -> None:
         self.db = db
         self.subscription_service = WebhookSubscriptionService(db)
+        self.client_pool = client_pool or get_webhook_client_pool()
+        self.scheduler = scheduler or get_endpoint_scheduler()
 
     def _generate_signature(self, payload: bytes, secret: str) -> str:
         """Generate HMAC-SHA256 signature for webhook payload."""
@@ -61,6 +90,33 @@ class WebhookDeliveryService:
 
         return headers
 
+    def _build_request(
+        self,
+        subscription: WebhookSubscription,
+        event_id: str,
+        event_type: str,
+        event_data: dict[str, Any],
+        tenant_id: str | None,
+    ) -> tuple[bytes, dict[str, str]]:
+        """Serialize and sign the payload for one subscription."""
+        payload = WebhookEventPayload(
+            id=event_id,
+            type=event_type,
+            timestamp=datetime.now(UTC),
+            data=event_data,
+            tenant_id=tenant_id,
+        )
+        payload_bytes = payload.model_dump_json().encode("utf-8")
+
+        signature = self._generate_signature(payload_bytes, subscription.secret)
+        headers = self._build_headers(
+            subscription=subscription,
+            signature=signature,
+            event_id=event_id,
+            event_type=event_type,
+        )
+        return payload_bytes, headers
+
     async def deliver(
         self,
         subscription: WebhookSubscription,
@@ -90,27 +146,8 @@ class WebhookDeliveryService:
         if event_id is None:
             event_id = str(uuid.uuid4())
 
-        # Build webhook payload
-        payload = WebhookEventPayload(
-            id=event_id,
-            type=event_type,
-            timestamp=datetime.now(UTC),
-            data=event_data,
-            tenant_id=tenant_id,
-        )
-
-        payload_json = payload.model_dump_json()
-        payload_bytes = payload_json.encode("utf-8")
-
-        # Generate signature
-        signature = self._generate_signature(payload_bytes, subscription.secret)
-
-        # Build headers
-        headers = self._build_headers(
-            subscription=subscription,
-            signature=signature,
-            event_id=event_id,
-            event_type=event_type,
+        payload_bytes, headers = self._build_request(
+            subscription, event_id, event_type, event_data, tenant_id
         )
 
         # Create delivery record
@@ -138,91 +175,156 @@ class WebhookDeliveryService:
 
         return delivery
 
-    async def _attempt_delivery(
+    async def _send(
         self,
-        delivery: WebhookDelivery,
         subscription: WebhookSubscription,
         payload_bytes: bytes,
         headers: dict[str, str],
-    ) -> None:
-        """Attempt to deliver webhook."""
-        start_time = time.time()
+    ) -> DeliveryAttempt:
+        """Send through the endpoint scheduler (circuit breaker, pacing, AIMD limit)."""
+        return await self.scheduler.submit(
+            subscription.url, lambda: self._post(subscription, payload_bytes, headers)
+        )
 
-        try:
-            async with httpx.AsyncClient(timeout=subscription.timeout_seconds) as client:
+    async def _post(
+        self,
+        subscription: WebhookSubscription,
+        payload_bytes: bytes,
+        headers: dict[str, str],
+    ) -> DeliveryAttempt:
+        """POST the payload on the pooled client for the endpoint's host."""
+        async with self.client_pool.slot(str(subscription.id)):
+            start_time = time.time()
+            try:
+                client = self.client_pool.client_for(subscription.url)
                 response = await client.post(
                     subscription.url,
                     content=payload_bytes,
                     headers=headers,
+                    timeout=subscription.timeout_seconds,
+                )
+                retry_after = None
+                if response.status_code in (429, 503):
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                return DeliveryAttempt(
+                    status_code=response.status_code,
+                    response_body=response.text[:1000],  # Truncate large responses
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    retry_after=retry_after,
+                )
+            except httpx.TimeoutException:
+                return DeliveryAttempt(
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    error=f"Request timeout after {subscription.timeout_seconds}s",
                 )
+            except Exception as e:
+                return DeliveryAttempt(
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    error=f"Delivery error: {str(e)}",
+                )
+
+    def _record_attempt(self, delivery: WebhookDelivery, attempt: DeliveryAttempt) -> bool:
+        """
+        Copy an attempt's outcome onto the delivery record (no I/O).
 
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Update delivery record
-                delivery.response_code = response.status_code
-                delivery.response_body = response.text[:1000]  # Truncate large responses
-                delivery.duration_ms = duration_ms
-
-                # Handle response
-                if response.status_code == 410:
-                    # 410 Gone - endpoint permanently disabled
-                    delivery.status = DeliveryStatus.DISABLED
-                    delivery.error_message = "Endpoint returned 410 Gone (permanently disabled)"
-
-                    # Disable subscription
-                    await self.subscription_service.disable_subscription(
-                        subscription_id=str(subscription.id),
-                        tenant_id=subscription.tenant_id,
-                        reason="Endpoint returned 410 Gone",
-                    )
-
-                    logger.warning(
-                        "Webhook endpoint returned 410 Gone, subscription disabled",
-                        subscription_id=str(subscription.id),
-                        url=subscription.url,
-                    )
-
-                elif 200 <= response.status_code < 300:
-                    # Success
-                    delivery.status = DeliveryStatus.SUCCESS
-
-                    # Update subscription statistics
-                    await self.subscription_service.update_statistics(
-                        subscription_id=str(subscription.id),
-                        success=True,
-                        tenant_id=subscription.tenant_id,
-                    )
-
-                    logger.info(
-                        "Webhook delivered successfully",
-                        subscription_id=str(subscription.id),
-                        event_type=delivery.event_type,
-                        status_code=response.status_code,
-                        duration_ms=duration_ms,
-                    )
-
-                else:
-                    # Failure - schedule retry if enabled
-                    delivery.status = DeliveryStatus.FAILED
-                    delivery.error_message = f"HTTP {response.status_code}: {response.text[:500]}"
-
-                    await self._handle_failure(delivery, subscription)
-
-        except httpx.TimeoutException:
-            duration_ms = int((time.time() - start_time) * 1000)
+        Returns True when the delivery was deferred without using up a retry.
+        Once a delivery has used its ``endpoint_max_deferrals``, further
+        deferrals are recorded as failed attempts so the retry limit applies.
+        """
+        if attempt.deferred and self._defer(delivery, attempt):
+            return True
+
+        delivery.duration_ms = attempt.duration_ms
+
+        if attempt.error is not None:
             delivery.status = DeliveryStatus.FAILED
-            delivery.error_message = f"Request timeout after {subscription.timeout_seconds}s"
-            delivery.duration_ms = duration_ms
+            delivery.error_message = attempt.error
+            return False
 
-            await self._handle_failure(delivery, subscription)
+        status_code = attempt.status_code or 0
+        delivery.response_code = status_code
+        delivery.response_body = attempt.response_body
 
-        except Exception as e:
-            duration_ms = int((time.time() - start_time) * 1000)
+        if status_code == 410:
+            # 410 Gone - endpoint permanently disabled
+            delivery.status = DeliveryStatus.DISABLED
+            delivery.error_message = "Endpoint returned 410 Gone (permanently disabled)"
+        elif 200 <= status_code < 300:
+            delivery.status = DeliveryStatus.SUCCESS
+        else:
             delivery.status = DeliveryStatus.FAILED
-            delivery.error_message = f"Delivery error: {str(e)}"
-            delivery.duration_ms = duration_ms
+            delivery.error_message = f"HTTP {status_code}: {(attempt.response_body or '')[:500]}"
+        return False
+
+    def _defer(self, delivery: WebhookDelivery, attempt: DeliveryAttempt) -> bool:
+        """Reschedule a delivery the endpoint scheduler did not send, within the cap."""
+        config = settings.webhooks
+        delivery.deferral_count = (delivery.deferral_count or 0) + 1
+        if delivery.deferral_count > config.endpoint_max_deferrals:
+            return False
+
+        # Nothing was sent, so this does not use up one of the subscription's retries
+        delivery.attempt_number = max(delivery.attempt_number - 1, 0)
+        delay = max(attempt.retry_after or 0, config.endpoint_min_defer_seconds)
+
+        delivery.status = DeliveryStatus.RETRYING
+        delivery.error_message = attempt.error
+        delivery.next_retry_at = datetime.now(UTC) + timedelta(seconds=delay)
+        return True
+
+    async def _attempt_delivery(
+        self,
+        delivery: WebhookDelivery,
+        subscription: WebhookSubscription,
+        payload_bytes: bytes,
+        headers: dict[str, str],
+    ) -> None:
+        """Attempt to deliver webhook."""
+        try:
+            attempt = await self._send(subscription, payload_bytes, headers)
+
+            if self._record_attempt(delivery, attempt):
+                next_retry_at = delivery.next_retry_at
+                logger.info(
+                    "Webhook delivery deferred",
+                    subscription_id=str(subscription.id),
+                    next_retry_at=next_retry_at.isoformat() if next_retry_at else None,
+                    reason=delivery.error_message,
+                )
+
+            elif delivery.status == DeliveryStatus.DISABLED:
+                # Disable subscription
+                await self.subscription_service.disable_subscription(
+                    subscription_id=str(subscription.id),
+                    tenant_id=subscription.tenant_id,
+                    reason="Endpoint returned 410 Gone",
+                )
+
+                logger.warning(
+                    "Webhook endpoint returned 410 Gone, subscription disabled",
+                    subscription_id=str(subscription.id),
+                    url=subscription.url,
+                )
+
+            elif delivery.status == DeliveryStatus.SUCCESS:
+                # Update subscription statistics
+                await self.subscription_service.update_statistics(
+                    subscription_id=str(subscription.id),
+                    success=True,
+                    tenant_id=subscription.tenant_id,
+                )
+
+                logger.info(
+                    "Webhook delivered successfully",
+                    subscription_id=str(subscription.id),
+                    event_type=delivery.event_type,
+                    status_code=delivery.response_code,
+                    duration_ms=delivery.duration_ms,
+                )
 
-            await self._handle_failure(delivery, subscription)
+            else:
+                # Failure - schedule retry if enabled
+                await self._handle_failure(delivery, subscription, attempt.retry_after)
 
         finally:
             await self.db.commit()
@@ -231,6 +333,7 @@ class WebhookDeliveryService:
         self,
         delivery: WebhookDelivery,
         subscription: WebhookSubscription,
+        retry_after: float | None = None,
     ) -> None:
         """Handle failed delivery and schedule retry if applicable."""
         # Update subscription failure statistics
@@ -240,13 +343,21 @@ class WebhookDeliveryService:
             tenant_id=subscription.tenant_id,
         )
 
+        self._schedule_retry(delivery, subscription, retry_after)
+
+    def _schedule_retry(
+        self,
+        delivery: WebhookDelivery,
+        subscription: WebhookSubscription,
+        retry_after: float | None = None,
+    ) -> None:
+        """Set the retry time for a failed delivery, or mark it failed for good."""
         # Check if retry is enabled and within retry limit
         if subscription.retry_enabled and delivery.attempt_number < subscription.max_retries:
             # Schedule retry with exponential backoff
-            # Retry delays: 5min, 1hr, 6hrs
-            retry_delays = [300, 3600, 21600]  # seconds
-            delay_index = min(delivery.attempt_number - 1, len(retry_delays) - 1)
-            delay_seconds = retry_delays[delay_index]
+            delay_index = min(delivery.attempt_number - 1, len(RETRY_DELAYS) - 1)
+            # Never earlier than the endpoint's Retry-After
+            delay_seconds = max(RETRY_DELAYS[delay_index], retry_after or 0)
 
             delivery.status = DeliveryStatus.RETRYING
             delivery.next_retry_at = datetime.now(UTC) + timedelta(seconds=delay_seconds)
@@ -305,27 +416,8 @@ class WebhookDeliveryService:
             )
             return False
 
-        # Create new payload
-        payload = WebhookEventPayload(
-            id=delivery.event_id,
-            type=delivery.event_type,
-            timestamp=datetime.now(UTC),
-            data=delivery.event_data,
-            tenant_id=tenant_id,
-        )
-
-        payload_json = payload.model_dump_json()
-        payload_bytes = payload_json.encode("utf-8")
-
-        # Generate new signature
-        signature = self._generate_signature(payload_bytes, subscription.secret)
-
-        # Build headers
-        headers = self._build_headers(
-            subscription=subscription,
-            signature=signature,
-            event_id=delivery.event_id,
-            event_type=delivery.event_type,
+        payload_bytes, headers = self._build_request(
+            subscription, delivery.event_id, delivery.event_type, delivery.event_data, tenant_id
         )
 
         # Increment attempt number
@@ -360,66 +452,6 @@ class WebhookDeliveryService:
         Returns:
             Number of retries processed
         """
-        from sqlalchemy import select
-
-        # Find deliveries ready for retry
-        now = datetime.now(UTC)
-        stmt = (
-            select(WebhookDelivery)
-            .where(
-                WebhookDelivery.status == DeliveryStatus.RETRYING,
-                WebhookDelivery.next_retry_at <= now,
-            )
-            .limit(limit)
-        )
-
-        result = await self.db.execute(stmt)
-        deliveries = result.scalars().all()
-
-        processed = 0
-        for delivery in deliveries:
-            # Get subscription
-            stmt_sub = select(WebhookSubscription).where(
-                WebhookSubscription.id == delivery.subscription_id
-            )
-            result_sub = await self.db.execute(stmt_sub)
-            subscription = result_sub.scalar_one_or_none()
-
-            if not subscription or not subscription.is_active:
-                delivery.status = DeliveryStatus.FAILED
-                delivery.error_message = "Subscription no longer active"
-                await self.db.commit()
-                continue
-
-            # Retry delivery
-            payload = WebhookEventPayload(
-                id=delivery.event_id,
-                type=delivery.event_type,
-                timestamp=datetime.now(UTC),
-                data=delivery.event_data,
-                tenant_id=delivery.tenant_id,
-            )
-
-            payload_json = payload.model_dump_json()
-            payload_bytes = payload_json.encode("utf-8")
-
-            signature = self._generate_signature(payload_bytes, subscription.secret)
-            headers = self._build_headers(
-                subscription=subscription,
-                signature=signature,
-                event_id=delivery.event_id,
-                event_type=delivery.event_type,
-            )
-
-            delivery.attempt_number += 1
-            await self._attempt_delivery(
-                delivery=delivery,
-                subscription=subscription,
-                payload_bytes=payload_bytes,
-                headers=headers,
-            )
-
-            processed += 1
+        from .dispatcher import WebhookDispatcher
 
-        logger.info("Processed pending webhook retries", count=processed)
-        return processed
+        return await WebhookDispatcher(self.db, delivery_service=self).process_retries(limit)
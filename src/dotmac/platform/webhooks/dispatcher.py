@@ -0,0 +1,281 @@
+"""
+Concurrent webhook fan-out with batched delivery bookkeeping.
+"""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime
+from typing import Any, cast
+
+import structlog
+from sqlalchemy import DateTime, Table, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dotmac.platform.settings import settings
+
+from .delivery import DeliveryAttempt, WebhookDeliveryService
+from .models import DeliveryStatus, WebhookDelivery, WebhookSubscription
+from .scheduler import endpoint_key
+
+logger = structlog.get_logger(__name__)
+
+DeliveryJob = tuple[WebhookDelivery, WebhookSubscription]
+
+
+class WebhookDispatcher:
+    """
+    Deliver webhooks to many subscriptions at once.
+
+    Delivery records for a batch are inserted with one commit, requests run
+    concurrently on the pooled HTTP clients (bounded globally and per
+    subscription by the client pool, and per endpoint by the endpoint
+    scheduler), and the resulting status changes and
+    subscription statistics are written back in one transaction. Individual
+    requests never touch the database.
+
+    Usage:
+        dispatcher = WebhookDispatcher(db)
+        deliveries = await dispatcher.dispatch(subscriptions, "invoice.created", data)
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        delivery_service: WebhookDeliveryService | None = None,
+    ) -> None:
+        self.db = db
+        self.delivery_service = delivery_service or WebhookDeliveryService(db)
+
+    async def dispatch(
+        self,
+        subscriptions: list[WebhookSubscription],
+        event_type: str,
+        event_data: dict[str, Any],
+        event_id: str | None = None,
+        tenant_id: str | None = None,
+    ) -> list[WebhookDelivery]:
+        """
+        Deliver one event to every subscription.
+
+        Args:
+            subscriptions: Subscriptions to deliver to
+            event_type: Event type (e.g., "invoice.created")
+            event_data: Event payload data
+            event_id: Optional event ID for idempotency
+            tenant_id: Optional tenant ID (defaults to each subscription's tenant)
+
+        Returns:
+            Delivery records, in subscription order
+        """
+        if not subscriptions:
+            return []
+
+        if event_id is None:
+            event_id = str(uuid.uuid4())
+
+        jobs: list[DeliveryJob] = [
+            (
+                WebhookDelivery(
+                    id=uuid.uuid4(),
+                    tenant_id=tenant_id or subscription.tenant_id,
+                    subscription_id=subscription.id,
+                    event_type=event_type,
+                    event_id=event_id,
+                    event_data=event_data,
+                    status=DeliveryStatus.PENDING,
+                    attempt_number=1,
+                ),
+                subscription,
+            )
+            for subscription in subscriptions
+        ]
+
+        # One batched INSERT for the whole fan-out
+        self.db.add_all([delivery for delivery, _ in jobs])
+        await self.db.commit()
+
+        await self._run(jobs)
+        return [delivery for delivery, _ in jobs]
+
+    async def process_retries(self, limit: int | None = None) -> int:
+        """
+        Re-send deliveries whose retry time has passed.
+
+        Args:
+            limit: Maximum number of retries to process
+
+        Returns:
+            Number of retries processed
+        """
+        now = datetime.now(UTC)
+        stmt = (
+            select(WebhookDelivery)
+            .where(
+                WebhookDelivery.status == DeliveryStatus.RETRYING,
+                WebhookDelivery.next_retry_at <= now,
+            )
+            .order_by(WebhookDelivery.next_retry_at)
+            .limit(limit or settings.webhooks.retry_batch_size)
+        )
+        result = await self.db.execute(stmt)
+        deliveries = list(result.scalars().all())
+        if not deliveries:
+            logger.info("Processed pending webhook retries", count=0)
+            return 0
+
+        # Subscriptions for the whole batch in one query
+        subscription_ids = {delivery.subscription_id for delivery in deliveries}
+        subscription_rows = await self.db.execute(
+            select(WebhookSubscription).where(WebhookSubscription.id.in_(subscription_ids))
+        )
+        subscriptions = {
+            subscription.id: subscription for subscription in subscription_rows.scalars().all()
+        }
+
+        jobs: list[DeliveryJob] = []
+        for delivery in deliveries:
+            subscription = subscriptions.get(delivery.subscription_id)
+            if not subscription or not subscription.is_active:
+                delivery.status = DeliveryStatus.FAILED
+                delivery.error_message = "Subscription no longer active"
+                continue
+
+            delivery.attempt_number += 1
+            jobs.append((delivery, subscription))
+
+        if jobs:
+            await self._run(jobs)
+        else:
+            await self.db.commit()
+
+        logger.info("Processed pending webhook retries", count=len(jobs))
+        return len(jobs)
+
+    async def _send(
+        self, delivery: WebhookDelivery, subscription: WebhookSubscription
+    ) -> DeliveryAttempt:
+        service = self.delivery_service
+        try:
+            payload_bytes, headers = service._build_request(
+                subscription,
+                delivery.event_id,
+                delivery.event_type,
+                delivery.event_data,
+                delivery.tenant_id,
+            )
+            return await service._send(subscription, payload_bytes, headers)
+        except Exception as e:
+            return DeliveryAttempt(error=f"Delivery error: {str(e)}")
+
+    def _blocked_attempts(self, jobs: list[DeliveryJob]) -> dict[int, DeliveryAttempt]:
+        """
+        Deferred attempts for jobs whose endpoint is not accepting deliveries.
+
+        Jobs are grouped by endpoint so a batch aimed at an open circuit (or
+        an endpoint that sent Retry-After) is rescheduled in one step,
+        without building payloads or queueing behind the scheduler.
+        """
+        scheduler = self.delivery_service.scheduler
+        by_endpoint: dict[str, list[int]] = defaultdict(list)
+        for index, (_, subscription) in enumerate(jobs):
+            by_endpoint[endpoint_key(subscription.url)].append(index)
+
+        blocked: dict[int, DeliveryAttempt] = {}
+        for key, indexes in by_endpoint.items():
+            wait = scheduler.blocked_for(jobs[indexes[0]][1].url)
+            if wait <= 0:
+                continue
+            for index in indexes:
+                blocked[index] = DeliveryAttempt(
+                    error=f"Delivery deferred: endpoint {key} unavailable",
+                    retry_after=wait,
+                    deferred=True,
+                )
+            logger.info("Webhook deliveries deferred", endpoint=key, count=len(indexes))
+        return blocked
+
+    async def _run(self, jobs: list[DeliveryJob]) -> None:
+        """Send every job concurrently, then record all outcomes in one transaction."""
+        service = self.delivery_service
+        blocked = self._blocked_attempts(jobs)
+        sendable = [job for index, job in enumerate(jobs) if index not in blocked]
+        sent = iter(
+            await asyncio.gather(*(self._send(delivery, sub) for delivery, sub in sendable))
+        )
+        attempts = [
+            blocked[index] if index in blocked else next(sent) for index in range(len(jobs))
+        ]
+
+        outcomes: dict[uuid.UUID, dict[str, int]] = defaultdict(
+            lambda: {"success": 0, "failure": 0}
+        )
+        gone: dict[uuid.UUID, WebhookSubscription] = {}
+        deferred = 0
+
+        for (delivery, subscription), attempt in zip(jobs, attempts, strict=True):
+            if service._record_attempt(delivery, attempt):
+                deferred += 1
+            elif delivery.status == DeliveryStatus.SUCCESS:
+                outcomes[subscription.id]["success"] += 1
+            elif delivery.status == DeliveryStatus.DISABLED:
+                gone[subscription.id] = subscription
+            else:
+                outcomes[subscription.id]["failure"] += 1
+                service._schedule_retry(delivery, subscription, attempt.retry_after)
+
+        await self._update_statistics(outcomes)
+        await self.db.commit()
+
+        for subscription in gone.values():
+            await service.subscription_service.disable_subscription(
+                subscription_id=str(subscription.id),
+                tenant_id=subscription.tenant_id,
+                reason="Endpoint returned 410 Gone",
+            )
+
+        logger.info(
+            "Webhook batch delivered",
+            deliveries=len(jobs),
+            succeeded=sum(counts["success"] for counts in outcomes.values()),
+            failed=sum(counts["failure"] for counts in outcomes.values()),
+            deferred=deferred,
+            disabled_subscriptions=len(gone),
+        )
+
+    async def _update_statistics(self, outcomes: dict[uuid.UUID, dict[str, int]]) -> None:
+        """Increment success/failure counters for every subscription in one executemany."""
+        if not outcomes:
+            return
+
+        table = cast(Table, WebhookSubscription.__table__)
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("subscription_id"))
+            .values(
+                success_count=table.c.success_count + bindparam("successes"),
+                failure_count=table.c.failure_count + bindparam("failures"),
+                last_triggered_at=bindparam("now"),
+                last_success_at=func.coalesce(
+                    bindparam("success_at", type_=DateTime()), table.c.last_success_at
+                ),
+                last_failure_at=func.coalesce(
+                    bindparam("failure_at", type_=DateTime()), table.c.last_failure_at
+                ),
+            )
+        )
+        now = datetime.now(UTC)
+        await self.db.execute(
+            stmt,
+            [
+                {
+                    "subscription_id": subscription_id,
+                    "successes": counts["success"],
+                    "failures": counts["failure"],
+                    "now": now,
+                    "success_at": now if counts["success"] else None,
+                    "failure_at": now if counts["failure"] else None,
+                }
+                for subscription_id, counts in outcomes.items()
+            ],
+        )
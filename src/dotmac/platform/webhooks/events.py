@@ -9,7 +9,7 @@ import structlog
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .delivery import WebhookDeliveryService
+from .dispatcher import WebhookDispatcher
 from .models import WebhookEvent
 from .service import WebhookSubscriptionService
 
@@ -166,29 +166,24 @@ class EventBus:
             )
             return 0
 
-        # Deliver to each subscription
-        delivery_service = WebhookDeliveryService(db)
-        delivered_count = 0
-
-        for subscription in subscriptions:
-            try:
-                await delivery_service.deliver(
-                    subscription=subscription,
-                    event_type=event_type,
-                    event_data=event_data,
-                    event_id=event_id,
-                    tenant_id=tenant_id,
-                )
-                delivered_count += 1
-
-            except Exception as e:
-                logger.error(
-                    "Failed to deliver webhook",
-                    subscription_id=str(subscription.id),
-                    event_type=event_type,
-                    error=str(e),
-                )
-                # Continue to next subscription
+        # Deliver to every subscription concurrently
+        try:
+            deliveries = await WebhookDispatcher(db).dispatch(
+                subscriptions=subscriptions,
+                event_type=event_type,
+                event_data=event_data,
+                event_id=event_id,
+                tenant_id=tenant_id,
+            )
+            delivered_count = len(deliveries)
+        except Exception as e:
+            logger.error(
+                "Failed to deliver webhooks",
+                event_type=event_type,
+                event_id=event_id,
+                error=str(e),
+            )
+            delivered_count = 0
 
         logger.info(
             "Event published to webhooks",
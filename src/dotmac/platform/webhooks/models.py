@@ -170,6 +170,10 @@ class WebhookDelivery(Base, TenantMixin, TimestampMixin):  # type: ignore[misc]
 
     # Retry tracking
     attempt_number: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    # Times the endpoint scheduler held the delivery back without sending it
+    deferral_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     next_retry_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
     # Timing
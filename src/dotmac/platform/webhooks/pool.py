@@ -0,0 +1,123 @@
+"""
+Long-lived HTTP clients and concurrency limits for webhook delivery.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+import structlog
+
+from dotmac.platform.core.http_pool import HttpClientProfile, get_http_client_registry
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class WebhookClientPool:
+    """
+    Shared ``httpx.AsyncClient`` per destination origin.
+
+    Clients come from the shared HTTP client registry under a webhook
+    profile carrying the webhook connection limits, so TCP/TLS connections
+    stay alive between deliveries to the same endpoint. The pool also bounds
+    in-flight deliveries globally and per subscription so a large fan-out
+    cannot exhaust sockets.
+
+    Clients and semaphores belong to the event loop that created them; when
+    the pool is used from a new loop (e.g. a Celery task running
+    ``asyncio.run``) they are recreated.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int | None = None,
+        max_keepalive_per_host: int | None = None,
+        keepalive_expiry: float | None = None,
+        max_concurrency: int | None = None,
+        per_subscription_concurrency: int | None = None,
+    ) -> None:
+        config = settings.webhooks
+        self._client_profile = HttpClientProfile(
+            timeout=float(config.timeout_seconds),
+            connect_timeout=settings.http_client.connect_timeout,
+            max_connections=max_connections_per_host or config.pool_max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host or config.pool_max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry or config.pool_keepalive_expiry,
+            http2=settings.http_client.http2,
+        )
+        # Pools with different limits must not share clients
+        limits = self._client_profile
+        self._profile = (
+            f"webhooks:{limits.max_connections}:{limits.max_keepalive_connections}"
+            f":{limits.keepalive_expiry:g}"
+        )
+        self._max_concurrency = max_concurrency or config.max_concurrency
+        self._per_subscription = per_subscription_concurrency or config.per_subscription_concurrency
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._global = asyncio.Semaphore(self._max_concurrency)
+        self._subscription_slots: dict[str, asyncio.Semaphore] = {}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.debug("Webhook client pool rebound to new event loop")
+        self._loop = loop
+        self._global = asyncio.Semaphore(self._max_concurrency)
+        self._subscription_slots = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Pooled client for the origin of ``url``."""
+        self._bind_loop()
+        registry = get_http_client_registry()
+        if not registry.has_profile(self._profile):
+            registry.register_profile(self._profile, self._client_profile)
+        return registry.client(url, profile=self._profile)
+
+    @asynccontextmanager
+    async def slot(self, subscription_id: str) -> AsyncIterator[None]:
+        """Hold a global and a per-subscription delivery slot."""
+        self._bind_loop()
+        per_subscription = self._subscription_slots.get(subscription_id)
+        if per_subscription is None:
+            per_subscription = asyncio.Semaphore(self._per_subscription)
+            self._subscription_slots[subscription_id] = per_subscription
+
+        async with per_subscription, self._global:
+            yield
+
+    def stats(self) -> dict[str, Any]:
+        """Pool size and limits, for health checks."""
+        return {
+            "clients": len(get_http_client_registry().stats(profile=self._profile)),
+            "max_concurrency": self._max_concurrency,
+            "per_subscription_concurrency": self._per_subscription,
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled webhook client."""
+        await get_http_client_registry().aclose(profile=self._profile)
+
+
+_client_pool: WebhookClientPool | None = None
+
+
+def get_webhook_client_pool() -> WebhookClientPool:
+    """Get the process-wide webhook client pool."""
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = WebhookClientPool()
+    return _client_pool
+
+
+async def close_webhook_client_pool() -> None:
+    """Close pooled clients (application shutdown)."""
+    global _client_pool
+    if _client_pool is not None:
+        await _client_pool.aclose()
+        _client_pool = None
@@ -0,0 +1,199 @@
+"""
+Event-type routing index for webhook subscriptions.
+
+In-process, per-tenant map from event type to the ids of the active
+subscriptions that want it. Exact event types are a dict lookup; trailing
+wildcards (``invoice.*``, ``*``) are bucketed by literal prefix so an event
+only checks the prefixes it actually has. Other glob patterns are matched
+with fnmatch. Subscription changes are broadcast over pub/sub so every
+worker drops its stale tenant index.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from fnmatch import fnmatchcase
+from uuid import UUID
+
+import structlog
+
+from dotmac.platform.core.invalidation import InvalidationListener
+from dotmac.platform.redis_client import RedisClientType, redis_manager
+from dotmac.platform.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "webhooks:routes:invalidate"
+INVALIDATE_ALL = "*"
+
+_GLOB_META = frozenset("*?[")
+
+# (subscription id, subscribed event types)
+SubscriptionRoute = tuple[UUID, Iterable[str]]
+
+
+class TenantRoutes:
+    """Compiled routes for one tenant."""
+
+    def __init__(self, routes: Iterable[SubscriptionRoute], match_cache_size: int = 256) -> None:
+        exact: dict[str, set[UUID]] = defaultdict(set)
+        prefixes: dict[str, set[UUID]] = defaultdict(set)
+        globs: dict[str, set[UUID]] = defaultdict(set)
+
+        subscription_count = 0
+        for subscription_id, event_types in routes:
+            subscription_count += 1
+            for event_type in event_types or ():
+                if not event_type:
+                    continue
+                if not any(char in _GLOB_META for char in event_type):
+                    exact[event_type].add(subscription_id)
+                elif event_type.endswith("*") and not any(
+                    char in _GLOB_META for char in event_type[:-1]
+                ):
+                    prefixes[event_type[:-1]].add(subscription_id)
+                else:
+                    globs[event_type].add(subscription_id)
+
+        self._exact = {key: frozenset(ids) for key, ids in exact.items()}
+        self._prefixes = {key: frozenset(ids) for key, ids in prefixes.items()}
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes})
+        self._globs = [(pattern, frozenset(ids)) for pattern, ids in globs.items()]
+        self.subscription_count = subscription_count
+        self.loaded_at = time.monotonic()
+
+        self._match_cache: OrderedDict[str, frozenset[UUID]] = OrderedDict()
+        self._match_cache_size = match_cache_size
+
+    def match(self, event_type: str) -> frozenset[UUID]:
+        """Ids of subscriptions routed ``event_type``."""
+        cached = self._match_cache.get(event_type)
+        if cached is not None:
+            self._match_cache.move_to_end(event_type)
+            return cached
+
+        matched: set[UUID] = set(self._exact.get(event_type, ()))
+        for length in self._prefix_lengths:
+            if length > len(event_type):
+                break
+            matched.update(self._prefixes.get(event_type[:length], ()))
+        for pattern, ids in self._globs:
+            if fnmatchcase(event_type, pattern):
+                matched.update(ids)
+
+        result = frozenset(matched)
+        self._match_cache[event_type] = result
+        if len(self._match_cache) > self._match_cache_size:
+            self._match_cache.popitem(last=False)
+        return result
+
+
+class WebhookRoutingIndex:
+    """
+    Process-wide registry of per-tenant webhook routes.
+
+    Routing a warm tenant performs no I/O. Entries are dropped when an
+    invalidation for the tenant arrives over pub/sub, and ``max_age`` bounds
+    staleness if the listener is not running.
+    """
+
+    def __init__(self, max_age: float | None = None) -> None:
+        self.max_age = (
+            float(settings.webhooks.route_cache_ttl_seconds) if max_age is None else max_age
+        )
+        self._routes: dict[str, TenantRoutes] = {}
+        self._load_locks: dict[str, asyncio.Lock] = {}
+        # Bumped on every invalidation; guards in-flight loads
+        self._generations: dict[str, int] = {}
+        self._listener = InvalidationListener(
+            INVALIDATION_CHANNEL,
+            self.handle_message,
+            self.invalidate_local,
+            name="webhooks.routing",
+        )
+
+    def get(self, tenant_id: str) -> TenantRoutes | None:
+        """Return the cached routes for a tenant if still fresh."""
+        routes = self._routes.get(tenant_id)
+        if routes is None:
+            return None
+        if self.max_age > 0 and time.monotonic() - routes.loaded_at > self.max_age:
+            self._routes.pop(tenant_id, None)
+            return None
+        return routes
+
+    async def get_or_load(
+        self,
+        tenant_id: str,
+        loader: Callable[[], Awaitable[Iterable[SubscriptionRoute]]],
+    ) -> TenantRoutes:
+        """Return the tenant routes, loading them once if missing (single-flight)."""
+        routes = self.get(tenant_id)
+        if routes is not None:
+            return routes
+
+        lock = self._load_locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            routes = self.get(tenant_id)
+            if routes is not None:
+                return routes
+
+            generation = self._generations.get(tenant_id, 0)
+            routes = TenantRoutes(await loader())
+
+            # Skip caching if an invalidation landed while we were loading
+            if self._generations.get(tenant_id, 0) == generation:
+                self._routes[tenant_id] = routes
+            return routes
+
+    def invalidate_local(self, tenant_id: str | None = None) -> None:
+        """Drop cached routes for one tenant, or all tenants."""
+        if tenant_id is None:
+            for key in list(self._routes) + list(self._generations):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._routes.clear()
+            return
+
+        self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+        self._routes.pop(tenant_id, None)
+
+    async def invalidate(self, tenant_id: str, redis: RedisClientType | None = None) -> None:
+        """Drop a tenant's routes locally and on every other worker."""
+        self.invalidate_local(tenant_id)
+        if redis is None:
+            try:
+                redis = redis_manager.get_client()
+            except RuntimeError:
+                # Redis not initialised (CLI tools, tests): other workers rely on max_age
+                return
+
+        try:
+            await redis.publish(INVALIDATION_CHANNEL, tenant_id)
+        except Exception as e:
+            logger.warning("webhooks.routing.publish_failed", tenant_id=tenant_id, error=str(e))
+
+    def handle_message(self, data: str | bytes) -> None:
+        """Apply an invalidation message (a tenant id, or ``*`` for all tenants)."""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        self.invalidate_local(None if data == INVALIDATE_ALL else data)
+
+    async def start_listener(self, redis: RedisClientType) -> None:
+        """Start the background pub/sub listener for route invalidations."""
+        self._listener.start(redis)
+
+    async def stop_listener(self) -> None:
+        """Stop the background pub/sub listener."""
+        await self._listener.stop()
+
+
+_routing_index: WebhookRoutingIndex | None = None
+
+
+def get_routing_index() -> WebhookRoutingIndex:
+    """Return the process-wide webhook routing index."""
+    global _routing_index
+    if _routing_index is None:
+        _routing_index = WebhookRoutingIndex()
+    return _routing_index
@@ -0,0 +1,326 @@
+"""
+Per-endpoint admission control for webhook delivery.
+
+Every destination origin (``scheme://host:port``) gets its own circuit
+breaker, AIMD concurrency limit and token bucket. A slow or failing endpoint
+therefore only slows down its own deliveries: once its circuit opens, or it
+asks us to back off with ``Retry-After``, further deliveries to it are
+deferred immediately instead of holding worker time and connection slots
+until they time out.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+import structlog
+
+from dotmac.platform.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerError,
+    CircuitState,
+)
+from dotmac.platform.settings import settings
+
+if TYPE_CHECKING:
+    from .delivery import DeliveryAttempt
+
+logger = structlog.get_logger(__name__)
+
+# Longest Retry-After we honour (matches the last retry delay)
+MAX_RETRY_AFTER = 21600.0
+
+
+def endpoint_key(url: str) -> str:
+    """Normalised ``scheme://host:port`` for a webhook URL."""
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return f"{parts.scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=UTC)
+        seconds = (retry_at - datetime.now(UTC)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def is_endpoint_failure(attempt: "DeliveryAttempt") -> bool:
+    """Whether an attempt says the endpoint is unhealthy (not just rejecting the payload)."""
+    if attempt.error is not None:
+        return True
+    status_code = attempt.status_code or 0
+    return status_code == 429 or status_code >= 500
+
+
+class _EndpointFailure(Exception):
+    """Carries a failed attempt through the circuit breaker."""
+
+    def __init__(self, attempt: "DeliveryAttempt") -> None:
+        super().__init__(attempt.error or f"HTTP {attempt.status_code}")
+        self.attempt = attempt
+
+
+class EndpointState:
+    """Circuit breaker, AIMD concurrency limit and token bucket for one endpoint."""
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        failure_threshold: int,
+        recovery_timeout: float,
+        initial_concurrency: int,
+        max_concurrency: int,
+        rate_per_second: float,
+        burst: int,
+    ) -> None:
+        self.key = key
+        self.breaker = CircuitBreaker(
+            name=f"webhook:{key}",
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            success_threshold=1,
+        )
+        self.max_concurrency = max_concurrency
+        self.limit = float(min(initial_concurrency, max_concurrency))
+        self.in_flight = 0
+
+        self.rate = rate_per_second
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self.paused_until = 0.0
+
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            # Primitives from a previous event loop cannot be awaited here
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    @property
+    def concurrency(self) -> int:
+        """Current in-flight limit; a recovering endpoint gets a single probe."""
+        if self.breaker.state != CircuitState.CLOSED:
+            return 1
+        return max(1, int(self.limit))
+
+    def blocked_for(self) -> float:
+        """Seconds until this endpoint accepts deliveries again (0 if it does now)."""
+        now = time.monotonic()
+        wait = max(self.paused_until - now, 0.0)
+        breaker = self.breaker
+        if breaker.state == CircuitState.OPEN and breaker.last_failure_time is not None:
+            reopen_in = breaker.recovery_timeout - (time.time() - breaker.last_failure_time)
+            wait = max(wait, reopen_in)
+        return wait
+
+    def take_token(self) -> float:
+        """Reserve one token; returns the seconds until it may be used (0 if now)."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        self.tokens -= 1
+        return max(-self.tokens, 0.0) / self.rate
+
+    def return_token(self) -> None:
+        self.tokens += 1
+
+    def on_success(self) -> None:
+        # Additive increase: roughly +1 per window of `limit` successful deliveries
+        self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def on_failure(self, retry_after: float | None) -> None:
+        # Multiplicative decrease
+        self.limit = max(1.0, self.limit / 2)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.breaker.state.value,
+            "concurrency_limit": self.concurrency,
+            "in_flight": self.in_flight,
+            "blocked_for": round(self.blocked_for(), 3),
+        }
+
+
+class EndpointScheduler:
+    """
+    Admission control for outbound webhook requests, per destination endpoint.
+
+    ``submit`` runs a send only if the endpoint's circuit is closed (or
+    half-open for a single probe), it is under its AIMD concurrency limit,
+    and its token bucket has a token. A delivery that cannot be admitted
+    within ``queue_timeout`` seconds comes back as a deferred attempt so the
+    caller reschedules it without counting it against the retry budget (up to
+    ``endpoint_max_deferrals`` times per delivery).
+
+    Usage:
+        scheduler = get_endpoint_scheduler()
+        attempt = await scheduler.submit(url, lambda: post(url, body))
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int | None = None,
+        recovery_timeout: float | None = None,
+        initial_concurrency: int | None = None,
+        max_concurrency: int | None = None,
+        rate_per_second: float | None = None,
+        burst: int | None = None,
+        queue_timeout: float | None = None,
+        max_endpoints: int = 10_000,
+    ) -> None:
+        config = settings.webhooks
+        self._new_endpoint = partial(
+            EndpointState,
+            failure_threshold=failure_threshold or config.endpoint_failure_threshold,
+            recovery_timeout=recovery_timeout or config.endpoint_recovery_timeout,
+            initial_concurrency=initial_concurrency or config.endpoint_initial_concurrency,
+            max_concurrency=max_concurrency or config.endpoint_max_concurrency,
+            rate_per_second=rate_per_second or config.endpoint_rate_per_second,
+            burst=burst or config.endpoint_burst,
+        )
+        self.queue_timeout = (
+            config.endpoint_queue_timeout if queue_timeout is None else queue_timeout
+        )
+        self.max_endpoints = max_endpoints
+        self._endpoints: OrderedDict[str, EndpointState] = OrderedDict()
+
+    def endpoint(self, url: str) -> EndpointState:
+        """State for the endpoint serving ``url``."""
+        key = endpoint_key(url)
+        state = self._endpoints.get(key)
+        if state is None:
+            state = self._new_endpoint(key)
+            self._endpoints[key] = state
+            self._evict_idle()
+        else:
+            self._endpoints.move_to_end(key)
+        return state
+
+    def _evict_idle(self) -> None:
+        excess = len(self._endpoints) - self.max_endpoints
+        if excess <= 0:
+            return
+        for key, state in list(self._endpoints.items()):
+            if excess <= 0:
+                break
+            if state.in_flight == 0 and state.breaker.is_closed and not state.blocked_for():
+                del self._endpoints[key]
+                excess -= 1
+
+    def blocked_for(self, url: str) -> float:
+        """Seconds until the endpoint serving ``url`` accepts deliveries (0 if it does now)."""
+        state = self._endpoints.get(endpoint_key(url))
+        return state.blocked_for() if state is not None else 0.0
+
+    async def submit(
+        self,
+        url: str,
+        send: Callable[[], Awaitable["DeliveryAttempt"]],
+    ) -> "DeliveryAttempt":
+        """Run ``send`` under the endpoint's admission control."""
+        state = self.endpoint(url)
+        deadline = time.monotonic() + self.queue_timeout
+
+        blocked = state.blocked_for()
+        if blocked > 0:
+            return self._deferred(state, blocked)
+
+        condition = state.condition
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: state.in_flight < state.concurrency),
+                    timeout=max(deadline - time.monotonic(), 0.0),
+                )
+            except TimeoutError:
+                return self._deferred(state, self.queue_timeout)
+            state.in_flight += 1
+
+        try:
+            token_wait = state.take_token()
+            if token_wait > 0:
+                if time.monotonic() + token_wait > deadline:
+                    state.return_token()
+                    return self._deferred(state, token_wait)
+                await asyncio.sleep(token_wait)
+
+            try:
+                attempt = await state.breaker.call(self._checked, send)
+            except CircuitBreakerError:
+                return self._deferred(state, state.blocked_for())
+            except _EndpointFailure as failure:
+                attempt = failure.attempt
+                state.on_failure(attempt.retry_after)
+            else:
+                state.on_success()
+            return attempt
+        finally:
+            async with condition:
+                state.in_flight -= 1
+                condition.notify()
+
+    @staticmethod
+    async def _checked(send: Callable[[], Awaitable["DeliveryAttempt"]]) -> "DeliveryAttempt":
+        attempt = await send()
+        if is_endpoint_failure(attempt):
+            raise _EndpointFailure(attempt)
+        return attempt
+
+    def _deferred(self, state: EndpointState, wait: float) -> "DeliveryAttempt":
+        from .delivery import DeliveryAttempt
+
+        reason = "circuit open" if state.breaker.is_open else "endpoint busy"
+        return DeliveryAttempt(
+            error=f"Delivery deferred: {reason} for {state.key}",
+            retry_after=wait,
+            deferred=True,
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-endpoint scheduler state, for health checks."""
+        return {key: state.stats() for key, state in self._endpoints.items()}
+
+
+_scheduler: EndpointScheduler | None = None
+
+
+def get_endpoint_scheduler() -> EndpointScheduler:
+    """Get the process-wide webhook endpoint scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = EndpointScheduler()
+    return _scheduler
+
+
+def reset_endpoint_scheduler() -> None:
+    """Forget all endpoint state (tests, configuration reloads)."""
+    global _scheduler
+    _scheduler = None
@@ -18,6 +18,7 @@ from .models import (
     WebhookSubscriptionUpdate,
     generate_webhook_secret,
 )
+from .routing import SubscriptionRoute, WebhookRoutingIndex, get_routing_index
 
 logger = structlog.get_logger(__name__)
 
@@ -25,8 +26,9 @@ logger = structlog.get_logger(__name__)
 class WebhookSubscriptionService:
     """Service for managing webhook subscriptions."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, routing_index: WebhookRoutingIndex | None = None) -> None:
         self.db = db
+        self.routing_index = routing_index or get_routing_index()
 
     async def create_subscription(
         self,
@@ -56,6 +58,7 @@ class WebhookSubscriptionService:
         self.db.add(subscription)
         await self.db.commit()
         await self.db.refresh(subscription)
+        await self.routing_index.invalidate(tenant_id)
 
         logger.info(
             "Webhook subscription created",
@@ -129,6 +132,8 @@ class WebhookSubscriptionService:
 
         await self.db.commit()
         await self.db.refresh(subscription)
+        if "events" in update_dict or "is_active" in update_dict:
+            await self.routing_index.invalidate(tenant_id)
 
         logger.info(
             "Webhook subscription updated",
@@ -147,6 +152,7 @@ class WebhookSubscriptionService:
 
         await self.db.delete(subscription)
         await self.db.commit()
+        await self.routing_index.invalidate(tenant_id)
 
         logger.info(
             "Webhook subscription deleted",
@@ -159,19 +165,36 @@ class WebhookSubscriptionService:
     async def get_subscriptions_for_event(
         self, event_type: str, tenant_id: str
     ) -> list[WebhookSubscription]:
-        """Get all active subscriptions for a specific event type and tenant."""
+        """
+        Get all active subscriptions for a specific event type and tenant.
+
+        Subscription ids come from the tenant's routing index (exact types
+        and wildcard patterns such as ``invoice.*``), so only matching
+        subscriptions are loaded.
+        """
+        routes = await self.routing_index.get_or_load(
+            tenant_id, lambda: self._load_routes(tenant_id)
+        )
+        subscription_ids = routes.match(event_type)
+        if not subscription_ids:
+            return []
+
         stmt = select(WebhookSubscription).where(
+            WebhookSubscription.id.in_(subscription_ids),
             WebhookSubscription.tenant_id == tenant_id,
             WebhookSubscription.is_active,
         )
-
         result = await self.db.execute(stmt)
-        all_subscriptions = result.scalars().all()
-
-        # Filter in Python since JSON contains query is DB-specific
-        matching_subscriptions = [sub for sub in all_subscriptions if event_type in sub.events]
+        return list(result.scalars().all())
 
-        return matching_subscriptions
+    async def _load_routes(self, tenant_id: str) -> list[SubscriptionRoute]:
+        """Ids and event types of the tenant's active subscriptions."""
+        stmt = select(WebhookSubscription.id, WebhookSubscription.events).where(
+            WebhookSubscription.tenant_id == tenant_id,
+            WebhookSubscription.is_active,
+        )
+        result = await self.db.execute(stmt)
+        return [(subscription_id, events) for subscription_id, events in result.all()]
 
     async def update_statistics(
         self,
@@ -227,6 +250,9 @@ class WebhookSubscriptionService:
         flag_modified(subscription, "custom_metadata")
 
         await self.db.commit()
+        # Routes are cached per tenant; a subscription without one is never routed
+        if subscription.tenant_id is not None:
+            await self.routing_index.invalidate(subscription.tenant_id)
 
         logger.warning(
             "Webhook subscription disabled",
@@ -26,15 +26,21 @@ def clear_global_cache():
 
     This fixture runs automatically before every test in the auth directory.
     """
+    from dotmac.platform.auth.permission_cache import get_permission_cache
+    from dotmac.platform.auth.permission_index import get_permission_hierarchy
     from dotmac.platform.core.caching import cache_clear
 
     # Clear all cached data before test
     cache_clear(flush_all=True)  # Use flush_all to ensure complete cleanup
+    get_permission_hierarchy().invalidate()
+    get_permission_cache().clear()
 
     yield  # Run the test
 
     # Clear again after test to prevent pollution of subsequent tests
     cache_clear(flush_all=True)
+    get_permission_hierarchy().invalidate()
+    get_permission_cache().clear()
 
 
 @pytest_asyncio.fixture(autouse=True, scope="function")
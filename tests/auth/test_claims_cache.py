@@ -0,0 +1,130 @@
+"""Tests for the verified JWT claims cache and per-request verification memo."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException, Request
+
+from dotmac.platform.auth import core as auth_core
+from dotmac.platform.auth.claims_cache import VerifiedClaimsCache
+from dotmac.platform.auth.core import JWTService, TokenType, verify_request_token
+
+pytestmark = pytest.mark.unit
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+class TestVerifiedClaimsCache:
+    def test_returns_copy_until_exp(self):
+        cache = VerifiedClaimsCache(max_size=4)
+        cache.set("tok", {"sub": "u1", "exp": time.time() + 60})
+
+        claims = cache.get("tok")
+        claims["sub"] = "mutated"
+
+        assert cache.get("tok")["sub"] == "u1"
+
+    def test_expired_and_expiryless_tokens_are_not_served(self):
+        cache = VerifiedClaimsCache(max_size=4)
+        cache.set("no-exp", {"sub": "u1"})
+        cache._entries[cache._key("old")] = (time.time() - 1, {"sub": "u2"})
+
+        assert cache.get("no-exp") is None
+        assert cache.get("old") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedClaimsCache(max_size=2)
+        exp = time.time() + 60
+        cache.set("a", {"exp": exp})
+        cache.set("b", {"exp": exp})
+        cache.get("a")
+        cache.set("c", {"exp": exp})
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+
+class TestJWTServiceClaimsCache:
+    @pytest.fixture
+    def jwt_service(self):
+        return JWTService(secret="test-secret", redis_url="redis://localhost:6379")
+
+    def test_signature_verified_once(self, jwt_service):
+        token = jwt_service.create_access_token("user123")
+
+        with (
+            patch.object(jwt_service, "is_token_revoked_sync", return_value=False),
+            patch.object(jwt_service, "_get_user_revoked_at_sync", return_value=None),
+            patch.object(
+                jwt_service,
+                "_try_asymmetric_verification",
+                wraps=jwt_service._try_asymmetric_verification,
+            ) as decode,
+        ):
+            first = jwt_service.verify_token(token, TokenType.ACCESS)
+            second = jwt_service.verify_token(token, TokenType.ACCESS)
+
+        assert first == second
+        assert decode.call_count == 1
+
+    def test_revocation_checked_on_cache_hit(self, jwt_service):
+        token = jwt_service.create_access_token("user123")
+
+        with patch.object(jwt_service, "_get_user_revoked_at_sync", return_value=None):
+            with patch.object(jwt_service, "is_token_revoked_sync", return_value=False):
+                jwt_service.verify_token(token)
+            with patch.object(jwt_service, "is_token_revoked_sync", return_value=True):
+                with pytest.raises(HTTPException):
+                    jwt_service.verify_token(token)
+
+    def test_token_type_checked_on_cache_hit(self, jwt_service):
+        token = jwt_service.create_refresh_token("user123")
+
+        with (
+            patch.object(jwt_service, "is_token_revoked_sync", return_value=False),
+            patch.object(jwt_service, "_get_user_revoked_at_sync", return_value=None),
+        ):
+            jwt_service.verify_token(token, TokenType.REFRESH)
+            with pytest.raises(HTTPException):
+                jwt_service.verify_token(token, TokenType.ACCESS)
+
+
+class TestRequestVerificationMemo:
+    def test_verifies_once_per_request(self):
+        with patch.object(auth_core, "jwt_service") as service:
+            service.verify_token.return_value = {"sub": "u1"}
+            request = _request()
+
+            assert verify_request_token(request, "tok") == {"sub": "u1"}
+            assert verify_request_token(request, "tok") == {"sub": "u1"}
+            verify_request_token(_request(), "tok")
+
+        assert service.verify_token.call_count == 2
+
+    def test_rejection_is_memoized(self):
+        with patch.object(auth_core, "jwt_service") as service:
+            service.verify_token.side_effect = HTTPException(status_code=401, detail="bad")
+            request = _request()
+
+            for _ in range(2):
+                with pytest.raises(HTTPException):
+                    verify_request_token(request, "tok")
+
+        assert service.verify_token.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_path_reuses_middleware_result(self):
+        with patch.object(auth_core, "jwt_service") as service:
+            service.verify_token.return_value = {"sub": "u1"}
+            request = _request()
+            verify_request_token(request, "tok")
+
+            claims = await auth_core.verify_request_token_async(request, "tok")
+
+        assert claims == {"sub": "u1"}
+        service.verify_token_async.assert_not_called()
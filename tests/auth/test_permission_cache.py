@@ -0,0 +1,139 @@
+"""Tests for the async two-tier RBAC permission cache."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from dotmac.platform.auth.permission_cache import PermissionCache
+from dotmac.platform.auth.rbac_service import PermissionSnapshot
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+def _loader(snapshot: PermissionSnapshot, calls: list[int], delay: float = 0.0):
+    async def load() -> PermissionSnapshot:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return snapshot
+
+    return load
+
+
+async def _get(cache: PermissionCache, user_id, loader):
+    return await cache.get_or_load(user_id, False, loader, PermissionSnapshot.from_cache_payload)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(redis):
+    cache = PermissionCache(ttl=60, local_ttl=30, local_max_size=10, redis=redis)
+    calls: list[int] = []
+    loader = _loader(PermissionSnapshot({"ticket.read"}), calls, delay=0.01)
+    user_id = uuid4()
+
+    results = await asyncio.gather(*(_get(cache, user_id, loader) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert all(result.grants("ticket.read") for result in results)
+    await _get(cache, user_id, loader)
+    assert cache.local_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_serves_other_workers(redis):
+    user_id = uuid4()
+    calls: list[int] = []
+    loader = _loader(PermissionSnapshot({"billing.*"}, {"billing.delete"}), calls)
+
+    await _get(PermissionCache(ttl=60, redis=redis), user_id, loader)
+    snapshot = await _get(PermissionCache(ttl=60, redis=redis), user_id, loader)
+
+    assert len(calls) == 1
+    assert snapshot.grants("billing.read")
+    assert not snapshot.grants("billing.delete")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_clears_redis_and_broadcasts(redis):
+    user_id = uuid4()
+    worker_a = PermissionCache(ttl=60, redis=redis)
+    worker_b = PermissionCache(ttl=60, redis=redis)
+    calls: list[int] = []
+    loader = _loader(PermissionSnapshot({"a"}), calls)
+    await _get(worker_a, user_id, loader)
+    await _get(worker_b, user_id, loader)
+
+    pubsub = redis.pubsub()
+    await pubsub.subscribe("rbac:permissions:invalidate")
+    await worker_a.invalidate(user_id)
+    message = None
+    while message is None or message["type"] != "message":
+        message = await pubsub.get_message(timeout=1)
+    worker_b.handle_message(message["data"])
+    await pubsub.aclose()
+
+    assert await redis.exists(PermissionCache.redis_key(user_id, False)) == 0
+    await _get(worker_b, user_id, loader)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_cached():
+    cache = PermissionCache(ttl=0, local_ttl=30, local_max_size=10)
+    user_id = uuid4()
+    calls: list[int] = []
+    loader = _loader(PermissionSnapshot({"stale"}), calls, delay=0.01)
+
+    pending = asyncio.create_task(_get(cache, user_id, loader))
+    await asyncio.sleep(0)
+    cache.invalidate_local(user_id)
+    await pending
+    await _get(cache, user_id, loader)
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_load_propagates_to_all_waiters():
+    cache = PermissionCache(ttl=0, local_ttl=30, local_max_size=10)
+
+    async def failing() -> PermissionSnapshot:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        *(_get(cache, "u1", failing) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_after_commit_drops_snapshot_loaded_mid_transaction(redis):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    cache = PermissionCache(ttl=60, local_ttl=30, local_max_size=10, redis=redis)
+    user_id = uuid4()
+    calls: list[int] = []
+    loader = _loader(PermissionSnapshot({"stale"}), calls)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async with AsyncSession(engine) as session:
+        await session.execute(text("SELECT 1"))
+        cache.invalidate_after_commit(session, user_id)
+        await _get(cache, user_id, loader)
+        await session.commit()
+        await asyncio.sleep(0.01)
+
+    assert await redis.exists(PermissionCache.redis_key(user_id, False)) == 0
+    await _get(cache, user_id, loader)
+    assert len(calls) == 2
+    await engine.dispose()
@@ -0,0 +1,100 @@
+"""Tests for the compiled permission trie and hierarchy closure table."""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from dotmac.platform.auth.permission_index import PermissionHierarchy, PermissionTrie
+from dotmac.platform.auth.rbac_service import PermissionSnapshot
+
+pytestmark = pytest.mark.unit
+
+
+def _linear_match(bucket: set[str], permission: str) -> bool:
+    """Reference implementation of the original wildcard scan."""
+    if permission in bucket or "*" in bucket:
+        return True
+    for entry in bucket:
+        if entry.endswith(".*"):
+            prefix = entry[:-2]
+            if permission == prefix or permission.startswith(f"{prefix}."):
+                return True
+    return False
+
+
+class TestPermissionTrie:
+    @pytest.mark.parametrize(
+        ("entries", "permission", "expected"),
+        [
+            ({"read:users"}, "read:users", True),
+            ({"read:users"}, "write:users", False),
+            ({"ticket.*"}, "ticket.read", True),
+            ({"ticket.*"}, "ticket", True),
+            ({"ticket.*"}, "tickets.read", False),
+            ({"ticket.read.*"}, "ticket.read.all", True),
+            ({"ticket.read.*"}, "ticket.write", False),
+            ({"ticket.read"}, "ticket", False),
+            ({"ticket.read"}, "ticket.read.all", False),
+            ({"*"}, "anything.at.all", True),
+            ({"billing.invoice.*"}, "billing.invoice.*", True),
+        ],
+    )
+    def test_matches_original_semantics(self, entries, permission, expected):
+        assert PermissionTrie(entries).matches(permission) is expected
+        assert _linear_match(entries, permission) is expected
+
+    def test_snapshot_denies_override_wildcard_allows(self):
+        snapshot = PermissionSnapshot({"billing.*"}, {"billing.invoice.delete"})
+
+        assert snapshot.grants("billing.invoice.read")
+        assert not snapshot.grants("billing.invoice.delete")
+        assert snapshot.grants_any(["billing.invoice.delete", "billing.invoice.read"])
+        assert not snapshot.grants_all(["billing.invoice.delete", "billing.invoice.read"])
+
+
+class TestPermissionHierarchy:
+    def test_closure_includes_all_ancestors(self):
+        root, mid, leaf = uuid4(), uuid4(), uuid4()
+        hierarchy = PermissionHierarchy()
+        hierarchy.build(
+            [
+                (leaf, "ticket.read.all", mid),
+                (mid, "ticket.read.team", root),
+                (root, "ticket.read.assigned", None),
+            ]
+        )
+
+        assert hierarchy.ancestors_of(leaf) == {mid, root}
+        assert hierarchy.expand({"ticket.read.all"}) == {
+            "ticket.read.all",
+            "ticket.read.team",
+            "ticket.read.assigned",
+        }
+        assert hierarchy.expand({"ticket.read.assigned"}) == {"ticket.read.assigned"}
+
+    def test_cycles_and_dangling_parents_terminate(self):
+        a, b, missing = uuid4(), uuid4(), uuid4()
+        hierarchy = PermissionHierarchy()
+        hierarchy.build([(a, "a", b), (b, "b", a), (uuid4(), "orphan", missing)])
+
+        assert hierarchy.expand({"a"}) == {"a", "b"}
+        assert hierarchy.expand({"orphan"}) == {"orphan"}
+
+    @pytest.mark.asyncio
+    async def test_loads_once_until_invalidated(self):
+        parent_id = uuid4()
+        result = MagicMock()
+        result.all.return_value = [(uuid4(), "child", parent_id), (parent_id, "parent", None)]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        hierarchy = PermissionHierarchy()
+
+        await hierarchy.ensure_loaded(db)
+        await hierarchy.ensure_loaded(db)
+        assert db.execute.await_count == 1
+        assert hierarchy.expand({"child"}) == {"child", "parent"}
+
+        hierarchy.invalidate()
+        await hierarchy.ensure_loaded(db)
+        assert db.execute.await_count == 2
@@ -5,6 +5,7 @@ These tests call router functions directly without TestClient
 to avoid async/greenlet issues and improve coverage.
 """
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
@@ -400,6 +401,37 @@ class TestRoleCRUDEndpointsDirect:
 
         assert result.name == "perm_role"
 
+    @pytest.mark.asyncio
+    async def test_update_role_permissions_invalidates_cached_snapshots(
+        self, async_db_session: AsyncSession, mock_admin_user, test_user
+    ):
+        """Changing a role's permissions drops every cached permission snapshot."""
+        from dotmac.platform.auth.rbac_router import RoleUpdateRequest, update_role
+
+        perm = Permission(
+            name="cached.perm",
+            display_name="Cached Perm",
+            category=PermissionCategory.USER,
+            is_active=True,
+        )
+        async_db_session.add(perm)
+        rbac = RBACService(async_db_session)
+        role = await rbac.create_role(name="cached_role", display_name="Cached", permissions=[])
+        await rbac.assign_role_to_user(test_user.id, "cached_role", granted_by=test_user.id)
+        await async_db_session.commit()
+        await asyncio.sleep(0.01)  # let the post-commit invalidation finish
+        assert not (await rbac.get_user_permissions(test_user.id)).grants("cached.perm")
+
+        await update_role(
+            role_id=role.id,
+            request=RoleUpdateRequest(permissions=["cached.perm"]),
+            db=async_db_session,
+            current_user=mock_admin_user,
+        )
+
+        snapshot = await RBACService(async_db_session).get_user_permissions(test_user.id)
+        assert snapshot.grants("cached.perm")
+
     @pytest.mark.asyncio
     async def test_grant_permission_to_user_direct(
         self, async_db_session: AsyncSession, mock_admin_user, test_user
@@ -545,15 +545,13 @@ class TestHelperMethods:
 
     async def test_expand_permissions_with_parent(self, rbac_service):
         """Test permission expansion with parent."""
-        child_perm = MagicMock(spec=Permission)
-        child_perm.name = "child:perm"
-        child_perm.parent_id = uuid4()
-
-        parent_perm = MagicMock(spec=Permission)
-        parent_perm.name = "parent:perm"
-
-        rbac_service._permission_cache["child:perm"] = child_perm
-        rbac_service.db.get = AsyncMock(return_value=parent_perm)
+        parent_id = uuid4()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            (uuid4(), "child:perm", parent_id),
+            (parent_id, "parent:perm", None),
+        ]
+        rbac_service.db.execute = AsyncMock(return_value=mock_result)
 
         expanded = await rbac_service._expand_permissions({"child:perm"})
 
@@ -562,12 +560,15 @@ class TestHelperMethods:
 
     async def test_expand_permissions_with_wildcard(self, rbac_service):
         """Test permission expansion with wildcards."""
-        with patch.object(rbac_service, "_get_permission_by_name", return_value=None):
-            expanded = await rbac_service._expand_permissions({"ticket.read.all"})
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        rbac_service.db.execute = AsyncMock(return_value=mock_result)
+
+        expanded = await rbac_service._expand_permissions({"ticket.read.all"})
 
-            assert "ticket.read.all" in expanded
-            assert "ticket.*" in expanded
-            assert "ticket.read.*" in expanded
+        assert "ticket.read.all" in expanded
+        assert "ticket.*" in expanded
+        assert "ticket.read.*" in expanded
 
     async def test_log_permission_grant(self, rbac_service):
         """Test logging permission grant."""
@@ -7,7 +7,7 @@ AFTER: ~120 lines using shared helpers (30% reduction)
 
 import hashlib
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
@@ -47,11 +47,8 @@ class TestInvoiceServiceHelpers:
 
         year = datetime.now(UTC).year
 
-        # Mock existing invoice
-        mock_invoice = MagicMock()
-        mock_invoice.invoice_number = _build_invoice_number(sample_tenant_id, year, 42)
-
-        mock_db.execute = AsyncMock(return_value=build_success_result(mock_invoice))
+        # Counter row was at 42; UPDATE ... RETURNING yields the incremented value
+        mock_db.execute = AsyncMock(return_value=build_success_result(43))
 
         # Generate next invoice number
         invoice_number = await service._generate_invoice_number(sample_tenant_id)
@@ -0,0 +1,113 @@
+"""Tests for counter-based invoice number allocation."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dotmac.platform.billing.invoicing.numbering import (
+    InvoiceNumberAllocator,
+    format_invoice_number,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+TENANT = "tenant-1"
+
+
+def _engine() -> MagicMock:
+    engine = MagicMock()
+    engine.begin.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    engine.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+    return engine
+
+
+def _sequence(invoice_number: str) -> int:
+    return int(invoice_number.rsplit("-", 1)[-1])
+
+
+class TestBlockAllocation:
+    async def test_numbers_come_from_reserved_blocks(self):
+        allocator = InvoiceNumberAllocator(block_size=5)
+        counter = {"value": 0}
+
+        async def increment(executor, tenant_id, year, count, *, concurrent):
+            assert concurrent is True
+            counter["value"] += count
+            return counter["value"]
+
+        with (
+            patch.object(allocator, "_autonomous_engine", return_value=_engine()),
+            patch.object(allocator, "_increment", side_effect=increment) as increment_mock,
+        ):
+            numbers = [await allocator.next_number(MagicMock(), TENANT) for _ in range(7)]
+
+        assert [_sequence(number) for number in numbers] == list(range(1, 8))
+        assert increment_mock.await_count == 2
+        assert numbers[0] == format_invoice_number(TENANT, datetime.now(UTC).year, 1)
+
+    async def test_reserve_covers_bulk_run_with_one_update(self):
+        allocator = InvoiceNumberAllocator(block_size=5)
+
+        with (
+            patch.object(allocator, "_autonomous_engine", return_value=_engine()),
+            patch.object(allocator, "_increment", AsyncMock(return_value=40)) as increment,
+        ):
+            await allocator.reserve(MagicMock(), TENANT, 40)
+            numbers = [await allocator.next_number(MagicMock(), TENANT) for _ in range(40)]
+
+        increment.assert_awaited_once()
+        assert [_sequence(number) for number in numbers] == list(range(1, 41))
+
+    async def test_reserve_is_noop_without_block_mode(self):
+        allocator = InvoiceNumberAllocator(block_size=1)
+
+        with patch.object(allocator, "_increment", AsyncMock()) as increment:
+            await allocator.reserve(MagicMock(), TENANT, 100)
+
+        increment.assert_not_awaited()
+
+
+class TestInTransactionAllocation:
+    async def test_counter_created_then_incremented(self, async_db_session):
+        allocator = InvoiceNumberAllocator()
+
+        numbers = [await allocator.next_number(async_db_session, TENANT) for _ in range(3)]
+        other = await allocator.next_number(async_db_session, "tenant-2")
+
+        assert [_sequence(number) for number in numbers] == [1, 2, 3]
+        assert _sequence(other) == 1
+
+
+class TestCounterEngine:
+    async def test_counter_uses_its_own_pool(self):
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        app_engine = create_async_engine("postgresql+asyncpg://app:secret@db/dotmac")
+        allocator = InvoiceNumberAllocator(block_size=5)
+
+        counter_engine = allocator._autonomous_engine(AsyncSession(app_engine))
+
+        assert counter_engine is not None and counter_engine is not app_engine
+        assert counter_engine.url == app_engine.url
+        assert counter_engine.pool is not app_engine.pool
+        assert allocator._autonomous_engine(AsyncSession(app_engine)) is counter_engine
+
+    def test_counter_engine_is_disposed_with_its_loop(self):
+        import asyncio
+
+        from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+        app_engine = create_async_engine("postgresql+asyncpg://app:secret@db/dotmac")
+        allocator = InvoiceNumberAllocator(block_size=5)
+
+        async def allocate() -> AsyncEngine | None:
+            return allocator._autonomous_engine(AsyncSession(app_engine))
+
+        with patch.object(AsyncEngine, "dispose", AsyncMock()) as dispose:
+            first = asyncio.run(allocate())
+            dispose.assert_awaited_once()
+            second = asyncio.run(allocate())
+
+        assert first is not None and second is not None and second is not first
+        assert dispose.await_count == 2
@@ -0,0 +1,159 @@
+"""Tests for process-pool batch invoice PDF rendering."""
+
+import io
+import zipfile
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dotmac.platform.billing.core.models import Invoice, InvoiceLineItem
+from dotmac.platform.billing.invoicing.pdf_batch import (
+    InvoicePDFRenderer,
+    RenderedInvoicePDF,
+    invoice_pdf_filename,
+)
+from dotmac.platform.billing.invoicing.service import InvoiceService
+
+TENANT = "tenant-pdf-batch"
+
+
+def _invoice(number: int) -> Invoice:
+    return Invoice(
+        invoice_id=f"inv-{number}",
+        invoice_number=f"INV-BATCH-{number:03d}",
+        customer_id=f"cust-{number}",
+        tenant_id=TENANT,
+        billing_email=f"customer{number}@example.com",
+        currency="USD",
+        status="open",
+        payment_status="pending",
+        issue_date=datetime.now(UTC),
+        due_date=datetime.now(UTC),
+        line_items=[
+            InvoiceLineItem(
+                description="Subscription",
+                quantity=1,
+                unit_price=1000,
+                tax_rate=0.0,
+                tax_amount=0,
+                discount_percentage=0.0,
+                discount_amount=0,
+                total_price=1000,
+            )
+        ],
+        subtotal=1000,
+        tax_amount=0,
+        discount_amount=0,
+        total_amount=1000,
+        remaining_balance=1000,
+    )
+
+
+class _FakeRenderer:
+    """Renders instantly and in reverse order, like a pool finishing out of order."""
+
+    async def render(self, invoices, *, company_info=None, locale="en_US", progress=None):
+        for rendered, invoice in enumerate(reversed(invoices), start=1):
+            if progress is not None:
+                progress(rendered, len(invoices))
+            yield RenderedInvoicePDF(
+                invoice=invoice,
+                filename=invoice_pdf_filename(invoice),
+                content=f"%PDF {invoice.invoice_id}".encode(),
+            )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_renderer_renders_in_worker_processes():
+    renderer = InvoicePDFRenderer(max_workers=2)
+    invoices = [_invoice(i) for i in range(3)]
+    progress: list[tuple[int, int]] = []
+
+    try:
+        pdfs = [
+            pdf
+            async for pdf in renderer.render(
+                invoices, progress=lambda done, total: progress.append((done, total))
+            )
+        ]
+    finally:
+        renderer.close()
+
+    assert sorted(pdf.invoice.invoice_id for pdf in pdfs) == ["inv-0", "inv-1", "inv-2"]
+    assert all(pdf.content.startswith(b"%PDF") for pdf in pdfs)
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBatchInvoicePDFs:
+    @pytest.fixture
+    def service(self, mock_db_session):
+        service = InvoiceService(mock_db_session)
+        service.pdf_renderer = _FakeRenderer()
+        service._get_invoices_for_rendering = AsyncMock(return_value=[_invoice(1), _invoice(2)])
+        return service
+
+    async def test_writes_files_in_request_order(self, service, tmp_path):
+        paths = await service.generate_batch_invoices_pdf(TENANT, ["inv-1", "inv-2"], str(tmp_path))
+
+        assert [path.rsplit("/", 1)[-1] for path in paths] == [
+            "invoice_INV-BATCH-001_cust-1.pdf",
+            "invoice_INV-BATCH-002_cust-2.pdf",
+        ]
+        assert (tmp_path / "invoice_INV-BATCH-001_cust-1.pdf").read_bytes() == b"%PDF inv-1"
+
+    async def test_stores_each_pdf(self, service):
+        storage = MagicMock()
+        storage.store_file = AsyncMock(side_effect=["file-2", "file-1"])
+        progress = MagicMock()
+
+        file_ids = await service.store_batch_invoices_pdf(
+            TENANT, ["inv-1", "inv-2"], storage=storage, progress=progress
+        )
+
+        assert file_ids == ["file-1", "file-2"]
+        assert progress.call_count == 2
+        first = storage.store_file.await_args_list[0].kwargs
+        assert first["content_type"] == "application/pdf"
+        assert first["tenant_id"] == TENANT
+        assert first["path"].startswith(f"invoices/{TENANT}/batches/")
+        assert first["metadata"]["invoice_id"] == "inv-2"
+
+    async def test_stores_zip_archive(self, service):
+        received: list[bytes] = []
+
+        async def store_file_stream(chunks, **kwargs):
+            received.extend([chunk async for chunk in chunks])
+            return MagicMock(file_id="archive-1")
+
+        storage = MagicMock()
+        storage.store_file_stream = AsyncMock(side_effect=store_file_stream)
+
+        file_ids = await service.store_batch_invoices_pdf(
+            TENANT, ["inv-1", "inv-2"], storage=storage, archive=True
+        )
+
+        assert file_ids == ["archive-1"]
+        stored = storage.store_file_stream.await_args.kwargs
+        assert stored["content_type"] == "application/zip"
+        storage.store_file.assert_not_called()
+        with zipfile.ZipFile(io.BytesIO(b"".join(received))) as archive:
+            assert sorted(archive.namelist()) == [
+                "invoice_INV-BATCH-001_cust-1.pdf",
+                "invoice_INV-BATCH-002_cust-2.pdf",
+            ]
+
+    async def test_unknown_invoices_store_nothing(self, service):
+        service._get_invoices_for_rendering = AsyncMock(return_value=[])
+        storage = MagicMock()
+        storage.store_file = AsyncMock()
+
+        with patch.object(service.pdf_renderer, "render") as render:
+            file_ids = await service.store_batch_invoices_pdf(TENANT, ["missing"], storage=storage)
+
+        assert file_ids == []
+        render.assert_not_called()
+        storage.store_file.assert_not_awaited()
@@ -0,0 +1,227 @@
+"""Tests for the checkpointed bulk subscription renewal engine."""
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from dotmac.platform.billing.models import (
+    BillingRenewalRunTable,
+    BillingSubscriptionPlanTable,
+    BillingSubscriptionTable,
+)
+from dotmac.platform.billing.subscriptions.models import SubscriptionStatus
+from dotmac.platform.billing.subscriptions.renewals import (
+    RUN_COMPLETED,
+    RUN_RUNNING,
+    SubscriptionRenewalEngine,
+)
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+PERIOD_END = datetime(2025, 1, 31, 12, tzinfo=UTC)
+
+
+def _shared_session(session):
+    """Session factory handing the engine the test's transactional session."""
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+def _plan(tenant_id: str, plan_id: str) -> BillingSubscriptionPlanTable:
+    return BillingSubscriptionPlanTable(
+        plan_id=plan_id,
+        tenant_id=tenant_id,
+        product_id="prod-1",
+        name="Monthly",
+        billing_cycle="monthly",
+        price=Decimal("20.00"),
+        currency="USD",
+        included_usage={},
+        overage_rates={},
+        is_active=True,
+    )
+
+
+def _subscription(
+    tenant_id: str, subscription_id: str, plan_id: str, **overrides
+) -> BillingSubscriptionTable:
+    data = {
+        "subscription_id": subscription_id,
+        "tenant_id": tenant_id,
+        "customer_id": f"cust-{subscription_id}",
+        "plan_id": plan_id,
+        "current_period_start": PERIOD_END - timedelta(days=31),
+        "current_period_end": PERIOD_END,
+        "status": SubscriptionStatus.ACTIVE.value,
+        "cancel_at_period_end": False,
+        "usage_records": {"api_calls": 10},
+    }
+    data.update(overrides)
+    return BillingSubscriptionTable(**data)
+
+
+@pytest.fixture
+def event_bus():
+    bus = MagicMock()
+    bus.publish = AsyncMock(return_value=0)
+    with patch("dotmac.platform.billing.subscriptions.renewals.get_event_bus", return_value=bus):
+        yield bus
+
+
+@pytest.fixture(autouse=True)
+def billing():
+    """Invoicing path: one invoice per subscription and period."""
+
+    async def invoice(subscription_id, tenant_id, idempotency_key=None):
+        return f"inv-{subscription_id}"
+
+    service = MagicMock()
+    service.process_subscription_billing = AsyncMock(side_effect=invoice)
+    service.invoice_service.reserve_invoice_numbers = AsyncMock()
+    with patch(
+        "dotmac.platform.billing.subscriptions.renewals.BillingIntegrationService",
+        return_value=service,
+    ):
+        yield service
+
+
+@pytest.fixture
+async def due_subscriptions(async_db_session):
+    async_db_session.add_all(
+        [
+            _plan("tenant-a", "plan-renew-a"),
+            _plan("tenant-b", "plan-renew-b"),
+            _subscription("tenant-a", "sub-renew-1", "plan-renew-a"),
+            _subscription("tenant-b", "sub-renew-2", "plan-renew-b"),
+            _subscription("tenant-a", "sub-renew-3", "plan-renew-a", custom_price=Decimal("5")),
+            _subscription(
+                "tenant-a",
+                "sub-renew-4",
+                "plan-renew-a",
+                current_period_end=datetime.now(UTC) + timedelta(days=20),
+            ),
+            _subscription("tenant-b", "sub-renew-5", "plan-renew-b", cancel_at_period_end=True),
+        ]
+    )
+    await async_db_session.commit()
+    return async_db_session
+
+
+async def _subscriptions(db) -> dict[str, BillingSubscriptionTable]:
+    result = await db.execute(
+        select(BillingSubscriptionTable).execution_options(populate_existing=True)
+    )
+    return {row.subscription_id: row for row in result.scalars().all()}
+
+
+def _period_end(row: BillingSubscriptionTable) -> datetime:
+    value = row.current_period_end
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+async def test_renews_due_subscriptions_across_tenants(due_subscriptions, event_bus, billing):
+    db = due_subscriptions
+    engine = SubscriptionRenewalEngine(_shared_session(db), batch_size=2, concurrency=1)
+
+    stats = await engine.run()
+
+    assert stats["renewed"] == 3
+    assert stats["batches"] == 2
+    assert stats["skipped"] == stats["failed"] == 0
+
+    rows = await _subscriptions(db)
+    for subscription_id in ("sub-renew-1", "sub-renew-2", "sub-renew-3"):
+        assert _period_end(rows[subscription_id]) == datetime(2025, 2, 28, 12, tzinfo=UTC)
+        assert rows[subscription_id].usage_records == {}
+    assert rows["sub-renew-4"].usage_records == {"api_calls": 10}
+    assert _period_end(rows["sub-renew-5"]) == PERIOD_END
+
+    billed = {
+        call.args[0]: call.kwargs["idempotency_key"]
+        for call in billing.process_subscription_billing.await_args_list
+    }
+    assert billed == {
+        subscription_id: f"renewal:{subscription_id}:{PERIOD_END.isoformat()}"
+        for subscription_id in ("sub-renew-1", "sub-renew-2", "sub-renew-3")
+    }
+
+    amounts = {
+        call.kwargs["event_data"]["subscription_id"]: call.kwargs["event_data"]["amount"]
+        for call in event_bus.publish.await_args_list
+    }
+    assert amounts == {"sub-renew-1": 20.0, "sub-renew-2": 20.0, "sub-renew-3": 5.0}
+    assert all(
+        call.kwargs["event_data"]["invoice_id"]
+        == f"inv-{call.kwargs['event_data']['subscription_id']}"
+        for call in event_bus.publish.await_args_list
+    )
+
+    run = await db.get(BillingRenewalRunTable, stats["run_id"])
+    assert run.status == RUN_COMPLETED
+    assert run.last_subscription_id == "sub-renew-3"
+    assert run.renewed == 3
+
+
+async def test_resumes_after_last_committed_batch(due_subscriptions, event_bus):
+    db = due_subscriptions
+    db.add(
+        BillingRenewalRunTable(
+            run_id="renewal_interrupted",
+            cutoff=datetime.now(UTC) + timedelta(days=1),
+            status=RUN_RUNNING,
+            last_subscription_id="sub-renew-1",
+            renewed=1,
+            skipped=0,
+            failed=0,
+        )
+    )
+    await db.commit()
+
+    stats = await SubscriptionRenewalEngine(_shared_session(db), concurrency=1).run()
+
+    assert stats["run_id"] == "renewal_interrupted"
+    assert stats["renewed"] == 3
+    rows = await _subscriptions(db)
+    assert _period_end(rows["sub-renew-1"]) == PERIOD_END
+    assert _period_end(rows["sub-renew-2"]) == datetime(2025, 2, 28, 12, tzinfo=UTC)
+    assert event_bus.publish.await_count == 2
+
+
+async def test_missing_plan_is_skipped(async_db_session, event_bus):
+    async_db_session.add(_subscription("tenant-c", "sub-renew-orphan", "plan-missing"))
+    await async_db_session.commit()
+
+    stats = await SubscriptionRenewalEngine(_shared_session(async_db_session)).run()
+
+    assert stats["renewed"] == 0
+    assert stats["skipped"] == 1
+    event_bus.publish.assert_not_awaited()
+
+
+async def test_period_advances_only_when_invoiced(due_subscriptions, event_bus, billing):
+    db = due_subscriptions
+
+    async def invoice(subscription_id, tenant_id, idempotency_key=None):
+        if subscription_id == "sub-renew-2":
+            raise RuntimeError("payment provider unavailable")
+        return None if subscription_id == "sub-renew-3" else f"inv-{subscription_id}"
+
+    billing.process_subscription_billing.side_effect = invoice
+
+    stats = await SubscriptionRenewalEngine(_shared_session(db), concurrency=1).run()
+
+    assert (stats["renewed"], stats["skipped"], stats["failed"]) == (1, 1, 1)
+    rows = await _subscriptions(db)
+    assert _period_end(rows["sub-renew-1"]) == datetime(2025, 2, 28, 12, tzinfo=UTC)
+    assert _period_end(rows["sub-renew-2"]) == PERIOD_END
+    assert _period_end(rows["sub-renew-3"]) == PERIOD_END
+    assert rows["sub-renew-2"].usage_records == {"api_calls": 10}
+    assert event_bus.publish.await_count == 1
@@ -443,8 +443,8 @@ class TestBillingCache:
 
         # Mock Redis
         mock_redis = Mock()
-        mock_redis.keys.return_value = ["billing:product:tenant1:999"]
-        mock_redis.delete.return_value = 1
+        mock_redis.scan_iter.return_value = iter(["billing:product:tenant1:999"])
+        mock_redis.unlink.return_value = 1
         mock_get_redis.return_value = mock_redis
 
         count = await cache.invalidate_pattern("billing:product:*")
@@ -446,11 +446,13 @@ class TestBillingCacheInvalidation:
     async def test_invalidate_pattern_redis(self):
         """Test pattern-based invalidation in Redis."""
         mock_redis = Mock()
-        mock_redis.keys.return_value = [
-            "billing:product:tenant-abc:prod-1",
-            "billing:product:tenant-abc:prod-2",
-        ]
-        mock_redis.delete.return_value = 2
+        mock_redis.scan_iter.return_value = iter(
+            [
+                "billing:product:tenant-abc:prod-1",
+                "billing:product:tenant-abc:prod-2",
+            ]
+        )
+        mock_redis.unlink.return_value = 2
 
         with patch("dotmac.platform.billing.cache.get_redis", return_value=mock_redis):
             cache = BillingCache()
@@ -459,8 +461,9 @@ class TestBillingCacheInvalidation:
             count = await cache.invalidate_pattern(pattern)
 
             assert count == 2
-            mock_redis.keys.assert_called_once_with(pattern)
-            mock_redis.delete.assert_called_once()
+            mock_redis.scan_iter.assert_called_once_with(match=pattern, count=500)
+            mock_redis.unlink.assert_called_once()
+            mock_redis.keys.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_invalidate_pattern_memory(self):
@@ -0,0 +1,122 @@
+"""Tests for cross-worker BillingCache invalidation backed by Redis tag sets."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from dotmac.platform.billing.cache import (
+    INVALIDATION_CHANNEL,
+    KEY_TAGS_PREFIX,
+    TAG_KEY_PREFIX,
+    BillingCache,
+)
+from dotmac.platform.core.cache_decorators import CacheTier
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa", reason="fakeredis needs lupa to run Lua scripts")
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def redis():
+    client = fakeredis.FakeRedis()
+    with (
+        patch("dotmac.platform.billing.cache.get_redis", return_value=client),
+        patch("dotmac.platform.billing.cache.cache_set"),
+        patch("dotmac.platform.billing.cache.cache_get", return_value=None),
+    ):
+        yield client
+
+
+def _published(pubsub) -> list[dict]:
+    messages = []
+    while (message := pubsub.get_message(timeout=0.1)) is not None:
+        if message["type"] == "message":
+            messages.append(json.loads(message["data"]))
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_tags_indexed_in_redis(redis):
+    cache = BillingCache()
+
+    await cache.set("billing:product:t1:p1", {"id": "p1"}, ttl=60, tags=["tenant:t1", "product:p1"])
+
+    assert redis.smembers(TAG_KEY_PREFIX + "tenant:t1") == {b"billing:product:t1:p1"}
+    assert redis.smembers(KEY_TAGS_PREFIX + "billing:product:t1:p1") == {
+        b"tenant:t1",
+        b"product:p1",
+    }
+    assert 0 < redis.ttl(TAG_KEY_PREFIX + "tenant:t1") <= 60
+
+
+@pytest.mark.asyncio
+async def test_tag_invalidation_reaches_keys_cached_by_other_workers(redis):
+    writer, invalidator = BillingCache(), BillingCache()
+    redis.set("billing:product:t1:p1", "{}")
+    redis.set("billing:product:t1:p2", "{}")
+    await writer.set("billing:product:t1:p1", {}, tags=["tenant:t1", "product:p1"])
+    await writer.set("billing:product:t1:p2", {}, tags=["tenant:t1"])
+
+    count = await invalidator.invalidate_by_tags(["product:p1"])
+
+    assert count == 1
+    assert not redis.exists("billing:product:t1:p1")
+    assert redis.exists("billing:product:t1:p2")
+    # p1 is no longer listed under its other tags
+    assert redis.smembers(TAG_KEY_PREFIX + "tenant:t1") == {b"billing:product:t1:p2"}
+    assert not redis.exists(KEY_TAGS_PREFIX + "billing:product:t1:p1")
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_broadcast_to_other_workers_l1(redis):
+    worker_a, worker_b = BillingCache(), BillingCache()
+    key = "billing:pricing:rules:t1:all"
+    await worker_a.set(key, ["rule"], tier=CacheTier.L1_MEMORY, tags=["tenant:t1"])
+    await worker_b.set(key, ["rule"], tier=CacheTier.L1_MEMORY, tags=["tenant:t1"])
+    pubsub = redis.pubsub()
+    pubsub.subscribe(INVALIDATION_CHANNEL)
+    _published(pubsub)
+
+    await worker_a.invalidate_by_tags(["tenant:t1"])
+    await worker_a.invalidate_pattern("billing:price:t1:*")
+    messages = _published(pubsub)
+    for message in messages:
+        worker_b.handle_message(json.dumps(message))
+        # Own broadcasts are ignored
+        worker_a.handle_message(json.dumps(message))
+
+    assert [m["tags"] for m in messages] == [["tenant:t1"], []]
+    assert messages[1]["patterns"] == ["billing:price:t1:*"]
+    assert worker_b._get_from_memory(key) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_pattern_scans_instead_of_keys(redis):
+    cache = BillingCache()
+    for i in range(1200):
+        redis.set(f"billing:price:t1:p{i}:1:c", "1")
+    redis.set("billing:price:t2:p1:1:c", "1")
+
+    with patch.object(redis, "keys", side_effect=AssertionError("KEYS must not be used")):
+        count = await cache.invalidate_pattern("billing:price:t1:*")
+
+    assert count == 1200
+    assert redis.exists("billing:price:t2:p1:1:c")
+
+
+def test_l1_routing_is_explicit_per_namespace():
+    cache = BillingCache()
+
+    cache._set_in_memory("billing:price:t1:p1:1:c", 1)
+    cache._set_in_memory("billing:subscriptions:customer:t1:c1", 2)
+    cache._set_in_memory("billing:usage:sub-product:2024-01", 3)
+    cache._set_in_memory("monitoring:subscription:stats", 4)
+
+    assert "billing:price:t1:p1:1:c" in cache.pricing_cache
+    assert "billing:subscriptions:customer:t1:c1" in cache.subscription_cache
+    # Substrings no longer route keys into an L1 cache
+    assert cache._get_from_memory("billing:usage:sub-product:2024-01") is None
+    assert cache._get_from_memory("monitoring:subscription:stats") is None
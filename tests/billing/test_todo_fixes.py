@@ -109,3 +109,27 @@ class TestBillingIntegrationFix:
         result = await billing_service._create_invoice(invoice_request, "tenant-123")
 
         assert result is None
+
+    @pytest.mark.asyncio
+    async def test_generate_usage_invoice_creates_invoice(self, billing_service):
+        """Usage charges are invoiced under the caller's idempotency key."""
+        product = Mock(currency="USD", metadata={"usage_rates": {"api_calls": "0.01"}})
+        product.is_usage_based.return_value = True
+        billing_service.catalog_service = Mock(get_product=AsyncMock(return_value=product))
+        billing_service.pricing_service = Mock(
+            calculate_price=AsyncMock(
+                return_value=Mock(total_discount_amount=Decimal("0"), final_price=Decimal("10"))
+            )
+        )
+        mock_invoice = Mock(invoice_id="inv-usage", status=InvoiceStatus.DRAFT)
+        billing_service.invoice_service.create_invoice = AsyncMock(return_value=mock_invoice)
+        billing_service.invoice_service.finalize_invoice = AsyncMock(return_value=mock_invoice)
+
+        result = await billing_service.generate_usage_invoice(
+            "prod-usage", {"api_calls": 1000}, "tenant-123", idempotency_key="usage-2025-12"
+        )
+
+        assert result == "inv-usage"
+        create_call = billing_service.invoice_service.create_invoice.call_args
+        assert create_call.kwargs["idempotency_key"] == "usage-2025-12"
+        assert create_call.kwargs["line_items"][0]["quantity"] == 1000
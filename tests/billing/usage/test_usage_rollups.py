@@ -0,0 +1,237 @@
+"""Tests for usage rollup buckets and set-based usage aggregation."""
+
+from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from dotmac.platform.billing.usage.models import UsageAggregate, UsageType
+from dotmac.platform.billing.usage.rollups import (
+    DAILY,
+    HOURLY,
+    MONTHLY,
+    bucket_end,
+    bucket_start,
+    is_bucket,
+    plan_window,
+)
+from dotmac.platform.billing.usage.schemas import (
+    UsageRecordCreate,
+    UsageRecordUpdate,
+    UsageReportRequest,
+)
+from dotmac.platform.billing.usage.service import UsageBillingService
+from dotmac.platform.core.exceptions import ValidationError
+
+TENANT = "tenant-usage-rollups"
+
+
+def _record(start: datetime, quantity: str, **overrides) -> UsageRecordCreate:
+    data = {
+        "subscription_id": "sub-1",
+        "customer_id": "cust-1",
+        "usage_type": UsageType.DATA_TRANSFER,
+        "quantity": Decimal(quantity),
+        "unit": "GB",
+        "unit_price": Decimal("0.10"),
+        "period_start": start,
+        "period_end": start + timedelta(minutes=5),
+        "source_system": "test",
+    }
+    data.update(overrides)
+    return UsageRecordCreate(**data)
+
+
+@pytest.mark.unit
+class TestRollupBuckets:
+    def test_bucket_start_truncates_to_period(self):
+        value = datetime(2025, 3, 14, 15, 9, 26, tzinfo=UTC)
+
+        assert bucket_start(value, HOURLY) == datetime(2025, 3, 14, 15, tzinfo=UTC)
+        assert bucket_start(value, DAILY) == datetime(2025, 3, 14, tzinfo=UTC)
+        assert bucket_start(value, MONTHLY) == datetime(2025, 3, 1, tzinfo=UTC)
+
+    def test_bucket_start_normalises_to_utc(self):
+        value = datetime(2025, 3, 1, 6, 30, tzinfo=timezone(timedelta(hours=5)))
+
+        assert bucket_start(value, DAILY) == datetime(2025, 3, 1, tzinfo=UTC)
+        assert bucket_start(datetime(2025, 3, 1, 1, 30), HOURLY) == datetime(
+            2025, 3, 1, 1, tzinfo=UTC
+        )
+
+    def test_bucket_end_rolls_over_year(self):
+        assert bucket_end(datetime(2025, 12, 1, tzinfo=UTC), MONTHLY) == datetime(
+            2026, 1, 1, tzinfo=UTC
+        )
+
+    def test_is_bucket(self):
+        start = datetime(2025, 2, 1, tzinfo=UTC)
+
+        assert is_bucket(start, datetime(2025, 3, 1, tzinfo=UTC), MONTHLY)
+        assert not is_bucket(start, datetime(2025, 2, 28, tzinfo=UTC), MONTHLY)
+        assert not is_bucket(start + timedelta(hours=1), start + timedelta(days=1), DAILY)
+
+    def test_plan_window_uses_coarsest_buckets(self):
+        start = datetime(2025, 1, 30, 22, 15, tzinfo=UTC)
+        end = datetime(2025, 3, 2, 1, 45, tzinfo=UTC)
+
+        segments, raw = plan_window(start, end)
+
+        assert segments == [
+            (MONTHLY, datetime(2025, 2, 1, tzinfo=UTC), datetime(2025, 3, 1, tzinfo=UTC)),
+            (DAILY, datetime(2025, 1, 31, tzinfo=UTC), datetime(2025, 2, 1, tzinfo=UTC)),
+            (HOURLY, datetime(2025, 1, 30, 23, tzinfo=UTC), datetime(2025, 1, 31, tzinfo=UTC)),
+            (DAILY, datetime(2025, 3, 1, tzinfo=UTC), datetime(2025, 3, 2, tzinfo=UTC)),
+            (HOURLY, datetime(2025, 3, 2, tzinfo=UTC), datetime(2025, 3, 2, 1, tzinfo=UTC)),
+        ]
+        assert raw == [
+            (start, datetime(2025, 1, 30, 23, tzinfo=UTC)),
+            (datetime(2025, 3, 2, 1, tzinfo=UTC), end),
+        ]
+
+    def test_plan_window_short_window_reads_records(self):
+        start = datetime(2025, 1, 1, 10, 5, tzinfo=UTC)
+        end = datetime(2025, 1, 1, 10, 55, tzinfo=UTC)
+
+        assert plan_window(start, end) == ([], [(start, end)])
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+class TestUsageRollups:
+    async def _rollups(self, db, period_type: str) -> list[UsageAggregate]:
+        result = await db.execute(
+            select(UsageAggregate)
+            .where(UsageAggregate.tenant_id == TENANT, UsageAggregate.period_type == period_type)
+            .order_by(UsageAggregate.period_start)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+    async def test_records_are_added_to_rollups(self, async_db_session):
+        service = UsageBillingService(async_db_session)
+        hour = datetime(2025, 4, 10, 9, tzinfo=UTC)
+
+        await service.create_usage_record(TENANT, _record(hour, "2"), currency="USD")
+        await service.create_usage_records(
+            TENANT,
+            [_record(hour + timedelta(minutes=30), "5"), _record(hour + timedelta(hours=3), "1")],
+            currency="USD",
+        )
+
+        hourly = await self._rollups(async_db_session, HOURLY)
+        assert [(row.period_start.hour, row.record_count) for row in hourly] == [(9, 2), (12, 1)]
+        assert hourly[0].total_quantity == Decimal("7")
+        assert hourly[0].min_quantity == Decimal("2")
+        assert hourly[0].max_quantity == Decimal("5")
+        assert hourly[0].total_amount == 70
+
+        (daily,) = await self._rollups(async_db_session, DAILY)
+        assert daily.record_count == 3
+        assert daily.total_quantity == Decimal("8")
+        (monthly,) = await self._rollups(async_db_session, MONTHLY)
+        assert monthly.record_count == 3
+
+    async def test_report_matches_records(self, async_db_session):
+        service = UsageBillingService(async_db_session)
+        start = datetime(2025, 5, 31, 23, 40, tzinfo=UTC)
+        records = [
+            _record(start, "1"),
+            _record(start + timedelta(minutes=25), "2"),
+            _record(start + timedelta(days=3), "4"),
+            _record(start + timedelta(days=3), "8", usage_type=UsageType.VOICE_MINUTES),
+            _record(start + timedelta(days=40), "16"),
+        ]
+        await service.create_usage_records(TENANT, records, currency="USD")
+
+        report = await service.generate_usage_report(
+            TENANT,
+            UsageReportRequest(
+                period_start=datetime(2025, 5, 31, 23, 30, tzinfo=UTC),
+                period_end=datetime(2025, 7, 1, 0, 10, tzinfo=UTC),
+            ),
+        )
+
+        data = report.usage_by_type[UsageType.DATA_TRANSFER]
+        assert data.total_quantity == Decimal("7")
+        assert data.record_count == 3
+        assert report.usage_by_type[UsageType.VOICE_MINUTES].total_quantity == Decimal("8")
+        assert report.total_quantity == Decimal("15")
+        assert report.total_amount == 150
+        assert report.currency == "USD"
+
+        filtered = await service.generate_usage_report(
+            TENANT,
+            UsageReportRequest(
+                period_start=datetime(2025, 5, 1, tzinfo=UTC),
+                period_end=datetime(2025, 8, 1, tzinfo=UTC),
+                usage_types=[UsageType.VOICE_MINUTES],
+            ),
+        )
+        assert list(filtered.usage_by_type) == [UsageType.VOICE_MINUTES]
+
+    async def test_update_and_delete_refresh_rollups(self, async_db_session):
+        service = UsageBillingService(async_db_session)
+        hour = datetime(2025, 6, 2, 8, tzinfo=UTC)
+        first = await service.create_usage_record(TENANT, _record(hour, "3"), currency="USD")
+        second = await service.create_usage_record(
+            TENANT, _record(hour + timedelta(minutes=10), "9"), currency="USD"
+        )
+
+        await service.update_usage_record(
+            TENANT, second.id, UsageRecordUpdate(quantity=Decimal("1"))
+        )
+        (hourly,) = await self._rollups(async_db_session, HOURLY)
+        assert hourly.total_quantity == Decimal("4")
+        assert hourly.max_quantity == Decimal("3")
+
+        await service.delete_usage_record(TENANT, first.id)
+        await service.delete_usage_record(TENANT, second.id)
+        assert await self._rollups(async_db_session, HOURLY) == []
+        assert await self._rollups(async_db_session, MONTHLY) == []
+
+    async def test_aggregate_usage_groups_in_database(self, async_db_session):
+        service = UsageBillingService(async_db_session)
+        day = datetime(2025, 7, 4, tzinfo=UTC)
+        await service.create_usage_records(
+            TENANT,
+            [
+                _record(day + timedelta(hours=1), "2"),
+                _record(day + timedelta(hours=2), "3"),
+                _record(day + timedelta(hours=2), "5", usage_type=UsageType.SMS_COUNT),
+            ],
+            currency="USD",
+        )
+
+        aggregate = await service.aggregate_usage(
+            TENANT,
+            "sub-1",
+            "weekly",
+            day,
+            day + timedelta(days=7),
+            usage_type=UsageType.DATA_TRANSFER,
+        )
+
+        assert aggregate is not None
+        assert aggregate.total_quantity == Decimal("5")
+        assert aggregate.record_count == 2
+
+        with pytest.raises(ValidationError):
+            await service.aggregate_usage(TENANT, "sub-1", DAILY, day, day + timedelta(days=2))
+
+    async def test_usage_summary_splits_billing_status(self, async_db_session):
+        service = UsageBillingService(async_db_session)
+        start = datetime(2025, 8, 1, 12, tzinfo=UTC)
+        first, _ = await service.create_usage_records(
+            TENANT, [_record(start, "10"), _record(start, "20")], currency="USD"
+        )
+        await service.mark_usage_as_billed(first.id, TENANT, invoice_id="inv-1")
+
+        stats = await service.get_usage_summary(TENANT)
+
+        assert stats.total_records == 2
+        assert stats.total_amount == 300
+        assert stats.billed_amount == 100
+        assert stats.pending_amount == 200
+        assert stats.by_type["data_transfer"].total_quantity == Decimal("30")
@@ -386,11 +386,12 @@ class TestPayPalWebhookHandler:
         mock_response.status_code = 200
         mock_response.json.return_value = {"access_token": "token_abc123"}
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
-
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
+        with patch(
+            "dotmac.platform.billing.webhooks.handlers.get_http_client",
+            return_value=mock_client_instance,
+        ):
             token = await paypal_handler._get_paypal_access_token()
 
             assert token == "token_abc123"
@@ -401,11 +402,12 @@ class TestPayPalWebhookHandler:
         mock_response = Mock()
         mock_response.status_code = 401
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value = mock_client_instance
-
+        mock_client_instance = AsyncMock()
+        mock_client_instance.post = AsyncMock(return_value=mock_response)
+        with patch(
+            "dotmac.platform.billing.webhooks.handlers.get_http_client",
+            return_value=mock_client_instance,
+        ):
             with pytest.raises(Exception, match="Failed to get PayPal access token"):
                 await paypal_handler._get_paypal_access_token()
 
@@ -0,0 +1,151 @@
+"""Tests for CacheService serializers, compression and bulk operations."""
+
+import json
+import zlib
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from dotmac.platform.cache import CacheNamespace, CacheService, PickleSerializer
+from dotmac.platform.cache.serializers import SerializerRegistry, default_registry
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.unit
+
+
+class _Opaque:
+    """Class that is not on the pickle allowlist."""
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
+
+
+def _service(redis, **kwargs) -> CacheService:
+    kwargs.setdefault("namespace_serializers", {})
+    return CacheService(redis=redis, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_json_payloads_stay_plain_and_legacy_entries_are_readable(redis):
+    cache = _service(redis, compress_min_bytes=0)
+
+    await cache.set("k", {"a": 1})
+    await redis.set("cache:global:api_response:legacy", zlib.compress(b'{"b":2}'))
+
+    assert await redis.get("cache:global:api_response:k") == b'{"a":1}'
+    assert await cache.get("legacy") == {"b": 2}
+
+
+@pytest.mark.asyncio
+async def test_serializer_selected_per_namespace(redis):
+    cache = _service(redis, namespace_serializers={CacheNamespace.REPORTS: "pickle"})
+    value = {"at": datetime(2024, 1, 1, tzinfo=UTC), "amount": Decimal("9.99"), "id": uuid4()}
+
+    await cache.set("r", value, namespace=CacheNamespace.REPORTS)
+    await cache.set("a", {"n": 1})
+
+    raw = await redis.get("cache:global:reports:r")
+    assert raw[:2] == bytes((0, PickleSerializer.format_id))
+    assert await cache.get("r", namespace=CacheNamespace.REPORTS) == value
+    # Readers decode by header, whatever their own namespace configuration
+    assert await _service(redis).get("r", namespace=CacheNamespace.REPORTS) == value
+    assert await cache.get("a") == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_pickle_loads_only_allowlisted_classes(redis):
+    cache = _service(redis, namespace_serializers={"objects": "pickle"})
+
+    await cache.set("x", _Opaque(), namespace="objects")
+
+    assert await cache.get("x", namespace="objects") is None
+
+    allowed = default_registry([f"{__name__}._Opaque"])
+    trusting = _service(redis, serializers=allowed, namespace_serializers={"objects": "pickle"})
+    assert isinstance(await trusting.get("x", namespace="objects"), _Opaque)
+
+
+@pytest.mark.asyncio
+async def test_compression_chosen_by_payload_size(redis):
+    cache = _service(redis, compress_min_bytes=256)
+    large = {"rows": ["value"] * 200}
+
+    await cache.set("small", {"a": 1})
+    await cache.set("large", large)
+    await cache.set("forced", {"a": 1}, compress=True)
+    await cache.set("skipped", large, compress=False)
+
+    assert await redis.get("cache:global:api_response:small") == b'{"a":1}'
+    assert CacheService._is_compressed(await redis.get("cache:global:api_response:large"))
+    assert CacheService._is_compressed(await redis.get("cache:global:api_response:forced"))
+    assert json.loads(await redis.get("cache:global:api_response:skipped")) == large
+    assert await cache.get("large") == large
+    assert await cache.get("forced") == {"a": 1}
+
+    stats = cache.get_serializer_stats()["json"]
+    assert stats["compressed"] == 2
+    assert stats["compression_ratio"] < 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_operations_span_multiple_batches(redis):
+    cache = _service(redis, batch_size=7)
+    items = {f"k{i}": {"i": i} for i in range(30)}
+
+    assert await cache.set_many(items, ttl=60) is True
+    result = await cache.get_many([*items, "missing"])
+
+    assert result == items
+    assert await redis.ttl("cache:global:api_response:k29") > 0
+    assert cache.get_stats()["api_response"]["cache_misses"] == 1
+
+    assert await cache.delete_many(["k0", "k1", "missing"]) == 2
+    assert await cache.invalidate_pattern("k2*") == 11
+    assert await cache.clear_namespace(CacheNamespace.API_RESPONSE) == 17
+
+
+@pytest.mark.asyncio
+async def test_stats_broken_down_by_serializer(redis):
+    cache = _service(redis, namespace_serializers={CacheNamespace.REPORTS: "pickle"})
+
+    await cache.set("a", 1)
+    await cache.get("a")
+    await cache.get("b")
+    await cache.set("r", {1, 2}, namespace=CacheNamespace.REPORTS)
+    await cache.get("r", namespace=CacheNamespace.REPORTS)
+    await cache.get("missing", namespace=CacheNamespace.REPORTS)
+
+    stats = cache.get_serializer_stats()
+    assert (stats["json"]["cache_hits"], stats["json"]["cache_misses"]) == (1, 1)
+    assert (stats["pickle"]["cache_hits"], stats["pickle"]["cache_misses"]) == (1, 1)
+    assert stats["pickle"]["encodes"] == stats["pickle"]["decodes"] == 1
+
+    cache.reset_stats()
+    assert cache.get_serializer_stats() == {}
+
+
+def test_unknown_serializer_rejected():
+    with pytest.raises(ValueError, match="Unknown cache serializer"):
+        CacheService(namespace_serializers={"reports": "yaml"})
+
+    registry = SerializerRegistry()
+    registry.register(PickleSerializer())
+    with pytest.raises(ValueError, match="already used"):
+        registry.register(type("Other", (PickleSerializer,), {"name": "other"})())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["orjson", "msgpack"])
+async def test_optional_serializers_round_trip(redis, name):
+    pytest.importorskip(name)
+    cache = _service(redis, namespace_serializers={CacheNamespace.API_RESPONSE: name})
+    value = {"items": [{"id": i, "name": f"n{i}"} for i in range(3)], "at": "2024-01-01"}
+
+    await cache.set("k", value)
+
+    assert await cache.get("k") == value
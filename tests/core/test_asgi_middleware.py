@@ -0,0 +1,139 @@
+"""Tests for the pure ASGI middleware variants."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.testclient import TestClient
+
+from dotmac.platform.core.asgi_middleware import BeforeRequestASGIMixin
+from dotmac.platform.core.request_context import RequestContextASGIMiddleware
+from dotmac.platform.monitoring.error_middleware import ErrorTrackingASGIMiddleware
+
+pytestmark = pytest.mark.unit
+
+
+class _GateMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        early_response = await self.process_request(request)
+        if early_response is not None:
+            return early_response
+        return await call_next(request)
+
+    async def process_request(self, request: Request) -> Response | None:
+        if request.headers.get("X-Block") == "response":
+            return JSONResponse(status_code=403, content={"detail": "blocked"})
+        if request.headers.get("X-Block") == "raise":
+            raise HTTPException(status_code=401, detail="nope")
+        if request.method == "POST":
+            request._body = await request.body()
+        request.state.gate = "passed"
+        return None
+
+
+class _GateASGIMiddleware(BeforeRequestASGIMixin, _GateMiddleware):
+    pass
+
+
+def _build_app(*middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok(request: Request):
+        return {"gate": getattr(request.state, "gate", None)}
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"body": (await request.body()).decode()}
+
+    @app.get("/missing")
+    async def missing():
+        return JSONResponse(status_code=404, content={"error": "Not found"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for chunk in (b"a", b"b", b"c"):
+                yield chunk
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    for cls in middleware:
+        app.add_middleware(cls)
+    return app
+
+
+class TestBeforeRequestASGIMixin:
+    def test_passes_through_and_shares_state(self):
+        client = TestClient(_build_app(_GateASGIMiddleware))
+
+        response = client.get("/ok")
+
+        assert response.status_code == 200
+        assert response.json() == {"gate": "passed"}
+
+    def test_early_response_short_circuits(self):
+        client = TestClient(_build_app(_GateASGIMiddleware))
+
+        response = client.get("/ok", headers={"X-Block": "response"})
+
+        assert response.status_code == 403
+        assert response.json() == {"detail": "blocked"}
+
+    def test_http_exception_is_rendered(self):
+        client = TestClient(_build_app(_GateASGIMiddleware))
+
+        response = client.get("/ok", headers={"X-Block": "raise"})
+
+        assert response.status_code == 401
+
+    def test_body_read_by_middleware_is_replayed(self):
+        client = TestClient(_build_app(_GateASGIMiddleware))
+
+        response = client.post("/echo", content=b"payload")
+
+        assert response.json() == {"body": "payload"}
+
+
+class TestRequestContextASGIMiddleware:
+    def test_adds_context_headers(self):
+        client = TestClient(_build_app(RequestContextASGIMiddleware))
+
+        response = client.get("/ok", headers={"X-Request-ID": "req-1", "X-Trace-ID": "t-1"})
+
+        assert response.headers["X-Request-ID"] == "req-1"
+        assert response.headers["X-Correlation-ID"].startswith("corr_")
+        assert response.headers["X-Trace-ID"] == "t-1"
+
+    def test_streaming_response_is_not_buffered(self):
+        client = TestClient(_build_app(RequestContextASGIMiddleware, _GateASGIMiddleware))
+
+        with client.stream("GET", "/stream") as response:
+            chunks = list(response.iter_bytes())
+
+        assert b"".join(chunks) == b"abc"
+        assert "X-Request-ID" in response.headers
+
+
+class TestErrorTrackingASGIMiddleware:
+    def test_tracks_error_status_with_route_template(self):
+        client = TestClient(_build_app(ErrorTrackingASGIMiddleware))
+
+        with patch("dotmac.platform.monitoring.error_middleware.track_http_error") as mock_track:
+            response = client.get("/missing")
+
+        assert response.status_code == 404
+        call_kwargs = mock_track.call_args[1]
+        assert call_kwargs["endpoint"] == "/missing"
+        assert call_kwargs["status_code"] == 404
+        assert call_kwargs["tenant_id"] == "unknown"
+
+    def test_success_is_not_tracked(self):
+        client = TestClient(_build_app(ErrorTrackingASGIMiddleware))
+
+        with patch("dotmac.platform.monitoring.error_middleware.track_http_error") as mock_track:
+            assert client.get("/ok").status_code == 200
+
+        mock_track.assert_not_called()
@@ -0,0 +1,211 @@
+"""Tests for the shared cache stampede protection."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from dotmac.platform.core.cache_decorators import cached_result
+from dotmac.platform.core.cache_stampede import (
+    StampedeGuard,
+    StampedeProtection,
+    unwrap_entry,
+    wrap_entry,
+)
+
+pytestmark = pytest.mark.unit
+
+NO_LEASE = StampedeProtection(lease_ttl=0, xfetch_beta=0)
+
+
+class _Store:
+    """In-memory cache backend exposing the read/write callables for one key."""
+
+    def __init__(self, entry=None):
+        self.entry = entry
+        self.writes = 0
+
+    async def read(self):
+        return self.entry
+
+    async def write(self, entry, ttl):
+        self.entry = entry
+        self.writes += 1
+
+
+def _counting_loader(value, delay=0.0):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    guard, store = StampedeGuard(), _Store()
+    loader, calls = _counting_loader("v", delay=0.02)
+
+    results = await asyncio.gather(
+        *(
+            guard.fetch(
+                "k", loader, read=store.read, write=store.write, ttl=60, protection=NO_LEASE
+            )
+            for _ in range(20)
+        )
+    )
+
+    assert results == ["v"] * 20
+    assert len(calls) == 1
+    assert store.writes == 1
+    assert unwrap_entry(store.entry)[0] == "v"
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_refreshing_in_background():
+    guard = StampedeGuard()
+    store = _Store(wrap_entry("old", 0.01, ttl=-1))  # already expired
+    loader, calls = _counting_loader("new", delay=0.01)
+    protection = StampedeProtection(lease_ttl=0, stale_ttl=60)
+
+    first = await guard.fetch(
+        "k", loader, read=store.read, write=store.write, ttl=60, protection=protection
+    )
+    second = await guard.fetch(
+        "k", loader, read=store.read, write=store.write, ttl=60, protection=protection
+    )
+    await asyncio.gather(*guard._tasks)
+
+    assert (first, second) == ("old", "old")
+    assert len(calls) == 1
+    assert unwrap_entry(store.entry)[0] == "new"
+
+
+@pytest.mark.asyncio
+async def test_xfetch_refreshes_before_expiry():
+    guard = StampedeGuard()
+    store = _Store(wrap_entry("old", delta=5.0, ttl=1))
+    loader, calls = _counting_loader("new")
+    protection = StampedeProtection(lease_ttl=0, xfetch_beta=1.0)
+
+    # random() close to 1 makes -log(1 - U) large: refresh is due
+    with patch("dotmac.platform.core.cache_stampede.random.random", return_value=0.999):
+        value = await guard.fetch(
+            "k", loader, read=store.read, write=store.write, ttl=60, protection=protection
+        )
+
+    assert value == "new"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_value_not_refreshed_early_when_compute_is_cheap():
+    guard = StampedeGuard()
+    store = _Store(wrap_entry("cached", delta=0.001, ttl=60))
+    loader, calls = _counting_loader("new")
+
+    value = await guard.fetch(
+        "k", loader, read=store.read, write=store.write, ttl=60, protection=StampedeProtection()
+    )
+
+    assert value == "cached"
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_lease_holder_elsewhere_is_awaited():
+    guard, store = StampedeGuard(), _Store()
+    loader, calls = _counting_loader("mine")
+
+    async def other_process_fills_cache():
+        await asyncio.sleep(0.05)
+        store.entry = wrap_entry("theirs", 0.05, ttl=60)
+
+    filler = asyncio.create_task(other_process_fills_cache())
+    with patch("dotmac.platform.core.cache_stampede.try_lock", return_value=None):
+        value = await guard.fetch(
+            "k",
+            loader,
+            read=store.read,
+            write=store.write,
+            ttl=60,
+            protection=StampedeProtection(lease_wait=1.0, xfetch_beta=0),
+        )
+    await filler
+
+    assert value == "theirs"
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_lease_errors_fall_back_to_local_load():
+    guard, store = StampedeGuard(), _Store()
+    loader, calls = _counting_loader("v")
+
+    with patch(
+        "dotmac.platform.core.cache_stampede.try_lock", side_effect=ConnectionError("down")
+    ) as try_lock:
+        for _ in range(2):
+            store.entry = None
+            await guard.fetch(
+                "k",
+                loader,
+                read=store.read,
+                write=store.write,
+                ttl=60,
+                protection=StampedeProtection(),
+            )
+
+    assert len(calls) == 2
+    # Lease is skipped for a while after the first failure
+    assert try_lock.call_count == 1
+    assert guard._lease_disabled_until > time.monotonic()
+
+
+@pytest.mark.asyncio
+async def test_cached_result_opt_in():
+    store: dict = {}
+    calls = []
+
+    @cached_result(ttl=60, key_prefix="stampede", key_params=["item"], stampede=NO_LEASE)
+    async def load(item: str) -> dict:
+        calls.append(item)
+        await asyncio.sleep(0.01)
+        return {"item": item}
+
+    with (
+        patch("dotmac.platform.core.cache_decorators.cache_get", side_effect=store.get),
+        patch(
+            "dotmac.platform.core.cache_decorators.cache_set",
+            side_effect=lambda key, value, ttl=None: store.__setitem__(key, value),
+        ),
+    ):
+        results = await asyncio.gather(*(load("a") for _ in range(5)))
+        again = await load("a")
+
+    assert results == [{"item": "a"}] * 5
+    assert again == {"item": "a"}
+    assert calls == ["a"]
+    assert unwrap_entry(store["stampede:a"])[0] == {"item": "a"}
+
+
+def test_stale_while_revalidate_refused_for_session_functions():
+    swr = StampedeProtection(stale_ttl=30)
+
+    with pytest.raises(ValueError, match="database session"):
+
+        @cached_result(ttl=60, key_params=["plan_id"], stampede=swr)
+        async def get_plan(plan_id: str, db: "AsyncSession") -> dict:  # noqa: F821
+            return {}
+
+    @cached_result(ttl=60, key_params=["plan_id"], stampede=swr)
+    async def get_public_plan(plan_id: str) -> dict:
+        return {}
+
+    @cached_result(ttl=60, key_params=["plan_id"], stampede=NO_LEASE)
+    async def get_plan_without_swr(plan_id: str, db: "AsyncSession") -> dict:  # noqa: F821
+        return {}
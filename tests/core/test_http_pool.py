@@ -0,0 +1,154 @@
+"""Tests for the process-wide outbound HTTP client registry."""
+
+import httpx
+import pytest
+
+from dotmac.platform.core.http_pool import (
+    HttpClientProfile,
+    HttpClientRegistry,
+    MeteredTransport,
+    PoolStats,
+    origin_of,
+)
+
+pytestmark = pytest.mark.unit
+
+PROFILE = HttpClientProfile(
+    timeout=10.0,
+    connect_timeout=5.0,
+    max_connections=4,
+    max_keepalive_connections=2,
+    keepalive_expiry=30.0,
+    http2=False,
+)
+
+
+@pytest.fixture
+def registry():
+    return HttpClientRegistry({"default": PROFILE, "fast": PROFILE})
+
+
+def test_origin_of_normalises_host_and_port():
+    assert origin_of("https://API.Example.com/v1?x=1") == "https://api.example.com:443"
+    assert origin_of("http://example.com:8080/hook") == "http://example.com:8080"
+    assert origin_of("http://example.com/") == "http://example.com:80"
+
+
+@pytest.mark.asyncio
+class TestHttpClientRegistry:
+    async def test_callers_share_a_client_per_origin(self, registry):
+        client = registry.client("https://hooks.example.com/a")
+
+        assert registry.client("https://hooks.example.com:443/b") is client
+        assert registry.client("https://other.example.com/a") is not client
+        await registry.aclose()
+
+    async def test_tls_options_and_profile_are_part_of_the_key(self, registry):
+        client = registry.client("https://example.com")
+
+        assert registry.client("https://example.com", verify=False) is not client
+        assert registry.client("https://example.com", profile="fast") is not client
+        assert len(registry.stats()) == 3
+        assert len(registry.stats(profile="fast")) == 1
+        await registry.aclose()
+
+    async def test_closed_client_is_replaced(self, registry):
+        client = registry.client("https://example.com")
+        await client.aclose()
+
+        assert registry.client("https://example.com") is not client
+        await registry.aclose()
+
+    async def test_aclose_profile_leaves_other_clients_open(self, registry):
+        default = registry.client("https://example.com")
+        fast = registry.client("https://example.com", profile="fast")
+
+        await registry.aclose(profile="fast")
+
+        assert fast.is_closed
+        assert not default.is_closed
+        assert registry.client("https://example.com") is default
+        await registry.aclose()
+        assert default.is_closed
+
+    async def test_unknown_profile(self, registry):
+        with pytest.raises(ValueError, match="Unknown HTTP client profile"):
+            registry.client("https://example.com", profile="missing")
+
+    async def test_registered_profile_is_used(self, registry):
+        registry.register_profile("slow", PROFILE)
+
+        assert registry.has_profile("slow")
+        assert registry.client("https://example.com", profile="slow").timeout.read == 10.0
+        await registry.aclose()
+
+
+@pytest.mark.asyncio
+class TestMeteredTransport:
+    async def test_counts_requests_and_releases_in_flight_slot(self):
+        stats = PoolStats()
+        transport = MeteredTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, text="ok")),
+            stats,
+            "default",
+        )
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://example.com/")
+
+        assert response.text == "ok"
+        assert stats.requests == 1
+        assert stats.in_flight == 0
+
+    async def test_streamed_response_holds_slot_until_closed(self):
+        stats = PoolStats()
+        transport = MeteredTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200, content=b"x" * 10)),
+            stats,
+            "default",
+        )
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("GET", "https://example.com/") as response:
+                assert stats.in_flight == 1
+                assert await response.aread() == b"x" * 10
+
+        assert stats.in_flight == 0
+
+    async def test_failed_request_releases_slot(self):
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        stats = PoolStats()
+        transport = MeteredTransport(httpx.MockTransport(fail), stats, "default")
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://example.com/")
+
+        assert stats.requests == 1
+        assert stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_client_does_not_carry_cookies_between_callers(registry, monkeypatch):
+    seen_cookies = []
+
+    def handler(request):
+        seen_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"Set-Cookie": "session=tenant-a; Path=/"})
+
+    monkeypatch.setattr(
+        "dotmac.platform.core.http_pool.httpx.AsyncHTTPTransport",
+        lambda **kwargs: httpx.MockTransport(handler),
+    )
+
+    caller_a = registry.client("https://hooks.example.com/a")
+    await caller_a.post("https://hooks.example.com/a")
+    caller_b = registry.client("https://hooks.example.com/b")
+    await caller_b.post("https://hooks.example.com/b")
+
+    assert caller_a is caller_b
+    assert seen_cookies == [None, None]
+    assert not caller_b.cookies
+    await registry.aclose()
@@ -49,21 +49,21 @@ class TestCoreModuleExports:
 
     def test_all_length(self):
         """Test that __all__ contains exactly the expected number of exports."""
-        # 9 exceptions + 2 models + 10 infrastructure + 28 domain events components = 49 total
+        # 9 exceptions + 2 models + 11 infrastructure + 28 domain events components = 50 total
         # Exceptions: DotMacError, ValidationError, AuthorizationError, ConfigurationError,
         #             BusinessRuleError, RepositoryError, EntityNotFoundError, NotFoundError,
         #             DuplicateEntityError
         # Models: BaseModel, TenantContext
         # Infrastructure: ensure_pydantic_v2, get_limiter, limiter, DistributedLock,
-        #                 redis_client, get_redis, CacheTier, cached_result, celery_app,
-        #                 idempotent_task
+        #                 redis_client, get_redis, CacheTier, cached_result,
+        #                 StampedeProtection, celery_app, idempotent_task
         # Domain events components:
         # - DomainEvent, DomainEventMetadata, DomainEventDispatcher, DomainEventPublisher
         # - AggregateRoot, Entity, ValueObject
         # - Value objects: Money, EmailAddress, PhoneNumber
         # - 13 predefined domain events (Invoice, Subscription, Customer, Payment)
         # - 4 factory/helper functions (get/reset for dispatcher and publisher)
-        assert len(core.__all__) == 49
+        assert len(core.__all__) == 50
 
     def test_import_from_core(self):
         """Test that symbols can be imported from core."""
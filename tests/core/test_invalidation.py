@@ -0,0 +1,39 @@
+"""Tests for the shared pub/sub invalidation listener."""
+
+import asyncio
+
+import pytest
+
+from dotmac.platform.core.invalidation import InvalidationListener
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.asyncio
+async def test_listener_resets_on_connect_then_applies_messages():
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    events: list[str] = []
+    listener = InvalidationListener(
+        "test:invalidate",
+        lambda data: events.append(f"message:{data}"),
+        lambda: events.append("connect"),
+        name="test",
+    )
+
+    listener.start(redis)
+    listener.start(redis)
+    for _ in range(100):
+        if events:
+            break
+        await asyncio.sleep(0.01)
+    await redis.publish("test:invalidate", "tenant-1")
+    for _ in range(100):
+        if len(events) > 1:
+            break
+        await asyncio.sleep(0.01)
+    await listener.stop()
+
+    assert events == ["connect", "message:tenant-1"]
+    assert not listener.running
@@ -38,7 +38,8 @@ pytestmark = [pytest.mark.asyncio, pytest.mark.integration, pytest.mark.e2e]
 def mock_storage_service():
     """Mock storage service for testing."""
     from dotmac.platform.file_storage import router as file_storage_router
-    from dotmac.platform.file_storage.service import get_storage_service
+    from dotmac.platform.file_storage.service import FileMetadata, get_storage_service
+    from dotmac.platform.file_storage.streaming import FileStream, limit_size
     from dotmac.platform.main import app
 
     class MockStorageService:
@@ -52,6 +53,27 @@ def mock_storage_service():
             self.copy_file = AsyncMock()
             self.update_file_metadata = AsyncMock()
 
+        # Streaming entry points delegate to the buffered mocks, like the
+        # service does for backends without streaming support
+        async def store_file_stream(self, chunks, *, max_size=None, **kwargs):
+            if max_size is not None:
+                chunks = limit_size(chunks, max_size)
+            file_data = b"".join([chunk async for chunk in chunks])
+            file_id = await self.store_file(file_data=file_data, **kwargs)
+            return FileMetadata(
+                file_id=file_id,
+                file_name=kwargs["file_name"],
+                file_size=len(file_data),
+                content_type=kwargs["content_type"],
+                created_at=datetime.now(UTC),
+            )
+
+        async def open_file(self, file_id, tenant_id=None):
+            file_data, metadata = await self.retrieve_file(file_id, tenant_id)
+            if file_data is None:
+                return None
+            return FileStream.from_bytes(file_data, metadata or {})
+
     mock_service = MockStorageService()
 
     app.dependency_overrides[get_storage_service] = lambda: mock_service
@@ -12,7 +12,10 @@ from dotmac.platform.events import (
     get_event_bus,
     reset_event_bus,
 )
+from dotmac.platform.events import bus as bus_module
+from dotmac.platform.events.exceptions import EventPublishError
 from dotmac.platform.events.storage import EventStorage
+from dotmac.platform.settings import settings
 
 pytestmark = pytest.mark.unit
 
@@ -144,7 +147,9 @@ class TestEventBus:
 
         monkeypatch.setattr("dotmac.platform.core.caching.get_redis", raise_on_get)
 
-        bus = get_event_bus(storage=EventStorage(use_redis=False), redis_client=None, enable_persistence=False)
+        bus = get_event_bus(
+            storage=EventStorage(use_redis=False), redis_client=None, enable_persistence=False
+        )
 
         assert isinstance(bus, EventBus)
         assert bus._redis is None  # type: ignore[attr-defined]
@@ -365,6 +370,25 @@ class TestEventBus:
         assert attempt_count == 2
         assert stored_event.status == EventStatus.COMPLETED
 
+    @pytest.mark.asyncio
+    async def test_retries_run_inline_before_start(self, event_bus, monkeypatch):
+        """An unstarted bus has no background tasks to outlive the caller's loop."""
+        monkeypatch.setattr(bus_module.settings.event_bus, "retry_base_delay", 0.01)
+        attempts = 0
+
+        async def flaky_handler(event: Event):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ValueError("first attempt fails")
+
+        event_bus.subscribe("test.event", flaky_handler)
+        event = await event_bus.publish(event_type="test.event", payload={})
+
+        assert attempts == 2
+        assert event.status == EventStatus.COMPLETED
+        assert event_bus.get_metrics()["pending_retries"] == 0
+
     @pytest.mark.asyncio
     async def test_dead_letter_queue(self, event_bus):
         """Test events moving to dead letter queue after max retries."""
@@ -437,6 +461,103 @@ class TestEventBus:
         reset_event_bus()
 
 
+class TestEventBusDispatch:
+    """Test queued dispatch once the event bus is started."""
+
+    @pytest.fixture
+    async def started_bus(self):
+        bus = EventBus(
+            storage=EventStorage(use_redis=False),
+            redis_client=None,
+            enable_persistence=True,
+            worker_count=1,
+            queue_size=2,
+        )
+        await bus.start()
+        yield bus
+        await bus.stop(drain_timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_publish_does_not_wait_for_handlers(self, started_bus):
+        gate = asyncio.Event()
+
+        async def slow_handler(event: Event):
+            await gate.wait()
+
+        started_bus.subscribe("test.event", slow_handler)
+
+        event = await asyncio.wait_for(started_bus.publish("test.event", {}), timeout=1.0)
+        assert event.status == EventStatus.PENDING
+
+        gate.set()
+        stored = await wait_for_event_status(started_bus, event.event_id, EventStatus.COMPLETED)
+        assert stored.processed_at is not None
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_events_run_first(self, started_bus):
+        gate = asyncio.Event()
+        order: list[str] = []
+
+        async def blocker(event: Event):
+            await gate.wait()
+
+        async def recorder(event: Event):
+            order.append(event.payload["name"])
+
+        started_bus.subscribe("block", blocker)
+        started_bus.subscribe("work", recorder)
+        await started_bus.publish("block", {})
+        await asyncio.sleep(0)  # worker picks up the blocker
+        await started_bus.publish("work", {"name": "low"}, priority=EventPriority.LOW)
+        await started_bus.publish("work", {"name": "critical"}, priority=EventPriority.CRITICAL)
+
+        gate.set()
+        await started_bus.stop(drain_timeout=1.0)
+
+        assert order == ["critical", "low"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self, started_bus, monkeypatch):
+        monkeypatch.setattr(settings.event_bus, "publish_timeout", 0.05)
+        gate = asyncio.Event()
+
+        async def blocker(event: Event):
+            await gate.wait()
+
+        started_bus.subscribe("test.event", blocker)
+        await started_bus.publish("test.event", {})
+        await asyncio.sleep(0)
+        await started_bus.publish("test.event", {})
+        await started_bus.publish("test.event", {})
+
+        with pytest.raises(EventPublishError):
+            await started_bus.publish("test.event", {})
+        assert started_bus.get_metrics()["queue_depth"]["normal"] == 2
+
+        gate.set()
+
+    @pytest.mark.asyncio
+    async def test_retries_are_scheduled_not_awaited(self, started_bus, monkeypatch):
+        monkeypatch.setattr(settings.event_bus, "retry_base_delay", 0.05)
+        attempts = 0
+
+        async def flaky_handler(event: Event):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ValueError("first attempt fails")
+
+        started_bus.subscribe("test.event", flaky_handler)
+        event = await started_bus.publish("test.event", {})
+
+        stored = await wait_for_event_status(started_bus, event.event_id, EventStatus.COMPLETED)
+
+        assert attempts == 2
+        assert stored.retry_count == 1
+        metrics = started_bus.get_metrics()
+        assert (metrics["handled"], metrics["failed"], metrics["pending_retries"]) == (1, 1, 0)
+
+
 class TestEventMetadata:
     """Test event metadata functionality."""
 
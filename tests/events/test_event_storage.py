@@ -2,99 +2,58 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import json
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from dotmac.platform.events.models import Event, EventStatus
-from dotmac.platform.events.storage import EventStorage
+from dotmac.platform.events.storage import INDEX_TTL_SECONDS, EventStorage
 
-pytestmark = pytest.mark.unit
-
-
-class FakeRedis:
-    """Minimal Redis client shim for testing indexing logic."""
-
-    def __init__(self) -> None:
-        self.store: dict[str, str] = {}
-        self.sorted_sets: dict[str, dict[str, float]] = defaultdict(dict)
-
-    # Key-value operations -------------------------------------------------
-    def setex(self, key: str, ttl: int, value: str) -> None:
-        self.store[key] = value
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa", reason="fakeredis needs lupa to run Lua scripts")
 
-    def get(self, key: str) -> str | None:
-        return self.store.get(key)
-
-    def publish(self, channel: str, message: str) -> None:  # pragma: no cover - noop
-        return None
-
-    # Sorted-set operations ------------------------------------------------
-    def zadd(self, key: str, mapping: dict[str, float]) -> int:
-        zset = self.sorted_sets.setdefault(key, {})
-        new_members = 0
-        for member, score in mapping.items():
-            if member not in zset:
-                new_members += 1
-            zset[member] = score
-        return new_members
+pytestmark = pytest.mark.unit
 
-    def expire(self, key: str, ttl: int) -> bool:  # pragma: no cover - noop
-        return True
 
-    def zrem(self, key: str, member: str) -> int:
-        zset = self.sorted_sets.get(key)
-        if not zset or member not in zset:
-            return 0
-        del zset[member]
-        return 1
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
 
-    def zrevrange(self, key: str, start: int, end: int) -> list[bytes]:
-        zset = self.sorted_sets.get(key, {})
-        if not zset:
-            return []
 
-        members_sorted = sorted(zset.items(), key=lambda item: item[1], reverse=True)
-        # Redis treats end as inclusive; adjust Python slicing accordingly
-        inclusive_end = None if end == -1 else end + 1
-        slice_members = [member for member, _ in members_sorted][start:inclusive_end]
-        return [member.encode() for member in slice_members]
+async def _members(redis, key: str) -> set[str]:
+    return {member.decode() for member in await redis.zrange(key, 0, -1)}
 
 
 @pytest.mark.asyncio
-async def test_redis_indices_clean_up_on_status_change(monkeypatch):
-    fake_redis = FakeRedis()
-    monkeypatch.setattr("dotmac.platform.events.storage.get_redis", lambda: fake_redis)
-
-    storage = EventStorage(use_redis=True)
+async def test_redis_indices_clean_up_on_status_change(redis):
+    storage = EventStorage(redis=redis)
     event = Event(
         event_type="billing.invoice.created", payload={}, metadata={"tenant_id": "tenant-1"}
     )
 
     await storage.save_event(event)
 
-    assert event.event_id in fake_redis.sorted_sets["events:status:pending"]
-    assert event.event_id in fake_redis.sorted_sets["events:type:billing.invoice.created"]
-    assert event.event_id in fake_redis.sorted_sets["events:tenant:tenant-1"]
-    assert event.event_id in fake_redis.sorted_sets["events:all"]
+    assert event.event_id in await _members(redis, "events:status:pending")
+    assert event.event_id in await _members(redis, "events:type:billing.invoice.created")
+    assert event.event_id in await _members(redis, "events:tenant:tenant-1")
+    assert event.event_id in await _members(redis, "events:all")
 
     event.status = EventStatus.COMPLETED
     await storage.update_event(event)
 
-    assert event.event_id not in fake_redis.sorted_sets["events:status:pending"]
-    assert event.event_id in fake_redis.sorted_sets["events:status:completed"]
+    assert event.event_id not in await _members(redis, "events:status:pending")
+    assert event.event_id in await _members(redis, "events:status:completed")
     # Type and tenant indices should be re-populated for the updated record
-    assert event.event_id in fake_redis.sorted_sets["events:type:billing.invoice.created"]
-    assert event.event_id in fake_redis.sorted_sets["events:tenant:tenant-1"]
-    assert event.event_id in fake_redis.sorted_sets["events:all"]
+    assert event.event_id in await _members(redis, "events:type:billing.invoice.created")
+    assert event.event_id in await _members(redis, "events:tenant:tenant-1")
+    assert event.event_id in await _members(redis, "events:all")
+    assert 0 < await redis.ttl("events:all") <= INDEX_TTL_SECONDS
 
 
 @pytest.mark.asyncio
-async def test_query_without_filters_reads_all_index(monkeypatch):
-    fake_redis = FakeRedis()
-    monkeypatch.setattr("dotmac.platform.events.storage.get_redis", lambda: fake_redis)
-
-    storage = EventStorage(use_redis=True)
+async def test_query_without_filters_reads_all_index(redis):
+    storage = EventStorage(redis=redis)
 
     event_a = Event(event_type="alpha.event", payload={})
     event_b = Event(event_type="beta.event", payload={})
@@ -105,3 +64,68 @@ async def test_query_without_filters_reads_all_index(monkeypatch):
     results = await storage.query_events()
 
     assert {e.event_id for e in results} == {event_a.event_id, event_b.event_id}
+
+
+@pytest.mark.asyncio
+async def test_event_body_is_compact_and_round_trips(redis):
+    storage = EventStorage(redis=redis)
+    event = Event(event_type="alpha.event", payload={"amount": 10})
+
+    await storage.save_event(event)
+
+    body = json.loads(await redis.get(f"event:{event.event_id}"))
+    assert "error_message" not in body
+    assert "tenant_id" not in body["metadata"]
+    assert await storage.get_event(event.event_id) == event
+
+
+@pytest.mark.asyncio
+async def test_batch_save_and_filtered_query_page_through_index(redis, monkeypatch):
+    monkeypatch.setattr("dotmac.platform.events.storage.QUERY_PAGE_SIZE", 3)
+    storage = EventStorage(redis=redis)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    events = [
+        Event(
+            event_type="usage.recorded",
+            payload={"i": i},
+            created_at=start + timedelta(seconds=i),
+            metadata={"tenant_id": "tenant-1" if i % 4 == 0 else "tenant-2"},
+        )
+        for i in range(12)
+    ]
+
+    await storage.save_events(events)
+    results = await storage.query_events(event_type="usage.recorded", tenant_id="tenant-1", limit=3)
+
+    assert len(await _members(redis, "events:type:usage.recorded")) == 12
+    assert [e.payload["i"] for e in results] == [8, 4, 0]
+
+
+@pytest.mark.asyncio
+async def test_get_events_skips_expired_bodies(redis):
+    storage = EventStorage(redis=redis)
+    kept, expired = Event(event_type="a", payload={}), Event(event_type="a", payload={})
+    await storage.save_events([kept, expired])
+    await redis.delete(f"event:{expired.event_id}")
+
+    results = await storage.get_events([expired.event_id, kept.event_id])
+
+    assert [e.event_id for e in results] == [kept.event_id]
+
+
+@pytest.mark.asyncio
+async def test_uses_shared_client_once_redis_is_initialised(monkeypatch):
+    from dotmac.platform.redis_client import redis_manager
+
+    shared = fakeredis.FakeAsyncRedis(decode_responses=True)
+    storage = EventStorage()
+    event = Event(event_type="alpha.event", payload={})
+
+    await storage.save_event(event)
+    assert await storage.get_event(event.event_id) == event
+
+    monkeypatch.setattr(redis_manager, "get_client", lambda: shared)
+    await storage.save_event(event)
+
+    assert await shared.exists(f"event:{event.event_id}") == 1
+    assert [e.event_id for e in await storage.query_events()] == [event.event_id]
@@ -0,0 +1,193 @@
+"""Tests for the Redis Streams event transport."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from dotmac.platform.events import streams as streams_module
+from dotmac.platform.events.bus import EventBus
+from dotmac.platform.events.models import Event, EventStatus
+from dotmac.platform.events.storage import EventStorage
+from dotmac.platform.events.streams import RedisStreamTransport
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture
+def event_bus_config():
+    # The settings instance the events modules read, which can differ from a
+    # fresh ``dotmac.platform.settings.settings`` import once other tests have
+    # reloaded that module.
+    return streams_module.settings.event_bus
+
+
+@pytest.fixture
+def transport(redis):
+    return RedisStreamTransport(redis=redis, stream_key="test:events", consumer="worker-1")
+
+
+def _bus(transport: RedisStreamTransport) -> EventBus:
+    return EventBus(
+        storage=EventStorage(use_redis=False),
+        redis_client=None,
+        enable_persistence=True,
+        worker_count=1,
+        transport=transport,
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_adds_to_stream_instead_of_running_handlers(redis, transport):
+    bus = _bus(transport)
+    calls: list[str] = []
+
+    async def handler(event: Event):
+        calls.append(event.event_id)
+
+    bus.subscribe("invoice.created", handler)
+    event = await bus.publish("invoice.created", {"amount": 10})
+
+    assert calls == []
+    assert await redis.xlen("test:events") == 1
+    await transport.ensure_group()
+    [(_, streamed)] = await transport.read(block_ms=0)
+    assert streamed.event_id == event.event_id
+    assert streamed.payload == {"amount": 10}
+
+
+@pytest.mark.asyncio
+async def test_started_bus_consumes_and_acknowledges(
+    redis, transport, event_bus_config, monkeypatch
+):
+    monkeypatch.setattr(event_bus_config, "read_block_ms", 10)
+    bus = _bus(transport)
+    handled = asyncio.Event()
+
+    async def handler(event: Event):
+        handled.set()
+
+    bus.subscribe("invoice.*", handler)
+    await bus.start()
+    try:
+        event = await bus.publish("invoice.paid", {})
+        await asyncio.wait_for(handled.wait(), timeout=2.0)
+        for _ in range(50):
+            pending = await redis.xpending("test:events", transport.group)
+            if pending["pending"] == 0:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await bus.stop(drain_timeout=1.0)
+
+    assert pending["pending"] == 0
+    stored = await bus.get_event(event.event_id)
+    assert stored is not None and stored.status == EventStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_reclaimed_then_dead_lettered(redis, event_bus_config, monkeypatch):
+    idle = 0.05
+    monkeypatch.setattr(event_bus_config, "claim_idle_ms", int(idle * 1000))
+    monkeypatch.setattr(event_bus_config, "max_deliveries", 2)
+    crashed = RedisStreamTransport(redis=redis, stream_key="test:events", consumer="crashed")
+    survivor = RedisStreamTransport(redis=redis, stream_key="test:events", consumer="survivor")
+    await crashed.ensure_group()
+    await crashed.add(Event(event_type="usage.recorded", payload={}))
+
+    assert len(await crashed.read(block_ms=0)) == 1  # delivery 1, never acknowledged
+    assert await survivor.claim_stale() == []  # not idle long enough yet
+    await asyncio.sleep(idle * 2)
+    assert len(await survivor.claim_stale()) == 1  # delivery 2
+    await asyncio.sleep(idle * 2)
+    assert await survivor.claim_stale() == []  # delivery 3 exceeds the limit
+
+    [(_, dead)] = await survivor.dead_letters()
+    assert dead.event_type == "usage.recorded"
+    assert (await redis.xpending("test:events", survivor.group))["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_events_are_dead_lettered_and_replayed(redis, transport):
+    bus = _bus(transport)
+
+    async def failing_handler(event: Event):
+        raise ValueError("boom")
+
+    bus.subscribe("webhook.failed", failing_handler)
+    event = Event(event_type="webhook.failed", payload={}, max_retries=1)
+    await bus._execute_handler(failing_handler, event)
+
+    assert event.status == EventStatus.DEAD_LETTER
+    assert len(await transport.dead_letters()) == 1
+
+    assert await bus.replay_dead_letters() == 1
+    assert await transport.dead_letters() == []
+    entries = await redis.xrange("test:events")
+    assert len(entries) == 1
+    replayed = Event.from_dict(json.loads(entries[0][1][b"event"]))
+    assert (replayed.event_id, replayed.status) == (event.event_id, EventStatus.PENDING)
+
+
+@pytest.mark.asyncio
+async def test_event_is_dead_lettered_once_after_all_handlers_finish(redis, transport):
+    bus = _bus(transport)
+    dead_letter_counts: list[int] = []
+
+    async def failing_handler(event: Event):
+        raise ValueError("boom")
+
+    async def other_failing_handler(event: Event):
+        raise ValueError("bang")
+
+    async def slow_handler(event: Event):
+        await asyncio.sleep(0.01)
+        dead_letter_counts.append(len(await transport.dead_letters()))
+
+    for handler in (failing_handler, other_failing_handler, slow_handler):
+        bus.subscribe("webhook.failed", handler)
+    event = Event(event_type="webhook.failed", payload={}, max_retries=1)
+    await bus._publish_local(event)
+
+    assert dead_letter_counts == [0]
+    [(_, dead)] = await transport.dead_letters()
+    assert (dead.event_id, dead.status) == (event.event_id, EventStatus.DEAD_LETTER)
+
+
+@pytest.mark.asyncio
+async def test_failed_entries_stay_pending_until_redelivered(
+    redis, transport, event_bus_config, monkeypatch
+):
+    idle = 0.05
+    monkeypatch.setattr(event_bus_config, "claim_idle_ms", int(idle * 1000))
+    bus = _bus(transport)
+    attempts: list[str] = []
+
+    async def flaky_handler(event: Event):
+        attempts.append(event.event_id)
+        if len(attempts) == 1:
+            raise ValueError("boom")
+
+    bus.subscribe("invoice.*", flaky_handler)
+    await transport.ensure_group()
+    await transport.add(Event(event_type="invoice.paid", payload={}))
+    await transport.add(Event(event_type="invoice.voided", payload={}))
+
+    await bus._deliver_batch(await transport.read(block_ms=0))
+    assert (await redis.xpending("test:events", transport.group))["pending"] == 1
+    assert len(bus._retries) == 0
+
+    await asyncio.sleep(idle * 2)
+    redelivered = await transport.claim_stale()
+    assert [event.event_id for _, event in redelivered] == attempts[:1]
+    await bus._deliver_batch(redelivered)
+    assert (await redis.xpending("test:events", transport.group))["pending"] == 0
@@ -285,9 +285,9 @@ class TestIsEnabled:
 
     @pytest.mark.asyncio
     async def test_is_enabled_from_redis(self, mock_redis_client):
-        """Test checking flag from Redis when not in cache."""
+        """Test checking flag from the Redis snapshot when not in cache."""
         flag_data = {"enabled": True, "context": {"env": "prod"}}
-        mock_redis_client.hget.return_value = json.dumps(flag_data)
+        mock_redis_client.hgetall.return_value = {b"redis_flag": json.dumps(flag_data).encode()}
 
         with patch(
             "dotmac.platform.feature_flags.core.get_redis_client", return_value=mock_redis_client
@@ -301,7 +301,7 @@ class TestIsEnabled:
     @pytest.mark.asyncio
     async def test_is_enabled_not_found(self, mock_redis_client):
         """Test checking non-existent flag."""
-        mock_redis_client.hget.return_value = None
+        mock_redis_client.hgetall.return_value = {}
 
         with patch(
             "dotmac.platform.feature_flags.core.get_redis_client", return_value=mock_redis_client
@@ -347,7 +347,7 @@ class TestIsEnabled:
     @pytest.mark.asyncio
     async def test_is_enabled_redis_error(self, mock_redis_client):
         """Test flag checking when Redis fails."""
-        mock_redis_client.hget.side_effect = redis.RedisError("Redis error")
+        mock_redis_client.hgetall.side_effect = redis.RedisError("Redis error")
 
         with patch(
             "dotmac.platform.feature_flags.core.get_redis_client", return_value=mock_redis_client
@@ -415,6 +415,34 @@ class TestCheckFlag:
 
                 assert response.status_code == status.HTTP_200_OK
 
+    def test_check_flag_ignores_tenant_in_request_context(self, client):
+        """The caller's tenant wins over a tenant_id sent in the context."""
+        request_data = {"flag_name": "tenant_flag", "context": {"tenant_id": "other-tenant"}}
+        seen: list[dict] = []
+
+        async def mock_is_enabled(flag_name, context):
+            seen.append(dict(context))
+            return True
+
+        with patch("dotmac.platform.feature_flags.router.is_enabled", side_effect=mock_is_enabled):
+            with patch("dotmac.platform.feature_flags.router.get_variant", return_value="control"):
+                response = client.post("/feature-flags/flags/check", json=request_data)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert seen[0]["tenant_id"] == "test-tenant"
+
+    def test_evaluate_flags_ignores_tenant_in_request_context(self, client):
+        """Bulk evaluation uses the caller's tenant, not one from the request body."""
+        evaluate_all = AsyncMock(return_value={"tenant_flag": True})
+
+        with patch("dotmac.platform.feature_flags.router.evaluate_all", evaluate_all):
+            response = client.post(
+                "/feature-flags/flags/evaluate", json={"context": {"tenant_id": "other-tenant"}}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert evaluate_all.await_args.args[0]["tenant_id"] == "test-tenant"
+
     def test_check_flag_service_error(self, client):
         """Test checking flag when service throws error."""
         request_data = {"flag_name": "error_flag"}
@@ -0,0 +1,133 @@
+"""Tests for the versioned flag snapshot and compiled targeting rules."""
+
+from unittest.mock import patch
+
+import pytest
+
+from dotmac.platform.feature_flags import core
+from dotmac.platform.feature_flags.core import (
+    FLAGS_KEY,
+    VERSION_KEY,
+    _flag_cache,
+    compile_flag,
+    evaluate_all,
+    handle_invalidation,
+    is_enabled,
+    set_flag,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    _flag_cache.clear()
+    yield
+    _flag_cache.clear()
+
+
+class TestCompiledRules:
+    def test_disabled_flag_is_always_off(self):
+        flag = compile_flag("off", {"enabled": False, "rollout_percentage": 100})
+
+        assert not flag.evaluate({"user_id": "u1"})
+
+    def test_attribute_match(self):
+        flag = compile_flag("beta", {"enabled": True, "context": {"plan": "pro", "_by": "x"}})
+
+        assert flag.evaluate({"plan": "pro"})
+        assert not flag.evaluate({"plan": "free"})
+        assert flag.evaluate(None)
+
+    def test_tenant_allowlist(self):
+        flag = compile_flag("pilot", {"enabled": True, "tenant_allowlist": ["t1", 2]})
+
+        assert flag.evaluate({"tenant_id": "t1"})
+        assert flag.evaluate({"tenant_id": 2})
+        assert not flag.evaluate({"tenant_id": "t3"})
+        assert not flag.evaluate(None)
+
+    def test_rollout_is_stable_and_proportional(self):
+        flag = compile_flag("ramp", {"enabled": True, "rollout_percentage": 25})
+        users = [{"user_id": f"user-{i}"} for i in range(2000)]
+
+        enabled = [flag.evaluate(user) for user in users]
+
+        assert enabled == [flag.evaluate(user) for user in users]
+        assert 400 < sum(enabled) < 600
+        assert not flag.evaluate({})
+        assert compile_flag("all", {"enabled": True, "rollout_percentage": 100}).evaluate(None)
+
+    def test_rules_combine(self):
+        flag = compile_flag(
+            "combo",
+            {"enabled": True, "context": {"env": "prod"}, "tenant_allowlist": ["t1"]},
+        )
+
+        assert flag.evaluate({"env": "prod", "tenant_id": "t1"})
+        assert not flag.evaluate({"env": "dev", "tenant_id": "t1"})
+        assert not flag.evaluate({"env": "prod", "tenant_id": "t2"})
+
+
+@pytest.mark.asyncio
+class TestSnapshot:
+    @pytest.fixture
+    def redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeAsyncRedis()
+        with patch("dotmac.platform.feature_flags.core.get_redis_client", return_value=client):
+            yield client
+
+    async def test_unknown_flags_are_negatively_cached(self, redis):
+        await set_flag("known", True)
+        _flag_cache.clear()
+
+        assert await is_enabled("known")
+        with patch.object(redis, "hgetall", wraps=redis.hgetall) as hgetall:
+            assert not await is_enabled("missing")
+            assert not await is_enabled("missing")
+            hgetall.assert_not_called()
+
+    async def test_evaluate_all(self, redis):
+        await set_flag("a", True)
+        await set_flag("b", False)
+        await set_flag("c", True, tenant_allowlist=["t1"])
+        _flag_cache.clear()
+
+        assert await evaluate_all({"tenant_id": "t1"}) == {"a": True, "b": False, "c": True}
+        assert (await evaluate_all({"tenant_id": "t2"}))["c"] is False
+
+    async def test_reloads_when_another_worker_changes_a_flag(self, redis):
+        await set_flag("shared", False)
+        await evaluate_all()
+        version = _flag_cache.version
+
+        # Another worker writes the flag and bumps the version
+        await redis.hset(FLAGS_KEY, "shared", '{"enabled": true}')
+        new_version = await redis.incr(VERSION_KEY)
+        assert new_version == version + 1
+
+        assert not await is_enabled("shared")
+        handle_invalidation(str(new_version))
+        assert await is_enabled("shared")
+        assert _flag_cache.version == new_version
+
+    async def test_version_poll_catches_missed_messages(self, redis, monkeypatch):
+        await set_flag("polled", False)
+        await evaluate_all()
+        await redis.hset(FLAGS_KEY, "polled", '{"enabled": true}')
+        await redis.incr(VERSION_KEY)
+
+        monkeypatch.setattr(core, "VERSION_CHECK_INTERVAL", 0.0)
+
+        assert await is_enabled("polled")
+
+    async def test_own_writes_do_not_force_a_reload(self, redis):
+        await set_flag("mine", False)
+        await evaluate_all()
+
+        await set_flag("mine", True)
+        handle_invalidation(str(_flag_cache.version))
+
+        assert not _flag_cache.stale
+        assert await is_enabled("mine")
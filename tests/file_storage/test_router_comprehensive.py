@@ -16,8 +16,6 @@ from datetime import UTC, datetime
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-
-pytestmark = pytest.mark.unit
 from fastapi import HTTPException, status
 from starlette.requests import Request
 
@@ -28,6 +26,9 @@ from dotmac.platform.file_storage.router import (
     FileUploadResponse,
 )
 from dotmac.platform.file_storage.service import FileMetadata
+from dotmac.platform.file_storage.streaming import FileStream, FileTooLargeError
+
+pytestmark = pytest.mark.unit
 
 # Mock current user for authentication
 
@@ -52,16 +53,39 @@ def mock_request():
     request.url = Mock()
     request.url.path = "/api/v1/files"
     request.method = "POST"
+    request.headers = {}
     return request
 
 
+async def _drain(response) -> bytes:
+    """Collect the body of a streamed download response."""
+    return b"".join([chunk async for chunk in response.stream])
+
+
+async def _store_stream(chunks, *, file_name, content_type, path, metadata, tenant_id, max_size):
+    """Consume an upload like the real service and describe what was stored."""
+    data = b"".join([chunk async for chunk in chunks])
+    return FileMetadata(
+        file_id="file-123",
+        file_name=file_name,
+        file_size=len(data),
+        content_type=content_type,
+        created_at=datetime.now(UTC),
+        path=path,
+        tenant_id=tenant_id,
+        metadata=metadata,
+    )
+
+
 @pytest.fixture
 def mock_storage_service():
     """Mock storage service."""
     service = AsyncMock()
-    service.store_file = AsyncMock(return_value="file-123")
-    service.retrieve_file = AsyncMock(
-        return_value=(b"file content", {"file_name": "test.txt", "content_type": "text/plain"})
+    service.store_file_stream = AsyncMock(side_effect=_store_stream)
+    service.open_file = AsyncMock(
+        return_value=FileStream.from_bytes(
+            b"file content", {"file_name": "test.txt", "content_type": "text/plain"}
+        )
     )
     service.delete_file = AsyncMock(return_value=True)
     service.list_files = AsyncMock(return_value=[])
@@ -101,7 +125,8 @@ class TestFileUploadEndpoint:
         mock_file = Mock(spec=UploadFile)
         mock_file.filename = "test.txt"
         mock_file.content_type = "text/plain"
-        mock_file.read = AsyncMock(return_value=file_content)
+        mock_file.size = len(file_content)
+        mock_file.read = AsyncMock(side_effect=[file_content, b""])
         mock_file.seek = AsyncMock()
 
         result = await upload_file(
@@ -119,7 +144,7 @@ class TestFileUploadEndpoint:
         assert result.content_type == "text/plain"
 
         # Verify service was called
-        mock_storage_service.store_file.assert_called_once()
+        mock_storage_service.store_file_stream.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_upload_file_with_custom_path(
@@ -133,7 +158,8 @@ class TestFileUploadEndpoint:
         mock_file = Mock(spec=UploadFile)
         mock_file.filename = "test.txt"
         mock_file.content_type = "text/plain"
-        mock_file.read = AsyncMock(return_value=b"test")
+        mock_file.size = len(b"test")
+        mock_file.read = AsyncMock(side_effect=[b"test", b""])
         mock_file.seek = AsyncMock()
 
         result = await upload_file(
@@ -146,7 +172,7 @@ class TestFileUploadEndpoint:
 
         assert result.file_id == "file-123"
         # Verify custom path was used
-        call_args = mock_storage_service.store_file.call_args
+        call_args = mock_storage_service.store_file_stream.call_args
         assert call_args.kwargs["path"] == "custom/path"
 
     @pytest.mark.asyncio
@@ -156,12 +182,12 @@ class TestFileUploadEndpoint:
 
         from dotmac.platform.file_storage.router import upload_file
 
-        # Create file larger than 100MB
-        large_content = b"x" * (101 * 1024 * 1024)
+        # Size known from the multipart parser: rejected before reading
         mock_file = Mock(spec=UploadFile)
         mock_file.filename = "large.txt"
         mock_file.content_type = "text/plain"
-        mock_file.read = AsyncMock(return_value=large_content)
+        mock_file.size = 101 * 1024 * 1024
+        mock_file.read = AsyncMock()
 
         with pytest.raises(HTTPException) as exc_info:
             await upload_file(
@@ -174,6 +200,35 @@ class TestFileUploadEndpoint:
 
         assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
         assert "too large" in exc_info.value.detail.lower()
+        mock_file.read.assert_not_called()
+        mock_storage_service.store_file_stream.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upload_file_too_large_while_streaming(
+        self, mock_request, mock_user, mock_storage_service
+    ):
+        """Test the size limit enforced while the upload is read."""
+        from fastapi import UploadFile
+
+        from dotmac.platform.file_storage.router import upload_file
+
+        mock_storage_service.store_file_stream = AsyncMock(side_effect=FileTooLargeError("big"))
+        mock_file = Mock(spec=UploadFile)
+        mock_file.filename = "large.txt"
+        mock_file.content_type = "text/plain"
+        mock_file.size = None
+        mock_file.read = AsyncMock(side_effect=[b"x", b""])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_file(
+                request=mock_request,
+                file=mock_file,
+                path=None,
+                description=None,
+                current_user=mock_user,
+            )
+
+        assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
 
     @pytest.mark.asyncio
     async def test_upload_file_unnamed(self, mock_request, mock_user, mock_storage_service):
@@ -185,7 +240,8 @@ class TestFileUploadEndpoint:
         mock_file = Mock(spec=UploadFile)
         mock_file.filename = None  # No filename
         mock_file.content_type = None  # No content type
-        mock_file.read = AsyncMock(return_value=b"test")
+        mock_file.size = len(b"test")
+        mock_file.read = AsyncMock(side_effect=[b"test", b""])
         mock_file.seek = AsyncMock()
 
         result = await upload_file(
@@ -202,7 +258,7 @@ class TestFileUploadEndpoint:
     @pytest.mark.asyncio
     async def test_upload_file_service_error(self, mock_request, mock_user, mock_storage_service):
         """Test file upload with service error."""
-        mock_storage_service.store_file = AsyncMock(side_effect=Exception("Storage error"))
+        mock_storage_service.store_file_stream = AsyncMock(side_effect=Exception("Storage error"))
 
         from fastapi import UploadFile
 
@@ -211,7 +267,8 @@ class TestFileUploadEndpoint:
         mock_file = Mock(spec=UploadFile)
         mock_file.filename = "test.txt"
         mock_file.content_type = "text/plain"
-        mock_file.read = AsyncMock(return_value=b"test")
+        mock_file.size = len(b"test")
+        mock_file.read = AsyncMock(side_effect=[b"test", b""])
         mock_file.seek = AsyncMock()
 
         with pytest.raises(HTTPException) as exc_info:
@@ -239,7 +296,10 @@ class TestFileDownloadEndpoint:
             request=mock_request, file_id="file-123", current_user=mock_user
         )
 
-        assert response.body == b"file content"
+        assert await _drain(response) == b"file content"
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Length"] == "12"
+        assert response.headers["Accept-Ranges"] == "bytes"
         assert response.media_type == "text/plain"
         assert "attachment" in response.headers["Content-Disposition"]
         assert "test.txt" in response.headers["Content-Disposition"]
@@ -247,7 +307,7 @@ class TestFileDownloadEndpoint:
     @pytest.mark.asyncio
     async def test_download_file_not_found(self, mock_request, mock_user, mock_storage_service):
         """Test downloading non-existent file."""
-        mock_storage_service.retrieve_file = AsyncMock(return_value=(None, None))
+        mock_storage_service.open_file = AsyncMock(return_value=None)
 
         from dotmac.platform.file_storage.router import download_file
 
@@ -262,7 +322,9 @@ class TestFileDownloadEndpoint:
         self, mock_request, mock_user, mock_storage_service
     ):
         """Test downloading file without metadata."""
-        mock_storage_service.retrieve_file = AsyncMock(return_value=(b"content", None))
+        mock_storage_service.open_file = AsyncMock(
+            return_value=FileStream.from_bytes(b"content", {})
+        )
 
         from dotmac.platform.file_storage.router import download_file
 
@@ -270,14 +332,14 @@ class TestFileDownloadEndpoint:
             request=mock_request, file_id="file-123", current_user=mock_user
         )
 
-        assert response.body == b"content"
+        assert await _drain(response) == b"content"
         assert response.media_type == "application/octet-stream"  # Default
         assert "download" in response.headers["Content-Disposition"]  # Default filename
 
     @pytest.mark.asyncio
     async def test_download_file_service_error(self, mock_request, mock_user, mock_storage_service):
         """Test file download with service error."""
-        mock_storage_service.retrieve_file = AsyncMock(side_effect=Exception("Retrieval error"))
+        mock_storage_service.open_file = AsyncMock(side_effect=Exception("Retrieval error"))
 
         from dotmac.platform.file_storage.router import download_file
 
@@ -16,6 +16,7 @@ from httpx import ASGITransport, AsyncClient
 from dotmac.platform.auth.core import UserInfo, create_access_token
 from dotmac.platform.file_storage.router import file_storage_router
 from dotmac.platform.file_storage.service import FileMetadata
+from dotmac.platform.file_storage.streaming import FileStream
 
 pytestmark = pytest.mark.integration
 
@@ -35,12 +36,23 @@ def mock_storage_service():
     """Mock file storage service."""
     service = AsyncMock()
 
-    # Mock store_file
-    service.store_file = AsyncMock(return_value="file-123")
+    # Mock store_file_stream - returns the stored FileMetadata
+    service.store_file_stream = AsyncMock(
+        return_value=FileMetadata(
+            file_id="file-123",
+            file_name="test.txt",
+            content_type="text/plain",
+            file_size=17,
+            path="uploads/test",
+            tenant_id="tenant-123",
+            created_at=datetime.now(UTC),
+            metadata={"uploaded_by": "user-123"},
+        )
+    )
 
-    # Mock retrieve_file - returns (bytes, dict) not FileMetadata
-    service.retrieve_file = AsyncMock(
-        return_value=(
+    # Mock open_file - returns a FileStream read lazily by the response
+    service.open_file = AsyncMock(
+        return_value=FileStream.from_bytes(
             b"test file content",
             {
                 "file_id": "file-123",
@@ -51,6 +63,7 @@ def mock_storage_service():
                 "tenant_id": "tenant-123",
                 "created_at": datetime.now(UTC).isoformat(),
                 "uploaded_by": "user-123",
+                "checksum": "abc123",
             },
         )
     )
@@ -234,6 +247,71 @@ async def test_download_file_success(file_storage_app: FastAPI, mock_storage_ser
     assert response.status_code == 200
     assert response.content == b"test file content"
     assert "text/plain" in response.headers["content-type"]
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == '"abc123"'
+
+
+@pytest.mark.asyncio
+async def test_download_file_range(file_storage_app: FastAPI, mock_storage_service, test_user):
+    """Test partial download with a Range header."""
+    token = create_access_token(
+        user_id=test_user.user_id,
+        username=test_user.username,
+        email=test_user.email,
+        tenant_id=test_user.tenant_id,
+        roles=test_user.roles,
+        permissions=test_user.permissions,
+    )
+
+    with (
+        patch("dotmac.platform.file_storage.router.storage_service", mock_storage_service),
+        patch("dotmac.platform.tenant.get_current_tenant_id", return_value="tenant-123"),
+    ):
+        transport = ASGITransport(app=file_storage_app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            partial = await client.get(
+                f"{BASE_STORAGE_PATH}/file-123/download",
+                headers={"Authorization": f"Bearer {token}", "Range": "bytes=5-8"},
+            )
+            unsatisfiable = await client.get(
+                f"{BASE_STORAGE_PATH}/file-123/download",
+                headers={"Authorization": f"Bearer {token}", "Range": "bytes=100-"},
+            )
+
+    assert partial.status_code == 206
+    assert partial.content == b"file"
+    assert partial.headers["content-range"] == "bytes 5-8/17"
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */17"
+
+
+@pytest.mark.asyncio
+async def test_download_file_not_modified(
+    file_storage_app: FastAPI, mock_storage_service, test_user
+):
+    """Test conditional download with a matching ETag."""
+    token = create_access_token(
+        user_id=test_user.user_id,
+        username=test_user.username,
+        email=test_user.email,
+        tenant_id=test_user.tenant_id,
+        roles=test_user.roles,
+        permissions=test_user.permissions,
+    )
+
+    with (
+        patch("dotmac.platform.file_storage.router.storage_service", mock_storage_service),
+        patch("dotmac.platform.tenant.get_current_tenant_id", return_value="tenant-123"),
+    ):
+        transport = ASGITransport(app=file_storage_app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.get(
+                f"{BASE_STORAGE_PATH}/file-123/download",
+                headers={"Authorization": f"Bearer {token}", "If-None-Match": '"abc123"'},
+            )
+
+    assert response.status_code == 304
+    assert response.content == b""
 
 
 @pytest.mark.asyncio
@@ -248,8 +326,8 @@ async def test_download_file_not_found(file_storage_app: FastAPI, mock_storage_s
         permissions=test_user.permissions,
     )
 
-    # Mock file not found - return (None, None) tuple
-    mock_storage_service.retrieve_file = AsyncMock(return_value=(None, None))
+    # Mock file not found
+    mock_storage_service.open_file = AsyncMock(return_value=None)
 
     with (
         patch("dotmac.platform.file_storage.router.storage_service", mock_storage_service),
@@ -0,0 +1,212 @@
+"""Tests for streamed file uploads and downloads."""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from dotmac.platform.file_storage.service import LocalFileStorage
+from dotmac.platform.file_storage.streaming import (
+    BlockingChunkReader,
+    FileStream,
+    FileStreamResponse,
+    FileTooLargeError,
+    RangeNotSatisfiableError,
+    etag_matches,
+    iter_bytes,
+    iter_file,
+    limit_size,
+    parse_range,
+)
+
+pytestmark = pytest.mark.unit
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def _send_response(response: FileStreamResponse, scope: dict) -> list[dict]:
+    messages: list[dict] = []
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await response({"type": "http", **scope}, None, send)
+    return messages
+
+
+class TestParseRange:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=10-", (10, 99)),
+            ("bytes=-10", (90, 99)),
+            ("bytes=90-500", (90, 99)),
+            ("bytes=-500", (0, 99)),
+            ("bytes=0-1,5-6", None),
+            ("items=0-9", None),
+            ("bytes=-", None),
+            ("bytes=abc", None),
+        ],
+    )
+    def test_parse(self, header, expected):
+        assert parse_range(header, 100) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=9-5", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range(header, 100)
+
+    def test_empty_file(self):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range("bytes=-10", 0)
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abc"', None)
+
+
+@pytest.mark.asyncio
+class TestChunks:
+    async def test_limit_size(self):
+        chunks = limit_size(iter_bytes(b"x" * 10, chunk_size=4), max_size=10)
+        assert await _collect(chunks) == b"x" * 10
+
+        with pytest.raises(FileTooLargeError):
+            await _collect(limit_size(iter_bytes(b"x" * 11, chunk_size=4), max_size=10))
+
+    async def test_iter_file_reads_rest_of_file(self):
+        handle = io.BytesIO(b"0123456789")
+        handle.seek(2)
+
+        assert [chunk async for chunk in iter_file(handle, chunk_size=3)] == [
+            b"234",
+            b"567",
+            b"89",
+        ]
+
+    async def test_file_stream_range(self):
+        stream = FileStream.from_bytes(b"0123456789", {"checksum": "abc"}, chunk_size=3)
+        partial = stream.with_range(2, 7)
+
+        assert await _collect(stream) == b"0123456789"
+        assert await _collect(partial) == b"234567"
+        assert partial.length == 6
+        assert partial.is_partial and not stream.is_partial
+        assert stream.etag == '"abc"'
+
+    async def test_blocking_reader_feeds_worker_thread(self):
+        reader = BlockingChunkReader(max_chunks=1)
+
+        def consume() -> bytes:
+            parts = []
+            while part := reader.read(3):
+                parts.append(part)
+            return b"".join(parts)
+
+        consumer = asyncio.ensure_future(asyncio.to_thread(consume))
+        await reader.feed(iter_bytes(b"abcdefghij", chunk_size=2), consumer)
+
+        assert await consumer == b"abcdefghij"
+
+    async def test_blocking_reader_surfaces_producer_error(self):
+        reader = BlockingChunkReader()
+
+        async def failing():
+            yield b"abc"
+            raise FileTooLargeError("too big")
+
+        consumer = asyncio.ensure_future(asyncio.to_thread(reader.read))
+        with pytest.raises(FileTooLargeError):
+            await reader.feed(failing(), consumer)
+        with pytest.raises(OSError, match="Upload aborted"):
+            await consumer
+
+    async def test_blocking_reader_surfaces_consumer_error(self):
+        reader = BlockingChunkReader(max_chunks=1)
+
+        def consume() -> None:
+            reader.read(1)
+            raise ValueError("bucket does not exist")
+
+        consumer = asyncio.ensure_future(asyncio.to_thread(consume))
+        with pytest.raises(ValueError, match="bucket does not exist"):
+            await reader.feed(iter_bytes(b"x" * 100, chunk_size=1), consumer)
+
+
+@pytest.mark.asyncio
+class TestLocalStreaming:
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return LocalFileStorage(base_path=str(tmp_path))
+
+    async def test_round_trip(self, storage):
+        data = bytes(range(256)) * 1000
+
+        stored = await storage.store_stream(
+            iter_bytes(data, chunk_size=4096), "data.bin", "application/octet-stream"
+        )
+        stream = await storage.open_stream(stored.file_id)
+
+        assert stored.file_size == len(data)
+        assert stored.checksum == hashlib.sha256(data).hexdigest()
+        assert stream.size == len(data)
+        assert stream.local_path is not None
+        assert await _collect(stream) == data
+        assert await _collect(stream.with_range(1000, 1999)) == data[1000:2000]
+
+    async def test_oversized_upload_leaves_no_file(self, storage, tmp_path):
+        with pytest.raises(FileTooLargeError):
+            await storage.store_stream(
+                limit_size(iter_bytes(b"x" * 100, chunk_size=10), max_size=50),
+                "big.bin",
+                "application/octet-stream",
+            )
+
+        assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+    async def test_missing_file(self, storage):
+        assert await storage.open_stream("00000000-0000-0000-0000-000000000000") is None
+
+
+@pytest.mark.asyncio
+class TestFileStreamResponse:
+    async def test_streams_chunks(self):
+        stream = FileStream.from_bytes(b"0123456789", {}, chunk_size=4).with_range(2, 8)
+        response = FileStreamResponse(stream, status_code=206)
+
+        messages = await _send_response(response, {"method": "GET"})
+
+        assert messages[0]["status"] == 206
+        assert (b"content-length", b"7") in messages[0]["headers"]
+        assert b"".join(m.get("body", b"") for m in messages[1:]) == b"2345678"
+        assert messages[-1]["more_body"] is False
+
+    async def test_head_sends_no_body(self):
+        response = FileStreamResponse(FileStream.from_bytes(b"0123456789", {}))
+
+        messages = await _send_response(response, {"method": "HEAD"})
+
+        assert (b"content-length", b"10") in messages[0]["headers"]
+        assert messages[1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+    async def test_zero_copy_for_local_files(self, tmp_path):
+        storage = LocalFileStorage(base_path=str(tmp_path))
+        stored = await storage.store_stream(iter_bytes(b"0123456789"), "a.txt", "text/plain")
+        stream = (await storage.open_stream(stored.file_id)).with_range(3, 5)
+
+        messages = await _send_response(
+            FileStreamResponse(stream),
+            {"method": "GET", "extensions": {"http.response.zerocopysend": {}}},
+        )
+
+        assert messages[1]["type"] == "http.response.zerocopysend"
+        assert (messages[1]["offset"], messages[1]["count"]) == (3, 3)
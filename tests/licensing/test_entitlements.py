@@ -0,0 +1,161 @@
+"""Tests for compiled tenant entitlement snapshots and their cache."""
+
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+
+from dotmac.platform.licensing.entitlements import (
+    INVALIDATION_CHANNEL,
+    EntitlementCache,
+    EntitlementSnapshot,
+    RoutePrefixTrie,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _snapshot(tenant_id: str = "tenant-1", **modules: float | None) -> EntitlementSnapshot:
+    return EntitlementSnapshot(
+        tenant_id=tenant_id,
+        subscription_id="sub-1",
+        modules=modules or {"billing": None},
+        capabilities={"billing": frozenset({"invoices_view"})},
+    )
+
+
+def _loader(snapshot: EntitlementSnapshot, calls: list[int], delay: float = 0.0):
+    async def load() -> EntitlementSnapshot:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return snapshot
+
+    return load
+
+
+class TestRoutePrefixTrie:
+    routes = {
+        "/api/v1/billing": ("billing", None),
+        "/api/v1/billing/analytics": ("analytics", "billing_reports"),
+        "/api/v1/subscriptions": ("subscriptions", None),
+    }
+
+    def test_longest_prefix_wins(self):
+        trie = RoutePrefixTrie(self.routes)
+
+        assert trie.match("/api/v1/billing/analytics/mrr") == ("analytics", "billing_reports")
+        assert trie.match("/api/v1/billing/invoices") == ("billing", None)
+        assert trie.match("/api/v1/billing") == ("billing", None)
+
+    def test_matches_like_startswith(self):
+        trie = RoutePrefixTrie(self.routes)
+
+        for path in ("/api/v1/billingx", "/api/v1/bill", "/api/v1/subscriptions/1", "/health"):
+            expected = None
+            for prefix, config in sorted(self.routes.items(), key=lambda x: -len(x[0])):
+                if path.startswith(prefix):
+                    expected = config
+                    break
+            assert trie.match(path) == expected
+
+    def test_no_match(self):
+        assert RoutePrefixTrie(self.routes).match("/api/v1/users") is None
+        assert RoutePrefixTrie({}).match("/api/v1/billing") is None
+
+
+class TestEntitlementSnapshot:
+    def test_module_and_capability(self):
+        snapshot = _snapshot()
+
+        assert snapshot.is_entitled("billing")
+        assert snapshot.is_entitled("billing", "invoices_view")
+        assert not snapshot.is_entitled("billing", "invoices_delete")
+        assert not snapshot.is_entitled("analytics")
+
+    def test_expired_module_is_not_entitled(self):
+        now = time.time()
+        snapshot = _snapshot(billing=now + 60, analytics=now - 60)
+
+        assert snapshot.is_entitled("billing", now=now)
+        assert not snapshot.is_entitled("analytics", now=now)
+        assert not snapshot.is_entitled("billing", now=now + 120)
+
+    def test_cache_payload_round_trip(self):
+        snapshot = _snapshot(billing=1_700_000_000.0)
+
+        restored = EntitlementSnapshot.from_cache_payload(snapshot.to_cache_payload())
+
+        assert restored == snapshot
+        assert EntitlementSnapshot.from_cache_payload({"tenant_id": "t"}) is None
+
+
+@pytest.mark.asyncio
+class TestEntitlementCache:
+    async def test_concurrent_misses_share_one_load(self):
+        cache = EntitlementCache(ttl=0, local_ttl=30, local_max_size=10)
+        calls: list[int] = []
+        loader = _loader(_snapshot(), calls, delay=0.01)
+        tenant_id = uuid4()
+
+        results = await asyncio.gather(*(cache.get_or_load(tenant_id, loader) for _ in range(10)))
+
+        assert len(calls) == 1
+        assert all(result.is_entitled("billing") for result in results)
+        await cache.get_or_load(tenant_id, loader)
+        assert cache.local_hits == 1
+
+    async def test_invalidation_is_per_tenant(self):
+        cache = EntitlementCache(ttl=0, local_ttl=30, local_max_size=10)
+        calls: list[int] = []
+        loader = _loader(_snapshot(), calls)
+        await cache.get_or_load("tenant-1", loader)
+        await cache.get_or_load("tenant-2", loader)
+
+        await cache.invalidate("tenant-1")
+        await cache.get_or_load("tenant-1", loader)
+        await cache.get_or_load("tenant-2", loader)
+        assert len(calls) == 3
+
+        cache.handle_message(b"*")
+        await cache.get_or_load("tenant-2", loader)
+        assert len(calls) == 4
+
+    async def test_invalidation_during_load_is_not_cached(self):
+        cache = EntitlementCache(ttl=0, local_ttl=30, local_max_size=10)
+        calls: list[int] = []
+        loader = _loader(_snapshot(), calls, delay=0.01)
+
+        pending = asyncio.create_task(cache.get_or_load("tenant-1", loader))
+        await asyncio.sleep(0)
+        cache.invalidate_local("tenant-1")
+        await pending
+        await cache.get_or_load("tenant-1", loader)
+
+        assert len(calls) == 2
+
+    async def test_redis_tier_and_broadcast(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        worker_a = EntitlementCache(ttl=60, redis=redis)
+        worker_b = EntitlementCache(ttl=60, redis=redis)
+        calls: list[int] = []
+        loader = _loader(_snapshot(), calls)
+
+        await worker_a.get_or_load("tenant-1", loader)
+        await worker_b.get_or_load("tenant-1", loader)
+        assert len(calls) == 1
+        assert worker_b.remote_hits == 1
+
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        await worker_a.invalidate("tenant-1")
+        message = None
+        while message is None or message["type"] != "message":
+            message = await pubsub.get_message(timeout=1)
+        worker_b.handle_message(message["data"])
+        await pubsub.aclose()
+
+        assert await redis.exists(EntitlementCache.redis_key("tenant-1")) == 0
+        await worker_b.get_or_load("tenant-1", loader)
+        assert len(calls) == 2
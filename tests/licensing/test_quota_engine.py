@@ -0,0 +1,249 @@
+"""Tests for Redis quota counters with write-behind to the usage table."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from dotmac.platform.licensing.framework import (
+    BillingCycle,
+    FeatureUsageLog,
+    PlanQuotaAllocation,
+    QuotaDefinition,
+    ServicePlan,
+    SubscriptionQuotaUsage,
+    SubscriptionStatus,
+    TenantSubscription,
+)
+from dotmac.platform.licensing.quotas import DIRTY_KEY, LOG_KEY, QuotaEngine
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa", reason="fakeredis needs lupa to run Lua scripts")
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+
+def _shared_session(session):
+    """Session factory handing the engine the test's transactional session."""
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.fixture
+def suffix():
+    """Unique per test: committed fixture rows are not always rolled back on SQLite."""
+    return uuid4().hex[:8]
+
+
+@pytest.fixture
+def tenant(suffix):
+    return f"tenant-quota-{suffix}"
+
+
+@pytest.fixture
+def codes(suffix):
+    return {"api_calls": f"api_calls_{suffix}", "staff_users": f"staff_users_{suffix}"}
+
+
+@pytest.fixture
+async def subscription(async_db_session, tenant, codes, suffix):
+    plan = ServicePlan(
+        id=uuid4(), plan_name="Pro", plan_code=f"pro-{suffix}", base_price_monthly=99
+    )
+    api_calls = QuotaDefinition(
+        id=uuid4(),
+        quota_code=codes["api_calls"],
+        quota_name="API Calls",
+        unit_name="call",
+        unit_plural="calls",
+        reset_period="MONTHLY",
+    )
+    seats = QuotaDefinition(
+        id=uuid4(),
+        quota_code=codes["staff_users"],
+        quota_name="Staff Users",
+        unit_name="user",
+        unit_plural="users",
+        overage_rate=2,
+    )
+    subscription = TenantSubscription(
+        id=uuid4(),
+        tenant_id=tenant,
+        plan_id=plan.id,
+        status=SubscriptionStatus.ACTIVE,
+        billing_cycle=BillingCycle.MONTHLY,
+        monthly_price=99,
+        current_period_end=datetime.now(UTC) + timedelta(days=30),
+    )
+    async_db_session.add_all(
+        [
+            plan,
+            api_calls,
+            seats,
+            PlanQuotaAllocation(plan_id=plan.id, quota_id=api_calls.id, included_quantity=5),
+            PlanQuotaAllocation(
+                plan_id=plan.id, quota_id=seats.id, included_quantity=2, allow_overage=True
+            ),
+            subscription,
+        ]
+    )
+    await async_db_session.commit()
+    return subscription
+
+
+@pytest.fixture
+def engine(redis, async_db_session):
+    return QuotaEngine(redis, _shared_session(async_db_session), flush_batch_size=2)
+
+
+async def test_loads_allocations_in_one_snapshot(
+    engine, async_db_session, subscription, tenant, codes
+):
+    allocations = await engine.allocations(async_db_session, tenant)
+
+    assert allocations.subscription_id == subscription.id
+    assert set(allocations.quotas) == set(codes.values())
+    assert allocations.quotas[codes["staff_users"]].overage_rate == 2.0
+    assert await engine.allocations(async_db_session, tenant) is allocations
+
+    engine.invalidate_allocations(tenant)
+    assert await engine.allocations(async_db_session, tenant) is not allocations
+
+
+async def test_concurrent_consumption_never_exceeds_limit(
+    engine, async_db_session, subscription, tenant, codes
+):
+    allocation = (await engine.allocations(async_db_session, tenant)).quotas[codes["api_calls"]]
+    # Seed the counter first: the shared test session cannot run queries concurrently
+    assert (await engine.consume(async_db_session, allocation, 1)).allowed
+
+    results = await asyncio.gather(
+        *(engine.consume(async_db_session, allocation, 1) for _ in range(20))
+    )
+
+    assert sum(result.allowed for result in results) == 4
+    assert await engine.usage(async_db_session, allocation) == 5
+
+
+async def test_overage_and_release(engine, async_db_session, subscription, tenant, codes):
+    allocations = await engine.allocations(async_db_session, tenant)
+    allocation = allocations.quotas[codes["staff_users"]]
+
+    assert (await engine.consume(async_db_session, allocation, 3)).usage == 3
+    assert (await engine.consume(async_db_session, allocation, -10)).usage == 0
+
+
+async def test_seeds_from_usage_row(engine, async_db_session, subscription, tenant, codes):
+    allocations = await engine.allocations(async_db_session, tenant)
+    allocation = allocations.quotas[codes["api_calls"]]
+    async_db_session.add(
+        SubscriptionQuotaUsage(
+            subscription_id=subscription.id,
+            quota_id=allocation.quota_id,
+            allocated_quantity=5,
+            current_usage=4,
+            period_start=datetime.now(UTC),
+            period_end=datetime.now(UTC) + timedelta(days=10),
+        )
+    )
+    await async_db_session.commit()
+
+    assert (await engine.consume(async_db_session, allocation, 1)).usage == 5
+    assert not (await engine.consume(async_db_session, allocation, 1)).allowed
+
+
+async def test_flush_writes_usage_and_logs(
+    engine, redis, async_db_session, subscription, tenant, codes
+):
+    allocations = await engine.allocations(async_db_session, tenant)
+    for code, quantity in ((codes["api_calls"], 2), (codes["staff_users"], 3)):
+        for _ in range(quantity):
+            await engine.consume(
+                async_db_session,
+                allocations.quotas[code],
+                1,
+                log={
+                    "tenant_id": tenant,
+                    "quota_id": str(allocations.quotas[code].quota_id),
+                    "quota_code": code,
+                    "at": datetime.now(UTC).timestamp(),
+                    "metadata": {"quantity": 1},
+                },
+            )
+
+    assert await engine.flush() == 2
+
+    rows = (
+        (
+            await async_db_session.execute(
+                select(SubscriptionQuotaUsage)
+                .where(SubscriptionQuotaUsage.subscription_id == subscription.id)
+                .execution_options(populate_existing=True)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    usage = {row.quota_id: row for row in rows}
+    seats = usage[allocations.quotas[codes["staff_users"]].quota_id]
+    assert usage[allocations.quotas[codes["api_calls"]].quota_id].current_usage == 2
+    assert seats.current_usage == 3
+    assert seats.overage_quantity == 1
+    assert float(seats.overage_charges) == 2.0
+
+    logs = (
+        (
+            await async_db_session.execute(
+                select(FeatureUsageLog).where(FeatureUsageLog.tenant_id == tenant)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert len(logs) == 5
+    seat_logs = [log.extra_metadata for log in logs if log.resource_id == codes["staff_users"]]
+    assert sorted(meta["overage"] for meta in seat_logs) == [0, 0, 1]
+    assert sorted(meta["overage_charge"] for meta in seat_logs) == [0.0, 0.0, 2.0]
+    assert await redis.scard(DIRTY_KEY) == 0
+    assert await redis.llen(LOG_KEY) == 0
+
+
+async def test_counter_changed_during_flush_stays_dirty(
+    engine, redis, async_db_session, subscription, tenant, codes
+):
+    allocation = (await engine.allocations(async_db_session, tenant)).quotas[codes["api_calls"]]
+    await engine.consume(async_db_session, allocation, 1)
+
+    original_write = engine._write_counters
+
+    async def write_then_consume(session, counters):
+        await original_write(session, counters)
+        await engine.consume(async_db_session, allocation, 1)
+
+    engine._write_counters = write_then_consume
+    await engine.flush()
+    engine._write_counters = original_write
+
+    assert await redis.sismember(DIRTY_KEY, allocation.counter_key)
+    await engine.flush()
+    row = (
+        await async_db_session.execute(
+            select(SubscriptionQuotaUsage)
+            .where(SubscriptionQuotaUsage.subscription_id == subscription.id)
+            .execution_options(populate_existing=True)
+        )
+    ).scalar_one()
+    assert row.current_usage == 2
+    assert await redis.scard(DIRTY_KEY) == 0
@@ -0,0 +1,132 @@
+"""
+EventStorage throughput benchmark.
+
+Measures events/sec for the Redis-backed EventStorage against a local Redis:
+the publish path (save + one status update per event), batched saves, and
+filtered queries (ZREVRANGE + MGET). Keys are written to a scratch database
+that is flushed before and after the run.
+
+Run standalone for a report:
+    python tests/performance/test_event_storage_throughput.py --events 20000 \
+        --redis-url redis://localhost:6379/15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from dotmac.platform.events.models import Event, EventStatus
+from dotmac.platform.events.storage import EventStorage
+
+pytestmark = [pytest.mark.performance]
+
+DEFAULT_REDIS_URL = "redis://localhost:6379/15"
+
+
+def _events(count: int) -> list[Event]:
+    return [
+        Event(
+            event_type=f"bench.event.{i % 10}",
+            payload={"sequence": i, "amount": i * 3, "currency": "USD"},
+            metadata={"tenant_id": f"tenant-{i % 25}", "source": "benchmark"},
+        )
+        for i in range(count)
+    ]
+
+
+async def measure(redis: Any, count: int, concurrency: int = 50) -> dict[str, float]:
+    """Return events/sec for each storage operation."""
+    storage = EventStorage(redis=redis)
+    results: dict[str, float] = {}
+
+    # Publish path: save, then one status update after the handler ran
+    events = _events(count)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def publish(event: Event) -> None:
+        async with semaphore:
+            await storage.save_event(event)
+            event.mark_completed()
+            await storage.update_event(event)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(publish(event) for event in events))
+    results["save+update events/s"] = count / (time.perf_counter() - start)
+
+    # Batched saves
+    events = _events(count)
+    start = time.perf_counter()
+    for offset in range(0, count, 500):
+        await storage.save_events(events[offset : offset + 500])
+    results["save_events events/s"] = count / (time.perf_counter() - start)
+
+    # Filtered queries
+    queries = 200
+    start = time.perf_counter()
+    returned = 0
+    for i in range(queries):
+        found = await storage.query_events(
+            event_type=f"bench.event.{i % 10}",
+            status=EventStatus.COMPLETED,
+            tenant_id=f"tenant-{i % 25}",
+            limit=50,
+        )
+        returned += len(found)
+    elapsed = time.perf_counter() - start
+    results["query events/s"] = returned / elapsed
+    results["query p_avg_ms"] = elapsed / queries * 1000
+    return results
+
+
+async def _connect(url: str) -> Any:
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(url, decode_responses=False)
+    await client.ping()
+    await client.flushdb()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_event_storage_throughput():
+    try:
+        redis = await _connect(DEFAULT_REDIS_URL)
+    except Exception as exc:
+        pytest.skip(f"local Redis not available: {exc}")
+
+    try:
+        results = await measure(redis, count=2000)
+    finally:
+        await redis.flushdb()
+        await redis.aclose()
+
+    assert results["save+update events/s"] > 0
+    assert results["query events/s"] > 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--redis-url", default=DEFAULT_REDIS_URL)
+    args = parser.parse_args()
+
+    async def run() -> dict[str, float]:
+        redis = await _connect(args.redis_url)
+        try:
+            return await measure(redis, args.events, args.concurrency)
+        finally:
+            await redis.flushdb()
+            await redis.aclose()
+
+    for name, value in asyncio.run(run()).items():
+        print(f"{name:>22}: {value:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+File storage streaming benchmark.
+
+Uploads and downloads one file through the local backend twice:
+
+- streamed: ``store_stream`` fed in ``stream_chunk_size`` chunks, then
+  ``open_stream`` read chunk by chunk (the upload/download endpoints' path)
+- buffered: the whole file read into memory, ``store`` and ``retrieve``
+  (the endpoints' previous path)
+
+and reports throughput (MB/s) and peak Python memory (MB, via tracemalloc)
+for each direction.
+
+Run standalone for a report:
+    python tests/performance/test_file_storage_streaming.py --size-mb 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from dotmac.platform.file_storage.service import LocalFileStorage
+
+pytestmark = [pytest.mark.performance]
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def _source(size: int) -> AsyncIterator[bytes]:
+    """Upload body arriving in chunks, as read from a spooled multipart file."""
+    block = os.urandom(CHUNK_SIZE)
+    for offset in range(0, size, CHUNK_SIZE):
+        yield block[: min(CHUNK_SIZE, size - offset)]
+
+
+async def _timed(operation: Callable[[], Awaitable[Any]]) -> tuple[Any, float, float]:
+    """Run ``operation``; return its result, seconds taken and peak traced MB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = await operation()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+async def measure(size_mb: int) -> dict[str, float]:
+    """Return MB/s and peak MB for streamed and buffered upload and download."""
+    size = size_mb * 1024 * 1024
+    results: dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as base_path:
+        storage = LocalFileStorage(base_path=base_path)
+
+        async def streamed_upload() -> str:
+            stored = await storage.store_stream(_source(size), "bench.bin", "application/bin")
+            return stored.file_id
+
+        file_id, elapsed, peak = await _timed(streamed_upload)
+        results["streamed upload MB/s"] = size_mb / elapsed
+        results["streamed upload peak MB"] = peak
+
+        async def streamed_download() -> int:
+            stream = await storage.open_stream(file_id)
+            received = 0
+            async for chunk in stream:
+                received += len(chunk)
+            return received
+
+        received, elapsed, peak = await _timed(streamed_download)
+        assert received == size
+        results["streamed download MB/s"] = size_mb / elapsed
+        results["streamed download peak MB"] = peak
+        await storage.delete(file_id)
+
+        async def buffered_upload() -> str:
+            data = b"".join([chunk async for chunk in _source(size)])
+            return await storage.store(data, "bench.bin", "application/bin")
+
+        file_id, elapsed, peak = await _timed(buffered_upload)
+        results["buffered upload MB/s"] = size_mb / elapsed
+        results["buffered upload peak MB"] = peak
+
+        async def buffered_download() -> int:
+            data, _ = await storage.retrieve(file_id)
+            return len(data or b"")
+
+        received, elapsed, peak = await _timed(buffered_download)
+        assert received == size
+        results["buffered download MB/s"] = size_mb / elapsed
+        results["buffered download peak MB"] = peak
+        await storage.delete(file_id)
+
+    return results
+
+
+@pytest.mark.asyncio
+async def test_file_storage_streaming():
+    results = await measure(size_mb=64)
+
+    assert results["streamed upload peak MB"] < 16
+    assert results["streamed download peak MB"] < 16
+    assert results["buffered download peak MB"] >= 64
+    assert all(value > 0 for value in results.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    args = parser.parse_args()
+
+    for name, value in asyncio.run(measure(args.size_mb)).items():
+        print(f"{name:>32}: {value:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Load balancer selection cost benchmark.
+
+Measures the cost of one ``LoadBalancer`` selection over a large endpoint pool
+(health data cached, as in steady state) for each traffic policy, plus:
+
+- ring_build: building the consistent hash ring, done once per membership change
+- remapped: share of keys that change endpoint when one endpoint is removed,
+  for the ring versus the old SHA-256 modulo ``len(endpoints)``
+
+Run standalone for a report:
+    python tests/performance/test_load_balancer_selection.py --endpoints 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import time
+from unittest.mock import patch
+
+import pytest
+
+from dotmac.platform.resilience.service_mesh import (
+    HashRing,
+    LoadBalancer,
+    ServiceEndpoint,
+    ServiceRegistry,
+    TrafficPolicy,
+)
+
+pytestmark = [pytest.mark.performance]
+
+POLICIES = (
+    TrafficPolicy.ROUND_ROBIN,
+    TrafficPolicy.LEAST_CONNECTIONS,
+    TrafficPolicy.LEAST_LOADED,
+    TrafficPolicy.CONSISTENT_HASH,
+    TrafficPolicy.STICKY_SESSION,
+)
+
+
+def _modulo_owner(key: str, count: int) -> int:
+    return int(hashlib.sha256(key.encode()).hexdigest()[:16], 16) % count
+
+
+def _registry(endpoints: int) -> ServiceRegistry:
+    registry = ServiceRegistry()
+    for index in range(endpoints):
+        registry.register_endpoint(ServiceEndpoint("bench", f"10.0.{index // 250}.{index}", 8000))
+        registry.connection_counts[f"10.0.{index // 250}.{index}:8000"] = index % 7
+        registry.record_latency(f"10.0.{index // 250}.{index}:8000", 0.01 + (index % 13) / 1000)
+    return registry
+
+
+def remapped_share(endpoints: list[ServiceEndpoint], keys: int = 10000) -> dict[str, float]:
+    """Share of keys moved by removing one endpoint: ring vs modulo."""
+    names = [f"user-{i}" for i in range(keys)]
+    before, after = HashRing(endpoints), HashRing(endpoints[1:])
+    ring_moved = sum(before.lookup(key) is not after.lookup(key) for key in names)
+    modulo_moved = sum(
+        endpoints[_modulo_owner(key, len(endpoints))]
+        is not endpoints[1:][_modulo_owner(key, len(endpoints) - 1)]
+        for key in names
+    )
+    return {"ring remapped": ring_moved / keys, "modulo remapped": modulo_moved / keys}
+
+
+async def measure(endpoints: int, selections: int) -> dict[str, float]:
+    """Return microseconds per selection for each policy, and ring build/remap figures."""
+    registry = _registry(endpoints)
+    lb = LoadBalancer(registry)
+    results: dict[str, float] = {}
+
+    with patch.object(lb, "_is_healthy", return_value=True):
+        for policy in POLICIES:
+            # Warm the ring and healthy-set caches
+            await lb.select_endpoint("bench", policy, {"user_id": "0"})
+            start = time.perf_counter()
+            for index in range(selections):
+                await lb.select_endpoint("bench", policy, {"user_id": str(index)})
+            elapsed = time.perf_counter() - start
+            results[f"{policy.value} us/select"] = elapsed / selections * 1e6
+
+    start = time.perf_counter()
+    HashRing(registry.get_endpoints("bench"))
+    results["ring_build ms"] = (time.perf_counter() - start) * 1000
+    results.update(remapped_share(registry.get_endpoints("bench")))
+    return results
+
+
+@pytest.mark.asyncio
+async def test_load_balancer_selection():
+    results = await measure(endpoints=1000, selections=500)
+
+    assert results["ring remapped"] < 0.01
+    assert results["modulo remapped"] > 0.5
+    assert all(value >= 0 for value in results.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoints", type=int, default=1000)
+    parser.add_argument("--selections", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, value in asyncio.run(measure(args.endpoints, args.selections)).items():
+        print(f"{name:>32}: {value:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
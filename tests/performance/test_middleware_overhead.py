@@ -0,0 +1,152 @@
+"""
+Middleware stack overhead benchmark.
+
+Builds the platform middleware stack around a trivial endpoint in both
+``settings.middleware_mode`` settings and measures per-request latency by
+driving the ASGI app directly (no sockets, no HTTP client).
+
+Run standalone for a report:
+    python tests/performance/test_middleware_overhead.py --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+
+from dotmac.platform.api.app_boundary_middleware import (
+    AppBoundaryASGIMiddleware,
+    AppBoundaryMiddleware,
+)
+from dotmac.platform.audit import AuditContextASGIMiddleware, AuditContextMiddleware
+from dotmac.platform.auth.csrf import CSRFASGIMiddleware, CSRFMiddleware
+from dotmac.platform.core.request_context import (
+    RequestContextASGIMiddleware,
+    RequestContextMiddleware,
+)
+from dotmac.platform.core.rls_middleware import RLSASGIMiddleware, RLSMiddleware
+from dotmac.platform.monitoring.error_middleware import (
+    ErrorTrackingASGIMiddleware,
+    ErrorTrackingMiddleware,
+    RequestMetricsASGIMiddleware,
+    RequestMetricsMiddleware,
+)
+from dotmac.platform.tenant import TenantASGIMiddleware, TenantMiddleware
+
+pytestmark = [pytest.mark.performance]
+
+# Same order as create_application (innermost first)
+STACKS: dict[str, list[tuple[type, dict[str, Any]]]] = {
+    "base_http": [
+        (AppBoundaryMiddleware, {}),
+        (AuditContextMiddleware, {}),
+        (RLSMiddleware, {}),
+        (CSRFMiddleware, {}),
+        (TenantMiddleware, {"require_tenant": False}),
+        (RequestMetricsMiddleware, {}),
+        (ErrorTrackingMiddleware, {}),
+        (RequestContextMiddleware, {"enable_logging": False}),
+    ],
+    "asgi": [
+        (AppBoundaryASGIMiddleware, {}),
+        (AuditContextASGIMiddleware, {}),
+        (RLSASGIMiddleware, {}),
+        (CSRFASGIMiddleware, {}),
+        (TenantASGIMiddleware, {"require_tenant": False}),
+        (RequestMetricsASGIMiddleware, {}),
+        (ErrorTrackingASGIMiddleware, {}),
+        (RequestContextASGIMiddleware, {"enable_logging": False}),
+    ],
+}
+
+
+def build_app(mode: str) -> Any:
+    """Return the built ASGI middleware stack for ``mode``."""
+    app = FastAPI()
+
+    @app.get("/api/v1/bench")
+    async def bench() -> dict[str, bool]:
+        return {"ok": True}
+
+    for cls, kwargs in STACKS[mode]:
+        app.add_middleware(cls, **kwargs)
+    return app.build_middleware_stack()
+
+
+def _scope() -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/bench",
+        "raw_path": b"/api/v1/bench",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "state": {},
+    }
+
+
+async def measure(mode: str, requests: int, warmup: int = 200) -> dict[str, float]:
+    """Return latency percentiles (microseconds) for ``requests`` sequential calls."""
+    app = build_app(mode)
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status: list[int] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    samples: list[float] = []
+    for i in range(warmup + requests):
+        start = time.perf_counter()
+        await app(_scope(), receive, send)
+        if i >= warmup:
+            samples.append((time.perf_counter() - start) * 1_000_000)
+
+    samples.sort()
+    return {
+        "p50_us": samples[len(samples) // 2],
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "mean_us": statistics.fmean(samples),
+        "status": float(status[-1]),
+    }
+
+
+@pytest.mark.asyncio
+async def test_asgi_stack_is_not_slower_than_base_http():
+    base = await measure("base_http", requests=300)
+    asgi = await measure("asgi", requests=300)
+
+    assert base["status"] == asgi["status"]
+    assert asgi["p50_us"] <= base["p50_us"] * 1.1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for mode in STACKS:
+        result = asyncio.run(measure(mode, args.requests))
+        print(
+            f"{mode:>10}: p50={result['p50_us']:8.1f}us  p99={result['p99_us']:8.1f}us  "
+            f"mean={result['mean_us']:8.1f}us  status={int(result['status'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
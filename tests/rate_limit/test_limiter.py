@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from dotmac.platform.rate_limit.limiter import (
+    LimitMode,
+    LimitSpec,
+    RateLimitAlgorithm,
+    ScriptedRateLimiter,
+)
+
+pytestmark = pytest.mark.unit
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa", reason="fakeredis needs lupa to run Lua scripts")
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+def _spec(algorithm: RateLimitAlgorithm, *, limit: int = 3, key: str = "rl:test", **kwargs):
+    return LimitSpec(
+        key=ScriptedRateLimiter.storage_key(key, algorithm),
+        limit=limit,
+        window_seconds=60,
+        algorithm=algorithm,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+async def test_acquire_allows_up_to_limit(redis, algorithm):
+    limiter = ScriptedRateLimiter(redis)
+    spec = _spec(algorithm)
+
+    results = [
+        (await limiter.evaluate([spec], LimitMode.ACQUIRE, now=1000.0 + i))[0] for i in range(4)
+    ]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.current_count for r in results[:3]] == [0, 1, 2]
+    assert results[3].retry_after > 0
+    assert results[3].retry_after_seconds >= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+async def test_window_expiry_allows_again(redis, algorithm):
+    limiter = ScriptedRateLimiter(redis)
+    spec = _spec(algorithm, limit=1)
+
+    (first,) = await limiter.evaluate([spec], LimitMode.ACQUIRE, now=1200.0)
+    (blocked,) = await limiter.evaluate([spec], LimitMode.ACQUIRE, now=1201.0)
+    (later,) = await limiter.evaluate([spec], LimitMode.ACQUIRE, now=1200.0 + 121)
+
+    assert first.allowed
+    assert not blocked.allowed
+    assert later.allowed
+
+
+@pytest.mark.asyncio
+async def test_check_does_not_record(redis):
+    limiter = ScriptedRateLimiter(redis)
+    spec = _spec(RateLimitAlgorithm.SLIDING_LOG, limit=1)
+
+    for _ in range(3):
+        (result,) = await limiter.check([spec])
+        assert result.allowed
+
+    assert await redis.zcard(spec.key) == 0
+
+
+@pytest.mark.asyncio
+async def test_blocked_enforced_limit_records_nothing(redis):
+    limiter = ScriptedRateLimiter(redis)
+    strict = _spec(RateLimitAlgorithm.SLIDING_LOG, limit=1, key="rl:strict")
+    loose = _spec(RateLimitAlgorithm.SLIDING_WINDOW, limit=10, key="rl:loose")
+
+    await limiter.evaluate([strict, loose], LimitMode.ACQUIRE, now=2000.0)
+    strict_result, loose_result = await limiter.evaluate(
+        [strict, loose], LimitMode.ACQUIRE, now=2001.0
+    )
+
+    assert not strict_result.allowed
+    assert loose_result.allowed
+    # The denied request must not consume quota in the other rule
+    (loose_after,) = await limiter.evaluate([loose], LimitMode.CHECK, now=2002.0)
+    assert loose_after.current_count == 1
+
+
+@pytest.mark.asyncio
+async def test_log_only_limit_still_records(redis):
+    limiter = ScriptedRateLimiter(redis)
+    spec = _spec(RateLimitAlgorithm.SLIDING_LOG, limit=1, enforce=False)
+
+    await limiter.evaluate([spec], LimitMode.ACQUIRE, now=3000.0)
+    (result,) = await limiter.evaluate([spec], LimitMode.ACQUIRE, now=3001.0)
+
+    assert not result.allowed
+    assert await redis.zcard(spec.key) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+async def test_concurrent_burst_does_not_overshoot(redis, algorithm):
+    limiter = ScriptedRateLimiter(redis)
+    spec = _spec(algorithm, limit=10)
+
+    results = await asyncio.gather(*(limiter.acquire([spec]) for _ in range(50)))
+
+    assert sum(1 for (r,) in results if r.allowed) == 10
@@ -4,6 +4,7 @@ from uuid import uuid4
 
 import pytest
 
+from dotmac.platform.rate_limit.limiter import LimitResult, RateLimitAlgorithm
 from dotmac.platform.rate_limit.models import RateLimitAction, RateLimitScope, RateLimitWindow
 from dotmac.platform.rate_limit.service import RateLimitService
 
@@ -83,3 +84,73 @@ async def test_increment_counter_for_tenant_scope():
     service._increment_counter.assert_awaited_once()
     call_args = service._increment_counter.await_args  # type: ignore[attr-defined]
     assert call_args[0][2] == tenant_id  # args: (tenant_id, rule, identifier)
+
+
+@pytest.mark.asyncio
+async def test_acquire_evaluates_all_rules_in_one_call():
+    tenant_id = "tenant-456"
+    tenant_rule = _make_rule()
+    ip_rule = _make_rule(RateLimitScope.PER_IP, max_requests=2)
+    for rule in (tenant_rule, ip_rule):
+        rule.algorithm = RateLimitAlgorithm.SLIDING_LOG
+
+    service = RateLimitService(db=AsyncMock(), redis=AsyncMock())
+    service._get_applicable_rules = AsyncMock(return_value=[tenant_rule, ip_rule])  # type: ignore[attr-defined]
+    service._log_violation = AsyncMock()  # type: ignore[attr-defined]
+
+    limiter = AsyncMock()
+    limiter.acquire.return_value = [
+        LimitResult(allowed=True, current_count=1, retry_after=0),
+        LimitResult(allowed=False, current_count=2, retry_after=12.3),
+    ]
+    service._limiter = limiter  # type: ignore[assignment]
+
+    allowed, applied_rule, count, retry_after = await service.acquire(
+        tenant_id=tenant_id,
+        endpoint="/api/v1/resource",
+        method="GET",
+        ip_address="10.0.0.1",
+    )
+
+    limiter.acquire.assert_awaited_once()
+    (specs,) = limiter.acquire.await_args.args
+    assert [spec.limit for spec in specs] == [5, 2]
+    assert allowed is False
+    assert applied_rule is ip_rule
+    assert count == 2
+    assert retry_after == 13
+    service._log_violation.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_acquire_log_only_rule_does_not_mask_block_rule():
+    log_rule = _make_rule()
+    log_rule.action = RateLimitAction.LOG_ONLY
+    block_rule = _make_rule(RateLimitScope.PER_IP, max_requests=2)
+    for rule in (log_rule, block_rule):
+        rule.algorithm = RateLimitAlgorithm.SLIDING_LOG
+
+    service = RateLimitService(db=AsyncMock(), redis=AsyncMock())
+    service._get_applicable_rules = AsyncMock(return_value=[log_rule, block_rule])  # type: ignore[attr-defined]
+    service._log_violation = AsyncMock()  # type: ignore[attr-defined]
+
+    limiter = AsyncMock()
+    limiter.acquire.return_value = [
+        LimitResult(allowed=False, current_count=6, retry_after=0),
+        LimitResult(allowed=False, current_count=2, retry_after=4),
+    ]
+    service._limiter = limiter  # type: ignore[assignment]
+
+    allowed, applied_rule, count, retry_after = await service.acquire(
+        tenant_id="tenant-456",
+        endpoint="/api/v1/resource",
+        method="GET",
+        ip_address="10.0.0.1",
+    )
+
+    (specs,) = limiter.acquire.await_args.args
+    assert [spec.enforce for spec in specs] == [False, True]
+    assert allowed is False
+    assert applied_rule is block_rule
+    assert (count, retry_after) == (2, 4)
+    assert service._log_violation.await_count == 2
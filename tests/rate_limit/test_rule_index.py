@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from dotmac.platform.rate_limit.models import RateLimitAction, RateLimitScope, RateLimitWindow
+from dotmac.platform.rate_limit.rule_index import (
+    INVALIDATION_CHANNEL,
+    RateLimitRuleIndex,
+    literal_prefix,
+)
+from dotmac.platform.rate_limit.service import RateLimitService
+
+pytestmark = pytest.mark.unit
+
+
+def _make_rule(
+    name: str,
+    endpoint_pattern: str | None = None,
+    *,
+    scope: RateLimitScope = RateLimitScope.PER_TENANT,
+    exempt_user_ids: list[str] | None = None,
+):
+    """Create a lightweight RateLimitRule-like object for testing."""
+    return SimpleNamespace(
+        id=uuid4(),
+        name=name,
+        scope=scope,
+        endpoint_pattern=endpoint_pattern,
+        max_requests=5,
+        window=RateLimitWindow.MINUTE,
+        window_seconds=60,
+        action=RateLimitAction.BLOCK,
+        priority=0,
+        exempt_user_ids=exempt_user_ids or [],
+        exempt_ip_addresses=[],
+        exempt_api_keys=[],
+        config={},
+    )
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("/api/v1/users", "/api/v1/users"),
+        ("^/api/v1/billing/.*", "/api/v1/billing/"),
+        ("/api/v1/items?", "/api/v1/item"),
+        ("/api/v1/(users|teams)", ""),
+        ("/a|/b", ""),
+        (".*", ""),
+    ],
+)
+def test_literal_prefix(pattern: str, expected: str):
+    assert literal_prefix(pattern) == expected
+
+
+def test_index_matches_in_priority_order():
+    index = RateLimitRuleIndex(max_age=0)
+    rules = [
+        _make_rule("billing", "/api/v1/billing/.*"),
+        _make_rule("global", scope=RateLimitScope.GLOBAL, endpoint_pattern="/ignored"),
+        _make_rule("users", r"/api/v1/users/\d+"),
+        _make_rule("broken", "/api/v1/(unclosed"),
+        _make_rule("any-api", "/api/.*"),
+    ]
+
+    tenant_index = index.build("tenant-1", rules)
+
+    assert tenant_index.rule_count == 4
+    assert [r.name for r in tenant_index.match("/api/v1/billing/invoices")] == [
+        "billing",
+        "global",
+        "any-api",
+    ]
+    assert [r.name for r in tenant_index.match("/api/v1/users/42")] == [
+        "global",
+        "users",
+        "any-api",
+    ]
+    assert [r.name for r in tenant_index.match("/health")] == ["global"]
+
+
+def test_compiled_rule_freezes_exemptions():
+    index = RateLimitRuleIndex(max_age=0)
+    tenant_index = index.build("tenant-1", [_make_rule("r", exempt_user_ids=["u1", "u1"])])
+
+    rule = tenant_index.match("/anything")[0]
+    assert rule.exempt_user_ids == frozenset({"u1"})
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_only_queries_once():
+    index = RateLimitRuleIndex(max_age=0)
+    loader = AsyncMock(return_value=[_make_rule("r")])
+
+    first = await index.get_or_load("tenant-1", loader)
+    second = await index.get_or_load("tenant-1", loader)
+
+    assert first is second
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_message_drops_tenant_index():
+    index = RateLimitRuleIndex(max_age=0)
+    loader = AsyncMock(return_value=[_make_rule("r")])
+    await index.get_or_load("tenant-1", loader)
+    await index.get_or_load("tenant-2", loader)
+
+    index.handle_message(b"tenant-1:3")
+
+    assert index.get("tenant-1") is None
+    assert index.get("tenant-2") is not None
+
+    rebuilt = await index.get_or_load("tenant-1", loader)
+    assert rebuilt.version == 3
+
+    # Replayed or out-of-order versions are ignored
+    index.handle_message("tenant-1:2")
+    assert index.get("tenant-1") is rebuilt
+
+
+@pytest.mark.asyncio
+async def test_publish_invalidation_bumps_version_and_publishes():
+    index = RateLimitRuleIndex(max_age=0)
+    redis = AsyncMock()
+    redis.incr.return_value = 7
+
+    version = await index.publish_invalidation(redis, "tenant-1")
+
+    assert version == 7
+    redis.incr.assert_awaited_once_with("ratelimit:rules:version:tenant-1")
+    redis.publish.assert_awaited_once_with(INVALIDATION_CHANNEL, "tenant-1:7")
+
+
+@pytest.mark.asyncio
+async def test_service_hot_path_skips_database():
+    index = RateLimitRuleIndex(max_age=0)
+    db = AsyncMock()
+    service = RateLimitService(db=db, redis=AsyncMock(), rule_index=index)
+    service._load_rules = AsyncMock(return_value=[_make_rule("r", "/api/.*")])  # type: ignore[method-assign]
+
+    for _ in range(3):
+        rules = await service._get_applicable_rules("tenant-1", "/api/v1/resource")
+        assert [r.name for r in rules] == ["r"]
+
+    service._load_rules.assert_awaited_once()
+    db.execute.assert_not_called()
@@ -0,0 +1,127 @@
+"""Tests for ring-based consistent hashing and power-of-two-choices selection."""
+
+from unittest.mock import patch
+
+import pytest
+
+from dotmac.platform.resilience.service_mesh import (
+    HashRing,
+    LoadBalancer,
+    ServiceEndpoint,
+    ServiceRegistry,
+    TrafficPolicy,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _registry(count: int) -> ServiceRegistry:
+    registry = ServiceRegistry()
+    for index in range(count):
+        registry.register_endpoint(ServiceEndpoint("svc", f"host{index}", 8000))
+    return registry
+
+
+class TestHashRing:
+    def test_removing_an_endpoint_only_moves_its_keys(self):
+        endpoints = [ServiceEndpoint("svc", f"host{i}", 8000) for i in range(20)]
+        before = HashRing(endpoints)
+        after = HashRing(endpoints[1:])
+        keys = [f"user-{i}" for i in range(2000)]
+
+        moved = [key for key in keys if before.lookup(key) is not after.lookup(key)]
+
+        assert all(before.lookup(key) is endpoints[0] for key in moved)
+        assert len(moved) < len(keys) * 0.1
+
+    def test_skips_endpoints_not_allowed(self):
+        endpoints = [ServiceEndpoint("svc", f"host{i}", 8000) for i in range(5)]
+        ring = HashRing(endpoints)
+        owner = ring.lookup("user-1")
+
+        fallback = ring.lookup("user-1", allowed={ep.key for ep in endpoints if ep is not owner})
+
+        assert fallback is not None and fallback is not owner
+        assert ring.lookup("user-1", allowed=set()) is None
+        assert HashRing([]).lookup("user-1") is None
+
+
+@pytest.mark.asyncio
+class TestLoadBalancerSelection:
+    async def test_ring_is_rebuilt_only_on_membership_change(self):
+        registry = _registry(10)
+        lb = LoadBalancer(registry)
+        context = {"user_id": "42"}
+
+        with patch.object(lb, "_is_healthy", return_value=True):
+            first = await lb.select_endpoint("svc", TrafficPolicy.CONSISTENT_HASH, context)
+            ring = lb._rings["svc"][1]
+            assert await lb.select_endpoint("svc", TrafficPolicy.CONSISTENT_HASH, context) is first
+            assert lb._rings["svc"][1] is ring
+
+            registry.register_endpoint(ServiceEndpoint("svc", "host-new", 8000))
+            await lb.select_endpoint("svc", TrafficPolicy.CONSISTENT_HASH, context)
+            assert lb._rings["svc"][1] is not ring
+
+    async def test_unhealthy_endpoint_keys_move_to_neighbours(self):
+        registry = _registry(10)
+        lb = LoadBalancer(registry)
+        context = {"session_id": "abc"}
+
+        with patch.object(lb, "_is_healthy", return_value=True):
+            owner = await lb.select_endpoint("svc", TrafficPolicy.STICKY_SESSION, context)
+
+        lb._healthy.clear()
+
+        async def healthy(endpoint):
+            return endpoint is not owner
+
+        with patch.object(lb, "_is_healthy", side_effect=healthy):
+            moved = await lb.select_endpoint("svc", TrafficPolicy.STICKY_SESSION, context)
+
+        assert moved is not owner
+
+    async def test_healthy_set_is_reused_between_selections(self):
+        lb = LoadBalancer(_registry(5))
+
+        with patch.object(lb, "_is_healthy", return_value=True) as is_healthy:
+            await lb.select_endpoint("svc", TrafficPolicy.ROUND_ROBIN)
+            await lb.select_endpoint("svc", TrafficPolicy.ROUND_ROBIN)
+
+        assert is_healthy.await_count == 5
+
+    async def test_least_loaded_prefers_faster_endpoint(self):
+        registry = _registry(2)
+        registry.record_latency("host0:8000", 0.5)
+        registry.record_latency("host1:8000", 0.01)
+        lb = LoadBalancer(registry)
+
+        with patch.object(lb, "_is_healthy", return_value=True):
+            for _ in range(10):
+                endpoint = await lb.select_endpoint("svc", TrafficPolicy.LEAST_LOADED)
+                assert endpoint.host == "host1"
+
+        registry.connection_counts["host1:8000"] = 100
+        assert lb._select_least_loaded(registry.get_endpoints("svc")).host == "host0"
+
+    def test_least_connections_samples_two_in_large_pools(self):
+        registry = _registry(100)
+        for index in range(100):
+            registry.connection_counts[f"host{index}:8000"] = index
+        lb = LoadBalancer(registry)
+        endpoints = registry.get_endpoints("svc")
+
+        picks = [lb._select_least_connections(endpoints) for _ in range(200)]
+
+        assert len({ep.host for ep in picks}) > 1
+        assert sum(registry.connection_counts[ep.key] for ep in picks) / len(picks) < 50
+
+
+class TestLatencyEwma:
+    def test_record_latency(self):
+        registry = ServiceRegistry()
+
+        registry.record_latency("a:1", 1.0)
+        registry.record_latency("a:1", 0.0)
+
+        assert registry.latency_ewma["a:1"] == pytest.approx(0.8)
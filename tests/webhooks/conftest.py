@@ -0,0 +1,30 @@
+"""
+Webhook test configuration and fixtures.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_routing_index():
+    """
+    Drop cached webhook routes before and after each test.
+
+    The routing index is process-wide, so routes compiled for a tenant in one
+    test would otherwise be reused by the next.
+    """
+    from dotmac.platform.webhooks.routing import get_routing_index
+
+    get_routing_index().invalidate_local()
+    yield
+    get_routing_index().invalidate_local()
+
+
+@pytest.fixture(autouse=True)
+def reset_endpoint_scheduler():
+    """Start each test with no endpoint circuit, concurrency or pacing state."""
+    from dotmac.platform.webhooks.scheduler import reset_endpoint_scheduler
+
+    reset_endpoint_scheduler()
+    yield
+    reset_endpoint_scheduler()
@@ -13,6 +13,7 @@ from dotmac.platform.webhooks.models import (
     WebhookDelivery,
     WebhookSubscription,
 )
+from dotmac.platform.webhooks.pool import WebhookClientPool
 
 pytestmark = pytest.mark.unit
 
@@ -49,7 +50,7 @@ def mock_subscription():
 @pytest.fixture
 def delivery_service(mock_db):
     """Create delivery service instance."""
-    return WebhookDeliveryService(mock_db)
+    return WebhookDeliveryService(mock_db, client_pool=WebhookClientPool())
 
 
 @pytest.mark.unit
@@ -524,7 +525,7 @@ class TestProcessPendingRetries:
 
         # Mock subscription not found
         subscription_result = MagicMock()
-        subscription_result.scalar_one_or_none.return_value = None
+        subscription_result.scalars.return_value.all.return_value = []
 
         mock_db.execute.side_effect = [deliveries_result, subscription_result]
 
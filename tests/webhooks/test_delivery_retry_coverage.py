@@ -14,12 +14,13 @@ from uuid import uuid4
 
 import pytest
 
-from dotmac.platform.webhooks.delivery import WebhookDeliveryService
+from dotmac.platform.webhooks.delivery import DeliveryAttempt, WebhookDeliveryService
 from dotmac.platform.webhooks.models import (
     DeliveryStatus,
     WebhookDelivery,
     WebhookSubscription,
 )
+from dotmac.platform.webhooks.pool import WebhookClientPool
 
 
 @pytest.fixture
@@ -36,7 +37,7 @@ def mock_db():
 @pytest.fixture
 def delivery_service(mock_db):
     """Create WebhookDeliveryService instance."""
-    return WebhookDeliveryService(mock_db)
+    return WebhookDeliveryService(mock_db, client_pool=WebhookClientPool())
 
 
 @pytest.mark.integration
@@ -247,28 +248,30 @@ class TestProcessPendingRetriesMethod:
         mock_delivery_result.scalars.return_value.all.return_value = deliveries
 
         mock_sub_result = MagicMock()
-        mock_sub_result.scalar_one_or_none.return_value = subscription
+        mock_sub_result.scalars.return_value.all.return_value = [subscription]
 
-        # Setup execute to return deliveries first, then subscription for each delivery
+        # Deliveries, then all their subscriptions in one query, then one statistics update
         mock_db.execute.side_effect = [
             mock_delivery_result,
             mock_sub_result,
-            mock_sub_result,
+            MagicMock(),
         ]
 
         with patch.object(
             delivery_service,
-            "_attempt_delivery",
+            "_send",
             new_callable=AsyncMock,
-        ) as mock_attempt:
-            # Execute - covers lines 393-420
+            return_value=DeliveryAttempt(status_code=200, response_body="OK"),
+        ) as mock_send:
             processed = await delivery_service.process_pending_retries(limit=10)
 
             # Verify
             assert processed == 2
             assert deliveries[0].attempt_number == 2
             assert deliveries[1].attempt_number == 2
-            assert mock_attempt.await_count == 2
+            assert mock_send.await_count == 2
+            assert mock_db.execute.await_count == 3
+            assert {d.status for d in deliveries} == {DeliveryStatus.SUCCESS}
 
     @pytest.mark.asyncio
     async def test_process_pending_retries_inactive_subscription(self, delivery_service, mock_db):
@@ -290,7 +293,7 @@ class TestProcessPendingRetriesMethod:
         mock_delivery_result.scalars.return_value.all.return_value = [delivery]
 
         mock_sub_result = MagicMock()
-        mock_sub_result.scalar_one_or_none.return_value = None  # Subscription not found
+        mock_sub_result.scalars.return_value.all.return_value = []  # Subscription not found
 
         mock_db.execute.side_effect = [mock_delivery_result, mock_sub_result]
 
@@ -353,19 +356,19 @@ class TestProcessPendingRetriesMethod:
         mock_delivery_result.scalars.return_value.all.return_value = deliveries
 
         mock_sub_result = MagicMock()
-        mock_sub_result.scalar_one_or_none.return_value = subscription
+        mock_sub_result.scalars.return_value.all.return_value = [subscription]
 
         mock_db.execute.side_effect = [
             mock_delivery_result,
             mock_sub_result,
-            mock_sub_result,
-            mock_sub_result,
+            MagicMock(),
         ]
 
         with patch.object(
             delivery_service,
-            "_attempt_delivery",
+            "_send",
             new_callable=AsyncMock,
+            return_value=DeliveryAttempt(status_code=200, response_body="OK"),
         ):
             # Execute with limit=5 (all 3 should be processed)
             processed = await delivery_service.process_pending_retries(limit=5)
@@ -0,0 +1,123 @@
+"""Tests for concurrent webhook dispatch and the shared client pool."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dotmac.platform.webhooks.delivery import DeliveryAttempt, WebhookDeliveryService
+from dotmac.platform.webhooks.dispatcher import WebhookDispatcher
+from dotmac.platform.webhooks.models import DeliveryStatus, WebhookSubscription
+from dotmac.platform.webhooks.pool import WebhookClientPool
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def mock_db():
+    db = AsyncMock()
+    db.add_all = MagicMock()
+    return db
+
+
+@pytest.fixture
+def delivery_service(mock_db):
+    return WebhookDeliveryService(mock_db, client_pool=WebhookClientPool())
+
+
+def _subscription(url: str = "https://hooks.example.com/a") -> WebhookSubscription:
+    return WebhookSubscription(
+        id=uuid.uuid4(),
+        tenant_id="tenant_123",
+        url=url,
+        secret="secret",
+        headers={},
+        is_active=True,
+        retry_enabled=True,
+        max_retries=3,
+        timeout_seconds=5,
+    )
+
+
+class TestWebhookClientPool:
+    @pytest.mark.asyncio
+    async def test_clients_are_shared_per_origin(self):
+        pool = WebhookClientPool()
+        try:
+            first = pool.client_for("https://Hooks.example.com/a")
+            assert pool.client_for("https://hooks.example.com:443/b") is first
+            assert pool.client_for("http://hooks.example.com/a") is not first
+            assert pool.stats()["clients"] == 2
+        finally:
+            await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_slots_bound_concurrency_per_subscription(self):
+        pool = WebhookClientPool(max_concurrency=10, per_subscription_concurrency=2)
+        active = peak = 0
+
+        async def deliver() -> None:
+            nonlocal active, peak
+            async with pool.slot("sub-1"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(deliver() for _ in range(6)))
+
+        assert peak == 2
+
+
+class TestWebhookDispatcher:
+    @pytest.mark.asyncio
+    async def test_dispatch_inserts_once_and_batches_statistics(self, mock_db, delivery_service):
+        healthy, failing = _subscription(), _subscription("https://down.example.com/hook")
+        attempts = {
+            str(healthy.id): DeliveryAttempt(status_code=200, response_body="OK"),
+            str(failing.id): DeliveryAttempt(status_code=503, response_body="busy"),
+        }
+
+        async def fake_send(subscription, payload_bytes, headers):
+            return attempts[str(subscription.id)]
+
+        with patch.object(delivery_service, "_send", side_effect=fake_send):
+            deliveries = await WebhookDispatcher(mock_db, delivery_service).dispatch(
+                [healthy, failing], "invoice.created", {"invoice_id": "inv_1"}
+            )
+
+        mock_db.add_all.assert_called_once()
+        assert [d.status for d in deliveries] == [DeliveryStatus.SUCCESS, DeliveryStatus.RETRYING]
+        assert deliveries[1].next_retry_at is not None
+        assert deliveries[0].event_id == deliveries[1].event_id
+
+        # One executemany for subscription statistics
+        assert mock_db.execute.await_count == 1
+        params = {p["subscription_id"]: p for p in mock_db.execute.call_args.args[1]}
+        assert (params[healthy.id]["successes"], params[healthy.id]["failures"]) == (1, 0)
+        assert (params[failing.id]["successes"], params[failing.id]["failures"]) == (0, 1)
+        assert mock_db.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gone_endpoint_disables_subscription(self, mock_db, delivery_service):
+        subscription = _subscription()
+
+        with (
+            patch.object(delivery_service, "_send", return_value=DeliveryAttempt(status_code=410)),
+            patch.object(
+                delivery_service.subscription_service, "disable_subscription", new=AsyncMock()
+            ) as disable,
+        ):
+            [delivery] = await WebhookDispatcher(mock_db, delivery_service).dispatch(
+                [subscription], "invoice.created", {}
+            )
+
+        assert delivery.status == DeliveryStatus.DISABLED
+        disable.assert_awaited_once()
+        mock_db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_without_subscriptions_does_nothing(self, mock_db):
+        assert await WebhookDispatcher(mock_db).dispatch([], "invoice.created", {}) == []
+        mock_db.commit.assert_not_awaited()
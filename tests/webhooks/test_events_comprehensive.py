@@ -206,11 +206,11 @@ class TestEventBusPublish:
         assert count == 0
         mock_service.get_subscriptions_for_event.assert_called_once()
 
-    @patch("dotmac.platform.webhooks.events.WebhookDeliveryService")
+    @patch("dotmac.platform.webhooks.events.WebhookDispatcher")
     @patch("dotmac.platform.webhooks.events.WebhookSubscriptionService")
     @pytest.mark.asyncio
-    async def test_publish_with_subscriptions(self, mock_sub_service, mock_del_service):
-        """Test publishing with active subscriptions."""
+    async def test_publish_with_subscriptions(self, mock_sub_service, mock_dispatcher_class):
+        """Test publishing fans out to all subscriptions in one dispatch."""
         event_bus = EventBus()
         mock_db = AsyncMock()
 
@@ -227,10 +227,10 @@ class TestEventBusPublish:
         )
         mock_sub_service.return_value = mock_sub_svc
 
-        # Mock delivery service
-        mock_del_svc = AsyncMock()
-        mock_del_svc.deliver = AsyncMock()
-        mock_del_service.return_value = mock_del_svc
+        # Mock dispatcher
+        mock_dispatcher = AsyncMock()
+        mock_dispatcher.dispatch = AsyncMock(return_value=[MagicMock(), MagicMock()])
+        mock_dispatcher_class.return_value = mock_dispatcher
 
         count = await event_bus.publish(
             event_type="invoice.created",
@@ -240,33 +240,28 @@ class TestEventBusPublish:
         )
 
         assert count == 2
-        assert mock_del_svc.deliver.call_count == 2
+        mock_dispatcher.dispatch.assert_awaited_once()
+        call_kwargs = mock_dispatcher.dispatch.call_args.kwargs
+        assert call_kwargs["subscriptions"] == [mock_subscription1, mock_subscription2]
 
-    @patch("dotmac.platform.webhooks.events.WebhookDeliveryService")
+    @patch("dotmac.platform.webhooks.events.WebhookDispatcher")
     @patch("dotmac.platform.webhooks.events.WebhookSubscriptionService")
     @pytest.mark.asyncio
-    async def test_publish_handles_delivery_errors(self, mock_sub_service, mock_del_service):
-        """Test that publish continues after delivery errors."""
+    async def test_publish_handles_delivery_errors(self, mock_sub_service, mock_dispatcher_class):
+        """Test that publish does not raise when dispatch fails."""
         event_bus = EventBus()
         mock_db = AsyncMock()
 
-        # Mock subscriptions
-        mock_subscription1 = MagicMock()
-        mock_subscription1.id = uuid.uuid4()
-        mock_subscription2 = MagicMock()
-        mock_subscription2.id = uuid.uuid4()
+        mock_subscription = MagicMock()
+        mock_subscription.id = uuid.uuid4()
 
-        # Mock subscription service
         mock_sub_svc = AsyncMock()
-        mock_sub_svc.get_subscriptions_for_event = AsyncMock(
-            return_value=[mock_subscription1, mock_subscription2]
-        )
+        mock_sub_svc.get_subscriptions_for_event = AsyncMock(return_value=[mock_subscription])
         mock_sub_service.return_value = mock_sub_svc
 
-        # Mock delivery service - first delivery fails, second succeeds
-        mock_del_svc = AsyncMock()
-        mock_del_svc.deliver = AsyncMock(side_effect=[Exception("Delivery failed"), None])
-        mock_del_service.return_value = mock_del_svc
+        mock_dispatcher = AsyncMock()
+        mock_dispatcher.dispatch = AsyncMock(side_effect=Exception("Delivery failed"))
+        mock_dispatcher_class.return_value = mock_dispatcher
 
         count = await event_bus.publish(
             event_type="invoice.created",
@@ -275,9 +270,8 @@ class TestEventBusPublish:
             db=mock_db,
         )
 
-        # Should still count 1 successful delivery
-        assert count == 1
-        assert mock_del_svc.deliver.call_count == 2
+        assert count == 0
+        mock_dispatcher.dispatch.assert_awaited_once()
 
 
 @pytest.mark.unit
@@ -0,0 +1,115 @@
+"""Tests for the webhook event-type routing index."""
+
+import asyncio
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from dotmac.platform.webhooks.routing import (
+    INVALIDATION_CHANNEL,
+    TenantRoutes,
+    WebhookRoutingIndex,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class TestTenantRoutes:
+    def test_exact_and_wildcard_matches(self):
+        exact, prefix, everything, glob, other = (uuid4() for _ in range(5))
+        routes = TenantRoutes(
+            [
+                (exact, ["invoice.created", "invoice.paid"]),
+                (prefix, ["invoice.*"]),
+                (everything, ["*"]),
+                (glob, ["*.failed"]),
+                (other, ["customer.created"]),
+            ]
+        )
+
+        assert routes.match("invoice.created") == {exact, prefix, everything}
+        assert routes.match("invoice.failed") == {prefix, everything, glob}
+        assert routes.match("payment.failed") == {everything, glob}
+        assert routes.match("customer.created") == {everything, other}
+        assert routes.subscription_count == 5
+
+    def test_no_match_returns_empty_set(self):
+        routes = TenantRoutes([(uuid4(), ["invoice.created"]), (uuid4(), [])])
+
+        assert routes.match("invoice.paid") == frozenset()
+        assert routes.match("invoice") == frozenset()
+
+    def test_match_cache_is_bounded(self):
+        routes = TenantRoutes([(uuid4(), ["*"])], match_cache_size=2)
+
+        for event_type in ("a", "b", "c"):
+            routes.match(event_type)
+
+        assert list(routes._match_cache) == ["b", "c"]
+
+
+class TestWebhookRoutingIndex:
+    @pytest.mark.asyncio
+    async def test_get_or_load_is_single_flight(self):
+        index = WebhookRoutingIndex(max_age=0)
+        subscription_id = uuid4()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return [(subscription_id, ["invoice.created"])]
+
+        results = await asyncio.gather(*(index.get_or_load("tenant-1", loader) for _ in range(5)))
+
+        assert calls == 1
+        assert all(routes is results[0] for routes in results)
+        assert results[0].match("invoice.created") == {subscription_id}
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_cached(self):
+        index = WebhookRoutingIndex(max_age=0)
+
+        async def loader():
+            index.invalidate_local("tenant-1")
+            return []
+
+        await index.get_or_load("tenant-1", loader)
+
+        assert index.get("tenant-1") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_publishes_tenant(self):
+        index = WebhookRoutingIndex(max_age=0)
+        await index.get_or_load("tenant-1", AsyncMock(return_value=[]))
+        redis = AsyncMock()
+
+        await index.invalidate("tenant-1", redis=redis)
+
+        assert index.get("tenant-1") is None
+        redis.publish.assert_awaited_once_with(INVALIDATION_CHANNEL, "tenant-1")
+
+    @pytest.mark.asyncio
+    async def test_handle_message(self):
+        index = WebhookRoutingIndex(max_age=0)
+        for tenant_id in ("tenant-1", "tenant-2", "tenant-3"):
+            await index.get_or_load(tenant_id, AsyncMock(return_value=[]))
+
+        index.handle_message(b"tenant-1")
+        assert index.get("tenant-1") is None
+        assert index.get("tenant-2") is not None
+
+        index.handle_message("*")
+        assert index.get("tenant-2") is None
+        assert index.get("tenant-3") is None
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_max_age(self):
+        index = WebhookRoutingIndex(max_age=60)
+        routes = await index.get_or_load("tenant-1", AsyncMock(return_value=[]))
+
+        routes.loaded_at -= 61
+
+        assert index.get("tenant-1") is None
@@ -0,0 +1,207 @@
+"""Tests for per-endpoint webhook scheduling."""
+
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dotmac.platform.settings import settings
+from dotmac.platform.webhooks.delivery import DeliveryAttempt, WebhookDeliveryService
+from dotmac.platform.webhooks.dispatcher import WebhookDispatcher
+from dotmac.platform.webhooks.models import DeliveryStatus, WebhookDelivery, WebhookSubscription
+from dotmac.platform.webhooks.pool import WebhookClientPool
+from dotmac.platform.webhooks.scheduler import (
+    EndpointScheduler,
+    endpoint_key,
+    parse_retry_after,
+)
+
+pytestmark = pytest.mark.unit
+
+DOWN_URL = "https://down.example.com/hook"
+
+
+def _scheduler(**overrides) -> EndpointScheduler:
+    options = {
+        "failure_threshold": 2,
+        "recovery_timeout": 60.0,
+        "initial_concurrency": 2,
+        "max_concurrency": 4,
+        "rate_per_second": 1000.0,
+        "burst": 100,
+        "queue_timeout": 0.5,
+    }
+    options.update(overrides)
+    return EndpointScheduler(**options)
+
+
+def _sender(attempt: DeliveryAttempt) -> AsyncMock:
+    return AsyncMock(return_value=attempt)
+
+
+class TestHelpers:
+    def test_endpoint_key_normalises_origin(self):
+        assert endpoint_key("https://Hooks.Example.com/a?b=1") == "https://hooks.example.com:443"
+        assert endpoint_key("http://hooks.example.com:8080/") == "http://hooks.example.com:8080"
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after("999999") == 21600.0
+
+        retry_at = format_datetime(datetime.now(UTC) + timedelta(seconds=90), usegmt=True)
+        assert 80 <= parse_retry_after(retry_at) <= 90
+
+
+class TestEndpointScheduler:
+    @pytest.mark.asyncio
+    async def test_circuit_opens_and_defers_without_sending(self):
+        scheduler = _scheduler()
+        send = _sender(DeliveryAttempt(status_code=500))
+
+        for _ in range(2):
+            attempt = await scheduler.submit(DOWN_URL, send)
+            assert attempt.status_code == 500
+
+        attempt = await scheduler.submit(DOWN_URL, send)
+
+        assert attempt.deferred is True
+        assert 0 < attempt.retry_after <= 60
+        assert send.await_count == 2
+        # Other endpoints are unaffected
+        ok = await scheduler.submit("https://up.example.com/hook", _sender(DeliveryAttempt(200)))
+        assert ok.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_circuit(self):
+        scheduler = _scheduler()
+        send = _sender(DeliveryAttempt(status_code=400))
+
+        for _ in range(5):
+            assert (await scheduler.submit(DOWN_URL, send)).status_code == 400
+
+        assert scheduler.blocked_for(DOWN_URL) == 0
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_single_probe(self):
+        scheduler = _scheduler(recovery_timeout=0.01, queue_timeout=0.05)
+        await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(error="timeout")))
+        await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(error="timeout")))
+        await asyncio.sleep(0.02)
+
+        release = asyncio.Event()
+
+        async def slow_probe():
+            await release.wait()
+            return DeliveryAttempt(status_code=200)
+
+        probe = asyncio.create_task(scheduler.submit(DOWN_URL, slow_probe))
+        await asyncio.sleep(0.01)
+        second = await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(200)))
+        release.set()
+
+        assert second.deferred is True
+        assert (await probe).status_code == 200
+        assert scheduler.endpoint(DOWN_URL).breaker.is_closed
+
+    @pytest.mark.asyncio
+    async def test_aimd_limit(self):
+        scheduler = _scheduler(failure_threshold=100)
+        state = scheduler.endpoint(DOWN_URL)
+
+        for _ in range(10):
+            await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(200)))
+        assert state.concurrency == 4
+
+        await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(503)))
+        assert state.concurrency == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_endpoint(self):
+        scheduler = _scheduler(failure_threshold=100)
+
+        await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(429, retry_after=30.0)))
+
+        assert 29 < scheduler.blocked_for(DOWN_URL) <= 30
+        attempt = await scheduler.submit(DOWN_URL, _sender(DeliveryAttempt(200)))
+        assert attempt.deferred is True
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_defers_beyond_queue_timeout(self):
+        scheduler = _scheduler(rate_per_second=1.0, burst=1, queue_timeout=0.1)
+        send = _sender(DeliveryAttempt(200))
+
+        assert (await scheduler.submit(DOWN_URL, send)).status_code == 200
+        attempt = await scheduler.submit(DOWN_URL, send)
+
+        assert attempt.deferred is True
+        assert send.await_count == 1
+
+
+class TestDeferredDeliveries:
+    @pytest.mark.asyncio
+    async def test_blocked_endpoint_batch_is_deferred_together(self):
+        db = AsyncMock()
+        db.add_all = MagicMock()
+        scheduler = _scheduler()
+        service = WebhookDeliveryService(db, client_pool=WebhookClientPool(), scheduler=scheduler)
+        scheduler.endpoint(DOWN_URL).on_failure(retry_after=120.0)
+
+        subscriptions = [
+            WebhookSubscription(
+                id=uuid.uuid4(),
+                tenant_id="tenant_123",
+                url=DOWN_URL,
+                secret="secret",
+                headers={},
+                retry_enabled=True,
+                max_retries=3,
+                timeout_seconds=5,
+            )
+            for _ in range(3)
+        ]
+
+        with patch.object(service, "_send", new=AsyncMock()) as send:
+            deliveries = await WebhookDispatcher(db, service).dispatch(
+                subscriptions, "invoice.created", {}
+            )
+
+        send.assert_not_awaited()
+        for delivery in deliveries:
+            assert delivery.status == DeliveryStatus.RETRYING
+            assert delivery.attempt_number == 0
+            assert delivery.next_retry_at >= datetime.now(UTC) + timedelta(seconds=110)
+        # Deferred deliveries are not failures: no statistics update
+        db.execute.assert_not_awaited()
+
+    def test_deferrals_past_the_cap_use_up_retries(self, monkeypatch):
+        monkeypatch.setattr(settings.webhooks, "endpoint_max_deferrals", 2)
+        service = WebhookDeliveryService(AsyncMock(), client_pool=WebhookClientPool())
+        delivery = WebhookDelivery(attempt_number=1, event_type="invoice.created")
+        subscription = WebhookSubscription(id=uuid.uuid4(), retry_enabled=True, max_retries=3)
+        attempt = DeliveryAttempt(error="Delivery deferred", retry_after=60.0, deferred=True)
+
+        outcomes = []
+        while delivery.status != DeliveryStatus.FAILED:
+            deferred = service._record_attempt(delivery, attempt)
+            if not deferred:
+                service._schedule_retry(delivery, subscription, attempt.retry_after)
+            outcomes.append(deferred)
+            # The retry processor counts the next run as a new attempt
+            delivery.attempt_number += 1
+
+        assert outcomes == [True, True, False, False, False]
+        assert delivery.deferral_count == 5
+
+    def test_schedule_retry_honours_retry_after(self):
+        service = WebhookDeliveryService(AsyncMock(), client_pool=WebhookClientPool())
+        delivery = WebhookDelivery(attempt_number=1, event_type="invoice.created")
+        subscription = WebhookSubscription(id=uuid.uuid4(), retry_enabled=True, max_retries=3)
+
+        service._schedule_retry(delivery, subscription, retry_after=900)
+
+        assert delivery.next_retry_at >= datetime.now(UTC) + timedelta(seconds=890)
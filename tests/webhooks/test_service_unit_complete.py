@@ -345,11 +345,13 @@ class TestGetSubscriptionsForEvent:
             is_active=True,
         )
 
+        routes_result = Mock()
+        routes_result.all.return_value = [(sub1.id, sub1.events), (sub2.id, sub2.events)]
         mock_result = Mock()
         mock_scalars = Mock()
-        mock_scalars.all.return_value = [sub1, sub2]
+        mock_scalars.all.return_value = [sub1]
         mock_result.scalars.return_value = mock_scalars
-        mock_db_session.execute.return_value = mock_result
+        mock_db_session.execute.side_effect = [routes_result, mock_result]
 
         subscriptions = await webhook_service.get_subscriptions_for_event(
             "user.registered", tenant_id
@@ -372,17 +374,17 @@ class TestGetSubscriptionsForEvent:
             is_active=True,
         )
 
-        mock_result = Mock()
-        mock_scalars = Mock()
-        mock_scalars.all.return_value = [sub1]
-        mock_result.scalars.return_value = mock_scalars
-        mock_db_session.execute.return_value = mock_result
+        routes_result = Mock()
+        routes_result.all.return_value = [(sub1.id, sub1.events)]
+        mock_db_session.execute.return_value = routes_result
 
         subscriptions = await webhook_service.get_subscriptions_for_event(
             "user.registered", tenant_id
         )
 
         assert len(subscriptions) == 0
+        # No matching ids, so subscriptions are never loaded
+        assert mock_db_session.execute.await_count == 1
 
 
 @pytest.mark.unit